@@ -1,17 +1,153 @@
 import discord
+import asyncio
+import time
 from discord.ext import commands
 from discord import app_commands
+from command_sync import sync_commands_if_changed
+
+class DMCleanupJob:
+    """Delete the bot's messages in the DMs of one or more users.
+
+    DM history is paged and messages are deleted with bounded concurrency.
+    discord.py's HTTP client already waits on rate-limit buckets; 429 responses
+    that still come through are retried after their Retry-After delay.
+    """
+
+    CONCURRENCY = 5
+    SCAN_LIMIT = 5000  # Messages scanned per user at most
+    MAX_RETRIES = 3
+    PROGRESS_INTERVAL = 3.0
+    INTERACTION_LIFETIME = 14 * 60  # Interaction tokens expire after 15 minutes
+
+    def __init__(self, bot, users, amount):
+        self.bot = bot
+        self.users = users
+        self.amount = amount
+        self.semaphore = asyncio.Semaphore(self.CONCURRENCY)
+        self.started_at = time.monotonic()
+        self.finished = False
+        self.interaction_expired = False
+        self.rate_limited = 0
+        self.results = {
+            user.id: {"user": user, "scanned": 0, "deleted": 0, "failed": 0, "status": "Pending"}
+            for user in users
+        }
+
+    def can_edit(self):
+        return not self.interaction_expired and time.monotonic() - self.started_at < self.INTERACTION_LIFETIME
+
+    async def run(self):
+        for user in self.users:
+            result = self.results[user.id]
+            result["status"] = "Running"
+            try:
+                await self.clean_user(user, result)
+                if result["status"] == "Running":
+                    result["status"] = "Done"
+            except discord.Forbidden:
+                result["status"] = "Access denied"
+            except Exception as e:
+                result["status"] = f"Error: {e}"
+
+    async def clean_user(self, user, result):
+        # Get DM channel with the user
+        dm_channel = user.dm_channel
+        if dm_channel is None:
+            dm_channel = await user.create_dm()
+
+        pending = set()
+        try:
+            async for message in dm_channel.history(limit=self.SCAN_LIMIT):
+                result["scanned"] += 1
+                if message.author.id != self.bot.user.id:
+                    continue
+
+                # Only queue what can still be needed: a failed or already gone
+                # message is replaced by an older one. Also keeps the number of
+                # in-flight deletions bounded while paging
+                while pending and (result["deleted"] + len(pending) >= self.amount
+                                   or len(pending) >= self.CONCURRENCY * 2):
+                    _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if result["deleted"] >= self.amount or result["status"] != "Running":
+                    break
+
+                pending.add(asyncio.create_task(self.delete_message(message, result)))
+
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            # History failed (or the job was cancelled): don't leave deletions running unobserved
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def delete_message(self, message, result):
+        async with self.semaphore:
+            if result["status"] != "Running":
+                return
+            for _ in range(self.MAX_RETRIES):
+                try:
+                    await message.delete()
+                    result["deleted"] += 1
+                    return
+                except discord.NotFound:
+                    return  # Message already deleted
+                except discord.Forbidden:
+                    result["status"] = "Access denied"  # Can't delete messages
+                    return
+                except discord.HTTPException as e:
+                    if e.status != 429:
+                        break
+                    self.rate_limited += 1
+                    retry_after = e.response.headers.get("Retry-After", 1) if e.response is not None else 1
+                    await asyncio.sleep(float(retry_after))
+            result["failed"] += 1
+
+    def create_embed(self):
+        total_deleted = sum(result["deleted"] for result in self.results.values())
+        elapsed = time.monotonic() - self.started_at
+
+        if self.finished:
+            title = "<:SucessLOGO:1407071637840592977> Messages Cleared"
+            color = discord.Color.green()
+        else:
+            title = "<a:LoadingLOGO:1407732919476424814> Clearing Messages..."
+            color = discord.Color.blurple()
+
+        embed = discord.Embed(
+            title=title,
+            description=f"Cleared {total_deleted} bot message(s) from {len(self.users)} user(s) DMs.",
+            color=color
+        )
+        for result in self.results.values():
+            value = f"Deleted: {result['deleted']}/{self.amount}\nScanned: {result['scanned']}\nStatus: {result['status']}"
+            if result["failed"]:
+                value += f"\nFailed: {result['failed']}"
+            embed.add_field(name=result["user"].display_name, value=value, inline=True)
+
+        footer = f"Elapsed: {elapsed:.0f}s"
+        if self.rate_limited:
+            footer += f" | Rate limited {self.rate_limited} time(s)"
+        embed.set_footer(text=footer)
+        return embed
 
 class AdministratorCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    @app_commands.command(name="clear_dm", description="Clear bot messages sent to a specific user in DMs")
+    @app_commands.command(name="clear_dm", description="Clear bot messages sent to specific users in DMs")
     @app_commands.describe(
         user="The user whose DM messages to clear",
-        amount="Number of messages to clear (1-999)"
+        amount="Number of messages to clear per user (1-999)",
+        user2="Another user whose DM messages to clear",
+        user3="Another user whose DM messages to clear",
+        user4="Another user whose DM messages to clear",
+        user5="Another user whose DM messages to clear"
     )
-    async def clear_dm_command(self, interaction: discord.Interaction, user: discord.User, amount: int):
+    async def clear_dm_command(self, interaction: discord.Interaction, user: discord.User, amount: int,
+                               user2: discord.User = None, user3: discord.User = None,
+                               user4: discord.User = None, user5: discord.User = None):
         # Check if user has admin permissions
         if not interaction.user.guild_permissions.administrator:
             embed = discord.Embed(
@@ -34,39 +170,77 @@ class AdministratorCommands(commands.Cog):
 
         await interaction.response.defer(ephemeral=True)
 
+        # Remove duplicates while keeping the given order
+        users = []
+        for target in (user, user2, user3, user4, user5):
+            if target and all(target.id != other.id for other in users):
+                users.append(target)
+
+        job = DMCleanupJob(self.bot, users, amount)
+        progress_message = await interaction.followup.send(embed=job.create_embed(), ephemeral=True, wait=True)
+
+        reporter = asyncio.create_task(self.report_progress(job, progress_message))
+        try:
+            await job.run()
+        finally:
+            job.finished = True
+            reporter.cancel()
+
+        # Edit the progress message, or post to the invoking channel if the interaction expired
+        embed = job.create_embed()
+        if job.can_edit() and await self.edit_progress(job, progress_message, embed):
+            return
+
+        try:
+            await interaction.channel.send(content=interaction.user.mention, embed=embed)
+        except discord.HTTPException as e:
+            print(f"Failed to post DM cleanup result: {e}")
+
+    async def report_progress(self, job, progress_message):
+        """Periodically edit the followup with the job progress"""
+        while not job.finished and job.can_edit():
+            await asyncio.sleep(DMCleanupJob.PROGRESS_INTERVAL)
+            if job.finished:
+                break
+            if not await self.edit_progress(job, progress_message, job.create_embed()):
+                break
+
+    async def edit_progress(self, job, progress_message, embed):
         try:
-            # Get DM channel with the user
-            dm_channel = user.dm_channel
-            if dm_channel is None:
-                dm_channel = await user.create_dm()
-
-            # Fetch messages and count bot messages
-            deleted_count = 0
-            async for message in dm_channel.history(limit=amount * 3):  # Get more to account for user messages
-                if message.author == self.bot.user and deleted_count < amount:
-                    try:
-                        await message.delete()
-                        deleted_count += 1
-                    except discord.NotFound:
-                        pass  # Message already deleted
-                    except discord.Forbidden:
-                        break  # Can't delete messages
-
-            # Success response
+            await progress_message.edit(embed=embed)
+            return True
+        except discord.HTTPException as e:
+            # Interaction token expired or message gone: stop editing
+            if isinstance(e, discord.NotFound) or e.status == 401:
+                job.interaction_expired = True
+            else:
+                print(f"Failed to update DM cleanup progress: {e}")
+            return False
+
+    @app_commands.command(name="sync_commands", description="Force a sync of the bot's slash commands with Discord")
+    async def sync_commands_command(self, interaction: discord.Interaction):
+        # Check if user has admin permissions
+        if not interaction.user.guild_permissions.administrator:
             embed = discord.Embed(
-                title="<:SucessLOGO:1407071637840592977> Messages Cleared",
-                description=f"Successfully cleared {deleted_count} bot message(s) from {user.mention}'s DMs.",
-                color=discord.Color.green()
+                title="<:ErrorLOGO:1407071682031648850> Permission Denied",
+                description="You need 'Administrator' permission to use this command.",
+                color=discord.Color.red()
             )
-            await interaction.followup.send(embed=embed, ephemeral=True)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            synced = await sync_commands_if_changed(self.bot, force=True)
 
-        except discord.Forbidden:
             embed = discord.Embed(
-                title="<:ErrorLOGO:1407071682031648850> Access Denied",
-                description="I don't have permission to access that user's DMs or delete messages.",
-                color=discord.Color.red()
+                title="<:SucessLOGO:1407071637840592977> Commands Synced",
+                description=f"Successfully synced {len(synced)} command(s) with Discord.",
+                color=discord.Color.green()
             )
             await interaction.followup.send(embed=embed, ephemeral=True)
+
         except Exception as e:
             embed = discord.Embed(
                 title="<:ErrorLOGO:1407071682031648850> Error",
@@ -0,0 +1,77 @@
+import io
+import math
+import os
+
+from image_ingest import ImageRejected
+from lazy_imports import LazyModule
+Image = LazyModule('PIL.Image')
+
+# Limits for animated card backgrounds (GIF, animated WebP, APNG)
+MAX_FRAMES = int(os.getenv('CARD_MAX_FRAMES', 120))
+MAX_DURATION_MS = int(os.getenv('CARD_MAX_DURATION_MS', 15000))
+MAX_FRAME_BYTES = int(os.getenv('CARD_MAX_FRAME_BYTES', 256 * 1024 * 1024))  # Decoded RGBA frames, at output size
+MAX_SOURCE_PIXELS = int(os.getenv('CARD_MAX_SOURCE_PIXELS', 7680 * 4320))  # Per source frame (8K)
+DEFAULT_FRAME_DURATION = 100  # ms, when a frame has none (browsers show 0 ms frames as 100 ms too)
+
+class AnimatedMedia:
+    """An uploaded background, decoded one frame at a time.
+
+    Works for static images and for GIF, WebP and APNG animations alike.
+    frames() only keeps what the card needs: at most MAX_FRAMES frames and
+    MAX_FRAME_BYTES of output frames (every n-th frame is kept and the skipped
+    frames' time is added to it), the first MAX_DURATION_MS of the animation,
+    and identical consecutive frames merged into one longer frame.
+    """
+
+    def __init__(self, data):
+        # Raises ImageRejected for images over MAX_SOURCE_PIXELS
+        self.image = Image.open(io.BytesIO(data))
+        width, height = self.image.size
+        if width * height > MAX_SOURCE_PIXELS:
+            raise ImageRejected(f"The image is too large ({width}x{height}, max {MAX_SOURCE_PIXELS:,} pixels).")
+        self.n_frames = getattr(self.image, 'n_frames', 1)
+        self.is_animated = bool(getattr(self.image, 'is_animated', False)) and self.n_frames > 1
+
+    def first_frame(self):
+        """First frame as RGBA"""
+        self.image.seek(0)
+        return self.image.convert("RGBA")
+
+    def frames(self, size, resize, max_frames=MAX_FRAMES, max_duration=MAX_DURATION_MS, max_bytes=MAX_FRAME_BYTES):
+        """Yield (frame, duration in ms); resize(RGBA source frame) returns a frame of the given output size"""
+        if not self.is_animated:
+            yield resize(self.first_frame()), DEFAULT_FRAME_DURATION
+            return
+
+        frame_limit = max(1, min(max_frames, max_bytes // max(1, size[0] * size[1] * 4)))
+        stride = math.ceil(self.n_frames / frame_limit)
+
+        pending = None  # [source bytes, output frame, duration] of the frame being extended
+        elapsed = 0
+        for index in range(self.n_frames):
+            if elapsed >= max_duration:
+                break
+            self.image.seek(index)
+            duration = self.image.info.get('duration') or DEFAULT_FRAME_DURATION
+            elapsed += duration
+
+            if pending and index % stride:
+                # Sampled out: shown as part of the previous kept frame
+                pending[2] += duration
+                continue
+
+            frame = self.image.convert("RGBA")
+            source = frame.tobytes()
+            if pending and source == pending[0]:
+                pending[2] += duration
+                continue
+
+            if pending:
+                yield pending[1], pending[2]
+            pending = [source, resize(frame), duration]
+
+        if pending:
+            yield pending[1], pending[2]
+
+    def close(self):
+        self.image.close()
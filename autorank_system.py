@@ -1,11 +1,11 @@
 
 import discord
 from discord.ext import commands, tasks
-import json
 import re
 from datetime import datetime
 import asyncio
 import emoji
+from json_store import json_document
 
 def normalize_emoji(emoji_str):
     """Normalize emoji from different Unicode formats using emoji library"""
@@ -42,16 +42,13 @@ def normalize_emoji(emoji_str):
         return "⭐"
 
 # File management functions
+autorank_store = json_document('autorank_data.json')
+
 def load_autorank_data():
-    try:
-        with open('autorank_data.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {"autoranks": {}}
+    return autorank_store.load(default=lambda: {"autoranks": {}})
 
 def save_autorank_data(data):
-    with open('autorank_data.json', 'w') as f:
-        json.dump(data, f, indent=2)
+    autorank_store.save(data)
 
 # Main AutoRank Management View
 class AutoRankMainView(discord.ui.View):
@@ -1456,8 +1453,7 @@ async def setup(bot):
     await bot.add_cog(AutoRankSystem(bot))
     # Add persistent view to bot
     bot.add_view(PersistentAutoRankButtonView())
-    # Restore existing autorank buttons
-    await restore_autorank_buttons(bot)
+    # Existing autorank buttons are restored in on_ready (main.py), once the caches are filled
 
 def update_existing_emoji_data():
     """Update existing autorank data to convert Unicode codes to direct emojis"""
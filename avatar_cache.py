@@ -0,0 +1,156 @@
+import asyncio
+import io
+import os
+from collections import OrderedDict
+
+import aiohttp
+
+from lazy_imports import LazyModule
+Image = LazyModule('PIL.Image')
+ImageDraw = LazyModule('PIL.ImageDraw')
+
+# Avatars for the cards: downloaded at the smallest CDN size that covers the
+# card, masked into a circle once per size, kept until the byte budget is full
+AVATAR_CACHE_BYTES = int(os.getenv('AVATAR_CACHE_BYTES', 64 * 1024 * 1024))  # Downloads + decoded circles
+AVATAR_CDN_SIZES = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096)  # Sizes the Discord CDN serves
+AVATAR_DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=15)
+
+def cdn_size(diameter):
+    """Smallest CDN size at least diameter pixels wide"""
+    for size in AVATAR_CDN_SIZES:
+        if size >= diameter:
+            return size
+    return AVATAR_CDN_SIZES[-1]
+
+def circle_avatar(data, diameter):
+    """Circular RGBA avatar, diameter pixels wide, from downloaded image bytes (first frame if animated)"""
+    avatar = Image.open(io.BytesIO(data)).convert("RGBA")
+    avatar = avatar.resize((diameter, diameter), Image.Resampling.LANCZOS)
+    mask = Image.new('L', (diameter, diameter), 0)
+    ImageDraw.Draw(mask).ellipse((0, 0, diameter, diameter), fill=255)
+    avatar.putalpha(mask)
+    return avatar
+
+class AvatarCache:
+    """Circular avatars by (user id, avatar hash, diameter), LRU within a byte budget.
+
+    The avatar hash is part of the key: a new avatar is a new entry, and
+    invalidate() (on_user_update below) frees the old ones right away. The
+    downloaded images are kept too (by CDN size), so another card size for
+    the same user only needs a new mask. Runs on the bot's event loop only.
+    """
+
+    def __init__(self, max_bytes=AVATAR_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, byte size)
+        self._bytes = 0
+        self._pending = {}  # key -> task, when several cards wait for the same avatar
+        self._session = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _put(self, key, value, size):
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def _http_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=AVATAR_DOWNLOAD_TIMEOUT)
+        return self._session
+
+    async def _download(self, url):
+        try:
+            async with self._http_session().get(url) as response:
+                if response.status == 200:
+                    return await response.read()
+            return None
+        except Exception as e:
+            print(f"Error downloading avatar {url}: {e}")
+            return None
+
+    async def _load(self, user_id, asset, diameter):
+        size = cdn_size(diameter)
+        source_key = ('source', user_id, asset.key, size)
+        data = self._get(source_key)
+        if data is None:
+            data = await self._download(asset.with_size(size).url)
+            if data is None:
+                return None
+            self._put(source_key, data, len(data))
+
+        avatar = await asyncio.to_thread(circle_avatar, data, diameter)
+        self._put(('circle', user_id, asset.key, diameter), avatar, diameter * diameter * 4)
+        return avatar
+
+    async def get(self, user, diameter):
+        """Circular RGBA avatar of a user or member, or None if it can't be downloaded.
+
+        Shared with other cards: paste it, never modify it in place.
+        """
+        asset = user.display_avatar
+        key = ('circle', user.id, asset.key, diameter)
+        avatar = self._get(key)
+        if avatar is not None:
+            self.hits += 1
+            return avatar
+
+        task = self._pending.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._load(user.id, asset, diameter))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        # A cancelled card doesn't cancel the download the others wait for
+        return await asyncio.shield(task)
+
+    def invalidate(self, user_id):
+        """Forget every avatar of a user (they changed it)"""
+        for key in [key for key in self._entries if key[1] == user_id]:
+            _, size = self._entries.pop(key)
+            self._bytes -= size
+
+    def get_stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+avatar_cache = AvatarCache()
+
+# Loaded as an extension: one listener for every card using the cache
+async def on_user_update(before, after):
+    """Forget the cached avatars of a user who changed theirs"""
+    if before.display_avatar != after.display_avatar:
+        avatar_cache.invalidate(after.id)
+
+async def setup(bot):
+    bot.add_listener(on_user_update)
+
+async def teardown(bot):
+    bot.remove_listener(on_user_update)
+    await avatar_cache.close()
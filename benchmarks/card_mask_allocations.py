@@ -0,0 +1,164 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+# Allocations of the texture masking done for one fully textured level card
+# (four text overlays, XP bar background and progress bar) and one
+# notification text overlay: the previous NumPy masking (arrays, zeros_like,
+# boolean-index copies, fromarray) against image_masks (in-place alpha).
+#
+# Pillow images are counted (and their pixel bytes summed) by wrapping
+# Image.Image._new, which wraps every image Pillow creates; NumPy buffers are
+# seen by tracemalloc.
+#
+#   python benchmarks/card_mask_allocations.py
+#   python benchmarks/card_mask_allocations.py --repeat 50
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from image_masks import apply_mask, binary_mask, clear_outside, clip_mask_width
+
+TEXT_SIZES = [(760, 190), (560, 220), (300, 180), (520, 150)]  # username, level, ranking, XP text canvases
+BAR_SIZE = (1200, 60)
+
+def texture(size, seed):
+    rng = np.random.default_rng(seed)
+    return Image.fromarray(rng.integers(0, 256, (size[1], size[0], 4), dtype=np.uint8), 'RGBA')
+
+def text_mask(size):
+    mask = Image.new('L', size, 0)
+    ImageDraw.Draw(mask).text((30, 30), "LEVEL 42", fill=255, font_size=size[1] - 60)
+    return mask
+
+def rounded_mask(size, width=None):
+    mask = Image.new('L', size, 0)
+    ImageDraw.Draw(mask).rounded_rectangle([(0, 0), ((width or size[0]) - 1, size[1] - 1)], radius=size[1] // 2, fill=255)
+    return mask
+
+def small_progress_mask(size, width):
+    mask = Image.new('L', size, 0)
+    ImageDraw.Draw(mask).ellipse([(0, 0), (size[1] - 1, size[1] - 1)], fill=255)
+    return mask
+
+# Before: the NumPy versions the cards used
+
+def before_text_overlay(overlay, mask):
+    result = Image.new('RGBA', overlay.size, (0, 0, 0, 0))
+    mask_array = np.array(mask)
+    overlay_array = np.array(overlay)
+    result_array = np.array(result)
+    text_pixels = mask_array > 0
+    result_array[text_pixels] = overlay_array[text_pixels]
+    return Image.fromarray(result_array, 'RGBA')
+
+def before_bar(texture_image, mask):
+    texture_array = np.array(texture_image)
+    mask_array = np.array(mask)
+    result_array = np.zeros_like(texture_array)
+    mask_pixels = mask_array > 0
+    result_array[mask_pixels] = texture_array[mask_pixels]
+    result_array[:, :, 3] = mask_array
+    return Image.fromarray(result_array, 'RGBA')
+
+def before_small_progress(texture_image, mask, width):
+    crop_mask = Image.new('L', mask.size, 0)
+    ImageDraw.Draw(crop_mask).rectangle([(0, 0), (width - 1, mask.height - 1)], fill=255)
+    progress_mask = Image.fromarray(np.minimum(np.array(mask), np.array(crop_mask)), 'L')
+    return before_bar(texture_image, progress_mask)
+
+def before_notification_overlay(overlay, mask):
+    result = Image.new('RGBA', overlay.size, (0, 0, 0, 0))
+    mask_array = np.array(mask)
+    overlay_array = np.array(overlay)
+    result_array = np.array(result)
+    result_array[(mask_array > 0) & (mask_array < 255)] = (0, 0, 0, 255)
+    text_pixels = mask_array == 255
+    result_array[text_pixels] = overlay_array[text_pixels]
+    result_array[:, :, 3] = mask_array
+    return Image.fromarray(result_array, 'RGBA')
+
+# After: image_masks
+
+def after_text_overlay(overlay, mask):
+    return clear_outside(overlay, mask)
+
+def after_bar(texture_image, mask):
+    return apply_mask(texture_image, mask)
+
+def after_small_progress(texture_image, mask, width):
+    return apply_mask(texture_image, clip_mask_width(mask, width))
+
+def after_notification_overlay(overlay, mask):
+    overlay.paste((0, 0, 0, 255), None, binary_mask(mask, 255, invert=True))
+    return apply_mask(overlay, mask)
+
+def card_inputs():
+    """Fresh inputs for one card (the cards mask freshly resized images)"""
+    texts = [(texture(size, index), text_mask(size)) for index, size in enumerate(TEXT_SIZES)]
+    notification = (texture(TEXT_SIZES[1], 9), text_mask(TEXT_SIZES[1]))
+    return {
+        "texts": texts,
+        "bar": (texture(BAR_SIZE, 5), rounded_mask(BAR_SIZE)),
+        "progress": (texture(BAR_SIZE, 6), small_progress_mask(BAR_SIZE, 40)),
+        "notification": notification,
+    }
+
+def mask_card(inputs, text_overlay, bar, small_progress, notification_overlay):
+    results = [text_overlay(overlay, mask) for overlay, mask in inputs["texts"]]
+    results.append(bar(*inputs["bar"]))
+    results.append(small_progress(*inputs["progress"], 40))
+    results.append(notification_overlay(*inputs["notification"]))
+    return results
+
+def visible(image):
+    """Pixels as they show once composited: color only counts where alpha > 0"""
+    array = np.array(image.convert('RGBA'))
+    array[array[:, :, 3] == 0] = 0
+    return array
+
+created = {"images": 0, "bytes": 0}
+_new = Image.Image._new
+
+def counting_new(self, im):
+    created["images"] += 1
+    created["bytes"] += im.size[0] * im.size[1] * (1 if im.mode in ('1', 'L', 'P') else 4)
+    return _new(self, im)
+
+def measure(name, functions, repeat):
+    images = image_bytes = numpy_peak = 0
+    elapsed = 0.0
+    for _ in range(repeat):
+        inputs = card_inputs()
+        created.update(images=0, bytes=0)
+        Image.Image._new = counting_new
+        tracemalloc.start()
+        start = time.perf_counter()
+        results = mask_card(inputs, *functions)
+        elapsed += time.perf_counter() - start
+        numpy_peak = max(numpy_peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        Image.Image._new = _new
+        images += created["images"]
+        image_bytes += created["bytes"]
+    print(f"{name:<7} {images / repeat:5.1f} images, {image_bytes / repeat / 1024:7.0f} KiB of pixels  "
+          f"NumPy peak {numpy_peak / 1024:6.0f} KiB  {elapsed / repeat * 1000:6.2f} ms per card")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Card masking allocations benchmark")
+    parser.add_argument("--repeat", type=int, default=20, help="Cards to mask per variant")
+    args = parser.parse_args()
+
+    before = measure("before", (before_text_overlay, before_bar, before_small_progress, before_notification_overlay), args.repeat)
+    after = measure("after", (after_text_overlay, after_bar, after_small_progress, after_notification_overlay), args.repeat)
+    for expected, result in zip(before, after):
+        assert np.array_equal(visible(expected), visible(result)), "masked images differ"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Measures palette matching throughput per color metric: full distance
+# search (ColorMetric.nearest), then the cached lookup table: cold (refined
+# for this image), new image (same palette, partly refined already) and warm
+# (the same image again, table hits only).
+#
+#   python benchmarks/color_metric_throughput.py
+#   python benchmarks/color_metric_throughput.py --size 1024 --colors 32 --metric cie76
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+import palette_lut
+from color_metrics import COLOR_METRICS
+
+def make_image(rng, size):
+    """Smooth gradients plus noise, closer to photos than pure noise"""
+    y, x = np.mgrid[0:size, 0:size] / max(1, size - 1)
+    base = np.stack([x * 255, y * 255, (1 - x) * (1 - y) * 255], axis=-1)
+    noise = rng.normal(0, 24, base.shape)
+    return np.clip(base + noise, 0, 255).astype(np.uint8)
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Color metric throughput benchmark")
+    parser.add_argument("--metric", action="append", choices=sorted(COLOR_METRICS), help="Metric to measure (repeatable)")
+    parser.add_argument("--size", type=int, default=512, help="Image side in pixels")
+    parser.add_argument("--colors", type=int, default=64, help="Palette size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    palette = rng.integers(0, 256, (args.colors, 3)).astype(np.float32)
+    image = make_image(rng, args.size)
+    second_image = make_image(rng, args.size)
+    pixels = image.shape[0] * image.shape[1]
+
+    # Fresh disk cache so the cold numbers include the build
+    palette_lut.PALETTE_CACHE_DIR = tempfile.mkdtemp(prefix="palette_cache_")
+
+    print(f"{pixels} pixels, {args.colors} colors")
+    for name in args.metric or list(COLOR_METRICS):
+        metric = COLOR_METRICS[name]
+        palette_features = metric.prepare(palette)
+        expected, full_time = timed(metric.nearest, image, palette_features)
+
+        table, build_time = timed(palette_lut.get_palette_lut, palette, name)
+        indices, cold_time = timed(table.lookup, image)
+        _, second_time = timed(table.lookup, second_image)
+        _, warm_time = timed(table.lookup, image)
+        assert np.array_equal(indices, expected), f"{name}: lookup table differs from the full search"
+
+        print(f"{metric.label:<18} full {pixels / full_time / 1e6:7.2f} Mpx/s  "
+              f"table build {build_time * 1000:7.1f} ms  "
+              f"cold {pixels / cold_time / 1e6:7.2f} Mpx/s  "
+              f"new image {pixels / second_time / 1e6:7.2f} Mpx/s  "
+              f"warm {pixels / warm_time / 1e6:7.2f} Mpx/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import os
+
+# Measures the import cost of the ticket system, excluding discord.py itself.
+# Each run happens in a fresh interpreter so module caches don't skew results.
+#
+#   python benchmarks/ticket_import_time.py
+#   python benchmarks/ticket_import_time.py --module ticket_bot  (legacy module, if present)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import sys, time, tracemalloc
+import discord, discord.ext.commands
+trace = sys.argv[2] == "1"
+if trace:
+    tracemalloc.start()
+start = time.perf_counter()
+__import__(sys.argv[1])
+elapsed = time.perf_counter() - start
+current, peak = tracemalloc.get_traced_memory()
+print(elapsed * 1000, current / 1024, peak / 1024)
+"""
+
+def run_probe(module, trace=False):
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, module, "1" if trace else "0"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    elapsed_ms, current_kib, peak_kib = map(float, result.stdout.split())
+    return elapsed_ms, current_kib, peak_kib
+
+def main():
+    parser = argparse.ArgumentParser(description="Ticket system import-time benchmark")
+    parser.add_argument("--module", action="append", help="Module to import (repeatable)")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    modules = args.module or ["ticket_system", "ticket_system.commands"]
+    for module in modules:
+        # Warm-up run compiles the .pyc files
+        run_probe(module)
+        times = [run_probe(module)[0] for _ in range(args.runs)]
+        # Memory is measured separately since tracing slows imports down
+        _, retained_kib, peak_kib = run_probe(module, trace=True)
+        print(f"{module:<28} median {statistics.median(times):7.2f} ms  "
+              f"min {min(times):7.2f} ms  "
+              f"retained {retained_kib:8.1f} KiB  peak {peak_kib:8.1f} KiB")
+
+if __name__ == "__main__":
+    main()
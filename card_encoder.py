@@ -0,0 +1,156 @@
+import io
+import os
+import threading
+import time
+
+from image_masks import binary_mask
+from lazy_imports import LazyModule
+Image = LazyModule('PIL.Image')
+
+# auto / webp: lossless WebP (smaller and faster than an optimized PNG, for
+# flat and photographic cards alike), png: lossless PNG, quantized: opt-in
+# 256-color palette PNG (lossy, banding on gradients, but ~5x smaller)
+CARD_OUTPUT_FORMAT = os.getenv('CARD_OUTPUT_FORMAT', 'auto')
+CARD_OUTPUT_SCALE = float(os.getenv('CARD_OUTPUT_SCALE', 1.0))  # 0.5: half-size cards, a quarter of the pixels
+WEBP_METHOD = 1    # Lossless WebP effort: higher methods are several times slower for ~2% smaller files
+WEBP_QUALITY = 25
+GIF_PALETTE_SAMPLES = 8  # Frames used to build the palette shared by every frame of a GIF
+GIF_PALETTE_SAMPLE_WIDTH = 512  # Samples are downscaled: the palette doesn't need every pixel
+GIF_TRANSPARENT_INDEX = 255  # Palette entry kept for transparent pixels (alpha < 128: GIF alpha is 1-bit)
+
+encoder_stats = {}  # kind -> {"cards", "bytes", "encode_ms", "last_format", "last_bytes", "last_encode_ms"}
+_stats_lock = threading.Lock()
+
+def card_extension(output):
+    """File extension of an encoded card, from its header"""
+    header = output.getvalue()[:12]
+    if header.startswith(b'GIF8'):
+        return 'gif'
+    if header.startswith(b'RIFF') and header[8:12] == b'WEBP':
+        return 'webp'
+    return 'png'
+
+def _scaled(frame, scale):
+    if scale == 1:
+        return frame
+    size = (max(1, round(frame.width * scale)), max(1, round(frame.height * scale)))
+    return frame.resize(size, Image.Resampling.LANCZOS)
+
+def _opaque(frame):
+    """RGB copy of fully opaque RGBA frames: a quarter less data to compress"""
+    if frame.mode == 'RGBA' and frame.getextrema()[3][0] == 255:
+        return frame.convert('RGB')
+    return frame
+
+def _quantized(frame, colors=256):
+    return frame.quantize(colors, method=Image.Quantize.FASTOCTREE)
+
+def _encode_static(frame, output, output_format):
+    frame = _opaque(frame)
+    if output_format in ('auto', 'webp'):
+        frame.save(output, format='WEBP', lossless=True, quality=WEBP_QUALITY, method=WEBP_METHOD)
+        return 'WEBP'
+    if output_format == 'quantized':
+        _quantized(frame).save(output, format='PNG', optimize=True)
+    else:
+        frame.save(output, format='PNG', optimize=True)
+    return 'PNG'
+
+def _shared_palette(frames, colors=256):
+    """Palette image built from a downscaled sample of the frames"""
+    step = max(1, len(frames) // GIF_PALETTE_SAMPLES)
+    samples = frames[::step][:GIF_PALETTE_SAMPLES]
+    width = min(GIF_PALETTE_SAMPLE_WIDTH, samples[0].width)
+    height = max(1, samples[0].height * width // samples[0].width)
+    sheet = Image.new('RGB', (width, height * len(samples)))
+    for index, sample in enumerate(samples):
+        sheet.paste(sample.convert('RGB').resize((width, height), Image.Resampling.BOX), (0, index * height))
+    return _quantized(sheet, colors)
+
+def _transparent_mask(frame):
+    """L mask of the pixels a GIF shows as transparent, None if there are none"""
+    if frame.mode != 'RGBA' or frame.getextrema()[3][0] >= 128:
+        return None
+    return binary_mask(frame.getchannel('A'), 128, invert=True)
+
+def _encode_animated(frames, durations, output):
+    # One palette for every frame (no per-frame color tables) and no dithering:
+    # unchanged pixels keep the same index, so each frame only stores the
+    # region that differs from the previous one
+    masks = [_transparent_mask(frame) for frame in frames]
+    transparent = any(mask is not None for mask in masks)
+    # Transparent cards: 255 colors, the last entry is the transparent one
+    palette = _shared_palette(frames, GIF_TRANSPARENT_INDEX if transparent else 256)
+    indexed = []
+    for frame, mask in zip(frames, masks):
+        frame = frame.convert('RGB').quantize(palette=palette, dither=Image.Dither.NONE)
+        if mask is not None:
+            frame.paste(GIF_TRANSPARENT_INDEX, None, mask)
+        indexed.append(frame)
+
+    options = {"disposal": 1}
+    if transparent:
+        # Each frame replaces the previous one: its transparent pixels mustn't show the last frame
+        options = {"transparency": GIF_TRANSPARENT_INDEX, "disposal": 2}
+    indexed[0].save(
+        output,
+        format='GIF',
+        save_all=True,
+        append_images=indexed[1:],
+        duration=durations,
+        loop=0,  # Infinite loop
+        **options,
+        optimize=False
+    )
+    return 'GIF'
+
+def encode_card(frames, durations=None, kind='card', output_format=None, scale=None):
+    """Encode rendered card frames (one frame: still image) into a BytesIO ready to upload.
+
+    Still cards become a lossless WebP unless CARD_OUTPUT_FORMAT says
+    otherwise, animated ones an optimized GIF (transparency kept). Encode
+    time and size are recorded in encoder_stats[kind].
+    """
+    started = time.perf_counter()
+    output_format = output_format or CARD_OUTPUT_FORMAT
+    scale = CARD_OUTPUT_SCALE if scale is None else scale
+    frames = [_scaled(frame, scale) for frame in frames]
+
+    output = io.BytesIO()
+    if len(frames) > 1:
+        encoded_format = _encode_animated(frames, durations, output)
+    else:
+        encoded_format = _encode_static(frames[0], output, output_format)
+    output.seek(0)
+
+    encode_ms = (time.perf_counter() - started) * 1000
+    size = output.getbuffer().nbytes
+    with _stats_lock:
+        stats = encoder_stats.setdefault(kind, {"cards": 0, "bytes": 0, "encode_ms": 0.0})
+        stats["cards"] += 1
+        stats["bytes"] += size
+        stats["encode_ms"] += encode_ms
+        stats["last_format"] = encoded_format
+        stats["last_bytes"] = size
+        stats["last_encode_ms"] = round(encode_ms, 1)
+    return output
+
+def merge_encoder_stats(stats):
+    """Add encoder_stats from another process (cards rendered by a worker)"""
+    with _stats_lock:
+        for kind, other in stats.items():
+            totals = encoder_stats.setdefault(kind, {"cards": 0, "bytes": 0, "encode_ms": 0.0})
+            for key in ("cards", "bytes", "encode_ms"):
+                totals[key] += other[key]
+            for key in ("last_format", "last_bytes", "last_encode_ms"):
+                if key in other:
+                    totals[key] = other[key]
+
+def get_encoder_stats(kind):
+    """Totals for one kind of card, with averages"""
+    with _stats_lock:
+        stats = dict(encoder_stats.get(kind, {"cards": 0, "bytes": 0, "encode_ms": 0.0}))
+    cards = max(1, stats["cards"])
+    stats["avg_bytes"] = stats["bytes"] // cards
+    stats["avg_encode_ms"] = round(stats["encode_ms"] / cards, 1)
+    return stats
@@ -0,0 +1,187 @@
+from lazy_imports import LazyModule
+np = LazyModule('numpy')
+
+CHUNK_SIZE = 1 << 14  # Points per batched distance computation
+
+class ColorMetric:
+    """Distance between colors, computed in batches with NumPy broadcasting.
+
+    prepare() turns (..., 3) RGB values (0-255) into the metric's feature
+    space once (the palette is prepared once per lookup table); distance()
+    compares broadcastable feature arrays. cell_radius() bounds how much the
+    distance to any palette color can change inside an RGB box, which lets
+    the lookup table resolve whole cells at once (None: no usable bound).
+    """
+
+    name = ""
+    label = ""
+
+    def prepare(self, rgb):
+        return np.asarray(rgb, dtype=np.float32)
+
+    def distance(self, features, palette_features):
+        raise NotImplementedError
+
+    def cell_radius(self, low, high):
+        return None
+
+    def nearest(self, rgb, palette_features):
+        """Index of the nearest palette color for each (..., 3) RGB value (full search)"""
+        rgb = np.asarray(rgb, dtype=np.float32)
+        flat = rgb.reshape(-1, 3)
+        indices = np.empty(len(flat), dtype=np.uint8)
+        for start in range(0, len(flat), CHUNK_SIZE):
+            features = self.prepare(flat[start:start + CHUNK_SIZE])
+            distances = self.distance(features[:, np.newaxis, :], palette_features[np.newaxis, :, :])
+            indices[start:start + CHUNK_SIZE] = np.argmin(distances, axis=1)
+        return indices.reshape(rgb.shape[:-1])
+
+class WeightedRGBMetric(ColorMetric):
+    """Euclidean RGB distance with per-channel weights"""
+
+    def __init__(self, name, label, weights):
+        self.name = name
+        self.label = label
+        self.weights = tuple(weights)
+
+    def distance(self, features, palette_features):
+        diff = (features - palette_features) * np.asarray(self.weights, dtype=np.float32)
+        return np.sqrt(np.sum(diff * diff, axis=-1))
+
+    def cell_radius(self, low, high):
+        # Farthest color of the box from its center
+        half = (np.asarray(high, dtype=np.float32) - low) / 2 * np.asarray(self.weights, dtype=np.float32)
+        return np.sqrt(np.sum(half * half, axis=-1))
+
+class RedmeanMetric(ColorMetric):
+    """Low-cost perceptual RGB distance: channel weights follow the mean red level"""
+
+    name = "redmean"
+    label = "Redmean"
+
+    def distance(self, features, palette_features):
+        diff = features - palette_features
+        red_mean = (features[..., 0] + palette_features[..., 0]) / 2
+        return np.sqrt((2 + red_mean / 256) * diff[..., 0] ** 2
+                       + 4 * diff[..., 1] ** 2
+                       + (2 + (255 - red_mean) / 256) * diff[..., 2] ** 2)
+
+    def cell_radius(self, low, high):
+        # Weights stay in [2, 3], so each weighted component moves by at most
+        # sqrt(3) * h from the color change plus 255 * h / (512 * 2 * sqrt(2))
+        # from the weight change (h = half the box side)
+        half = (np.asarray(high, dtype=np.float32) - low) / 2
+        red = np.sqrt(3) * half[..., 0] + 255 * half[..., 0] / (1024 * np.sqrt(2))
+        blue = np.sqrt(3) * half[..., 2] + 255 * half[..., 0] / (1024 * np.sqrt(2))
+        return np.sqrt(red ** 2 + (2 * half[..., 1]) ** 2 + blue ** 2)
+
+# sRGB (D65) -> XYZ, normalized by the reference white
+_XYZ_MATRIX = [[0.4124564 / 0.95047, 0.3575761 / 0.95047, 0.1804375 / 0.95047],
+               [0.2126729, 0.7151522, 0.0721750],
+               [0.0193339 / 1.08883, 0.1191920 / 1.08883, 0.9503041 / 1.08883]]
+
+def _lab_f(rgb):
+    """CIELAB f(X/Xn), f(Y/Yn), f(Z/Zn) of (..., 3) sRGB values; increasing in every channel"""
+    c = np.asarray(rgb, dtype=np.float32) / 255
+    linear = np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ np.asarray(_XYZ_MATRIX, dtype=np.float32).T
+    return np.where(xyz > 216 / 24389, np.cbrt(xyz), (24389 / 27 * xyz + 16) / 116)
+
+def rgb_to_lab(rgb):
+    f = _lab_f(rgb)
+    return np.stack([116 * f[..., 1] - 16,
+                     500 * (f[..., 0] - f[..., 1]),
+                     200 * (f[..., 1] - f[..., 2])], axis=-1).astype(np.float32)
+
+class CIE76Metric(ColorMetric):
+    """CIELAB ΔE*76: Euclidean distance in L*a*b*"""
+
+    name = "cie76"
+    label = "CIELAB ΔE76"
+
+    def prepare(self, rgb):
+        return rgb_to_lab(rgb)
+
+    def distance(self, features, palette_features):
+        diff = features - palette_features
+        return np.sqrt(np.sum(diff * diff, axis=-1))
+
+    def cell_radius(self, low, high):
+        # f(X), f(Y), f(Z) are increasing in R, G and B: how far they can move
+        # from their value at the center is given by the box corners, which
+        # bounds the L*, a* and b* changes
+        low = np.asarray(low, dtype=np.float32)
+        high = np.asarray(high, dtype=np.float32)
+        f_center = _lab_f((low + high) / 2)
+        up = _lab_f(high) - f_center
+        down = f_center - _lab_f(low)
+        L = 116 * np.maximum(up[..., 1], down[..., 1])
+        a = 500 * np.maximum(up[..., 0] + down[..., 1], down[..., 0] + up[..., 1])
+        b = 200 * np.maximum(up[..., 1] + down[..., 2], down[..., 1] + up[..., 2])
+        return np.sqrt(L ** 2 + a ** 2 + b ** 2)
+
+def delta_e_2000(lab1, lab2):
+    """CIEDE2000 color difference of broadcastable (..., 3) L*a*b* arrays"""
+    L1, a1, b1 = lab1[..., 0], lab1[..., 1], lab1[..., 2]
+    L2, a2, b2 = lab2[..., 0], lab2[..., 1], lab2[..., 2]
+
+    c_mean7 = ((np.hypot(a1, b1) + np.hypot(a2, b2)) / 2) ** 7
+    g = 0.5 * (1 - np.sqrt(c_mean7 / (c_mean7 + 25.0 ** 7)))
+    a1p, a2p = (1 + g) * a1, (1 + g) * a2
+    c1p, c2p = np.hypot(a1p, b1), np.hypot(a2p, b2)
+    h1p = np.degrees(np.arctan2(b1, a1p)) % 360
+    h2p = np.degrees(np.arctan2(b2, a2p)) % 360
+    chroma_product = c1p * c2p
+
+    dh = h2p - h1p
+    dh = np.where(dh > 180, dh - 360, np.where(dh < -180, dh + 360, dh))
+    dh = np.where(chroma_product == 0, 0, dh)
+    dL = L2 - L1
+    dC = c2p - c1p
+    dH = 2 * np.sqrt(chroma_product) * np.sin(np.radians(dh) / 2)
+
+    L_mean = (L1 + L2) / 2
+    c_mean_p = (c1p + c2p) / 2
+    h_sum = h1p + h2p
+    h_mean = np.where(np.abs(h1p - h2p) <= 180, h_sum / 2,
+                      np.where(h_sum < 360, (h_sum + 360) / 2, (h_sum - 360) / 2))
+    h_mean = np.where(chroma_product == 0, h_sum, h_mean)
+
+    t = (1 - 0.17 * np.cos(np.radians(h_mean - 30)) + 0.24 * np.cos(np.radians(2 * h_mean))
+         + 0.32 * np.cos(np.radians(3 * h_mean + 6)) - 0.20 * np.cos(np.radians(4 * h_mean - 63)))
+    c_mean_p7 = c_mean_p ** 7
+    r_c = 2 * np.sqrt(c_mean_p7 / (c_mean_p7 + 25.0 ** 7))
+    r_t = -np.sin(np.radians(60 * np.exp(-((h_mean - 275) / 25) ** 2))) * r_c
+    s_l = 1 + 0.015 * (L_mean - 50) ** 2 / np.sqrt(20 + (L_mean - 50) ** 2)
+    s_c = 1 + 0.045 * c_mean_p
+    s_h = 1 + 0.015 * c_mean_p * t
+
+    return np.sqrt((dL / s_l) ** 2 + (dC / s_c) ** 2 + (dH / s_h) ** 2 + r_t * (dC / s_c) * (dH / s_h))
+
+class CIEDE2000Metric(CIE76Metric):
+    """CIEDE2000: the most perceptually uniform, and the slowest.
+
+    It is not a true distance (no triangle inequality, hue discontinuities),
+    so cell_radius() gives no bound and lookups are resolved per color.
+    """
+
+    name = "ciede2000"
+    label = "CIELAB ΔE2000"
+
+    def distance(self, features, palette_features):
+        return delta_e_2000(features, palette_features)
+
+    def cell_radius(self, low, high):
+        return None
+
+COLOR_METRICS = {metric.name: metric for metric in [
+    WeightedRGBMetric("weighted", "Weighted RGB", [0.299, 0.587, 0.114]),
+    WeightedRGBMetric("rgb", "RGB (Euclidean)", [1.0, 1.0, 1.0]),
+    RedmeanMetric(),
+    CIE76Metric(),
+    CIEDE2000Metric(),
+]}
+
+def get_color_metric(name):
+    """Color metric by name (see COLOR_METRICS); unknown names raise KeyError"""
+    return COLOR_METRICS[name]
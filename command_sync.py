@@ -0,0 +1,46 @@
+import hashlib
+import json
+import time
+
+COMMAND_SYNC_FILE = 'command_sync_data.json'
+
+def compute_command_fingerprint(tree, application_id=None):
+    """Hash the serialized global application commands of a command tree"""
+    payload = [command.to_dict(tree) for command in tree.get_commands()]
+    payload.sort(key=lambda command: (command.get("type", 1), command["name"]))
+    serialized = json.dumps(
+        {"application_id": application_id, "commands": payload},
+        sort_keys=True, separators=(',', ':'), default=str
+    )
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+def load_command_sync_data():
+    try:
+        with open(COMMAND_SYNC_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_command_sync_data(data):
+    with open(COMMAND_SYNC_FILE, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4)
+
+async def sync_commands_if_changed(client, force=False):
+    """Sync the command tree only when its fingerprint changed since the last sync.
+
+    Returns the list of synced commands, or None when the sync was skipped.
+    """
+    fingerprint = compute_command_fingerprint(client.tree, client.application_id)
+    data = load_command_sync_data()
+
+    if not force and data.get("fingerprint") == fingerprint:
+        print(f'Command tree unchanged ({fingerprint[:12]}), skipping sync')
+        return None
+
+    synced = await client.tree.sync()
+    save_command_sync_data({
+        "fingerprint": fingerprint,
+        "command_count": len(synced),
+        "synced_at": time.strftime('%Y-%m-%dT%H:%M:%S')
+    })
+    return synced
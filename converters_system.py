@@ -1,19 +1,34 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import json
 import os
 import aiohttp
 import uuid
 from datetime import datetime
 import time
-from PIL import Image, ImageDraw
-import numpy as np
+from lazy_imports import LazyModule
+# PIL and numpy are only imported when the first image is processed
+Image = LazyModule('PIL.Image')
+ImageDraw = LazyModule('PIL.ImageDraw')
+np = LazyModule('numpy')
 import io
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from multiprocessing import cpu_count
 import asyncio
+from collections import OrderedDict
 from functools import partial
+from json_store import json_document
+from palette_lut import get_palette_lut
+from color_metrics import COLOR_METRICS
+from image_ingest import ImageRejected, fetch_source_image
+
+converters_store = json_document('converters_data.json')
+
+# Cache de conversion par session : images redimensionnées et URLs des résultats déjà envoyés
+PREPARED_CACHE_SIZE = 2
+CONVERTED_CACHE_SIZE = 16
+# Les clics rapprochés (Less/More, couleurs...) ne lancent qu'une seule conversion
+CONVERSION_DEBOUNCE_SECONDS = 0.4
 
 def process_image_chunk_parallel(chunk_data, palette, chunk_index):
     """Traite un chunk d'image en parallèle - fonction globale pour multiprocessing"""
@@ -55,6 +70,34 @@ class ConverterData:
         self.image_width = 0
         self.image_height = 0
         self.pixelated_url = ""
+        self.source = None  # SourceImage of image_url, reused by every re-conversion
+        self.prepared_images = OrderedDict()  # (size, semi_transparent) -> resized image
+        self.converted_urls = OrderedDict()   # conversion settings -> uploaded result URL
+
+    def attach_source(self, source):
+        """Use a SourceImage for the current image_url; caches of a previous source are dropped"""
+        if self.source is source:
+            return
+        if self.source is not None:
+            self.source.close()
+        self.source = source
+        self.prepared_images.clear()
+        self.converted_urls.clear()
+
+    def set_source(self, source):
+        """Use a downloaded image as the session's image (original size by default)"""
+        self.attach_source(source)
+        self.image_url = source.url
+        self.image_width = source.width
+        self.image_height = source.height
+        self.pixelated_url = ""  # Reset processed image
+
+    def clear_source(self):
+        if self.source is not None:
+            self.source.close()
+            self.source = None
+        self.prepared_images.clear()
+        self.converted_urls.clear()
 
 class PixelsConverterView(discord.ui.View):
     def __init__(self, bot, user_id):
@@ -67,49 +110,44 @@ class PixelsConverterView(discord.ui.View):
         self.waiting_for_image = False
         self.color_page = 0
         self.colors_per_page = 8  # 2 rows of 4
+        self.conversion_lock = asyncio.Lock()
+        self.conversion_generation = 0  # Incrémenté à chaque demande de conversion
+
+    async def on_timeout(self):
+        # Libère l'image source (et sa version décodée) de la session
+        self.converter_data.clear_source()
 
     def load_colors(self):
-        try:
-            with open('converters_data.json', 'r') as f:
-                data = json.load(f)
-                # Ajouter le support des couleurs cachées si pas présent
-                for color in data.get("colors", []):
-                    if "hidden" not in color:
-                        color["hidden"] = False
-
-                # S'assurer que les paramètres globaux existent
-                if "settings" not in data:
-                    data["settings"] = {"semi_transparent": False}
-                elif "semi_transparent" not in data["settings"]:
-                    data["settings"]["semi_transparent"] = False
-
-                # S'assurer que user_data existe
-                if "user_data" not in data:
-                    data["user_data"] = {}
-
-                # Initialiser les données utilisateur si pas présentes
-                user_str = str(self.user_id)
-                if user_str not in data["user_data"]:
-                    data["user_data"][user_str] = {
-                        "dithering": False  # Par défaut désactivé
-                    }
-                elif "dithering" not in data["user_data"][user_str]:
-                    data["user_data"][user_str]["dithering"] = False
-
-                return data
-        except (FileNotFoundError, json.JSONDecodeError):
-            # Return default data if file doesn't exist
-            return {
-                "colors": [],
-                "settings": {"semi_transparent": False},
-                "user_data": {
-                    str(self.user_id): {"dithering": False}
-                }
+        data = converters_store.load(default=lambda: {"colors": []})
+        # Ajouter le support des couleurs cachées si pas présent
+        for color in data.get("colors", []):
+            if "hidden" not in color:
+                color["hidden"] = False
+
+        # S'assurer que les paramètres globaux existent
+        if "settings" not in data:
+            data["settings"] = {"semi_transparent": False}
+        elif "semi_transparent" not in data["settings"]:
+            data["settings"]["semi_transparent"] = False
+
+        # S'assurer que user_data existe
+        if "user_data" not in data:
+            data["user_data"] = {}
+
+        # Initialiser les données utilisateur si pas présentes
+        user_str = str(self.user_id)
+        if user_str not in data["user_data"]:
+            data["user_data"][user_str] = {
+                "dithering": False  # Par défaut désactivé
             }
+        elif "dithering" not in data["user_data"][user_str]:
+            data["user_data"][user_str]["dithering"] = False
+
+        return data
 
     def save_colors(self):
-        with open('converters_data.json', 'w') as f:
-            json.dump(self.colors_data, f, indent=2)
+        # Fusionne avec les modifications des autres utilisateurs depuis le chargement
+        converters_store.save(self.colors_data)
 
     def get_user_dithering_setting(self):
         """Récupère le paramètre de dithering pour cet utilisateur"""
@@ -127,6 +165,26 @@ class PixelsConverterView(discord.ui.View):
         self.colors_data["user_data"][user_str]["dithering"] = enabled
         self.save_colors()
 
+    def get_user_color_metric(self):
+        """Métrique de couleur choisie par l'utilisateur (None : celle par défaut de chaque mode)"""
+        user_str = str(self.user_id)
+        metric = self.colors_data.get("user_data", {}).get(user_str, {}).get("color_metric")
+        return metric if metric in COLOR_METRICS else None
+
+    def set_user_color_metric(self, metric):
+        """Définit la métrique de couleur pour cet utilisateur (None : par défaut)"""
+        user_str = str(self.user_id)
+        if "user_data" not in self.colors_data:
+            self.colors_data["user_data"] = {}
+        if user_str not in self.colors_data["user_data"]:
+            self.colors_data["user_data"][user_str] = {}
+
+        if metric is None:
+            self.colors_data["user_data"][user_str].pop("color_metric", None)
+        else:
+            self.colors_data["user_data"][user_str]["color_metric"] = metric
+        self.save_colors()
+
     def get_active_colors(self):
         """Récupère les couleurs activées dans la palette"""
         return [c for c in self.colors_data["colors"] if c.get("enabled", False)]
@@ -200,15 +258,16 @@ class PixelsConverterView(discord.ui.View):
                 [51,57,65],[109,117,141],[179,185,209]
             ], dtype=np.float32)
 
+        # Table RGB -> palette en cache pour cette palette et la métrique choisie
+        palette_lut = get_palette_lut(palette_rgb, self.get_user_color_metric() or 'rgb')
+
         # Dithering optimisé Floyd-Steinberg avec traitement ligne par ligne pour vitesse maximale
         for y in range(new_height):
             for x in range(new_width):
                 old_pixel = img_array[y, x]
                 
-                # Calcul vectorisé ultra-rapide de la couleur la plus proche
-                diff = palette_rgb - old_pixel
-                distances = np.sum(diff * diff, axis=1)
-                closest_idx = np.argmin(distances)
+                # Couleur la plus proche via la table (pixel arrondi et borné à 0-255)
+                closest_idx = palette_lut.index_of(*old_pixel)
                 new_pixel = palette_rgb[closest_idx]
                 
                 img_array[y, x] = new_pixel
@@ -282,33 +341,19 @@ class PixelsConverterView(discord.ui.View):
 
         # Gestion RGBA/RGB optimisée
         if len(img_array.shape) == 3 and img_array.shape[2] == 4:  # RGBA
-            rgb_data = img_array[:, :, :3].astype(np.float32)
+            rgb_data = img_array[:, :, :3]
             alpha_data = img_array[:, :, 3]
         else:  # RGB
-            rgb_data = img_array.astype(np.float32)
+            rgb_data = img_array
             alpha_data = np.full((height, width), 255, dtype=np.uint8)
 
-        # Traitement vectorisé ultra-optimisé avec qualité maximale
-        rgb_flat = rgb_data.reshape(-1, 3)
-        
-        # Calcul vectorisé des distances avec algorithme de distance perceptuelle amélioré
-        # Utilise la pondération perceptuelle pour des couleurs plus naturelles
-        r_weight = 0.299
-        g_weight = 0.587  
-        b_weight = 0.114
-        
-        weights = np.array([r_weight, g_weight, b_weight], dtype=np.float32)
-        
-        # Broadcasting ultra-optimisé pour tous les pixels à la fois
-        diff = rgb_flat[:, np.newaxis, :] - palette_rgb[np.newaxis, :, :]
-        
-        # Distance perceptuelle pondérée pour de meilleurs résultats visuels
-        weighted_diff = diff * weights
-        distances = np.sum(weighted_diff * weighted_diff, axis=2)
-        
-        closest_indices = np.argmin(distances, axis=1)
-        processed_flat = palette_rgb[closest_indices]
-        processed_rgb = processed_flat.reshape(rgb_data.shape)
+        # Par défaut, distance perceptuelle pondérée pour des couleurs plus naturelles
+        metric = self.get_user_color_metric() or 'weighted'
+
+        # Table RGB -> palette en cache (mémoire + disque) pour cette palette :
+        # la couleur la plus proche de chaque pixel est une simple indexation
+        palette_lut = get_palette_lut(palette_rgb, metric)
+        processed_rgb = palette_lut.quantize(rgb_data)
 
         # Gestion transparence ultra-rapide
         if original_mode in ('RGBA', 'LA', 'P') or transparent_hide_active:
@@ -391,21 +436,12 @@ class PixelsConverterView(discord.ui.View):
     def process_image_vectorized_fast(self, image_array, palette):
         """Version vectorisée ultra-rapide utilisant des opérations numpy optimisées"""
         try:
-            height, width, channels = image_array.shape
-            reshaped = image_array.reshape(-1, 3).astype(np.float32)
-            palette_np = np.array(palette, dtype=np.float32)
-
-            # Calcul vectorisé des distances pour tous les pixels à la fois
-            # Utilise broadcasting pour calculer les distances entre chaque pixel et chaque couleur
-            distances = np.sqrt(np.sum((reshaped[:, np.newaxis, :] - palette_np[np.newaxis, :, :]) ** 2, axis=2))
+            rgb = np.clip(image_array, 0, 255).astype(np.uint8)
 
-            # Trouve l'index de la couleur la plus proche pour chaque pixel
-            closest_indices = np.argmin(distances, axis=1)
+            # Couleur la plus proche de chaque pixel via la table en cache de la palette
+            processed = get_palette_lut(palette).quantize(rgb)
 
-            # Applique les couleurs correspondantes
-            processed = palette_np[closest_indices]
-
-            return processed.reshape(height, width, channels).astype(np.uint8)
+            return processed.astype(np.uint8)
 
         except Exception as e:
             print(f"Erreur vectorisation: {e}")
@@ -418,49 +454,13 @@ class PixelsConverterView(discord.ui.View):
             return None
 
         try:
-            # Téléchargement async optimisé avec timeout
-            timeout = aiohttp.ClientTimeout(total=10)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(self.converter_data.image_url) as response:
-                    if response.status != 200:
-                        return None
-                    image_data = await response.read()
+            # Image source téléchargée une seule fois par session, puis décodée une fois
+            source = await self.get_source_image()
 
-            # Traitement PIL ultra-optimisé
-            image = Image.open(io.BytesIO(image_data))
-            
             # Optimisation selon la taille de l'image
             target_size = (self.converter_data.image_width, self.converter_data.image_height)
             total_pixels = target_size[0] * target_size[1]
-            
-            # Redimensionnement intelligent selon la taille
-            if image.size != target_size:
-                if total_pixels > 2073600:  # Plus de 1920x1080 (Full HD)
-                    # Utiliser LANCZOS pour les grandes images pour maintenir la qualité
-                    image = image.resize(target_size, Image.Resampling.LANCZOS)
-                else:
-                    # NEAREST pour les petites images pour la vitesse
-                    image = image.resize(target_size, Image.Resampling.NEAREST)
-
-            # Conversion couleur ultra-optimisée
-            if image.mode in ('RGBA', 'LA', 'P'):
-                if not self.colors_data["settings"]["semi_transparent"]:
-                    # Conversion optimisée avec composite
-                    if image.mode == 'P':
-                        image = image.convert('RGBA')
-                    if image.mode in ('RGBA', 'LA'):
-                        background = Image.new('RGB', image.size, (255, 255, 255))
-                        if image.mode == 'RGBA':
-                            background.paste(image, mask=image.split()[-1])
-                        else:
-                            background.paste(image)
-                        image = background
-                    else:
-                        image = image.convert('RGB')
-                else:
-                    image = image.convert('RGBA')
-            else:
-                image = image.convert('RGB')
+            semi_transparent = self.colors_data["settings"]["semi_transparent"]
 
             # Palette active optimisée
             active_colors = self.get_active_colors()
@@ -472,9 +472,25 @@ class PixelsConverterView(discord.ui.View):
                 self.save_colors()
                 active_colors = self.get_active_colors()
 
+            # Résultat déjà converti et envoyé avec exactement ces paramètres
+            user_dithering = self.get_user_dithering_setting()
+            conversion_key = (
+                target_size,
+                semi_transparent,
+                user_dithering,
+                self.get_user_color_metric(),
+                tuple((tuple(color["rgb"]), color.get("hidden", False)) for color in active_colors)
+            )
+            cached_url = self.converter_data.converted_urls.get(conversion_key)
+            if cached_url:
+                self.converter_data.converted_urls.move_to_end(conversion_key)
+                self.converter_data.pixelated_url = cached_url
+                return cached_url
+
+            image = self.get_prepared_image(source, target_size, semi_transparent)
+
             # Traitement image avec détection automatique de la meilleure méthode
             if active_colors:
-                user_dithering = self.get_user_dithering_setting()
                 print(f"Dithering actif pour utilisateur {self.user_id}: {user_dithering}")
                 
                 if user_dithering:
@@ -513,6 +529,9 @@ class PixelsConverterView(discord.ui.View):
 
                 github_url = f"https://raw.githubusercontent.com/TheBlueEL/pictures/main/{filename}"
                 self.converter_data.pixelated_url = github_url
+                self.converter_data.converted_urls[conversion_key] = github_url
+                while len(self.converter_data.converted_urls) > CONVERTED_CACHE_SIZE:
+                    self.converter_data.converted_urls.popitem(last=False)
                 return github_url
 
             return None
@@ -521,6 +540,59 @@ class PixelsConverterView(discord.ui.View):
             print(f"Erreur lors du traitement ultra rapide de l'image: {e}")
             return None
 
+    def get_prepared_image(self, source, target_size, semi_transparent):
+        """Source redimensionnée et convertie (RGB / RGBA), en cache pour la session"""
+        key = (target_size, semi_transparent)
+        image = self.converter_data.prepared_images.get(key)
+        if image is not None:
+            self.converter_data.prepared_images.move_to_end(key)
+            return image
+
+        image = source.decode()
+        total_pixels = target_size[0] * target_size[1]
+
+        # Redimensionnement intelligent selon la taille
+        if image.size != target_size:
+            if total_pixels > 2073600:  # Plus de 1920x1080 (Full HD)
+                # Utiliser LANCZOS pour les grandes images pour maintenir la qualité
+                image = image.resize(target_size, Image.Resampling.LANCZOS)
+            else:
+                # NEAREST pour les petites images pour la vitesse
+                image = image.resize(target_size, Image.Resampling.NEAREST)
+
+        # Conversion couleur ultra-optimisée
+        if image.mode in ('RGBA', 'LA', 'P'):
+            if not semi_transparent:
+                # Conversion optimisée avec composite
+                if image.mode == 'P':
+                    image = image.convert('RGBA')
+                if image.mode in ('RGBA', 'LA'):
+                    background = Image.new('RGB', image.size, (255, 255, 255))
+                    if image.mode == 'RGBA':
+                        background.paste(image, mask=image.split()[-1])
+                    else:
+                        background.paste(image)
+                    image = background
+                else:
+                    image = image.convert('RGB')
+            else:
+                image = image.convert('RGBA')
+        else:
+            image = image.convert('RGB')
+
+        self.converter_data.prepared_images[key] = image
+        while len(self.converter_data.prepared_images) > PREPARED_CACHE_SIZE:
+            self.converter_data.prepared_images.popitem(last=False)
+        return image
+
+    async def get_source_image(self):
+        """SourceImage of the current image_url, downloaded (with size guards) only once"""
+        source = self.converter_data.source
+        if source is None or source.url != self.converter_data.image_url:
+            source = await fetch_source_image(self.converter_data.image_url)
+            self.converter_data.attach_source(source)
+        return source
+
     async def process_image_parallel_chunks(self, img_array, palette):
         """Traite l'image en parallèle par chunks pour une vitesse maximale"""
         try:
@@ -677,8 +749,23 @@ class PixelsConverterView(discord.ui.View):
             return None
 
     async def process_image(self):
-        """Traite l'image selon les paramètres sélectionnés avec l'algorithme ultra-rapide"""
-        return await self.process_image_ultra_fast()
+        """Traite l'image selon les paramètres sélectionnés avec l'algorithme ultra-rapide.
+
+        Les demandes rapprochées sont regroupées : seule la dernière lance une
+        conversion (avec les paramètres à jour), les précédentes renvoient None.
+        """
+        self.conversion_generation += 1
+        generation = self.conversion_generation
+
+        await asyncio.sleep(CONVERSION_DEBOUNCE_SECONDS)
+        if generation != self.conversion_generation:
+            return None
+
+        async with self.conversion_lock:
+            # Une demande plus récente est arrivée pendant la conversion précédente
+            if generation != self.conversion_generation:
+                return None
+            return await self.process_image_ultra_fast()
 
     def get_main_embed(self, username):
         embed = discord.Embed(
@@ -812,10 +899,12 @@ class PixelsConverterView(discord.ui.View):
 
         dithering_status = "ON" if self.get_user_dithering_setting() else "OFF"
         semi_transparent_status = "ON" if self.colors_data["settings"]["semi_transparent"] else "OFF"
+        user_metric = self.get_user_color_metric()
+        metric_status = COLOR_METRICS[user_metric].label if user_metric else "Default"
 
         embed.add_field(
             name="Current Settings",
-            value=f"**Dithering:** {dithering_status}\n**Semi-Transparent:** {semi_transparent_status}",
+            value=f"**Dithering:** {dithering_status}\n**Semi-Transparent:** {semi_transparent_status}\n**Color Metric:** {metric_status}",
             inline=False
         )
 
@@ -825,6 +914,12 @@ class PixelsConverterView(discord.ui.View):
             inline=False
         )
 
+        embed.add_field(
+            name="Color Metric Info",
+            value="How the closest palette color is chosen. CIELAB metrics match human perception best but are slower on new palettes.",
+            inline=False
+        )
+
         bot_name = get_bot_name(self.bot)
         embed.set_thumbnail(url=self.bot.user.display_avatar.url)
         embed.set_footer(text=f"{bot_name} | Settings", icon_url=self.bot.user.display_avatar.url)
@@ -1163,6 +1258,8 @@ class PixelsConverterView(discord.ui.View):
 
                     def create_color_callback(color_index):
                         async def color_callback(interaction):
+                            # Le retraitement de l'image peut dépasser les 3s de Discord
+                            await interaction.response.defer()
                             try:
                                 # Vérification de sécurité avant de modifier
                                 if color_index < len(self.colors_data["colors"]):
@@ -1177,12 +1274,12 @@ class PixelsConverterView(discord.ui.View):
                                     
                                     embed = self.get_color_selection_embed()
                                     self.update_buttons()
-                                    await interaction.response.edit_message(embed=embed, view=self)
+                                    await interaction.followup.edit_message(message_id=interaction.message.id, embed=embed, view=self)
                                 else:
-                                    await interaction.response.send_message("Erreur: Couleur introuvable", ephemeral=True)
+                                    await interaction.followup.send("Erreur: Couleur introuvable", ephemeral=True)
                             except Exception as e:
                                 print(f"Erreur callback couleur: {e}")
-                                await interaction.response.send_message(f"Erreur: {str(e)}", ephemeral=True)
+                                await interaction.followup.send(f"Erreur: {str(e)}", ephemeral=True)
                         return color_callback
 
                     button.callback = create_color_callback(color_idx)
@@ -1235,7 +1332,7 @@ class PixelsConverterView(discord.ui.View):
 
                 # Reprocess image automatically if we have one
                 if self.converter_data.image_url:
-                    processed_url = await self.process_image_ultra_fast()
+                    processed_url = await self.process_image()
                     if processed_url:
                         self.converter_data.pixelated_url = processed_url
 
@@ -1245,6 +1342,40 @@ class PixelsConverterView(discord.ui.View):
 
             semi_transparent_button.callback = semi_transparent_callback
 
+            # Color metric select - Par utilisateur
+            user_metric = self.get_user_color_metric()
+            metric_options = [discord.SelectOption(
+                label="Default",
+                value="default",
+                description="Weighted RGB, or RGB with dithering",
+                default=user_metric is None
+            )]
+            for metric in COLOR_METRICS.values():
+                metric_options.append(discord.SelectOption(
+                    label=metric.label,
+                    value=metric.name,
+                    default=metric.name == user_metric
+                ))
+            metric_select = discord.ui.Select(placeholder="Color Metric", options=metric_options)
+
+            async def metric_callback(interaction):
+                await interaction.response.defer()
+
+                selected = metric_select.values[0]
+                self.set_user_color_metric(None if selected == "default" else selected)
+
+                # Reprocesser l'image avec la nouvelle métrique
+                if self.converter_data.image_url:
+                    processed_url = await self.process_image()
+                    if processed_url:
+                        self.converter_data.pixelated_url = processed_url
+
+                embed = self.get_settings_embed()
+                self.update_buttons()
+                await interaction.followup.edit_message(message_id=interaction.message.id, embed=embed, view=self)
+
+            metric_select.callback = metric_callback
+
             # Back button
             back_button = discord.ui.Button(
                 label="Back",
@@ -1263,6 +1394,7 @@ class PixelsConverterView(discord.ui.View):
             self.add_item(dithering_button)
             self.add_item(semi_transparent_button)
             self.add_item(back_button)
+            self.add_item(metric_select)
 
 class SizeModal(discord.ui.Modal):
     def __init__(self, converter_data, parent_view):
@@ -1377,32 +1509,27 @@ class ImageURLModal(discord.ui.Modal):
 
         # Check if URL is accessible and get image dimensions
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(image_url) as response:
-                    if response.status == 200:
-                        image_data = await response.read()
-
-                        # Obtenir les vraies dimensions avec PIL
-                        from PIL import Image
-                        import io
-                        image = Image.open(io.BytesIO(image_data))
-
-                        self.converter_data.image_url = image_url
-                        self.converter_data.image_width = image.width
-                        self.converter_data.image_height = image.height
-                        self.converter_data.pixelated_url = ""  # Reset processed image
-
-                        # Traiter automatiquement l'image avec la palette par défaut
-                        processed_url = await self.parent_view.process_image()
-                        if processed_url:
-                            self.converter_data.pixelated_url = processed_url
-
-                        self.parent_view.current_mode = "image_preview"
-                        embed = self.parent_view.get_image_preview_embed()
-                        self.parent_view.update_buttons()
-                        await interaction.response.edit_message(embed=embed, view=self.parent_view)
-                    else:
-                        raise Exception("Image not found")
+            # Téléchargement limité en taille, dimensions lues dans l'en-tête
+            source = await fetch_source_image(image_url)
+            self.converter_data.set_source(source)
+
+            # Traiter automatiquement l'image avec la palette par défaut
+            processed_url = await self.parent_view.process_image()
+            if processed_url:
+                self.converter_data.pixelated_url = processed_url
+
+            self.parent_view.current_mode = "image_preview"
+            embed = self.parent_view.get_image_preview_embed()
+            self.parent_view.update_buttons()
+            await interaction.response.edit_message(embed=embed, view=self.parent_view)
+        except ImageRejected as e:
+            print(f"Image URL rejected: {e}")
+            error_embed = discord.Embed(
+                title="<:ErrorLOGO:1407071682031648850> Image Rejected",
+                description=str(e),
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=error_embed, ephemeral=True)
         except Exception as e:
             print(f"Error processing image URL: {e}") # Added print for debugging
             error_embed = discord.Embed(
@@ -1418,7 +1545,11 @@ class ConvertersCommand(commands.Cog):
         self.active_managers = {}
 
     async def download_image(self, image_url):
-        """Download image from URL, save locally, sync to GitHub, then delete locally"""
+        """Download image from URL, save locally, sync to GitHub, then delete locally.
+
+        Returns the SourceImage (its url set to the GitHub copy) so the bytes
+        are reused for conversion; raises ImageRejected for invalid or too large images.
+        """
         try:
             # Create images directory if it doesn't exist
             os.makedirs('images', exist_ok=True)
@@ -1427,33 +1558,31 @@ class ConvertersCommand(commands.Cog):
             filename = f"{uuid.uuid4()}.png"
             file_path = os.path.join('images', filename)
 
-            # Download the image
-            async with aiohttp.ClientSession() as session:
-                async with session.get(image_url) as response:
-                    if response.status == 200:
-                        with open(file_path, 'wb') as f:
-                            async for chunk in response.content.iter_chunked(8192):
-                                f.write(chunk)
-
-                        # Synchronize with GitHub
-                        from github_sync import GitHubSync
-                        github_sync = GitHubSync()
-                        sync_success = await github_sync.sync_image_to_pictures_repo(file_path)
-
-                        if sync_success:
-                            # Delete local file after successful sync
-                            try:
-                                os.remove(file_path)
-                            except Exception as e:
-                                print(f"<:ErrorLOGO:1407071682031648850> Erreur lors de la suppression locale: {e}")
-
-                            # Return GitHub raw URL from public pictures repo
-                            github_url = f"https://raw.githubusercontent.com/TheBlueEL/pictures/main/{filename}"
-                            return github_url
-                        else:
-                            print("<:ErrorLOGO:1407071682031648850> Échec de la synchronisation, fichier local conservé")
-                            return None
-            return None
+            # Download the image (size limited, dimensions checked from the header)
+            source = await fetch_source_image(image_url)
+            source.save_to(file_path)
+
+            # Synchronize with GitHub
+            from github_sync import GitHubSync
+            github_sync = GitHubSync()
+            sync_success = await github_sync.sync_image_to_pictures_repo(file_path)
+
+            if sync_success:
+                # Delete local file after successful sync
+                try:
+                    os.remove(file_path)
+                except Exception as e:
+                    print(f"<:ErrorLOGO:1407071682031648850> Erreur lors de la suppression locale: {e}")
+
+                # GitHub raw URL from public pictures repo
+                source.url = f"https://raw.githubusercontent.com/TheBlueEL/pictures/main/{filename}"
+                return source
+            else:
+                print("<:ErrorLOGO:1407071682031648850> Échec de la synchronisation, fichier local conservé")
+                source.close()
+                return None
+        except ImageRejected:
+            raise
         except Exception as e:
             print(f"Error downloading image: {e}")
             return None
@@ -1470,9 +1599,28 @@ class ConvertersCommand(commands.Cog):
                 attachment = message.attachments[0]
                 allowed_extensions = ['.png', '.jpg', '.jpeg', '.gif', '.webp', '.bmp', '.svg']
                 if any(attachment.filename.lower().endswith(ext) for ext in allowed_extensions):
-                    local_file = await self.download_image(attachment.url)
+                    try:
+                        source = await self.download_image(attachment.url)
+                    except ImageRejected as e:
+                        try:
+                            await message.delete()
+                        except:
+                            pass
+
+                        error_embed = discord.Embed(
+                            title="<:ErrorLOGO:1407071682031648850> Image Rejected",
+                            description=str(e),
+                            color=discord.Color.red()
+                        )
 
-                    if local_file:
+                        try:
+                            await message.channel.send(embed=error_embed, delete_after=5)
+                        except:
+                            pass
+                        return
+
+                    if source:
+                        local_file = source.url
                         try:
                             await message.delete()
                         except:
@@ -1504,61 +1652,24 @@ class ConvertersCommand(commands.Cog):
                                 print(f"Interaction error: {e}")
                                 return
 
-                            # Get real image dimensions
-                            try:
-                                async with aiohttp.ClientSession() as session:
-                                    async with session.get(local_file) as response:
-                                        if response.status == 200:
-                                            image_data = await response.read()
-                                            from PIL import Image
-                                            import io
-                                            image = Image.open(io.BytesIO(image_data))
-
-                                            manager.converter_data.image_url = local_file
-                                            manager.converter_data.image_width = image.width
-                                            manager.converter_data.image_height = image.height
-                                            manager.converter_data.pixelated_url = ""  # Reset processed image
-                                            manager.current_mode = "image_preview"
-                                            manager.waiting_for_image = False
-
-                                            # Traiter automatiquement l'image avec la palette par défaut
-                                            processed_url = await manager.process_image()
-                                            if processed_url:
-                                                manager.converter_data.pixelated_url = processed_url
-
-                                            embed = manager.get_image_preview_embed()
-                                            manager.update_buttons()
-
-                                            # Use followup if interaction already responded
-                                            if interaction.response.is_done():
-                                                await interaction.followup.edit_message(message_id=interaction.message.id, embed=embed, view=manager)
-                                            else:
-                                                await interaction.response.edit_message(embed=embed, view=manager)
-                                        else:
-                                            raise Exception("Image not accessible")
-                            except Exception as e:
-                                print(f"Error getting image dimensions: {e}")
-                                # Fallback to default dimensions
-                                manager.converter_data.image_url = local_file
-                                manager.converter_data.image_width = 800
-                                manager.converter_data.image_height = 600
-                                manager.converter_data.pixelated_url = ""
-                                manager.current_mode = "image_preview"
-                                manager.waiting_for_image = False
+                            # Dimensions déjà lues dans l'en-tête au téléchargement : pas de second téléchargement
+                            manager.converter_data.set_source(source)
+                            manager.current_mode = "image_preview"
+                            manager.waiting_for_image = False
 
-                                # Traiter automatiquement l'image avec la palette par défaut
-                                processed_url = await manager.process_image()
-                                if processed_url:
-                                    manager.converter_data.pixelated_url = processed_url
+                            # Traiter automatiquement l'image avec la palette par défaut
+                            processed_url = await manager.process_image()
+                            if processed_url:
+                                manager.converter_data.pixelated_url = processed_url
 
-                                embed = manager.get_image_preview_embed()
-                                manager.update_buttons()
+                            embed = manager.get_image_preview_embed()
+                            manager.update_buttons()
 
-                                # Use followup if interaction already responded
-                                if interaction.response.is_done():
-                                    await interaction.followup.edit_message(message_id=interaction.message.id, embed=embed, view=manager)
-                                else:
-                                    await interaction.response.edit_message(embed=embed, view=manager)
+                            # Use followup if interaction already responded
+                            if interaction.response.is_done():
+                                await interaction.followup.edit_message(message_id=interaction.message.id, embed=embed, view=manager)
+                            else:
+                                await interaction.response.edit_message(embed=embed, view=manager)
 
                         continue_button.callback = continue_callback
 
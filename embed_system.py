@@ -1,7 +1,6 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import json
 import os
 import aiohttp
 import io
@@ -9,6 +8,9 @@ import uuid
 import base64
 import requests
 import time
+from json_store import json_document
+
+embed_store = json_document('embed_data.json')
 
 def get_bot_name(bot):
     """Récupère le nom d'affichage du bot"""
@@ -54,23 +56,19 @@ class EmbedManagerView(discord.ui.View):
         self.selected_channel = None
 
     def load_embeds(self):
-        try:
-            with open('embed_data.json', 'r') as f:
-                data = json.load(f)
-                # Add IDs to existing embeds that don't have them
-                for embed in data.get("created", []):
-                    if "id" not in embed:
-                        embed["id"] = EmbedData().generate_unique_id()
-                for embed in data.get("published", []):
-                    if "id" not in embed:
-                        embed["id"] = EmbedData().generate_unique_id()
-                return data
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {"created": [], "published": []}
+        data = embed_store.load(default=lambda: {"created": [], "published": []})
+        # Add IDs to existing embeds that don't have them
+        for embed in data.get("created", []):
+            if "id" not in embed:
+                embed["id"] = EmbedData().generate_unique_id()
+        for embed in data.get("published", []):
+            if "id" not in embed:
+                embed["id"] = EmbedData().generate_unique_id()
+        return data
 
     def save_embeds(self):
-        with open('embed_data.json', 'w') as f:
-            json.dump(self.embeds_data, f, indent=2)
+        # Merges with edits saved by other admins since this view loaded the embeds
+        embed_store.save(self.embeds_data)
 
     def save_current_embed(self):
         """Save the current embed to the created list"""
@@ -2,11 +2,15 @@
 import os
 import requests
 import base64
+import asyncio
+import time
 from dotenv import load_dotenv
 
 # Charger les variables d'environnement
 load_dotenv()
 
+PICTURES_UPLOAD_ATTEMPTS = 3  # Uploads simultanés vers le même dépôt: GitHub peut répondre 409
+
 class GitHubSync:
     def __init__(self):
         self.github_token = os.getenv('GITHUB_TOKEN')
@@ -105,8 +109,15 @@ class GitHubSync:
             print(f"Erreur lors de l'upload de {filename}: {e}")
             return False
 
-    async def sync_image_to_pictures_repo(self, file_path):
-        """Synchroniser une image vers le repository pictures"""
+    async def sync_image_to_pictures_repo(self, file_path, content_addressed=False):
+        """Synchroniser une image vers le repository pictures (requests bloquant: exécuté dans un thread).
+
+        content_addressed: le nom dépend du contenu, un fichier déjà présent est
+        identique et n'est pas renvoyé.
+        """
+        return await asyncio.to_thread(self._sync_image_to_pictures_repo, file_path, content_addressed)
+
+    def _sync_image_to_pictures_repo(self, file_path, content_addressed=False):
         try:
             if not self.github_token:
                 print("Token GitHub manquant")
@@ -122,29 +133,35 @@ class GitHubSync:
 
             filename = os.path.basename(file_path)
 
-            # Vérifier si le fichier existe déjà
-            sha = None
-            try:
-                url = f"{base_url}/contents/{filename}"
-                response = requests.get(url, headers=headers)
-                if response.status_code == 200:
-                    sha = response.json()["sha"]
-            except:
-                pass
-
-            # Préparer les données
-            data = {
-                "message": f"Auto-upload: {filename}",
-                "content": content,
-                "branch": "main"
-            }
-
-            if sha:
-                data["sha"] = sha
-
-            # Upload vers GitHub
             url = f"{base_url}/contents/{filename}"
-            response = requests.put(url, headers=headers, json=data)
+            for attempt in range(PICTURES_UPLOAD_ATTEMPTS):
+                # Vérifier si le fichier existe déjà
+                sha = None
+                try:
+                    response = requests.get(url, headers=headers)
+                    if response.status_code == 200:
+                        if content_addressed:
+                            return True  # Même nom, même contenu: rien à envoyer
+                        sha = response.json()["sha"]
+                except:
+                    pass
+
+                # Préparer les données
+                data = {
+                    "message": f"Auto-upload: {filename}",
+                    "content": content,
+                    "branch": "main"
+                }
+
+                if sha:
+                    data["sha"] = sha
+
+                # Upload vers GitHub
+                response = requests.put(url, headers=headers, json=data)
+                # 409: un autre upload parallèle a déplacé la branche entre-temps, on réessaie
+                if response.status_code != 409:
+                    break
+                time.sleep(0.5 * (attempt + 1))
 
             return response.status_code in [200, 201]
 
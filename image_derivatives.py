@@ -0,0 +1,54 @@
+import hashlib
+import io
+
+from lazy_imports import LazyModule
+Image = LazyModule('PIL.Image')
+
+# Size caps (longest side, in pixels)
+PREVIEW_MAX_SIZE = 1024
+THUMBNAIL_MAX_SIZE = 256
+
+def content_address(data):
+    """Content-addressed file name stem: identical uploads share one file"""
+    return hashlib.sha256(data).hexdigest()[:32]
+
+# Pillow format -> file extension of the stored original
+FORMAT_EXTENSIONS = {"PNG": "png", "JPEG": "jpg", "GIF": "gif", "WEBP": "webp", "BMP": "bmp"}
+
+def pixel_art_resize(image, max_size):
+    """Shrink an image to fit in max_size x max_size.
+
+    Wplace art is pixel art: NEAREST keeps hard pixel edges instead of the blur
+    LANCZOS/BILINEAR would add. Images already within the cap are unchanged.
+    """
+    width, height = image.size
+    longest = max(width, height)
+    if longest <= max_size:
+        return image
+
+    scale = max_size / longest
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return image.resize(size, Image.NEAREST)
+
+def create_derivatives(data):
+    """Build the preview (lossless WebP) and thumbnail (PNG) of an uploaded image.
+
+    Returns {"preview": bytes, "thumbnail": bytes}, or {} when the image can't
+    be decoded or is animated (the original is used as-is then).
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as source:
+            if getattr(source, "is_animated", False):
+                return {}
+            image = source.convert("RGBA")
+    except Exception as e:
+        print(f"Cannot create image derivatives: {e}")
+        return {}
+
+    preview = io.BytesIO()
+    pixel_art_resize(image, PREVIEW_MAX_SIZE).save(preview, format="WEBP", lossless=True, method=4)
+
+    thumbnail = io.BytesIO()
+    pixel_art_resize(image, THUMBNAIL_MAX_SIZE).save(thumbnail, format="PNG", optimize=True)
+
+    return {"preview": preview.getvalue(), "thumbnail": thumbnail.getvalue()}
@@ -0,0 +1,116 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import warnings
+
+import aiohttp
+
+from lazy_imports import LazyModule
+Image = LazyModule('PIL.Image')
+
+# Limits for user-supplied images (URLs and attachments)
+MAX_DOWNLOAD_BYTES = int(os.getenv('CONVERTER_MAX_DOWNLOAD_BYTES', 25 * 1024 * 1024))
+MAX_IMAGE_PIXELS = int(os.getenv('CONVERTER_MAX_IMAGE_PIXELS', 7680 * 4320))  # 8K
+SPOOL_MEMORY_BYTES = 4 * 1024 * 1024  # Larger downloads spill to a temporary file
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=30, sock_read=10)
+
+class ImageRejected(Exception):
+    """The image can't be used; the message is shown to the user"""
+
+class SourceImage:
+    """A downloaded image: raw bytes in a spooled buffer, header info, decoded copy.
+
+    The dimensions come from the image header (nothing is decoded until
+    decode() is called), and the decoded image is kept so re-conversions of
+    the same source don't download or decode it again.
+    """
+
+    def __init__(self, url, buffer, byte_size, width, height, image_format):
+        self.url = url
+        self.buffer = buffer
+        self.byte_size = byte_size
+        self.width = width
+        self.height = height
+        self.format = image_format
+        self._decoded = None
+
+    def open(self):
+        """Lazily-decoded PIL image reading from the buffer"""
+        self.buffer.seek(0)
+        return Image.open(self.buffer)
+
+    def decode(self):
+        """Decoded first frame, cached (shared: never modify it in place)"""
+        if self._decoded is None:
+            image = self.open()
+            try:
+                image.load()
+            except Image.DecompressionBombError as e:
+                raise ImageRejected(f"The image is too large to process: {e}")
+            self._decoded = image
+        return self._decoded
+
+    def save_to(self, path):
+        """Write the original bytes to a file"""
+        self.buffer.seek(0)
+        with open(path, 'wb') as f:
+            shutil.copyfileobj(self.buffer, f)
+
+    def close(self):
+        self._decoded = None
+        self.buffer.close()
+
+def probe_image(buffer):
+    """(width, height, format) from the image header, without decoding pixels"""
+    buffer.seek(0)
+    try:
+        with warnings.catch_warnings():
+            # Our own limit is checked below
+            warnings.simplefilter('ignore', Image.DecompressionBombWarning)
+            with Image.open(buffer) as image:
+                width, height = image.size
+                image_format = image.format
+    except Image.DecompressionBombError:
+        raise ImageRejected("The image has too many pixels.")
+    except Exception:
+        raise ImageRejected("The file is not a supported image.")
+
+    # PIL only refuses images over twice its own limit: check ours explicitly
+    if width <= 0 or height <= 0:
+        raise ImageRejected("The image is empty.")
+    if width * height > MAX_IMAGE_PIXELS:
+        raise ImageRejected(f"The image is too large ({width}x{height}, max {MAX_IMAGE_PIXELS:,} pixels).")
+    return width, height, image_format
+
+async def fetch_source_image(url, max_bytes=MAX_DOWNLOAD_BYTES):
+    """Stream an image into a spooled buffer and check its size and dimensions.
+
+    Raises ImageRejected when the download fails or the image is too big.
+    """
+    buffer = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+    try:
+        byte_size = 0
+        async with aiohttp.ClientSession(timeout=DOWNLOAD_TIMEOUT) as session:
+            async with session.get(url) as response:
+                if response.status != 200:
+                    raise ImageRejected(f"The image could not be downloaded (HTTP {response.status}).")
+                if response.content_length is not None and response.content_length > max_bytes:
+                    raise ImageRejected(f"The file is too large (max {max_bytes // (1024 * 1024)} MB).")
+
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    byte_size += len(chunk)
+                    # Content-Length can be missing or wrong: count what is received
+                    if byte_size > max_bytes:
+                        raise ImageRejected(f"The file is too large (max {max_bytes // (1024 * 1024)} MB).")
+                    buffer.write(chunk)
+
+        width, height, image_format = probe_image(buffer)
+        return SourceImage(url, buffer, byte_size, width, height, image_format)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        buffer.close()
+        raise ImageRejected(f"The image could not be downloaded: {e}")
+    except BaseException:
+        buffer.close()
+        raise
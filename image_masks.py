@@ -0,0 +1,122 @@
+import threading
+from collections import OrderedDict
+
+from lazy_imports import LazyModule
+Image = LazyModule('PIL.Image')
+ImageDraw = LazyModule('PIL.ImageDraw')
+
+BAR_SIZE_CACHE_SIZE = 8  # Bar sizes with their masks kept in memory
+BAR_PROGRESS_CACHE_SIZE = 64  # Progress masks kept per bar size
+
+# Masking without NumPy round trips: each helper changes the image in place
+# (putalpha, or a paste through the mask) with at most one L-sized
+# temporary, instead of converting the RGBA images to arrays, copying pixels
+# by boolean index and rebuilding them
+
+_BINARY_TABLES = {}
+
+def binary_mask(mask, threshold=1, invert=False):
+    """L mask: 255 where mask >= threshold (invert: where it's below), 0 elsewhere (one lookup table pass)"""
+    table = _BINARY_TABLES.get((threshold, invert))
+    if table is None:
+        table = _BINARY_TABLES[(threshold, invert)] = [255 if (value >= threshold) != invert else 0 for value in range(256)]
+    return mask.point(table)
+
+def apply_mask(image, mask):
+    """Set an RGBA image's alpha to mask, in place, and return it.
+
+    Pixels outside the mask keep their color under a zero alpha: they're
+    invisible once pasted or composited.
+    """
+    if image.mode != 'RGBA':
+        image = image.convert('RGBA')
+    image.putalpha(mask)
+    return image
+
+def clear_outside(image, mask):
+    """Make an RGBA image fully transparent (0, 0, 0, 0) wherever mask is 0, in place, and return it"""
+    image.paste(0, None, binary_mask(mask, invert=True))
+    return image
+
+def clip_mask_width(mask, width):
+    """Clear the columns of an L mask from width on, in place (a rectangle crop of the mask)"""
+    if width < mask.width:
+        mask.paste(0, (max(0, width), 0, mask.width, mask.height))
+    return mask
+
+class BarMasks:
+    """Masks of a rounded XP bar of one size, drawn once and shared (never modify them in place).
+
+    progress() derives the mask of any progress width from the full-width
+    mask and its end cap: the straight part of a rounded bar is the same at
+    every width, only the cap moves.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.full = Image.new('L', (width, height), 0)
+        ImageDraw.Draw(self.full).rounded_rectangle([(0, 0), (width - 1, height - 1)], radius=height // 2, fill=255)
+        self.cap_width = min(width, height // 2 + 1)
+        self.cap = self.full.crop((width - self.cap_width, 0, width, height))
+        # Start of the bar for progress narrower than the bar height
+        self.circle = Image.new('L', (height, height), 0)
+        ImageDraw.Draw(self.circle).ellipse([(0, 0), (height - 1, height - 1)], fill=255)
+        self._progress = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _build_progress(self, progress_width, squeeze):
+        if progress_width >= self.height + 2:
+            mask = self.full.copy()
+            mask.paste(self.cap, (progress_width - self.cap_width, 0))
+            return clip_mask_width(mask, progress_width)
+
+        mask = Image.new('L', (self.width, self.height), 0)
+        draw = ImageDraw.Draw(mask)
+        if progress_width >= self.height:
+            # Almost a circle: Pillow rounds such narrow rectangles differently, drawn as is
+            draw.rounded_rectangle([(0, 0), (progress_width - 1, self.height - 1)], radius=self.height // 2, fill=255)
+        elif squeeze:
+            draw.ellipse([(0, 0), (min(progress_width * 2, self.height) - 1, self.height - 1)], fill=255)
+        else:
+            mask.paste(self.circle, (0, 0))
+        return clip_mask_width(mask, progress_width)
+
+    def progress(self, progress_width, squeeze=False):
+        """Bar-sized L mask of the bar filled up to progress_width (cached).
+
+        Narrower than the bar height, the fill is the start circle cut at
+        progress_width (squeeze: a half ellipse progress_width wide instead).
+        """
+        key = (progress_width, squeeze)
+        with self._lock:
+            mask = self._progress.get(key)
+            if mask is not None:
+                self._progress.move_to_end(key)
+                return mask
+
+        mask = self._build_progress(progress_width, squeeze)
+        with self._lock:
+            self._progress[key] = mask
+            while len(self._progress) > BAR_PROGRESS_CACHE_SIZE:
+                self._progress.popitem(last=False)
+        return mask
+
+_bar_masks = OrderedDict()
+_bar_masks_lock = threading.Lock()
+
+def bar_masks(width, height):
+    """Shared BarMasks for a bar size"""
+    key = (width, height)
+    with _bar_masks_lock:
+        masks = _bar_masks.get(key)
+        if masks is not None:
+            _bar_masks.move_to_end(key)
+            return masks
+
+    masks = BarMasks(width, height)
+    with _bar_masks_lock:
+        masks = _bar_masks.setdefault(key, masks)
+        while len(_bar_masks) > BAR_SIZE_CACHE_SIZE:
+            _bar_masks.popitem(last=False)
+    return masks
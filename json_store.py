@@ -0,0 +1,313 @@
+import asyncio
+import atexit
+import contextlib
+import json
+import os
+import stat
+import tempfile
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+# fsync after each write: 'always' (default) or 'never' (faster, but a power
+# loss can lose the last writes); can be overridden per document
+FSYNC_POLICY = os.getenv('JSON_STORE_FSYNC', 'always').lower()
+
+def file_signature(path):
+    """Cheap change detector for a JSON file (mtime + size)"""
+    try:
+        stat_result = os.stat(path)
+        return (stat_result.st_mtime_ns, stat_result.st_size)
+    except OSError:
+        return None
+
+class Snapshot(dict):
+    """Private copy of a JSON document, tagged with the version it was loaded at.
+
+    base is the committed text of that version (shared, not copied): the
+    merge base of the copy, however many saves happen before it is saved.
+    """
+    __slots__ = ('version', 'base')
+
+def _empty_like(value):
+    if isinstance(value, dict):
+        return {}
+    if isinstance(value, list):
+        return []
+    return _MISSING
+
+def _entry_ids(items):
+    """IDs of a list of {"id": ...} entries, or None if it isn't one"""
+    ids = []
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get("id"), (str, int)):
+            return None
+        ids.append(item["id"])
+    return ids if len(set(ids)) == len(ids) else None
+
+def _merge_mappings(base, mine, theirs):
+    """Merge key -> value mappings; returns [(key, value)] in theirs' order, then mine's additions"""
+    merged = []
+    for key in list(theirs) + [key for key in mine if key not in theirs]:
+        in_base, in_mine, in_theirs = key in base, key in mine, key in theirs
+        if in_mine and in_theirs:
+            merged.append((key, merge_documents(base.get(key, _empty_like(mine[key])), mine[key], theirs[key])))
+        elif in_mine:
+            # Dropped by them: keep it only if it's new or we changed it
+            if not in_base or mine[key] != base[key]:
+                merged.append((key, mine[key]))
+        elif not in_base or theirs[key] != base[key]:
+            merged.append((key, theirs[key]))
+    return merged
+
+def merge_documents(base, mine, theirs):
+    """Three-way merge of two edits (mine, theirs) of the same JSON value (base).
+
+    Dicts are merged per key and lists of {"id": ...} entries per entry, so
+    edits of different settings / embeds / artworks are all kept. When both
+    sides changed the same value, mine (the latest save) wins.
+    """
+    if mine == base or theirs == mine:
+        return theirs
+    if theirs == base:
+        return mine
+
+    if isinstance(base, dict) and isinstance(mine, dict) and isinstance(theirs, dict):
+        return dict(_merge_mappings(base, mine, theirs))
+
+    if isinstance(base, list) and isinstance(mine, list) and isinstance(theirs, list):
+        base_ids, mine_ids, theirs_ids = _entry_ids(base), _entry_ids(mine), _entry_ids(theirs)
+        if base_ids is not None and mine_ids is not None and theirs_ids is not None:
+            merged = _merge_mappings(dict(zip(base_ids, base)), dict(zip(mine_ids, mine)), dict(zip(theirs_ids, theirs)))
+            return [value for _, value in merged]
+
+    return mine
+
+class DocumentWriter:
+    """Single background thread writing JSON documents to disk.
+
+    The queue only keeps the latest text of each document: saving a file ten
+    times while it is being written results in a single extra write.
+    on_written callbacks run in the writer thread once a text containing
+    their save is on disk (never if the write fails: the next successful
+    write runs them).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._condition = threading.Condition(self.lock)
+        self._pending = OrderedDict()  # document -> (text, [on_written callbacks])
+        self._waiting = {}  # document -> callbacks of failed writes, run after the next one
+        self._writing = None
+        self._thread = None
+
+    def submit(self, document, text, on_written=None):
+        with self._condition:
+            _, callbacks = self._pending.pop(document, (None, []))
+            if on_written is not None:
+                callbacks.append(on_written)
+            self._pending[document] = (text, callbacks)
+            document._dirty = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='json-store-writer', daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                document, (text, callbacks) = self._pending.popitem(last=False)
+                callbacks = self._waiting.pop(document, []) + callbacks
+                self._writing = document
+
+            signature = None
+            try:
+                signature = document._write(text)
+            except Exception as e:
+                print(f"Error writing {document.path}: {e}")
+
+            if signature is None:
+                with self._condition:
+                    self._waiting[document] = callbacks + self._waiting.get(document, [])
+            else:
+                for callback in callbacks:
+                    try:
+                        callback()
+                    except Exception as e:
+                        print(f"Error after writing {document.path}: {e}")
+
+            with self._condition:
+                self._writing = None
+                if signature is not None:
+                    document._signature = signature
+                if document not in self._pending:
+                    document._dirty = False
+                self._condition.notify_all()
+
+    def flush(self, timeout=None):
+        """Block until every queued document is on disk; False on timeout"""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and self._writing is None, timeout)
+
+document_writer = DocumentWriter()
+atexit.register(document_writer.flush)
+
+class JsonDocument:
+    """A JSON data file shared by every module that reads or writes it.
+
+    Reads are served from memory and revalidated against the file's mtime and
+    size, so manual edits of the file are still picked up. Saving only dumps
+    compact JSON on the event loop; the background writer formats the file
+    and atomically replaces the original through a temporary file. Every
+    loaded copy remembers the document version it was taken from, and that
+    version's text: saving a copy that is older than the latest save merges
+    both edits instead of overwriting the other one. `lock` / `edit()`
+    serialize async read-modify-write sequences.
+    """
+
+    def __init__(self, path, indent=2, ensure_ascii=True, fsync=None):
+        self.path = path
+        self.indent = indent  # None: compact file, for data nobody reads by hand
+        self.ensure_ascii = ensure_ascii
+        self.fsync = fsync  # None: FSYNC_POLICY
+        self._lock = None
+        self._dirty = False  # A save is queued or being written (guarded by document_writer.lock)
+        self._version = 0
+        self._text = None  # Committed JSON text, None if the file is missing or invalid
+        self._data = None  # Parsed _text, shared by read()
+        self._signature = None
+        self._loaded = False
+
+    @property
+    def lock(self):
+        # Created on first use, inside the bot's event loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    # Reading
+    def _revalidate(self):
+        with document_writer.lock:
+            # Until the writer catches up, memory is newer than the file
+            if self._dirty:
+                return
+            signature = file_signature(self.path)
+            if self._loaded and signature == self._signature:
+                return
+
+        text, data = None, None
+        if signature is not None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    text = f.read()
+                data = json.loads(text)
+            except (OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+                print(f"Cannot read {self.path}: {e}")
+                text, data = None, None
+
+        self._loaded = True
+        self._signature = signature
+        self._commit(text, data)
+
+    def _commit(self, text, data):
+        self._version += 1
+        self._text = text
+        self._data = data
+
+    @property
+    def version(self):
+        self._revalidate()
+        return self._version
+
+    def read(self, default=None):
+        """Shared parsed document, for read-only use (never modify it)"""
+        self._revalidate()
+        if self._text is None:
+            return default() if callable(default) else default
+        if self._data is None:
+            self._data = json.loads(self._text)
+        return self._data
+
+    def load(self, default=dict):
+        """Private copy of the document that can be modified and saved"""
+        self._revalidate()
+        data = default() if self._text is None else json.loads(self._text)
+        if isinstance(data, dict):
+            data = Snapshot(data)
+            data.version = self._version
+            data.base = self._text
+        return data
+
+    # Writing
+    def save(self, data, merge=True, on_written=None):
+        """Write data and return the new version.
+
+        If data was loaded before the latest save, the changes made since are
+        merged into it first (merge=False overwrites them). on_written is
+        called from the writer thread once this save is on disk.
+        """
+        self._revalidate()
+        base_version = getattr(data, 'version', None)
+        if merge and base_version is not None and base_version != self._version:
+            self._merge_into(data)
+
+        # Compact dumps use the C encoder; indenting is left to the writer thread
+        text = json.dumps(data, separators=(',', ':'), ensure_ascii=self.ensure_ascii)
+        self._commit(text, None)
+        document_writer.submit(self, text, on_written)
+        if isinstance(data, Snapshot):
+            data.version = self._version
+            data.base = text
+        return self._version
+
+    def _merge_into(self, data):
+        base = json.loads(data.base) if data.base is not None else {}
+        theirs = json.loads(self._text) if self._text is not None else {}
+        merged = merge_documents(base, dict(data), theirs)
+        data.clear()
+        data.update(merged)
+
+    def _write(self, text):
+        """Runs in the writer thread; returns the new file signature"""
+        if self.indent is not None:
+            text = json.dumps(json.loads(text), indent=self.indent, ensure_ascii=self.ensure_ascii)
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(self.path)}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+                f.flush()
+                if (self.fsync if self.fsync is not None else FSYNC_POLICY != 'never'):
+                    os.fsync(f.fileno())
+            try:
+                os.chmod(temp_path, stat.S_IMODE(os.stat(self.path).st_mode))
+            except OSError:
+                os.chmod(temp_path, 0o644)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(temp_path)
+            raise
+        return file_signature(self.path)
+
+    @contextlib.asynccontextmanager
+    async def edit(self, default=dict):
+        """async with document.edit() as data: ... saves data on exit (not if an error is raised)"""
+        async with self.lock:
+            data = self.load(default)
+            yield data
+            self.save(data)
+
+_documents = {}
+
+def json_document(path, indent=2, ensure_ascii=True, fsync=None):
+    """The shared JsonDocument of a file (created on first use)"""
+    key = os.path.abspath(path)
+    document = _documents.get(key)
+    if document is None:
+        document = _documents[key] = JsonDocument(path, indent, ensure_ascii, fsync)
+    return document
@@ -0,0 +1,24 @@
+import importlib
+
+class LazyModule:
+    """Module proxy that imports the real module on first attribute access.
+
+    Used for heavy dependencies (PIL, numpy) so loading a cog doesn't pay for
+    them until the first image is actually processed.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
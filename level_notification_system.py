@@ -4,92 +4,414 @@ from discord import app_commands
 import json
 import aiohttp
 import io
-from PIL import Image, ImageDraw, ImageFont, ImageOps
+from lazy_imports import LazyModule
+# PIL is only imported when the first image is processed
+Image = LazyModule('PIL.Image')
+ImageDraw = LazyModule('PIL.ImageDraw')
+ImageFont = LazyModule('PIL.ImageFont')
+ImageOps = LazyModule('PIL.ImageOps')
+import asyncio
 import time
 import uuid
 import os
+from animated_media import AnimatedMedia
+from avatar_cache import avatar_cache
+from card_encoder import card_extension, encode_card
+from image_masks import apply_mask, binary_mask
+from json_store import json_document
+from render_service import card_user, render_service
+from text_render import draw_text, text_mask, text_surface
 
 # Data management functions for notifications
-def load_notification_data():
-    try:
-        with open('leveling_data.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            # Initialize notification settings if they don't exist
-            if "notification_settings" not in data:
-                data["notification_settings"] = {
-                    "level_notifications": {
-                        "enabled": True,
-                        "cycle": 1,
-                        "level_card": {
-                            "background_color": [245, 55, 48],
-                            "background_image": None,
-                            "username_color": [255, 255, 255],
-                            "level_text_color": [255, 255, 255],
-                            "message_text_color": [255, 255, 255],
-                            "info_text_color": [200, 200, 200],
-                            "outline_enabled": True,
-                            "outline_color": [255, 255, 255],
-                            "outline_image": None,
-                            "username_position": {"x": 540, "y": 200, "font_size": 80},
-                            "level_position": {"x": 540, "y": 300, "font_size": 120},
-                            "message_position": {"x": 540, "y": 450, "font_size": 60},
-                            "info_position": {"x": 540, "y": 550, "font_size": 40},
-                            "avatar_position": {"x": 190, "y": 190, "size": 300},
-                            "outline_position": {"x": 190, "y": 190, "size": 300},
-                            "text_outline_enabled": True,
-                            "text_outline_color": [0, 0, 0],
-                            "text_outline_width": 2
-                        }
-                    },
-                    "role_notifications": {
-                        "enabled": False
-                    },
-                    "custom_notifications": {
-                        "enabled": False
-                    }
-                }
-                save_notification_data(data)
-            return data
-    except FileNotFoundError:
-        # Return default structure if file doesn't exist
-        return {
-            "notification_settings": {
-                "level_notifications": {
-                    "enabled": True,
-                    "cycle": 1,
-                    "level_card": {
-                        "background_color": [245, 55, 48],
-                        "background_image": None,
-                        "username_color": [255, 255, 255],
-                        "level_text_color": [255, 255, 255],
-                        "message_text_color": [255, 255, 255],
-                        "info_text_color": [200, 200, 200],
-                        "outline_enabled": True,
-                        "outline_color": [255, 255, 255],
-                        "outline_image": None,
-                        "username_position": {"x": 540, "y": 200, "font_size": 80},
-                        "level_position": {"x": 540, "y": 300, "font_size": 120},
-                        "message_position": {"x": 540, "y": 450, "font_size": 60},
-                        "info_position": {"x": 540, "y": 550, "font_size": 40},
-                        "avatar_position": {"x": 190, "y": 190, "size": 300},
-                        "outline_position": {"x": 190, "y": 190, "size": 300},
-                        "text_outline_enabled": True,
-                        "text_outline_color": [0, 0, 0],
-                        "text_outline_width": 2
-                    }
-                },
-                "role_notifications": {
-                    "enabled": False
-                },
-                "custom_notifications": {
-                    "enabled": False
+leveling_store = json_document('leveling_data.json', indent=None, ensure_ascii=False)  # Machine-only: compact
+
+def default_notification_data():
+    """Default structure, used while leveling_data.json doesn't exist"""
+    return {
+        "notification_settings": {
+            "level_notifications": {
+                "enabled": True,
+                "cycle": 1,
+                "level_card": {
+                    "background_color": [245, 55, 48],
+                    "background_image": None,
+                    "username_color": [255, 255, 255],
+                    "level_text_color": [255, 255, 255],
+                    "message_text_color": [255, 255, 255],
+                    "info_text_color": [200, 200, 200],
+                    "outline_enabled": True,
+                    "outline_color": [255, 255, 255],
+                    "outline_image": None,
+                    "username_position": {"x": 540, "y": 200, "font_size": 80},
+                    "level_position": {"x": 540, "y": 300, "font_size": 120},
+                    "message_position": {"x": 540, "y": 450, "font_size": 60},
+                    "info_position": {"x": 540, "y": 550, "font_size": 40},
+                    "avatar_position": {"x": 190, "y": 190, "size": 300},
+                    "outline_position": {"x": 190, "y": 190, "size": 300},
+                    "text_outline_enabled": True,
+                    "text_outline_color": [0, 0, 0],
+                    "text_outline_width": 2
                 }
+            },
+            "role_notifications": {
+                "enabled": False
+            },
+            "custom_notifications": {
+                "enabled": False
             }
         }
+    }
+
+def load_notification_data():
+    data = leveling_store.load(default=default_notification_data)
+    # Initialize notification settings if they don't exist
+    if "notification_settings" not in data:
+        data["notification_settings"] = default_notification_data()["notification_settings"]
+        save_notification_data(data)
+    return data
 
 def save_notification_data(data):
-    with open('leveling_data.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    leveling_store.save(data)
+
+# Card rendering: plain data in, encoded card out. These run in a render
+# worker (see render_service), the view downloads the images beforehand
+
+def create_circle_mask(size):
+    """Create circular mask for profile picture"""
+    mask = Image.new('L', size, 0)
+    draw = ImageDraw.Draw(mask)
+    draw.ellipse((0, 0, size[0], size[1]), fill=255)
+    return mask
+
+def resize_image_proportionally_centered(image, target_width, target_height):
+    """Resize image maintaining proportions and cropping from center"""
+    try:
+        # Calculate scaling factor to make image fit target dimensions
+        scale_factor = max(target_width / image.width, target_height / image.height)
+
+        # Calculate new dimensions after scaling
+        new_width = int(image.width * scale_factor)
+        new_height = int(image.height * scale_factor)
+
+        # Resize image to new dimensions
+        resized_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+
+        # Calculate crop coordinates to center the image
+        left = (new_width - target_width) // 2
+        top = (new_height - target_height) // 2
+        right = left + target_width
+        bottom = top + target_height
+
+        # Crop to exact target size, centered
+        cropped_image = resized_image.crop((left, top, right, bottom))
+
+        return cropped_image
+
+    except Exception as e:
+        print(f"Error resizing image proportionally: {e}")
+        return image.resize((target_width, target_height), Image.Resampling.LANCZOS)
+
+def draw_text_with_outline(image, text, position, font, color, outline_color, outline_width):
+    """Draw text with outline (native stroke, cached rendering)"""
+    draw_text(image, position, text, font, color, stroke_width=outline_width, stroke_fill=outline_color)
+
+def text_with_image_overlay(text, font, color, overlay_data=None, text_width=None, text_height=None):
+    """Create text with optional image overlay for notification cards (overlay_data: downloaded image bytes)"""
+    try:
+        # Create text surface
+        if text_width is None or text_height is None:
+            text_bbox = font.getbbox(text)
+            text_width = text_bbox[2] - text_bbox[0]
+            text_height = text_bbox[3] - text_bbox[1]
+
+        # Add padding (extra for outline when image is used)
+        padding = 35 if overlay_data else 30
+        canvas_width = text_width + (padding * 2)
+        canvas_height = text_height + (padding * 2)
+
+        if overlay_data:
+            overlay_img = Image.open(io.BytesIO(overlay_data)).convert("RGBA")
+
+            # Create text mask with outline for better definition:
+            # 128 on the outline (dilated text), 255 on the text itself
+            canvas_size = (canvas_width, canvas_height)
+            text_x = padding
+            text_y = padding
+            outline_width = 3
+
+            outline_mask, (left, top) = text_mask(text, font, stroke_width=outline_width)
+            outline_layer = Image.new('L', canvas_size, 0)
+            outline_layer.paste(outline_mask.point(lambda value: value * 128 // 255), (text_x + left, text_y + top))
+
+            glyph_mask, (left, top) = text_mask(text, font)
+            glyph_layer = Image.new('L', canvas_size, 0)
+            glyph_layer.paste(glyph_mask, (text_x + left, text_y + top))
+
+            text_mask_image = Image.composite(Image.new('L', canvas_size, 255), outline_layer, glyph_layer)
+
+            # Get the actual text bounding box for centering the image
+            actual_text_bbox = font.getbbox(text)
+            actual_text_width = actual_text_bbox[2] - actual_text_bbox[0]
+            actual_text_height = actual_text_bbox[3] - actual_text_bbox[1]
+
+            # Calculate scaling to fit image proportionally within text bounds
+            scale_x = actual_text_width / overlay_img.width
+            scale_y = actual_text_height / overlay_img.height
+            scale = max(scale_x, scale_y)
+
+            # Calculate new dimensions
+            new_width = int(overlay_img.width * scale)
+            new_height = int(overlay_img.height * scale)
+
+            # Resize image maintaining proportions
+            overlay_resized = overlay_img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+
+            # Center the resized image within the canvas
+            center_x = padding + actual_text_width // 2
+            center_y = padding + actual_text_height // 2
+            
+            paste_x = center_x - new_width // 2
+            paste_y = center_y - new_height // 2
+
+            # Create canvas for the centered image
+            centered_overlay = Image.new('RGBA', (canvas_width, canvas_height), (0, 0, 0, 0))
+            
+            # Calculate crop coordinates if image extends beyond canvas
+            crop_left = max(0, -paste_x)
+            crop_top = max(0, -paste_y)
+            crop_right = min(new_width, new_width - (paste_x + new_width - canvas_width))
+            crop_bottom = min(new_height, new_height - (paste_y + new_height - canvas_height))
+            
+            # Crop the overlay if necessary
+            if crop_left > 0 or crop_top > 0 or crop_right < new_width or crop_bottom < new_height:
+                cropped_overlay = overlay_resized.crop((crop_left, crop_top, crop_right, crop_bottom))
+                final_paste_x = max(0, paste_x)
+                final_paste_y = max(0, paste_y)
+            else:
+                cropped_overlay = overlay_resized
+                final_paste_x = paste_x
+                final_paste_y = paste_y
+
+            # Paste the centered and cropped image
+            centered_overlay.paste(cropped_overlay, (final_paste_x, final_paste_y), cropped_overlay)
+
+            # Final result with black outline: black where mask < 255 (outline area), the
+            # texture on the main text area (mask == 255), alpha channel set to the mask
+            centered_overlay.paste((0, 0, 0, 255), None, binary_mask(text_mask_image, 255, invert=True))
+            return apply_mask(centered_overlay, text_mask_image)
+
+        # Fallback to regular colored text
+        temp_img = Image.new('RGBA', (canvas_width, canvas_height), (0, 0, 0, 0))
+        temp_draw = ImageDraw.Draw(temp_img)
+        temp_draw.text((padding, padding), text, font=font, fill=tuple(color))
+        return temp_img
+
+    except Exception as e:
+        print(f"Error creating text with image overlay: {e}")
+        # Fallback to basic text
+        text_bbox = font.getbbox(text)
+        text_width = text_bbox[2] - text_bbox[0]
+        text_height = text_bbox[3] - text_bbox[1]
+        padding = 30
+        temp_img = Image.new('RGBA', (text_width + padding * 2, text_height + padding * 2), (0, 0, 0, 0))
+        temp_draw = ImageDraw.Draw(temp_img)
+        temp_draw.text((padding, padding), text, font=font, fill=tuple(color))
+        return temp_img
+
+def notification_card_image_urls(config):
+    """Every image a notification card with this config can draw"""
+    outline_urls = []
+    if config.get("outline_enabled", True):
+        # The default outline is also the mask of a custom outline image
+        outline_urls = [config.get("outline_image"), "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/ProfileOutline.png"]
+    return [
+        config.get("background_image"),
+        *outline_urls,
+        config.get("username_text_image"),
+        config.get("level_text_image"),
+        config.get("message_text_image"),
+        config.get("information_text_image"),
+    ]
+
+def render_notification_level_card(user, avatar, level, config, assets):
+    """Draw a notification level card (1080x1080) from plain data (runs in a render worker).
+
+    user is a CardUser, avatar its circular avatar at the card's avatar size
+    (None if unavailable), assets maps the config's image URLs to their
+    downloaded bytes (None when the download failed). Returns the encoded card.
+    """
+    try:
+        # Create 1080x1080 background
+        background = Image.new("RGBA", (1080, 1080), (0, 0, 0, 0))
+
+        # Set background with proper proportional resizing
+        if config.get("background_image"):
+            bg_data = assets.get(config["background_image"])
+            if bg_data:
+                # First frame only: animated backgrounds aren't decoded further
+                bg_img = AnimatedMedia(bg_data).first_frame()
+                # Use centered proportional resizing for background
+                background = resize_image_proportionally_centered(
+                    bg_img, 1080, 1080
+                )
+            else:
+                bg_color = tuple(config.get("background_color", [245, 55, 48])) + (255,)
+                background = Image.new("RGBA", (1080, 1080), bg_color)
+        else:
+            bg_color = tuple(config.get("background_color", [245, 55, 48])) + (255,)
+            background = Image.new("RGBA", (1080, 1080), bg_color)
+
+        # User avatar, already circular at the card size (avatar cache)
+        if avatar is not None:
+            avatar_pos = config.get("avatar_position", {"x": 190, "y": 190, "size": 300})
+
+            # Paste avatar
+            background.paste(avatar, (avatar_pos["x"], avatar_pos["y"]), avatar)
+
+            # Add outline if enabled
+            if config.get("outline_enabled", True):
+                outline_pos = config.get("outline_position", {"x": 190, "y": 190, "size": 300})
+                outline_url = "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/ProfileOutline.png"
+
+                if config.get("outline_image"):
+                    outline_url = config["outline_image"]
+
+                outline_data = assets.get(outline_url)
+                if outline_data:
+                    outline = Image.open(io.BytesIO(outline_data)).convert("RGBA")
+                    outline = outline.resize((outline_pos["size"], outline_pos["size"]), Image.Resampling.LANCZOS)
+
+                    # Apply color if specified and not using custom image
+                    if config.get("outline_color") and not config.get("outline_image"):
+                        color_override = config["outline_color"]
+                        colored_outline = Image.new("RGBA", outline.size, tuple(color_override + [255]))
+                        colored_outline.putalpha(outline.split()[-1])
+                        outline = colored_outline
+
+                    # Create mask for outline to only show parts that overlay with avatar
+                    if config.get("outline_image"):
+                        # Download the default outline to use as a template mask
+                        default_outline_url = "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/ProfileOutline.png"
+                        default_outline_data = assets.get(default_outline_url)
+                        if default_outline_data:
+                            default_outline = Image.open(io.BytesIO(default_outline_data)).convert("RGBA")
+                            default_outline_resized = default_outline.resize((outline_pos["size"], outline_pos["size"]), Image.Resampling.LANCZOS)
+                            
+                            # Use the alpha channel of the default outline as the mask
+                            outline_template_alpha = default_outline_resized.split()[-1]
+                            outline.putalpha(outline_template_alpha)
+                        else:
+                            # Fallback to circular mask if default outline can't be loaded
+                            outline_mask = create_circle_mask((outline_pos["size"], outline_pos["size"]))
+                            outline.putalpha(outline_mask)
+
+                    background.paste(outline, (outline_pos["x"], outline_pos["y"]), outline)
+
+        # Add text
+        draw = ImageDraw.Draw(background)
+
+        # Load fonts
+        try:
+            font_username = ImageFont.truetype("PlayPretend.otf", config.get("username_position", {}).get("font_size", 80))
+            font_level = ImageFont.truetype("PlayPretend.otf", config.get("level_position", {}).get("font_size", 120))
+            font_message = ImageFont.truetype("PlayPretend.otf", config.get("message_position", {}).get("font_size", 60))
+            font_info = ImageFont.truetype("PlayPretend.otf", config.get("info_position", {}).get("font_size", 40))
+        except IOError:
+            font_username = ImageFont.load_default()
+            font_level = ImageFont.load_default()
+            font_message = ImageFont.load_default()
+            font_info = ImageFont.load_default()
+
+        # Text outline settings
+        text_outline_enabled = config.get("text_outline_enabled", True)
+        outline_color = tuple(config.get("text_outline_color", [0, 0, 0]))
+        outline_width = config.get("text_outline_width", 2)
+
+        # Draw username with optional image overlay
+        username_pos = config.get("username_position", {"x": 540, "y": 200})
+        username_color = tuple(config.get("username_color", [255, 255, 255]))
+        username_text = user.name
+        username_image_url = config.get("username_text_image")
+
+        if username_image_url and username_image_url != "None":
+            username_surface = text_with_image_overlay(
+                username_text, font_username, username_color, assets.get(username_image_url)
+            )
+            background.paste(username_surface,
+                           (username_pos["x"] - 30, username_pos["y"] - 30),
+                           username_surface)
+        else:
+            if text_outline_enabled:
+                draw_text_with_outline(background, username_text, (username_pos["x"], username_pos["y"]),
+                                          font_username, username_color, outline_color, outline_width)
+            else:
+                draw.text((username_pos["x"], username_pos["y"]), username_text, font=font_username, fill=username_color)
+
+        # Draw level with optional image overlay
+        level_pos = config.get("level_position", {"x": 540, "y": 300})
+        level_color = tuple(config.get("level_text_color", [255, 255, 255]))
+        level_text = f"LEVEL {level}"
+        level_image_url = config.get("level_text_image")
+
+        if level_image_url and level_image_url != "None":
+            level_surface = text_with_image_overlay(
+                level_text, font_level, level_color, assets.get(level_image_url)
+            )
+            background.paste(level_surface,
+                           (level_pos["x"] - 30, level_pos["y"] - 30),
+                           level_surface)
+        else:
+            if text_outline_enabled:
+                draw_text_with_outline(background, level_text, (level_pos["x"], level_pos["y"]),
+                                          font_level, level_color, outline_color, outline_width)
+            else:
+                draw.text((level_pos["x"], level_pos["y"]), level_text, font=font_level, fill=level_color)
+
+        # Draw message with optional image overlay
+        message_pos = config.get("message_position", {"x": 540, "y": 450})
+        message_color = tuple(config.get("message_text_color", [255, 255, 255]))
+        message_text = "You just reached a new level !"
+        message_image_url = config.get("message_text_image")
+
+        if message_image_url and message_image_url != "None":
+            message_surface = text_with_image_overlay(
+                message_text, font_message, message_color, assets.get(message_image_url)
+            )
+            background.paste(message_surface,
+                           (message_pos["x"] - 30, message_pos["y"] - 30),
+                           message_surface)
+        else:
+            if text_outline_enabled:
+                draw_text_with_outline(background, message_text, (message_pos["x"], message_pos["y"]),
+                                          font_message, message_color, outline_color, outline_width)
+            else:
+                draw.text((message_pos["x"], message_pos["y"]), message_text, font=font_message, fill=message_color)
+
+        # Draw info with optional image overlay
+        info_pos = config.get("info_position", {"x": 540, "y": 550})
+        info_color = tuple(config.get("info_text_color", [200, 200, 200]))
+        info_text = "Type /level for more information"
+        info_image_url = config.get("information_text_image")
+
+        if info_image_url and info_image_url != "None":
+            info_surface = text_with_image_overlay(
+                info_text, font_info, info_color, assets.get(info_image_url)
+            )
+            background.paste(info_surface,
+                           (info_pos["x"] - 30, info_pos["y"] - 30),
+                           info_surface)
+        else:
+            if text_outline_enabled:
+                draw_text_with_outline(background, info_text, (info_pos["x"], info_pos["y"]),
+                                          font_info, info_color, outline_color, outline_width)
+            else:
+                draw.text((info_pos["x"], info_pos["y"]), info_text, font=font_info, fill=info_color)
+
+        return encode_card([background], kind='notification')
+
+    except Exception as e:
+        print(f"Error creating notification level card: {e}")
+        return None
 
 class NotificationSystemView(discord.ui.View):
     def __init__(self, bot, user):
@@ -521,6 +843,12 @@ class NotificationLevelCardView(discord.ui.View):
             print(f"Error downloading image {url}: {e}")
             return None
 
+    async def download_images(self, urls):
+        """Download several images at once: {url: bytes, or None when the download failed}"""
+        urls = list(dict.fromkeys(url for url in urls if url and url != "None"))
+        results = await asyncio.gather(*(self.download_image(url) for url in urls))
+        return dict(zip(urls, results))
+
     async def upload_image_to_discord_channel(self, image_url):
         """Upload image to specific Discord channel and return Discord URL"""
         try:
@@ -595,186 +923,20 @@ class NotificationLevelCardView(discord.ui.View):
 
     async def create_text_with_image_overlay(self, text, font, color, image_url=None, text_width=None, text_height=None):
         """Create text with optional image overlay for notification cards"""
-        try:
-            # Create text surface
-            if text_width is None or text_height is None:
-                text_bbox = font.getbbox(text)
-                text_width = text_bbox[2] - text_bbox[0]
-                text_height = text_bbox[3] - text_bbox[1]
-
-            # Add padding (extra for outline when image is used)
-            padding = 35 if image_url and image_url != "None" else 30
-            canvas_width = text_width + (padding * 2)
-            canvas_height = text_height + (padding * 2)
-
-            if image_url and image_url != "None":
-                # Download overlay image
-                overlay_data = await self.download_image(image_url)
-                if overlay_data:
-                    overlay_img = Image.open(io.BytesIO(overlay_data)).convert("RGBA")
-
-                    # Create text mask with outline for better definition
-                    text_mask = Image.new('L', (canvas_width, canvas_height), 0)
-                    mask_draw = ImageDraw.Draw(text_mask)
-                    text_x = padding
-                    text_y = padding
-                    
-                    # Draw outline in mask for better edge definition
-                    outline_width = 3
-                    for dx in range(-outline_width, outline_width + 1):
-                        for dy in range(-outline_width, outline_width + 1):
-                            if dx != 0 or dy != 0:
-                                mask_draw.text((text_x + dx, text_y + dy), text, font=font, fill=128)
-                    
-                    # Draw main text in mask
-                    mask_draw.text((text_x, text_y), text, font=font, fill=255)
-
-                    # Get the actual text bounding box for centering the image
-                    actual_text_bbox = font.getbbox(text)
-                    actual_text_width = actual_text_bbox[2] - actual_text_bbox[0]
-                    actual_text_height = actual_text_bbox[3] - actual_text_bbox[1]
-
-                    # Calculate scaling to fit image proportionally within text bounds
-                    scale_x = actual_text_width / overlay_img.width
-                    scale_y = actual_text_height / overlay_img.height
-                    scale = max(scale_x, scale_y)
-
-                    # Calculate new dimensions
-                    new_width = int(overlay_img.width * scale)
-                    new_height = int(overlay_img.height * scale)
-
-                    # Resize image maintaining proportions
-                    overlay_resized = overlay_img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-                    # Center the resized image within the canvas
-                    center_x = padding + actual_text_width // 2
-                    center_y = padding + actual_text_height // 2
-                    
-                    paste_x = center_x - new_width // 2
-                    paste_y = center_y - new_height // 2
-
-                    # Create canvas for the centered image
-                    centered_overlay = Image.new('RGBA', (canvas_width, canvas_height), (0, 0, 0, 0))
-                    
-                    # Calculate crop coordinates if image extends beyond canvas
-                    crop_left = max(0, -paste_x)
-                    crop_top = max(0, -paste_y)
-                    crop_right = min(new_width, new_width - (paste_x + new_width - canvas_width))
-                    crop_bottom = min(new_height, new_height - (paste_y + new_height - canvas_height))
-                    
-                    # Crop the overlay if necessary
-                    if crop_left > 0 or crop_top > 0 or crop_right < new_width or crop_bottom < new_height:
-                        cropped_overlay = overlay_resized.crop((crop_left, crop_top, crop_right, crop_bottom))
-                        final_paste_x = max(0, paste_x)
-                        final_paste_y = max(0, paste_y)
-                    else:
-                        cropped_overlay = overlay_resized
-                        final_paste_x = paste_x
-                        final_paste_y = paste_y
-
-                    # Paste the centered and cropped image
-                    centered_overlay.paste(cropped_overlay, (final_paste_x, final_paste_y), cropped_overlay)
-
-                    # Create final result with black outline
-                    result = Image.new('RGBA', (canvas_width, canvas_height), (0, 0, 0, 0))
-
-                    # First, create black outline
-                    outline_result = Image.new('RGBA', (canvas_width, canvas_height), (0, 0, 0, 0))
-                    outline_draw = ImageDraw.Draw(outline_result)
-                    
-                    # Draw black outline
-                    outline_width = 3
-                    for dx in range(-outline_width, outline_width + 1):
-                        for dy in range(-outline_width, outline_width + 1):
-                            if dx != 0 or dy != 0:
-                                outline_draw.text((text_x + dx, text_y + dy), text, font=font, fill=(0, 0, 0, 255))
-
-                    # Apply texture only to main text pixels
-                    import numpy as np
-                    mask_array = np.array(text_mask)
-                    overlay_array = np.array(centered_overlay)
-                    result_array = np.array(result)
-                    outline_array = np.array(outline_result)
-
-                    # First apply the black outline where mask > 0 but < 255 (outline area)
-                    outline_pixels = (mask_array > 0) & (mask_array < 255)
-                    result_array[outline_pixels] = outline_array[outline_pixels]
-
-                    # Then apply texture where mask == 255 (main text area)
-                    text_pixels = mask_array == 255
-                    result_array[text_pixels] = overlay_array[text_pixels]
-                    
-                    # Set alpha channel
-                    result_array[:, :, 3] = mask_array
-
-                    result = Image.fromarray(result_array, 'RGBA')
-                    return result
-
-            # Fallback to regular colored text
-            temp_img = Image.new('RGBA', (canvas_width, canvas_height), (0, 0, 0, 0))
-            temp_draw = ImageDraw.Draw(temp_img)
-            temp_draw.text((padding, padding), text, font=font, fill=tuple(color))
-            return temp_img
-
-        except Exception as e:
-            print(f"Error creating text with image overlay: {e}")
-            # Fallback to basic text
-            text_bbox = font.getbbox(text)
-            text_width = text_bbox[2] - text_bbox[0]
-            text_height = text_bbox[3] - text_bbox[1]
-            padding = 30
-            temp_img = Image.new('RGBA', (text_width + padding * 2, text_height + padding * 2), (0, 0, 0, 0))
-            temp_draw = ImageDraw.Draw(temp_img)
-            temp_draw.text((padding, padding), text, font=font, fill=tuple(color))
-            return temp_img
+        overlay_data = await self.download_image(image_url) if image_url and image_url != "None" else None
+        return text_with_image_overlay(text, font, color, overlay_data, text_width, text_height)
 
     def create_circle_mask(self, size):
         """Create circular mask for profile picture"""
-        mask = Image.new('L', size, 0)
-        draw = ImageDraw.Draw(mask)
-        draw.ellipse((0, 0, size[0], size[1]), fill=255)
-        return mask
+        return create_circle_mask(size)
 
     def resize_image_proportionally_centered(self, image, target_width, target_height):
         """Resize image maintaining proportions and cropping from center"""
-        try:
-            # Calculate scaling factor to make image fit target dimensions
-            scale_factor = max(target_width / image.width, target_height / image.height)
-
-            # Calculate new dimensions after scaling
-            new_width = int(image.width * scale_factor)
-            new_height = int(image.height * scale_factor)
-
-            # Resize image to new dimensions
-            resized_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-            # Calculate crop coordinates to center the image
-            left = (new_width - target_width) // 2
-            top = (new_height - target_height) // 2
-            right = left + target_width
-            bottom = top + target_height
-
-            # Crop to exact target size, centered
-            cropped_image = resized_image.crop((left, top, right, bottom))
-
-            return cropped_image
-
-        except Exception as e:
-            print(f"Error resizing image proportionally: {e}")
-            return image.resize((target_width, target_height), Image.Resampling.LANCZOS)
+        return resize_image_proportionally_centered(image, target_width, target_height)
 
-    def draw_text_with_outline(self, draw, text, position, font, color, outline_color, outline_width):
-        """Draw text with outline"""
-        x, y = position
-
-        # Draw outline
-        for dx in range(-outline_width, outline_width + 1):
-            for dy in range(-outline_width, outline_width + 1):
-                if dx != 0 or dy != 0:
-                    draw.text((x + dx, y + dy), text, font=font, fill=outline_color)
-
-        # Draw main text
-        draw.text((x, y), text, font=font, fill=color)
+    def draw_text_with_outline(self, image, text, position, font, color, outline_color, outline_width):
+        """Draw text with outline (native stroke, cached rendering)"""
+        draw_text_with_outline(image, text, position, font, color, outline_color, outline_width)
 
     def create_text_surface_with_outline(self, text, font, color, outline_color=(0, 0, 0), outline_width=3):
         """Create text surface with outline for image overlays"""
@@ -788,23 +950,12 @@ class NotificationLevelCardView(discord.ui.View):
         canvas_width = text_width + (padding * 2)
         canvas_height = text_height + (padding * 2)
         
-        # Create text surface with outline
-        text_surface = Image.new('RGBA', (canvas_width, canvas_height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(text_surface)
-        
-        text_x = padding
-        text_y = padding
-        
-        # Draw outline
-        for dx in range(-outline_width, outline_width + 1):
-            for dy in range(-outline_width, outline_width + 1):
-                if dx != 0 or dy != 0:
-                    draw.text((text_x + dx, text_y + dy), text, font=font, fill=outline_color)
-        
-        # Draw main text
-        draw.text((text_x, text_y), text, font=font, fill=tuple(color))
-        
-        return text_surface
+        # Create text surface with outline (native stroke)
+        canvas = Image.new('RGBA', (canvas_width, canvas_height), (0, 0, 0, 0))
+        rendered, (left, top) = text_surface(text, font, color, stroke_width=outline_width, stroke_fill=outline_color)
+        canvas.alpha_composite(rendered, (padding + left, padding + top))
+
+        return canvas
 
 
 
@@ -1065,184 +1216,13 @@ class NotificationLevelCardView(discord.ui.View):
         try:
             config = self.get_config()
 
-            # Create 1080x1080 background
-            background = Image.new("RGBA", (1080, 1080), (0, 0, 0, 0))
-
-            # Set background with proper proportional resizing
-            if config.get("background_image"):
-                bg_data = await self.download_image(config["background_image"])
-                if bg_data:
-                    bg_img = Image.open(io.BytesIO(bg_data)).convert("RGBA")
-                    # Use centered proportional resizing for background
-                    background = self.resize_image_proportionally_centered(
-                        bg_img, 1080, 1080
-                    )
-                else:
-                    bg_color = tuple(config.get("background_color", [245, 55, 48])) + (255,)
-                    background = Image.new("RGBA", (1080, 1080), bg_color)
-            else:
-                bg_color = tuple(config.get("background_color", [245, 55, 48])) + (255,)
-                background = Image.new("RGBA", (1080, 1080), bg_color)
-
-            # Download user avatar
-            avatar_url = user.display_avatar.url
-            avatar_data = await self.download_image(avatar_url)
-            if avatar_data:
-                avatar = Image.open(io.BytesIO(avatar_data)).convert("RGBA")
-                avatar_pos = config.get("avatar_position", {"x": 190, "y": 190, "size": 300})
-                size = avatar_pos["size"]
-                avatar = avatar.resize((size, size), Image.Resampling.LANCZOS)
-
-                # Make avatar circular
-                mask = self.create_circle_mask((size, size))
-                avatar.putalpha(mask)
-
-                # Paste avatar
-                background.paste(avatar, (avatar_pos["x"], avatar_pos["y"]), avatar)
-
-                # Add outline if enabled
-                if config.get("outline_enabled", True):
-                    outline_pos = config.get("outline_position", {"x": 190, "y": 190, "size": 300})
-                    outline_url = "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/ProfileOutline.png"
-
-                    if config.get("outline_image"):
-                        outline_url = config["outline_image"]
-
-                    outline_data = await self.download_image(outline_url)
-                    if outline_data:
-                        outline = Image.open(io.BytesIO(outline_data)).convert("RGBA")
-                        outline = outline.resize((outline_pos["size"], outline_pos["size"]), Image.Resampling.LANCZOS)
-
-                        # Apply color if specified and not using custom image
-                        if config.get("outline_color") and not config.get("outline_image"):
-                            color_override = config["outline_color"]
-                            colored_outline = Image.new("RGBA", outline.size, tuple(color_override + [255]))
-                            colored_outline.putalpha(outline.split()[-1])
-                            outline = colored_outline
-
-                        # Create mask for outline to only show parts that overlay with avatar
-                        if config.get("outline_image"):
-                            # Download the default outline to use as a template mask
-                            default_outline_url = "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/ProfileOutline.png"
-                            default_outline_data = await self.download_image(default_outline_url)
-                            if default_outline_data:
-                                default_outline = Image.open(io.BytesIO(default_outline_data)).convert("RGBA")
-                                default_outline_resized = default_outline.resize((outline_pos["size"], outline_pos["size"]), Image.Resampling.LANCZOS)
-                                
-                                # Use the alpha channel of the default outline as the mask
-                                outline_template_alpha = default_outline_resized.split()[-1]
-                                outline.putalpha(outline_template_alpha)
-                            else:
-                                # Fallback to circular mask if default outline can't be loaded
-                                outline_mask = self.create_circle_mask((outline_pos["size"], outline_pos["size"]))
-                                outline.putalpha(outline_mask)
-
-                        background.paste(outline, (outline_pos["x"], outline_pos["y"]), outline)
-
-            # Add text
-            draw = ImageDraw.Draw(background)
-
-            # Load fonts
-            try:
-                font_username = ImageFont.truetype("PlayPretend.otf", config.get("username_position", {}).get("font_size", 80))
-                font_level = ImageFont.truetype("PlayPretend.otf", config.get("level_position", {}).get("font_size", 120))
-                font_message = ImageFont.truetype("PlayPretend.otf", config.get("message_position", {}).get("font_size", 60))
-                font_info = ImageFont.truetype("PlayPretend.otf", config.get("info_position", {}).get("font_size", 40))
-            except IOError:
-                font_username = ImageFont.load_default()
-                font_level = ImageFont.load_default()
-                font_message = ImageFont.load_default()
-                font_info = ImageFont.load_default()
-
-            # Text outline settings
-            text_outline_enabled = config.get("text_outline_enabled", True)
-            outline_color = tuple(config.get("text_outline_color", [0, 0, 0]))
-            outline_width = config.get("text_outline_width", 2)
-
-            # Draw username with optional image overlay
-            username_pos = config.get("username_position", {"x": 540, "y": 200})
-            username_color = tuple(config.get("username_color", [255, 255, 255]))
-            username_text = user.name
-            username_image_url = config.get("username_text_image")
-
-            if username_image_url and username_image_url != "None":
-                username_surface = await self.create_text_with_image_overlay(
-                    username_text, font_username, username_color, username_image_url
-                )
-                background.paste(username_surface,
-                               (username_pos["x"] - 30, username_pos["y"] - 30),
-                               username_surface)
-            else:
-                if text_outline_enabled:
-                    self.draw_text_with_outline(draw, username_text, (username_pos["x"], username_pos["y"]),
-                                              font_username, username_color, outline_color, outline_width)
-                else:
-                    draw.text((username_pos["x"], username_pos["y"]), username_text, font=font_username, fill=username_color)
-
-            # Draw level with optional image overlay
-            level_pos = config.get("level_position", {"x": 540, "y": 300})
-            level_color = tuple(config.get("level_text_color", [255, 255, 255]))
-            level_text = f"LEVEL {level}"
-            level_image_url = config.get("level_text_image")
-
-            if level_image_url and level_image_url != "None":
-                level_surface = await self.create_text_with_image_overlay(
-                    level_text, font_level, level_color, level_image_url
-                )
-                background.paste(level_surface,
-                               (level_pos["x"] - 30, level_pos["y"] - 30),
-                               level_surface)
-            else:
-                if text_outline_enabled:
-                    self.draw_text_with_outline(draw, level_text, (level_pos["x"], level_pos["y"]),
-                                              font_level, level_color, outline_color, outline_width)
-                else:
-                    draw.text((level_pos["x"], level_pos["y"]), level_text, font=font_level, fill=level_color)
-
-            # Draw message with optional image overlay
-            message_pos = config.get("message_position", {"x": 540, "y": 450})
-            message_color = tuple(config.get("message_text_color", [255, 255, 255]))
-            message_text = "You just reached a new level !"
-            message_image_url = config.get("message_text_image")
-
-            if message_image_url and message_image_url != "None":
-                message_surface = await self.create_text_with_image_overlay(
-                    message_text, font_message, message_color, message_image_url
-                )
-                background.paste(message_surface,
-                               (message_pos["x"] - 30, message_pos["y"] - 30),
-                               message_surface)
-            else:
-                if text_outline_enabled:
-                    self.draw_text_with_outline(draw, message_text, (message_pos["x"], message_pos["y"]),
-                                              font_message, message_color, outline_color, outline_width)
-                else:
-                    draw.text((message_pos["x"], message_pos["y"]), message_text, font=font_message, fill=message_color)
-
-            # Draw info with optional image overlay
-            info_pos = config.get("info_position", {"x": 540, "y": 550})
-            info_color = tuple(config.get("info_text_color", [200, 200, 200]))
-            info_text = "Type /level for more information"
-            info_image_url = config.get("information_text_image")
-
-            if info_image_url and info_image_url != "None":
-                info_surface = await self.create_text_with_image_overlay(
-                    info_text, font_info, info_color, info_image_url
-                )
-                background.paste(info_surface,
-                               (info_pos["x"] - 30, info_pos["y"] - 30),
-                               info_surface)
-            else:
-                if text_outline_enabled:
-                    self.draw_text_with_outline(draw, info_text, (info_pos["x"], info_pos["y"]),
-                                              font_info, info_color, outline_color, outline_width)
-                else:
-                    draw.text((info_pos["x"], info_pos["y"]), info_text, font=font_info, fill=info_color)
-
-            output = io.BytesIO()
-            background.save(output, format='PNG')
-            output.seek(0)
-            return output
+            # Images downloaded here (all at once), the card is drawn by a render worker
+            avatar_size = config.get("avatar_position", {"x": 190, "y": 190, "size": 300})["size"]
+            avatar, assets = await asyncio.gather(
+                avatar_cache.get(user, avatar_size),
+                self.download_images(notification_card_image_urls(config))
+            )
+            return await render_service.run('notification', render_notification_level_card, card_user(user), avatar, level, config, assets)
 
         except Exception as e:
             print(f"Error creating notification level card: {e}")
@@ -1258,7 +1238,7 @@ class NotificationLevelCardView(discord.ui.View):
                 os.makedirs('images', exist_ok=True)
                 import time
                 timestamp = int(time.time())
-                filename = f"notification_level_preview_{self.user_id}_{timestamp}.png"
+                filename = f"notification_level_preview_{self.user_id}_{timestamp}.{card_extension(preview_image)}"
                 file_path = os.path.join('images', filename)
 
                 with open(file_path, 'wb') as f:
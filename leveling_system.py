@@ -1,74 +1,89 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import json
 import aiohttp
 import io
-from PIL import Image, ImageDraw, ImageFont, ImageOps
+from lazy_imports import LazyModule
+# PIL is only imported when the first image is processed
+Image = LazyModule('PIL.Image')
+ImageDraw = LazyModule('PIL.ImageDraw')
+ImageFont = LazyModule('PIL.ImageFont')
+ImageOps = LazyModule('PIL.ImageOps')
+import asyncio
 import time
 import math
+import itertools
 import uuid
 import os
+from animated_media import AnimatedMedia
+from avatar_cache import avatar_cache
+from card_encoder import card_extension, encode_card
+from image_masks import apply_mask, bar_masks, clear_outside
+from json_store import json_document
+from render_service import card_user, render_service
+from text_render import draw_text, fit_font, font_key, load_font, text_width, text_mask as cached_text_mask
 
 # Data management functions
-def load_leveling_data():
-    try:
-        with open('leveling_data.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {
-            "leveling_settings": {
-                "enabled": True,
-                "xp_settings": {
-                    "messages": {"enabled": True, "xp_per_message": 20, "cooldown": 10},
-                    "characters": {"enabled": False, "xp_per_character": 1, "character_limit": 20, "cooldown": 10}
+leveling_store = json_document('leveling_data.json', indent=None, ensure_ascii=False)  # Machine-only: compact
+
+def default_leveling_data():
+    """Default structure, used while leveling_data.json doesn't exist"""
+    return {
+        "leveling_settings": {
+            "enabled": True,
+            "xp_settings": {
+                "messages": {"enabled": True, "xp_per_message": 20, "cooldown": 10},
+                "characters": {"enabled": False, "xp_per_character": 1, "character_limit": 20, "cooldown": 10}
+            },
+            "rewards": {"roles": {}, "custom": {}},
+            "customization_permissions": {
+                "background": {
+                    "enabled": True,
+                    "image_permission_level": 0,
+                    "color_permission_level": 0
                 },
-                "rewards": {"roles": {}, "custom": {}},
-                "customization_permissions": {
-                    "background": {
-                        "enabled": True,
-                        "image_permission_level": 0,
-                        "color_permission_level": 0
-                    },
-                    "avatar_outline": {
-                        "enabled": True,
-                        "image_permission_level": 0,
-                        "color_permission_level": 0
-                    },
-                    "username": {
-                        "enabled": True,
-                        "color_permission_level": 0
-                    },
-                    "bar_progress": {
-                        "enabled": True,
-                        "color_permission_level": 0
-                    },
-                    "content": {
-                        "enabled": True,
-                        "color_permission_level": 0
-                    }
+                "avatar_outline": {
+                    "enabled": True,
+                    "image_permission_level": 0,
+                    "color_permission_level": 0
                 },
-                "level_card": {
-                    "background_image": "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/LevelBar.png",
-                    "profile_position": {"x": 50, "y": 50, "size": 150},
-                    "username_position": {"x": 220, "y": 80, "font_size": 60},
-                    "level_position": {"x": 220, "y": 140, "font_size": 40},
-                    "xp_bar_position": {"x": 30, "y": 726, "width": 1988, "height": 30},
-                    "username_color": [0, 0, 0],  # Default username color (black)
-                    "level_color": [245, 55, 48], # Default level color (red)
-                    "xp_bar_color": [245, 55, 48], # Default XP bar color (red)
-                    "background_color": [245, 55, 48], # Default background color (red)
-                    "xp_text_color": [154, 154, 154], # Default XP text color (gray)
-                    "profile_outline": {
-                        "enabled": True,
-                        "url": "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/ProfileOutline.png",
-                        "color": [255, 255, 255]
-                    }
+                "username": {
+                    "enabled": True,
+                    "color_permission_level": 0
+                },
+                "bar_progress": {
+                    "enabled": True,
+                    "color_permission_level": 0
+                },
+                "content": {
+                    "enabled": True,
+                    "color_permission_level": 0
                 }
             },
-            "user_data": {},
-            "user_level_cards": {}
-        }
+            "level_card": {
+                "background_image": "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/LevelBar.png",
+                "profile_position": {"x": 50, "y": 50, "size": 150},
+                "username_position": {"x": 220, "y": 80, "font_size": 60},
+                "level_position": {"x": 220, "y": 140, "font_size": 40},
+                "xp_bar_position": {"x": 30, "y": 726, "width": 1988, "height": 30},
+                "username_color": [0, 0, 0],  # Default username color (black)
+                "level_color": [245, 55, 48], # Default level color (red)
+                "xp_bar_color": [245, 55, 48], # Default XP bar color (red)
+                "background_color": [245, 55, 48], # Default background color (red)
+                "xp_text_color": [154, 154, 154], # Default XP text color (gray)
+                "profile_outline": {
+                    "enabled": True,
+                    "url": "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/ProfileOutline.png",
+                    "color": [255, 255, 255]
+                }
+            }
+        },
+        "user_data": {},
+        "user_level_cards": {}
+    }
+
+def load_leveling_data():
+    return leveling_store.load(default=default_leveling_data)
 
 def load_user_level_card_config(user_id):
     """Load user-specific level card configuration"""
@@ -94,8 +109,7 @@ def save_user_level_card_config(user_id, config):
     save_leveling_data(data)
 
 def save_leveling_data(data):
-    with open('leveling_data.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    leveling_store.save(data)
 
 def calculate_xp_for_level(level):
     """Calculate XP needed for a specific level"""
@@ -124,936 +138,966 @@ def get_xp_for_next_level(current_xp):
     current_xp_in_level = current_xp - current_level_xp
     return xp_needed_for_next, current_xp_in_level
 
-class LevelingSystem(commands.Cog):
-    def __init__(self, bot):
-        self.bot = bot
-        self.user_cooldowns = {}
+# Card rendering: plain data in, encoded card out. These run in a render
+# worker (see render_service), the cog downloads the images beforehand
 
-    async def download_image(self, url):
-        """Download image from URL"""
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await response.read()
-            return None
-        except Exception as e:
-            print(f"Error downloading image {url}: {e}")
-            return None
+def create_circle_mask(size):
+    """Create circular mask for profile picture"""
+    mask = Image.new('L', size, 0)
+    draw = ImageDraw.Draw(mask)
+    draw.ellipse((0, 0, size[0], size[1]), fill=255)
+    return mask
 
-    def create_circle_mask(self, size):
-        """Create circular mask for profile picture"""
-        mask = Image.new('L', size, 0)
-        draw = ImageDraw.Draw(mask)
-        draw.ellipse((0, 0, size[0], size[1]), fill=255)
-        return mask
+def resize_image_proportionally_centered(image, target_width, target_height):
+    """Resize image maintaining proportions and cropping from center - universal method"""
+    try:
+        # Calculate scaling factor to make image fit target dimensions
+        scale_factor = max(target_width / image.width, target_height / image.height)
 
-    def resize_image_proportionally_centered(self, image, target_width, target_height):
-        """Resize image maintaining proportions and cropping from center - universal method"""
-        try:
-            # Calculate scaling factor to make image fit target dimensions
-            scale_factor = max(target_width / image.width, target_height / image.height)
+        # Calculate new dimensions after scaling
+        new_width = int(image.width * scale_factor)
+        new_height = int(image.height * scale_factor)
 
-            # Calculate new dimensions after scaling
-            new_width = int(image.width * scale_factor)
-            new_height = int(image.height * scale_factor)
+        # Resize image to new dimensions
+        resized_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
 
-            # Resize image to new dimensions
-            resized_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        # Calculate crop coordinates to center the image
+        left = (new_width - target_width) // 2
+        top = (new_height - target_height) // 2
+        right = left + target_width
+        bottom = top + target_height
 
-            # Calculate crop coordinates to center the image
-            left = (new_width - target_width) // 2
-            top = (new_height - target_height) // 2
-            right = left + target_width
-            bottom = top + target_height
+        # Crop to exact target size, centered
+        cropped_image = resized_image.crop((left, top, right, bottom))
 
-            # Crop to exact target size, centered
-            cropped_image = resized_image.crop((left, top, right, bottom))
+        return cropped_image
 
-            return cropped_image
+    except Exception as e:
+        print(f"Error resizing image proportionally: {e}")
+        return image.resize((target_width, target_height), Image.Resampling.LANCZOS)
 
-        except Exception as e:
-            print(f"Error resizing image proportionally: {e}")
-            return image.resize((target_width, target_height), Image.Resampling.LANCZOS)
+def text_with_image_overlay(text, font, color, overlay_data=None):
+    """Create text with optional image overlay (overlay_data: downloaded image bytes)"""
+    try:
+        # Create text surface
+        text_bbox = font.getbbox(text)
+        text_width = text_bbox[2] - text_bbox[0]
+        text_height = text_bbox[3] - text_bbox[1]
 
-    def resize_xp_bar_image_proportionally(self, image, target_width, target_height):
-        """Resize XP bar image maintaining proportions and cropping from center"""
-        return self.resize_image_proportionally_centered(image, target_width, target_height)
+        # Ajouter plus de padding pour éviter les coupures
+        padding = 30
+        canvas_width = text_width + (padding * 2)
+        canvas_height = text_height + (padding * 2)
 
-    async def apply_text_image_overlay(self, text_image_url, text_surface, text_bbox):
-        """Apply image overlay to text using mask technique"""
+        if overlay_data:
+            overlay_img = Image.open(io.BytesIO(overlay_data)).convert("RGBA")
+
+            # Créer d'abord le masque de texte PRÉCIS qui suit exactement la forme des lettres
+            text_mask = Image.new('L', (canvas_width, canvas_height), 0)
+
+            # Masque du texte rendu une seule fois (en cache) pour garder la forme exacte
+            text_x = padding
+            text_y = padding
+            glyph_mask, (left, top) = cached_text_mask(text, font)
+            text_mask.paste(glyph_mask, (text_x + left, text_y + top))
+
+            # Redimensionner l'image pour qu'elle ait la même largeur que le canvas
+            original_ratio = overlay_img.width / overlay_img.height
+            new_width = canvas_width
+            new_height = int(new_width / original_ratio)
+
+            # Redimensionner l'image avec la nouvelle largeur
+            overlay_resized = overlay_img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+
+            # Rogner l'image centrée pour qu'elle ait la même hauteur que le canvas
+            if new_height > canvas_height:
+                # L'image est plus haute, rogner du centre
+                crop_top = (new_height - canvas_height) // 2
+                overlay_cropped = overlay_resized.crop((0, crop_top, new_width, crop_top + canvas_height))
+            else:
+                # L'image est plus petite ou égale, la centrer sur le canvas
+                overlay_cropped = Image.new('RGBA', (canvas_width, canvas_height), (0, 0, 0, 0))
+                paste_y = (canvas_height - new_height) // 2
+                overlay_cropped.paste(overlay_resized, (0, paste_y))
+
+            # Appliquer la texture UNIQUEMENT aux pixels des lettres: l'image rognée devient
+            # transparente partout où le masque est à 0
+            return clear_outside(overlay_cropped, text_mask)
+
+        # Fallback to regular colored text
+        temp_img = Image.new('RGBA', (canvas_width, canvas_height), (0, 0, 0, 0))
+        temp_draw = ImageDraw.Draw(temp_img)
+        temp_draw.text((padding, padding), text, font=font, fill=tuple(color))
+        return temp_img
+
+    except Exception as e:
+        print(f"Error creating text with image overlay: {e}")
+        # Fallback to basic text
+        text_bbox = font.getbbox(text)
+        text_width = text_bbox[2] - text_bbox[0]
+        text_height = text_bbox[3] - text_bbox[1]
+        padding = 30
+        temp_img = Image.new('RGBA', (text_width + padding * 2, text_height + padding * 2), (0, 0, 0, 0))
+        temp_draw = ImageDraw.Draw(temp_img)
+        temp_draw.text((padding, padding), text, font=font, fill=tuple(color))
+        return temp_img
+
+def calculate_dynamic_positions(user, user_data, user_ranking, config, bg_width, bg_height):
+    """Calculate dynamic positions for all text elements based on content length"""
+    try:
+        # Get fonts for text measurement
         try:
-            if not text_image_url or text_image_url == "None":
-                return text_surface
+            font_username = load_font("PlayPretend.otf", config["username_position"]["font_size"])
+            font_level = load_font("PlayPretend.otf", config["level_position"]["font_size"])
+            font_xp = load_font("PlayPretend.otf", config["xp_text_position"]["font_size"])
+            font_ranking = load_font("PlayPretend.otf", config.get("ranking_position", {}).get("font_size", 120))
+            font_discriminator = load_font("PlayPretend.otf", config.get("discriminator_position", {}).get("font_size", 50))
+        except IOError:
+            try:
+                font_username = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", config["username_position"]["font_size"])
+                font_level = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", config["level_position"]["font_size"])
+                font_xp = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", config["xp_text_position"]["font_size"])
+                font_ranking = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", config.get("ranking_position", {}).get("font_size", 120))
+                font_discriminator = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", config.get("discriminator_position", {}).get("font_size", 50))
+            except IOError:
+                font_username = ImageFont.load_default()
+                font_level = ImageFont.load_default()
+                font_xp = ImageFont.load_default()
+                font_ranking = ImageFont.load_default()
+                font_discriminator = ImageFont.load_default()
+
+        # Prepare text content
+        username = user.name
+        level_text = f"LEVEL {user_data['level']}"
+        ranking_text = f"#{user_ranking}"
+        discriminator = f"#{user.discriminator}" if user.discriminator != "0" else f"#{user.id % 10000:04d}"
+
+        xp_needed, current_xp_in_level = get_xp_for_next_level(user_data["xp"])
+        xp_text = f"{current_xp_in_level}/{xp_needed} XP"
+
+        # Get text dimensions
+        level_width = text_width(level_text, font_level)
+        ranking_width = text_width(ranking_text, font_ranking)
+        xp_width = text_width(xp_text, font_xp)
+        username_width = text_width(username, font_username)
+        discriminator_width = text_width(discriminator, font_discriminator)
+
+        # Define margins and spacing
+        margin = 50
+        min_spacing = 30
+        username_discriminator_spacing = 10
+
+        # Calculate positions from right to left (XP has priority)
+        # XP text position (pushes from right)
+        default_xp_x = config["xp_text_position"]["x"]
+        xp_x = min(default_xp_x, bg_width - margin - xp_width)
+        xp_y = config["xp_text_position"]["y"]
+
+        # Level text position (pushes from right, but gives way to XP only if needed)
+        default_level_x = config["level_position"]["x"]
+        if default_level_x + level_width + min_spacing > xp_x:
+            level_x = xp_x - level_width - min_spacing
+        else:
+            level_x = default_level_x
+        level_y = config["level_position"]["y"]
 
-            # Download overlay image
-            overlay_data = await self.download_image(text_image_url)
-            if not overlay_data:
-                return text_surface
+        # Ranking position (pushes from right, but gives way to level only if needed)
+        default_ranking_x = config.get("ranking_position", {}).get("x", 1350)
+        if default_ranking_x + ranking_width + min_spacing > level_x:
+            ranking_x = level_x - ranking_width - min_spacing
+        else:
+            ranking_x = default_ranking_x
+        ranking_y = config.get("ranking_position", {}).get("y", 35)
+
+        # Username and discriminator (push from left, but give way to XP)
+        available_space_for_username = xp_x - config["username_position"]["x"] - min_spacing - discriminator_width - username_discriminator_spacing
+
+        # Adjust username font size if necessary
+        username_font_size = config["username_position"]["font_size"]
+        if username_width > available_space_for_username and font_key(font_username):
+            # Largest size that fits (binary search on the same font file, minimum size of 30)
+            _, fitted_size, fitted_width = fit_font(font_username.path, username, available_space_for_username,
+                                                    username_font_size, min(30, username_font_size))
+            username_font_size = fitted_size
+            # If still too wide at the minimum size, keep the original width for the layout
+            if fitted_width <= available_space_for_username:
+                username_width = fitted_width
+
+        # Username position
+        username_x = config["username_position"]["x"]
+        username_y = config["username_position"]["y"]
+
+        # If username had to be resized significantly, move it down slightly
+        if username_font_size < config["username_position"]["font_size"] * 0.8:
+            username_y += int((config["username_position"]["font_size"] - username_font_size) * 0.3)
+
+        # Discriminator position (right after username)
+        discriminator_x = username_x + username_width + username_discriminator_spacing
+        discriminator_y = config.get("discriminator_position", {}).get("y", 295)
 
-            overlay_img = Image.open(io.BytesIO(overlay_data)).convert("RGBA")
+        return {
+            "username": {"x": username_x, "y": username_y},
+            "discriminator": {"x": discriminator_x, "y": discriminator_y},
+            "level": {"x": level_x, "y": level_y},
+            "ranking": {"x": ranking_x, "y": ranking_y},
+            "xp_text": {"x": xp_x, "y": xp_y},
+            "fonts": {"username_size": username_font_size}
+        }
 
-            # Resize overlay to match text bounding box
-            text_width = text_bbox[2] - text_bbox[0]
-            text_height = text_bbox[3] - text_bbox[1]
-            overlay_resized = overlay_img.resize((text_width, text_height), Image.Resampling.LANCZOS)
+    except Exception as e:
+        print(f"Error calculating dynamic positions: {e}")
+        # Return default positions if calculation fails
+        return {
+            "username": {"x": config["username_position"]["x"], "y": config["username_position"]["y"]},
+            "discriminator": {"x": config.get("discriminator_position", {}).get("x", 1050), "y": config.get("discriminator_position", {}).get("y", 295)},
+            "level": {"x": config["level_position"]["x"], "y": config["level_position"]["y"]},
+            "ranking": {"x": config.get("ranking_position", {}).get("x", 1350), "y": config.get("ranking_position", {}).get("y", 35)},
+            "xp_text": {"x": config["xp_text_position"]["x"], "y": config["xp_text_position"]["y"]},
+            "fonts": {"username_size": config["username_position"]["font_size"]}
+        }
 
-            # Create mask from text surface alpha channel
-            text_mask = text_surface.split()[-1]  # Get alpha channel
+def level_card_image_urls(config):
+    """Every image a level card with this config can draw"""
+    outline_config = config.get("profile_outline", {})
+    outline_url = None
+    if outline_config.get("enabled", True):
+        outline_url = outline_config.get("custom_image") or outline_config.get("url")
+    return [
+        config.get("background_image"),
+        config.get("level_bar_image", "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/LevelBar.png"),
+        config.get("xp_progress_image"),
+        outline_url,
+        config.get("username_image"),
+        config.get("level_text_image"),
+        config.get("ranking_position", {}).get("background_image"),
+        config.get("xp_info_image"),
+    ]
+
+def demo_card_image_urls(config):
+    """Every image the demo level card can draw"""
+    outline_config = config.get("profile_outline", {"enabled": True})
+    outline_url = None
+    if outline_config.get("enabled", True):
+        outline_url = outline_config.get("url", "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/ProfileOutline.png")
+    return [
+        config.get("background_image"),
+        config.get("level_bar_image", "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/LevelBar.png"),
+        outline_url,
+    ]
+
+def render_level_card(user, avatar, user_data, user_ranking, config, assets):
+    """Draw a level card from plain data (runs in a render worker).
+
+    user is a CardUser, avatar its circular avatar at the profile size (None
+    if unavailable), assets maps every image URL of the config to its
+    downloaded bytes (None when the download failed). Returns the encoded card.
+    """
+    try:
+        # Get background size from config
+        bg_width = config.get("background_size", {}).get("width", 2048)
+        bg_height = config.get("background_size", {}).get("height", 540)
+
+        # Variables pour gérer les GIFs animés
+        is_animated_gif = False
+        frames = []
+        durations = []
+
+        # Create background based on configuration
+        if config.get("background_image") and config["background_image"] != "None":
+            # Download and use background image
+            bg_data = assets.get(config["background_image"])
+            if bg_data:
+                # Frames decoded one at a time (GIF, WebP, APNG), capped, identical frames merged
+                media = AnimatedMedia(bg_data)
+                frame_iterator = media.frames((bg_width, bg_height), lambda frame: resize_image_proportionally_centered(
+                    frame, bg_width, bg_height
+                ))
+                background, first_duration = next(frame_iterator)
+
+                if media.is_animated:
+                    is_animated_gif = True
+                    # Background frames are only resized when the GIF is composed
+                    frames = itertools.chain([(background, first_duration)], frame_iterator)
+                    background = background.copy()
+            else:
+                # Fallback to background color if image download fails
+                default_bg_color = config.get("background_color", [15, 17, 16]) # Use correct default color
+                bg_color = tuple(default_bg_color) + (255,)
+                background = Image.new("RGBA", (bg_width, bg_height), bg_color)
+        elif config.get("background_color") and config["background_color"] != "None":
+            # Use background color
+            if isinstance(config["background_color"], list) and len(config["background_color"]) == 3:
+                bg_color = tuple(config["background_color"]) + (255,)
+            else:
+                bg_color = (255, 255, 255, 255)  # Default white if format is incorrect
+            background = Image.new("RGBA", (bg_width, bg_height), bg_color)
+        else:
+            # Default to the specified background color in the config
+            default_bg_color = config.get("background_color", [15, 17, 16]) # Use correct default color
+            bg_color = tuple(default_bg_color) + (255,)
+            background = Image.new("RGBA", (bg_width, bg_height), bg_color)
+
+        # Download and add level bar image
+        levelbar_data = assets.get(config.get("level_bar_image", "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/LevelBar.png"))
+        levelbar_x = 0
+        levelbar_y = 0
+
+        if levelbar_data:
+            levelbar = Image.open(io.BytesIO(levelbar_data)).convert("RGBA")
+            # Position level bar using config
+            xp_bar_config = config.get("xp_bar_position", {})
+            if "x" in xp_bar_config and "y" in xp_bar_config:
+                levelbar_x = xp_bar_config["x"]
+                levelbar_y = xp_bar_config["y"]
+                # Only resize if width/height specified AND it's not the default LevelBar
+                if "width" in xp_bar_config and "height" in xp_bar_config:
+                    if config.get("level_bar_image") != "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/LevelBar.png":
+                        # Custom image - use proportional resizing from center
+                        levelbar = resize_image_proportionally_centered(
+                            levelbar, 
+                            xp_bar_config["width"], 
+                            xp_bar_config["height"]
+                        )
+                    else:
+                        # Default LevelBar - maintain original size and proportions
+                        pass
+            else:
+                # Default positioning
+                levelbar_x = 30
+                levelbar_y = bg_height - levelbar.height - 30
+
+            # XP bar background and progress with rounded corners: masks drawn once per
+            # bar size, each bar is a paste of a color or texture through its mask
+            masks = bar_masks(levelbar.width, levelbar.height)
+            bar_box = (levelbar_x, levelbar_y, levelbar_x + levelbar.width, levelbar_y + levelbar.height)
+            bg_color_default = (80, 80, 80, 255)  # Dark gray background
+
+            # Check if there's a custom XP bar image texture
+            xp_bar_image_url = config.get("level_bar_image")
+            if xp_bar_image_url and xp_bar_image_url != "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/LevelBar.png":
+                # Apply custom texture to the background bar
+                try:
+                    xp_bar_texture_data = assets.get(xp_bar_image_url)
+                    if xp_bar_texture_data:
+                        xp_bar_texture = Image.open(io.BytesIO(xp_bar_texture_data)).convert("RGBA")
 
-            # Apply mask to overlay image
-            overlay_resized.putalpha(text_mask)
+                        # Resize texture to fit the bar dimensions using centered proportional resizing
+                        texture_resized = resize_image_proportionally_centered(
+                            xp_bar_texture, levelbar.width, levelbar.height
+                        )
 
-            # Create result image
-            result = Image.new('RGBA', text_surface.size, (0, 0, 0, 0))
-            result.paste(overlay_resized, (text_bbox[0], text_bbox[1]), overlay_resized)
+                        # Apply texture only to the rounded rectangle shape (alpha = mask)
+                        rounded_bg = apply_mask(texture_resized, masks.full)
+                        background.paste(rounded_bg, (levelbar_x, levelbar_y), rounded_bg)
+                    else:
+                        # Fallback to default color bar
+                        background.paste(bg_color_default, bar_box, masks.full)
+                except Exception as e:
+                    print(f"Error applying XP bar texture: {e}")
+                    # Fallback to default color bar
+                    background.paste(bg_color_default, bar_box, masks.full)
+            else:
+                # Use default color bar
+                background.paste(bg_color_default, bar_box, masks.full)
 
-            return result
+            # Create XP progress bar overlay with rounded corners
+            xp_needed, current_xp_in_level = get_xp_for_next_level(user_data["xp"])
+            if xp_needed > 0:
+                progress = current_xp_in_level / xp_needed
+            else:
+                progress = 1.0
 
-        except Exception as e:
-            print(f"Error applying text image overlay: {e}")
-            return text_surface
+            # Create XP progress bar using the specified color or texture
+            if progress > 0:
+                progress_width = int(levelbar.width * progress)
 
-    async def create_text_with_image_overlay(self, text, font, color, image_url=None):
-        """Create text with optional image overlay"""
-        try:
-            # Create text surface
-            text_bbox = font.getbbox(text)
-            text_width = text_bbox[2] - text_bbox[0]
-            text_height = text_bbox[3] - text_bbox[1]
+                if progress_width > 0:
+                    xp_bar_color_rgb = config.get("xp_bar_color", [245, 55, 48])
+                    xp_bar_color = tuple(xp_bar_color_rgb) + (255,)
+
+                    # Check if there's a custom XP progress image texture
+                    xp_progress_image_url = config.get("xp_progress_image")
+                    if xp_progress_image_url and xp_progress_image_url != "None":
+                        # Apply custom texture to the progress bar
+                        try:
+                            xp_progress_texture_data = assets.get(xp_progress_image_url)
+                            if xp_progress_texture_data:
+                                xp_progress_texture = Image.open(io.BytesIO(xp_progress_texture_data)).convert("RGBA")
+
+                                # Resize texture to fit the FULL bar dimensions first
+                                texture_full = resize_image_proportionally_centered(
+                                    xp_progress_texture, levelbar.width, levelbar.height
+                                )
 
-            # Ajouter plus de padding pour éviter les coupures
-            padding = 30
-            canvas_width = text_width + (padding * 2)
-            canvas_height = text_height + (padding * 2)
-
-            if image_url and image_url != "None":
-                # Download overlay image
-                overlay_data = await self.download_image(image_url)
-                if overlay_data:
-                    overlay_img = Image.open(io.BytesIO(overlay_data)).convert("RGBA")
-
-                    # Créer d'abord le masque de texte PRÉCIS qui suit exactement la forme des lettres
-                    text_mask = Image.new('L', (canvas_width, canvas_height), 0)
-                    mask_draw = ImageDraw.Draw(text_mask)
-
-                    # Dessiner le texte UNE SEULE FOIS pour garder la forme exacte
-                    text_x = padding
-                    text_y = padding
-                    mask_draw.text((text_x, text_y), text, font=font, fill=255)
-
-                    # Redimensionner l'image pour qu'elle ait la même largeur que le canvas
-                    original_ratio = overlay_img.width / overlay_img.height
-                    new_width = canvas_width
-                    new_height = int(new_width / original_ratio)
-
-                    # Redimensionner l'image avec la nouvelle largeur
-                    overlay_resized = overlay_img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-                    # Rogner l'image centrée pour qu'elle ait la même hauteur que le canvas
-                    if new_height > canvas_height:
-                        # L'image est plus haute, rogner du centre
-                        crop_top = (new_height - canvas_height) // 2
-                        overlay_cropped = overlay_resized.crop((0, crop_top, new_width, crop_top + canvas_height))
+                                # Apply texture only to the progress area (alpha = mask); below the
+                                # bar height, a half-circle cropped to the progress width
+                                progress_bar = apply_mask(texture_full, masks.progress(progress_width))
+                                background.paste(progress_bar, (levelbar_x, levelbar_y), progress_bar)
+                            else:
+                                # Fallback to colored progress bar
+                                background.paste(xp_bar_color, bar_box, masks.progress(progress_width, squeeze=True))
+                        except Exception as e:
+                            print(f"Error applying XP progress texture: {e}")
+                            # Fallback to colored progress bar
+                            background.paste(xp_bar_color, bar_box, masks.progress(progress_width))
                     else:
-                        # L'image est plus petite ou égale, la centrer sur le canvas
-                        overlay_cropped = Image.new('RGBA', (canvas_width, canvas_height), (0, 0, 0, 0))
-                        paste_y = (canvas_height - new_height) // 2
-                        overlay_cropped.paste(overlay_resized, (0, paste_y))
+                        # Use default colored progress bar
+                        background.paste(xp_bar_color, bar_box, masks.progress(progress_width, squeeze=True))
 
-                    # Créer l'image finale avec transparence complète
-                    result = Image.new('RGBA', (canvas_width, canvas_height), (0, 0, 0, 0))
 
-                    # Appliquer la texture UNIQUEMENT aux pixels des lettres
-                    # Convertir le masque en array pour manipulation pixel par pixel
-                    import numpy as np
-                    mask_array = np.array(text_mask)
-                    overlay_array = np.array(overlay_cropped)
-                    result_array = np.array(result)
+        # User avatar, already circular at the card size (avatar cache)
+        if avatar is not None:
+            size = config["profile_position"]["size"]
 
-                    # Pour chaque pixel où le masque n'est pas 0 (donc où il y a du texte)
-                    text_pixels = mask_array > 0
-                    result_array[text_pixels] = overlay_array[text_pixels]
+            # Paste avatar
+            background.paste(avatar, (config["profile_position"]["x"], config["profile_position"]["y"]), avatar)
 
-                    # Reconvertir en image PIL
-                    result = Image.fromarray(result_array, 'RGBA')
+            # Add profile outline if enabled
+            profile_outline_config = config.get("profile_outline", {})
+            if profile_outline_config.get("enabled", True):
+                # Check for custom image first
+                if profile_outline_config.get("custom_image"):
+                    outline_url = profile_outline_config["custom_image"]
+                else:
+                    outline_url = profile_outline_config.get("url")
 
-                    return result
+                if outline_url:
+                    outline_data = assets.get(outline_url)
+                    if outline_data:
+                        outline = Image.open(io.BytesIO(outline_data)).convert("RGBA")
 
-            # Fallback to regular colored text
-            temp_img = Image.new('RGBA', (canvas_width, canvas_height), (0, 0, 0, 0))
-            temp_draw = ImageDraw.Draw(temp_img)
-            temp_draw.text((padding, padding), text, font=font, fill=tuple(color))
-            return temp_img
+                        # Apply color override if specified (only for default outline, not custom image)
+                        if profile_outline_config.get("color_override") and not profile_outline_config.get("custom_image"):
+                            color_override = profile_outline_config["color_override"]
+                            colored_outline = Image.new("RGBA", outline.size, tuple(color_override + [255]))
+                            colored_outline.putalpha(outline.split()[-1])
+                            outline = colored_outline
 
-        except Exception as e:
-            print(f"Error creating text with image overlay: {e}")
-            # Fallback to basic text
-            text_bbox = font.getbbox(text)
-            text_width = text_bbox[2] - text_bbox[0]
-            text_height = text_bbox[3] - text_bbox[1]
-            padding = 30
-            temp_img = Image.new('RGBA', (text_width + padding * 2, text_height + padding * 2), (0, 0, 0, 0))
-            temp_draw = ImageDraw.Draw(temp_img)
-            temp_draw.text((padding, padding), text, font=font, fill=tuple(color))
-            return temp_img
+                        # Get outline size from config (default to avatar size if not specified)
+                        outline_size = profile_outline_config.get("size", size)
+                        outline = outline.resize((outline_size, outline_size), Image.Resampling.LANCZOS)
 
-    def calculate_user_ranking(self, user_id):
-        """Calculate user's ranking position compared to all other users"""
-        data = load_leveling_data()
-        all_users = data["user_data"]
+                        # Calculate centered position for outline
+                        avatar_center_x = config["profile_position"]["x"] + size // 2
+                        avatar_center_y = config["profile_position"]["y"] + size // 2
+                        outline_x = avatar_center_x - outline_size // 2
+                        outline_y = avatar_center_y - outline_size // 2
 
-        # Create a list of (user_id, xp) tuples and sort by XP descending
-        user_xp_list = [(uid, udata["xp"]) for uid, udata in all_users.items()]
-        user_xp_list.sort(key=lambda x: x[1], reverse=True)
+                        # Paste outline centered over avatar
+                        background.paste(outline, (outline_x, outline_y), outline)
 
-        # Find the position of the current user
-        for position, (uid, xp) in enumerate(user_xp_list, 1):
-            if uid == str(user_id):
-                return position
+        # Calculate dynamic positions based on content
+        positions = calculate_dynamic_positions(user, user_data, user_ranking, config, bg_width, bg_height)
 
-        return len(user_xp_list) + 1  # If not found, place at the end
+        # Draw text
+        draw = ImageDraw.Draw(background)
 
-    def calculate_dynamic_positions(self, user, user_data, user_ranking, config, bg_width, bg_height):
-        """Calculate dynamic positions for all text elements based on content length"""
         try:
-            # Get fonts for text measurement
+            font_username = load_font("PlayPretend.otf", positions["fonts"]["username_size"])
+            font_level = load_font("PlayPretend.otf", config["level_position"]["font_size"])
+        except IOError:
+            # Fallback vers les polices système si PlayPretend.otf n'est pas disponible
+            try:
+                font_username = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", positions["fonts"]["username_size"])
+                font_level = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", config["level_position"]["font_size"])
+            except IOError:
+                font_username = ImageFont.load_default()
+                font_level = ImageFont.load_default()
+
+        # Draw username with configurable color and optional image overlay
+        username = user.name
+        username_color = config.get("username_color", [255, 255, 255]) # Default white
+        username_image_url = config.get("username_image")
+
+        if username_image_url and username_image_url != "None":
+            username_surface = text_with_image_overlay(
+                username, font_username, username_color, assets.get(username_image_url)
+            )
+            background.paste(username_surface, 
+                           (positions["username"]["x"] - 30, positions["username"]["y"] - 30), 
+                           username_surface)
+        else:
+            draw.text((positions["username"]["x"], positions["username"]["y"]),
+                     username, font=font_username, fill=tuple(username_color))
+
+        # Draw discriminator next to username
+        discriminator_config = config.get("discriminator_position", {})
+        if discriminator_config:
+            discriminator = f"#{user.discriminator}" if user.discriminator != "0" else f"#{user.id % 10000:04d}"
+            discriminator_color = discriminator_config.get("color", [200, 200, 200])
+
             try:
-                font_username = ImageFont.truetype("PlayPretend.otf", config["username_position"]["font_size"])
-                font_level = ImageFont.truetype("PlayPretend.otf", config["level_position"]["font_size"])
-                font_xp = ImageFont.truetype("PlayPretend.otf", config["xp_text_position"]["font_size"])
-                font_ranking = ImageFont.truetype("PlayPretend.otf", config.get("ranking_position", {}).get("font_size", 120))
-                font_discriminator = ImageFont.truetype("PlayPretend.otf", config.get("discriminator_position", {}).get("font_size", 50))
+                font_discriminator = load_font("PlayPretend.otf", discriminator_config.get("font_size", 50))
             except IOError:
                 try:
-                    font_username = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", config["username_position"]["font_size"])
-                    font_level = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", config["level_position"]["font_size"])
-                    font_xp = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", config["xp_text_position"]["font_size"])
-                    font_ranking = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", config.get("ranking_position", {}).get("font_size", 120))
-                    font_discriminator = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", config.get("discriminator_position", {}).get("font_size", 50))
+                    font_discriminator = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", discriminator_config.get("font_size", 50))
                 except IOError:
-                    font_username = ImageFont.load_default()
-                    font_level = ImageFont.load_default()
-                    font_xp = ImageFont.load_default()
-                    font_ranking = ImageFont.load_default()
                     font_discriminator = ImageFont.load_default()
 
-            # Prepare text content
-            username = user.name
-            level_text = f"LEVEL {user_data['level']}"
+            draw.text((positions["discriminator"]["x"], positions["discriminator"]["y"]),
+                     discriminator, font=font_discriminator, fill=tuple(discriminator_color))
+
+        # Draw level with configurable color and optional image overlay
+        level_text = f"LEVEL {user_data['level']}"
+        level_color = config.get("level_color", [245, 55, 48]) # Default red
+        level_image_url = config.get("level_text_image")
+
+        if level_image_url and level_image_url != "None":
+            level_surface = text_with_image_overlay(
+                level_text, font_level, level_color, assets.get(level_image_url)
+            )
+            background.paste(level_surface, 
+                           (positions["level"]["x"] - 30, positions["level"]["y"] - 30), 
+                           level_surface)
+        else:
+            draw.text((positions["level"]["x"], positions["level"]["y"]),
+                     level_text, font=font_level, fill=tuple(level_color))
+
+        # Draw ranking position with optional image overlay
+        ranking_config = config.get("ranking_position", {})
+        if ranking_config:
             ranking_text = f"#{user_ranking}"
-            discriminator = f"#{user.discriminator}" if user.discriminator != "0" else f"#{user.id % 10000:04d}"
+            ranking_color = ranking_config.get("color", [255, 255, 255])
+            ranking_image_url = ranking_config.get("background_image")
 
-            xp_needed, current_xp_in_level = get_xp_for_next_level(user_data["xp"])
-            xp_text = f"{current_xp_in_level}/{xp_needed} XP"
+            try:
+                font_ranking = load_font("PlayPretend.otf", ranking_config.get("font_size", 60))
+            except IOError:
+                try:
+                    font_ranking = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", ranking_config.get("font_size", 60))
+                except IOError:
+                    font_ranking = ImageFont.load_default()
 
-            # Get text dimensions
-            level_bbox = font_level.getbbox(level_text)
-            level_width = level_bbox[2] - level_bbox[0]
+            if ranking_image_url and ranking_image_url != "None":
+                ranking_surface = text_with_image_overlay(
+                    ranking_text, font_ranking, ranking_color, assets.get(ranking_image_url)
+                )
+                background.paste(ranking_surface, 
+                               (positions["ranking"]["x"] - 30, positions["ranking"]["y"] - 30), 
+                               ranking_surface)
+            else:
+                draw.text((positions["ranking"]["x"], positions["ranking"]["y"]),
+                         ranking_text, font=font_ranking, fill=tuple(ranking_color))
 
-            ranking_bbox = font_ranking.getbbox(ranking_text)
-            ranking_width = ranking_bbox[2] - ranking_bbox[0]
+        # Draw XP progress text with optional image overlay
+        xp_needed, current_xp_in_level = get_xp_for_next_level(user_data["xp"])
+        xp_text = f"{current_xp_in_level}/{xp_needed} XP"
+        xp_info_image_url = config.get("xp_info_image")
 
-            xp_bbox = font_xp.getbbox(xp_text)
-            xp_width = xp_bbox[2] - xp_bbox[0]
+        try:
+            font_xp = load_font("PlayPretend.otf", config["xp_text_position"]["font_size"])
+        except IOError:
+            # Fallback vers les polices système
+            try:
+                font_xp = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", config["xp_text_position"]["font_size"])
+            except IOError:
+                font_xp = ImageFont.load_default()
 
-            username_bbox = font_username.getbbox(username)
-            username_width = username_bbox[2] - username_bbox[0]
+        if xp_info_image_url and xp_info_image_url != "None":
+            xp_surface = text_with_image_overlay(
+                xp_text, font_xp, config.get("xp_text_color", [255, 255, 255]), assets.get(xp_info_image_url)
+            )
+            background.paste(xp_surface, 
+                           (positions["xp_text"]["x"] - 30, positions["xp_text"]["y"] - 30), 
+                           xp_surface)
+        else:
+            draw.text((positions["xp_text"]["x"], positions["xp_text"]["y"]), 
+                     xp_text, font=font_xp, fill=tuple(config.get("xp_text_color", [255, 255, 255])))
 
-            discriminator_bbox = font_discriminator.getbbox(discriminator)
-            discriminator_width = discriminator_bbox[2] - discriminator_bbox[0]
 
-            # Define margins and spacing
-            margin = 50
-            min_spacing = 30
-            username_discriminator_spacing = 10
+        # If it's an animated GIF, process all frames
+        if is_animated_gif:
+            final_frames = []
 
-            # Calculate positions from right to left (XP has priority)
-            # XP text position (pushes from right)
-            default_xp_x = config["xp_text_position"]["x"]
-            xp_x = min(default_xp_x, bg_width - margin - xp_width)
-            xp_y = config["xp_text_position"]["y"]
+            for bg_frame, duration in frames:
+                durations.append(duration)
+                # Use bg_frame as background for this frame
+                current_background = bg_frame.copy()
 
-            # Level text position (pushes from right, but gives way to XP only if needed)
-            default_level_x = config["level_position"]["x"]
-            if default_level_x + level_width + min_spacing > xp_x:
-                level_x = xp_x - level_width - min_spacing
-            else:
-                level_x = default_level_x
-            level_y = config["level_position"]["y"]
+                # Add level bar to this frame
+                if levelbar_data:
+                    current_background.paste(levelbar, (levelbar_x, levelbar_y), levelbar)
 
-            # Ranking position (pushes from right, but gives way to level only if needed)
-            default_ranking_x = config.get("ranking_position", {}).get("x", 1350)
-            if default_ranking_x + ranking_width + min_spacing > level_x:
-                ranking_x = level_x - ranking_width - min_spacing
-            else:
-                ranking_x = default_ranking_x
-            ranking_y = config.get("ranking_position", {}).get("y", 35)
+                    # Add XP progress bar
+                    if progress > 0:
+                        xp_progress_bar_frame = Image.new("RGBA", (int(levelbar.width * progress), levelbar.height), xp_bar_color)
+                        current_background.paste(xp_progress_bar_frame, (levelbar_x, levelbar_y), xp_progress_bar_frame)
 
-            # Username and discriminator (push from left, but give way to XP)
-            available_space_for_username = xp_x - config["username_position"]["x"] - min_spacing - discriminator_width - username_discriminator_spacing
+                # Add avatar
+                if avatar is not None:
+                    current_background.paste(avatar, (config["profile_position"]["x"], config["profile_position"]["y"]), avatar)
 
-            # Adjust username font size if necessary
-            username_font_size = config["username_position"]["font_size"]
-            if username_width > available_space_for_username:
-                # Calculate new font size to fit
-                scale_factor = available_space_for_username / username_width
-                username_font_size = max(30, int(username_font_size * scale_factor))  # Minimum size of 30
+                # Add text to this frame (each text is rendered once, then composited on every frame)
 
-                # Recalculate with new font size
+                # Get adjusted font for username
                 try:
-                    font_username_adjusted = ImageFont.truetype("PlayPretend.otf", username_font_size)
+                    font_username_frame = load_font("PlayPretend.otf", positions["fonts"]["username_size"])
                 except IOError:
                     try:
-                        font_username_adjusted = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", username_font_size)
+                        font_username_frame = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", positions["fonts"]["username_size"])
                     except IOError:
-                        font_username_adjusted = ImageFont.load_default()
-
-                username_bbox_adjusted = font_username_adjusted.getbbox(username)
-                username_width_adjusted = username_bbox_adjusted[2] - username_bbox_adjusted[0]
-
-                # If still too wide, keep the adjusted size
-                if username_width_adjusted <= available_space_for_username:
-                    username_width = username_width_adjusted
-
-            # Username position
-            username_x = config["username_position"]["x"]
-            username_y = config["username_position"]["y"]
-
-            # If username had to be resized significantly, move it down slightly
-            if username_font_size < config["username_position"]["font_size"] * 0.8:
-                username_y += int((config["username_position"]["font_size"] - username_font_size) * 0.3)
-
-            # Discriminator position (right after username)
-            discriminator_x = username_x + username_width + username_discriminator_spacing
-            discriminator_y = config.get("discriminator_position", {}).get("y", 295)
-
-            return {
-                "username": {"x": username_x, "y": username_y},
-                "discriminator": {"x": discriminator_x, "y": discriminator_y},
-                "level": {"x": level_x, "y": level_y},
-                "ranking": {"x": ranking_x, "y": ranking_y},
-                "xp_text": {"x": xp_x, "y": xp_y},
-                "fonts": {"username_size": username_font_size}
-            }
-
-        except Exception as e:
-            print(f"Error calculating dynamic positions: {e}")
-            # Return default positions if calculation fails
-            return {
-                "username": {"x": config["username_position"]["x"], "y": config["username_position"]["y"]},
-                "discriminator": {"x": config.get("discriminator_position", {}).get("x", 1050), "y": config.get("discriminator_position", {}).get("y", 295)},
-                "level": {"x": config["level_position"]["x"], "y": config["level_position"]["y"]},
-                "ranking": {"x": config.get("ranking_position", {}).get("x", 1350), "y": config.get("ranking_position", {}).get("y", 35)},
-                "xp_text": {"x": config["xp_text_position"]["x"], "y": config["xp_text_position"]["y"]},
-                "fonts": {"username_size": config["username_position"]["font_size"]}
-            }
+                        font_username_frame = ImageFont.load_default()
 
-    async def create_level_card(self, user):
-        """Create level card for user"""
-        try:
-            data = load_leveling_data()
-            user_data = data["user_data"].get(str(user.id), {"xp": 0, "level": 1})
-            config = load_user_level_card_config(user.id)
+                # Draw username
+                draw_text(current_background, (positions["username"]["x"], positions["username"]["y"]),
+                          username, font_username_frame, tuple(username_color))
 
-            # Calculate user ranking
-            user_ranking = self.calculate_user_ranking(user.id)
+                # Draw discriminator
+                discriminator_config = config.get("discriminator_position", {})
+                if discriminator_config:
+                    discriminator = f"#{user.discriminator}" if user.discriminator != "0" else f"#{user.id % 10000:04d}"
+                    discriminator_color = discriminator_config.get("color", [200, 200, 200])
 
-            # Get background size from config
-            bg_width = config.get("background_size", {}).get("width", 2048)
-            bg_height = config.get("background_size", {}).get("height", 540)
-
-            # Variables pour gérer les GIFs animés
-            is_animated_gif = False
-            frames = []
-            durations = []
-
-            # Create background based on configuration
-            if config.get("background_image") and config["background_image"] != "None":
-                # Download and use background image
-                bg_data = await self.download_image(config["background_image"])
-                if bg_data:
-                    original_bg = Image.open(io.BytesIO(bg_data))
-
-                    # Vérifier si c'est un GIF animé
-                    if hasattr(original_bg, 'is_animated') and original_bg.is_animated:
-                        is_animated_gif = True
-                        # Traiter chaque frame du GIF
-                        for frame_idx in range(original_bg.n_frames):
-                            original_bg.seek(frame_idx)
-                            frame = original_bg.copy().convert("RGBA")
-
-                            # Use centered proportional resizing for animated frame
-                            processed_frame = self.resize_image_proportionally_centered(
-                                frame, bg_width, bg_height
-                            )
-                            frames.append(processed_frame)
-
-                            # Récupérer la durée de la frame
-                            try:
-                                duration = original_bg.info.get('duration', 100)
-                                durations.append(duration)
-                            except:
-                                durations.append(100)  # 100ms par défaut
-                    else:
-                        # Image statique
-                        original_bg = original_bg.convert("RGBA")
+                    try:
+                        font_discriminator = load_font("PlayPretend.otf", discriminator_config.get("font_size", 50))
+                    except IOError:
+                        try:
+                            font_discriminator = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", discriminator_config.get("font_size", 50))
+                        except IOError:
+                            font_discriminator = ImageFont.load_default()
 
-                        # Use centered proportional resizing for background
-                        background = self.resize_image_proportionally_centered(
-                            original_bg, bg_width, bg_height
-                        )
-                else:
-                    # Fallback to background color if image download fails
-                    default_bg_color = config.get("background_color", [15, 17, 16]) # Use correct default color
-                    bg_color = tuple(default_bg_color) + (255,)
-                    background = Image.new("RGBA", (bg_width, bg_height), bg_color)
-            elif config.get("background_color") and config["background_color"] != "None":
-                # Use background color
-                if isinstance(config["background_color"], list) and len(config["background_color"]) == 3:
-                    bg_color = tuple(config["background_color"]) + (255,)
-                else:
-                    bg_color = (255, 255, 255, 255)  # Default white if format is incorrect
-                background = Image.new("RGBA", (bg_width, bg_height), bg_color)
-            else:
-                # Default to the specified background color in the config
-                default_bg_color = config.get("background_color", [15, 17, 16]) # Use correct default color
-                bg_color = tuple(default_bg_color) + (255,)
-                background = Image.new("RGBA", (bg_width, bg_height), bg_color)
+                    draw_text(current_background, (positions["discriminator"]["x"], positions["discriminator"]["y"]),
+                              discriminator, font_discriminator, tuple(discriminator_color))
 
-            # Download and add level bar image
-            levelbar_data = await self.download_image(config.get("level_bar_image", "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/LevelBar.png"))
-            levelbar_x = 0
-            levelbar_y = 0
-
-            if levelbar_data:
-                levelbar = Image.open(io.BytesIO(levelbar_data)).convert("RGBA")
-                # Position level bar using config
-                xp_bar_config = config.get("xp_bar_position", {})
-                if "x" in xp_bar_config and "y" in xp_bar_config:
-                    levelbar_x = xp_bar_config["x"]
-                    levelbar_y = xp_bar_config["y"]
-                    # Only resize if width/height specified AND it's not the default LevelBar
-                    if "width" in xp_bar_config and "height" in xp_bar_config:
-                        if config.get("level_bar_image") != "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/LevelBar.png":
-                            # Custom image - use proportional resizing from center
-                            levelbar = self.resize_image_proportionally_centered(
-                                levelbar, 
-                                xp_bar_config["width"], 
-                                xp_bar_config["height"]
-                            )
-                        else:
-                            # Default LevelBar - maintain original size and proportions
-                            pass
-                else:
-                    # Default positioning
-                    levelbar_x = 30
-                    levelbar_y = bg_height - levelbar.height - 30
+                # Draw level
+                draw_text(current_background, (positions["level"]["x"], positions["level"]["y"]),
+                          level_text, font_level, tuple(level_color))
 
-                # Create XP bar background with rounded corners that matches the progress bar shape
-                if levelbar_data:
-                    # Calculate radius for half-circle (half of height)
-                    radius = levelbar.height // 2
+                # Draw ranking position
+                ranking_config = config.get("ranking_position", {})
+                if ranking_config:
+                    ranking_text = f"#{user_ranking}"
+                    ranking_color = ranking_config.get("color", [255, 255, 255])
 
-                    # Check if there's a custom XP bar image texture
-                    xp_bar_image_url = config.get("level_bar_image")
-                    if xp_bar_image_url and xp_bar_image_url != "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/LevelBar.png":
-                        # Apply custom texture to the background bar
+                    try:
+                        font_ranking = load_font("PlayPretend.otf", ranking_config.get("font_size", 60))
+                    except IOError:
                         try:
-                            xp_bar_texture_data = await self.download_image(xp_bar_image_url)
-                            if xp_bar_texture_data:
-                                xp_bar_texture = Image.open(io.BytesIO(xp_bar_texture_data)).convert("RGBA")
+                            font_ranking = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", ranking_config.get("font_size", 60))
+                        except IOError:
+                            font_ranking = ImageFont.load_default()
 
-                                # Resize texture to fit the bar dimensions using centered proportional resizing
-                                texture_resized = self.resize_image_proportionally_centered(
-                                    xp_bar_texture, levelbar.width, levelbar.height
-                                )
+                    draw_text(current_background, (positions["ranking"]["x"], positions["ranking"]["y"]),
+                              ranking_text, font_ranking, tuple(ranking_color))
 
-                                # Create mask for rounded rectangle
-                                mask = Image.new('L', (levelbar.width, levelbar.height), 0)
-                                mask_draw = ImageDraw.Draw(mask)
-                                mask_draw.rounded_rectangle(
-                                    [(0, 0), (levelbar.width - 1, levelbar.height - 1)],
-                                    radius=radius,
-                                    fill=255
-                                )
+                # Draw XP progress text
+                xp_needed, current_xp_in_level = get_xp_for_next_level(user_data["xp"])
+                xp_text = f"{current_xp_in_level}/{xp_needed} XP"
+                draw_text(current_background, (positions["xp_text"]["x"], positions["xp_text"]["y"]),
+                          xp_text, font_xp, tuple(config.get("xp_text_color", [255, 255, 255])))
 
-                                # Apply texture only to the rounded rectangle shape
-                                import numpy as np
-                                texture_array = np.array(texture_resized)
-                                mask_array = np.array(mask)
-                                result_array = np.zeros_like(texture_array)
+                final_frames.append(current_background)
 
-                                # Only copy pixels where the mask is not 0
-                                mask_pixels = mask_array > 0
-                                result_array[mask_pixels] = texture_array[mask_pixels]
-                                result_array[:, :, 3] = mask_array  # Set alpha channel to match mask
+            # Optimized GIF (shared palette, only changed regions per frame)
+            return encode_card(final_frames, durations, kind='level')
+        else:
+            # Static image
+            # If background is still not defined, create a default image
+            if 'background' not in locals():
+                # Use the specified background color in the config or default to red
+                default_bg_color = config.get("background_color", [245, 55, 48])
+                bg_color = tuple(default_bg_color) + (255,)
+                background = Image.new("RGBA", (bg_width, bg_height), bg_color)
 
-                                rounded_bg = Image.fromarray(result_array, 'RGBA')
 
-                                # Paste the textured background
-                                background.paste(rounded_bg, (levelbar_x, levelbar_y), rounded_bg)
-                            else:
-                                # Fallback to default color bar
-                                bg_color_default = (80, 80, 80, 255)  # Dark gray background
-                                rounded_bg = Image.new("RGBA", (levelbar.width, levelbar.height), (0, 0, 0, 0))
-                                rounded_bg_draw = ImageDraw.Draw(rounded_bg)
-                                rounded_bg_draw.rounded_rectangle(
-                                    [(0, 0), (levelbar.width - 1, levelbar.height - 1)],
-                                    radius=radius,
-                                    fill=bg_color_default
-                                )
-                                background.paste(rounded_bg, (levelbar_x, levelbar_y), rounded_bg)
-                        except Exception as e:
-                            print(f"Error applying XP bar texture: {e}")
-                            # Fallback to default color bar
-                            bg_color_default = (80, 80, 80, 255)  # Dark gray background
-                            rounded_bg = Image.new("RGBA", (levelbar.width, levelbar.height), (0, 0, 0, 0))
-                            rounded_bg_draw = ImageDraw.Draw(rounded_bg)
-                            rounded_bg_draw.rounded_rectangle(
-                                [(0, 0), (levelbar.width - 1, levelbar.height - 1)],
-                                radius=radius,
-                                fill=bg_color_default
-                            )
-                            background.paste(rounded_bg, (levelbar_x, levelbar_y), rounded_bg)
-                    else:
-                        # Use default color bar
-                        bg_color_default = (80, 80, 80, 255)  # Dark gray background
-                        rounded_bg = Image.new("RGBA", (levelbar.width, levelbar.height), (0, 0, 0, 0))
-                        rounded_bg_draw = ImageDraw.Draw(rounded_bg)
-                        rounded_bg_draw.rounded_rectangle(
-                            [(0, 0), (levelbar.width - 1, levelbar.height - 1)],
-                            radius=radius,
-                            fill=bg_color_default
-                        )
-                        background.paste(rounded_bg, (levelbar_x, levelbar_y), rounded_bg)
+            return encode_card([background], kind='level')
 
-                # Create XP progress bar overlay with rounded corners
-                xp_needed, current_xp_in_level = get_xp_for_next_level(user_data["xp"])
-                if xp_needed > 0:
-                    progress = current_xp_in_level / xp_needed
-                else:
-                    progress = 1.0
-
-                # Create XP progress bar using the specified color or texture
-                if progress > 0:
-                    progress_width = int(levelbar.width * progress)
-
-                    if progress_width > 0:
-                        # Check if there's a custom XP progress image texture
-                        xp_progress_image_url = config.get("xp_progress_image")
-                        if xp_progress_image_url and xp_progress_image_url != "None":
-                            # Apply custom texture to the progress bar
-                            try:
-                                xp_progress_texture_data = await self.download_image(xp_progress_image_url)
-                                if xp_progress_texture_data:
-                                    xp_progress_texture = Image.open(io.BytesIO(xp_progress_texture_data)).convert("RGBA")
-
-                                    # Resize texture to fit the FULL bar dimensions first
-                                    texture_full = self.resize_image_proportionally_centered(
-                                        xp_progress_texture, levelbar.width, levelbar.height
-                                    )
-
-                                    # Create progress mask with rounded corners
-                                    progress_mask = Image.new('L', (levelbar.width, levelbar.height), 0)
-                                    progress_mask_draw = ImageDraw.Draw(progress_mask)
-
-                                    # Calculate radius for half-circle (half of height)
-                                    radius = levelbar.height // 2
-
-                                    # Draw progress mask based on progress width
-                                    if progress_width >= levelbar.height:
-                                        # Full rounded rectangle when progress is wide enough
-                                        progress_mask_draw.rounded_rectangle(
-                                            [(0, 0), (progress_width - 1, levelbar.height - 1)],
-                                            radius=radius,
-                                            fill=255
-                                        )
-                                    else:
-                                        # Create proper half-circle for small progress
-                                        # Draw a full circle but crop it to progress width
-                                        circle_diameter = levelbar.height
-                                        progress_mask_draw.ellipse(
-                                            [(0, 0), (circle_diameter - 1, circle_diameter - 1)],
-                                            fill=255
-                                        )
-                                        # Create a mask to crop the circle to progress width
-                                        crop_mask = Image.new('L', (levelbar.width, levelbar.height), 0)
-                                        crop_draw = ImageDraw.Draw(crop_mask)
-                                        crop_draw.rectangle([(0, 0), (progress_width - 1, levelbar.height - 1)], fill=255)
-
-                                        # Apply crop mask to progress mask
-                                        import numpy as np
-                                        progress_array = np.array(progress_mask)
-                                        crop_array = np.array(crop_mask)
-                                        progress_array = np.minimum(progress_array, crop_array)
-                                        progress_mask = Image.fromarray(progress_array, 'L')
-
-                                    # Apply texture only to the progress area
-                                    import numpy as np
-                                    texture_array = np.array(texture_full)
-                                    mask_array = np.array(progress_mask)
-                                    result_array = np.zeros_like(texture_array)
-
-                                    # Only copy pixels where the mask is not 0
-                                    mask_pixels = mask_array > 0
-                                    result_array[mask_pixels] = texture_array[mask_pixels]
-                                    result_array[:, :, 3] = mask_array  # Set alpha channel to match mask
-
-                                    progress_bar = Image.fromarray(result_array, 'RGBA')
-
-                                    # Paste the textured progress bar over the background
-                                    background.paste(progress_bar, (levelbar_x, levelbar_y), progress_bar)
-                                else:
-                                    # Fallback to colored progress bar
-                                    xp_bar_color_rgb = config.get("xp_bar_color", [245, 55, 48])
-                                    xp_bar_color = tuple(xp_bar_color_rgb) + (255,)
-                                    progress_bar = Image.new("RGBA", (progress_width, levelbar.height), (0, 0, 0, 0))
-                                    progress_draw = ImageDraw.Draw(progress_bar)
-
-                                    radius = levelbar.height // 2
-                                    if progress_width >= levelbar.height:
-                                        progress_draw.rounded_rectangle(
-                                            [(0, 0), (progress_width - 1, levelbar.height - 1)],
-                                            radius=radius,
-                                            fill=xp_bar_color
-                                        )
-                                    else:
-                                        progress_draw.ellipse(
-                                            [(0, 0), (min(progress_width * 2, levelbar.height) - 1, levelbar.height - 1)],
-                                            fill=xp_bar_color
-                                        )
-                                    background.paste(progress_bar, (levelbar_x, levelbar_y), progress_bar)
-                            except Exception as e:
-                                print(f"Error applying XP progress texture: {e}")
-                                # Fallback to colored progress bar
-                                xp_bar_color_rgb = config.get("xp_bar_color", [245, 55, 48])
-                                xp_bar_color = tuple(xp_bar_color_rgb) + (255,)
-                                progress_bar = Image.new("RGBA", (progress_width, levelbar.height), (0, 0, 0, 0))
-                                progress_draw = ImageDraw.Draw(progress_bar)
-
-                                radius = levelbar.height // 2
-                                if progress_width >= levelbar.height:
-                                    progress_draw.rounded_rectangle(
-                                        [(0, 0), (progress_width - 1, levelbar.height - 1)],
-                                        radius=radius,
-                                        fill=xp_bar_color
-                                    )
-                                else:
-                                    # Create proper half-circle for small progress
-                                    circle_diameter = levelbar.height
-                                    # Create a temporary surface for the full circle
-                                    temp_surface = Image.new("RGBA", (circle_diameter, levelbar.height), (0, 0, 0, 0))
-                                    temp_draw = ImageDraw.Draw(temp_surface)
-                                    temp_draw.ellipse(
-                                        [(0, 0), (circle_diameter - 1, circle_diameter - 1)],
-                                        fill=xp_bar_color
-                                    )
-                                    # Crop the circle to progress width
-                                    cropped_circle = temp_surface.crop((0, 0, progress_width, levelbar.height))
-                                    progress_bar.paste(cropped_circle, (0, 0), cropped_circle)
-                                background.paste(progress_bar, (levelbar_x, levelbar_y), progress_bar)
-                        else:
-                            # Use default colored progress bar
-                            xp_bar_color_rgb = config.get("xp_bar_color", [245, 55, 48])
-                            xp_bar_color = tuple(xp_bar_color_rgb) + (255,)
-                            progress_bar = Image.new("RGBA", (progress_width, levelbar.height), (0, 0, 0, 0))
-                            progress_draw = ImageDraw.Draw(progress_bar)
-
-                            radius = levelbar.height // 2
-                            if progress_width >= levelbar.height:
-                                progress_draw.rounded_rectangle(
-                                    [(0, 0), (progress_width - 1, levelbar.height - 1)],
-                                    radius=radius,
-                                    fill=xp_bar_color
-                                )
-                            else:
-                                progress_draw.ellipse(
-                                    [(0, 0), (min(progress_width * 2, levelbar.height) - 1, levelbar.height - 1)],
-                                    fill=xp_bar_color
-                                )
-                            background.paste(progress_bar, (levelbar_x, levelbar_y), progress_bar)
-
-
-            # Download user avatar
-            avatar_url = user.display_avatar.url
-            avatar_data = await self.download_image(avatar_url)
-            if avatar_data:
-                avatar = Image.open(io.BytesIO(avatar_data)).convert("RGBA")
-                size = config["profile_position"]["size"]
-                avatar = avatar.resize((size, size), Image.Resampling.LANCZOS)
-
-                # Make avatar circular
-                mask = self.create_circle_mask((size, size))
-                avatar.putalpha(mask)
-
-                # Paste avatar
-                background.paste(avatar, (config["profile_position"]["x"], config["profile_position"]["y"]), avatar)
-
-                # Add profile outline if enabled
-                profile_outline_config = config.get("profile_outline", {})
-                if profile_outline_config.get("enabled", True):
-                    # Check for custom image first
-                    if profile_outline_config.get("custom_image"):
-                        outline_url = profile_outline_config["custom_image"]
-                    else:
-                        outline_url = profile_outline_config.get("url")
+    except Exception as e:
+        print(f"Error creating level card: {e}")
+        return None
+
+def render_demo_level_card(bot_user, avatar, config, assets):
+    """Draw the demo level card (level 100, rank #1) from plain data, like render_level_card"""
+    try:
+        # Create demo user data (level 100, rank #1)
+        demo_user_data = {"xp": 999999, "level": 100}
+
+        # Get background size from config
+        bg_width = config.get("background_size", {}).get("width", 2048)
+        bg_height = config.get("background_size", {}).get("height", 540)
+
+        # Create background based on configuration
+        if config.get("background_image") and config["background_image"] != "None":
+            bg_data = assets.get(config["background_image"])
+            if bg_data:
+                # First frame only (animated backgrounds too)
+                frame = AnimatedMedia(bg_data).first_frame()
+
+                # Use centered proportional resizing for demo background
+                background = resize_image_proportionally_centered(
+                    frame, bg_width, bg_height
+                )
+            else:
+                default_bg_color = config.get("background_color", [245, 55, 48])
+                bg_color = tuple(default_bg_color) + (255,)
+                background = Image.new("RGBA", (bg_width, bg_height), bg_color)
+        elif config.get("background_color") and config["background_color"] != "None":
+            if isinstance(config["background_color"], list) and len(config["background_color"]) == 3:
+                bg_color = tuple(config["background_color"]) + (255,)
+            else:
+                bg_color = (255, 255, 255, 255)
+            background = Image.new("RGBA", (bg_width, bg_height), bg_color)
+        else:
+            default_bg_color = config.get("background_color", [245, 55, 48])
+            bg_color = tuple(default_bg_color) + (255,)
+            background = Image.new("RGBA", (bg_width, bg_height), bg_color)
+
+        # Download and add level bar image
+        levelbar_data = assets.get(config.get("level_bar_image", "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/LevelBar.png"))
+        levelbar_x = 0
+        levelbar_y = 0
+
+        if levelbar_data:
+            levelbar = Image.open(io.BytesIO(levelbar_data)).convert("RGBA")
+            xp_bar_config = config.get("xp_bar_position", {})
+            if "x" in xp_bar_config and "y" in xp_bar_config:
+                if "width" in xp_bar_config and "height" in xp_bar_config:
+                    levelbar = levelbar.resize((xp_bar_config["width"], xp_bar_config["height"]), Image.Resampling.LANCZOS)
+                levelbar_x = xp_bar_config["x"]
+                levelbar_y = xp_bar_config["y"]
+            else:
+                levelbar_x = 30
+                levelbar_y = bg_height - levelbar.height - 30
+
+            background.paste(levelbar, (levelbar_x, levelbar_y), levelbar)
+
+            # Create full XP progress bar (100% filled for demo)
+            xp_bar_color_rgb = config.get("xp_bar_color", [245, 55, 48])
+            xp_bar_color = tuple(xp_bar_color_rgb) + (255,)
+            progress_bar = Image.new("RGBA", (levelbar.width, levelbar.height), xp_bar_color)
+            background.paste(progress_bar, (levelbar_x, levelbar_y), levelbar)
+
+        # Bot avatar, already circular at the card size (avatar cache)
+        if avatar is not None:
+            size = config["profile_position"]["size"]
+
+            # Paste avatar
+            background.paste(avatar, (config["profile_position"]["x"], config["profile_position"]["y"]), avatar)
+
+            # Add profile outline (default enabled)
+            profile_outline_config = config.get("profile_outline", {"enabled": True, "url": "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/ProfileOutline.png"})
+            if profile_outline_config.get("enabled", True):
+                outline_url = profile_outline_config.get("url", "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/ProfileOutline.png")
+                outline_data = assets.get(outline_url)
+                if outline_data:
+                    outline = Image.open(io.BytesIO(outline_data)).convert("RGBA")
+
+                    # Apply color override if specified
+                    if profile_outline_config.get("color_override"):
+                        color_override = profile_outline_config["color_override"]
+                        colored_outline = Image.new("RGBA", outline.size, tuple(color_override + [255]))
+                        colored_outline.putalpha(outline.split()[-1])
+                        outline = colored_outline
+
+                    # Get outline size from config (default to avatar size if not specified)
+                    outline_size = profile_outline_config.get("size", size)
+                    outline = outline.resize((outline_size, outline_size), Image.Resampling.LANCZOS)
+
+                    # Calculate centered position for outline
+                    avatar_center_x = config["profile_position"]["x"] + size // 2
+                    avatar_center_y = config["profile_position"]["y"] + size // 2
+                    outline_x = avatar_center_x - outline_size // 2
+                    outline_y = avatar_center_y - outline_size // 2
+
+                    # Paste outline centered over avatar
+                    background.paste(outline, (outline_x, outline_y), outline)
+
+        # Calculate dynamic positions for demo user
+        positions = calculate_dynamic_positions(bot_user, demo_user_data, 1, config, bg_width, bg_height)
+
+        # Draw text
+        draw = ImageDraw.Draw(background)
 
-                    if outline_url:
-                        outline_data = await self.download_image(outline_url)
-                        if outline_data:
-                            outline = Image.open(io.BytesIO(outline_data)).convert("RGBA")
+        try:
+            font_username = load_font("PlayPretend.otf", positions["fonts"]["username_size"])
+            font_level = load_font("PlayPretend.otf", config["level_position"]["font_size"])
+        except IOError:
+            try:
+                font_username = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", positions["fonts"]["username_size"])
+                font_level = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", config["level_position"]["font_size"])
+            except IOError:
+                font_username = ImageFont.load_default()
+                font_level = ImageFont.load_default()
 
-                            # Apply color override if specified (only for default outline, not custom image)
-                            if profile_outline_config.get("color_override") and not profile_outline_config.get("custom_image"):
-                                color_override = profile_outline_config["color_override"]
-                                colored_outline = Image.new("RGBA", outline.size, tuple(color_override + [255]))
-                                colored_outline.putalpha(outline.split()[-1])
-                                outline = colored_outline
+        # Draw username with configurable color
+        username = bot_user.name
+        username_color = config.get("username_color", [255, 255, 255])
+        draw.text((positions["username"]["x"], positions["username"]["y"]),
+                 username, font=font_username, fill=tuple(username_color))
 
-                            # Get outline size from config (default to avatar size if not specified)
-                            outline_size = profile_outline_config.get("size", size)
-                            outline = outline.resize((outline_size, outline_size), Image.Resampling.LANCZOS)
+        # Draw discriminator
+        discriminator_config = config.get("discriminator_position", {})
+        if discriminator_config:
+            discriminator = f"#{bot_user.discriminator}" if bot_user.discriminator != "0" else f"#{bot_user.id % 10000:04d}"
+            discriminator_color = discriminator_config.get("color", [200, 200, 200])
 
-                            # Calculate centered position for outline
-                            avatar_center_x = config["profile_position"]["x"] + size // 2
-                            avatar_center_y = config["profile_position"]["y"] + size // 2
-                            outline_x = avatar_center_x - outline_size // 2
-                            outline_y = avatar_center_y - outline_size // 2
+            try:
+                font_discriminator = load_font("PlayPretend.otf", discriminator_config.get("font_size", 50))
+            except IOError:
+                try:
+                    font_discriminator = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", discriminator_config.get("font_size", 50))
+                except IOError:
+                    font_discriminator = ImageFont.load_default()
 
-                            # Paste outline centered over avatar
-                            background.paste(outline, (outline_x, outline_y), outline)
+            draw.text((positions["discriminator"]["x"], positions["discriminator"]["y"]),
+                     discriminator, font=font_discriminator, fill=tuple(discriminator_color))
 
-            # Calculate dynamic positions based on content
-            positions = self.calculate_dynamic_positions(user, user_data, user_ranking, config, bg_width, bg_height)
+        # Draw level with configurable color
+        level_text = "LEVEL 100"
+        level_color = config.get("level_color", [245, 55, 48])
+        draw.text((positions["level"]["x"], positions["level"]["y"]),
+                 level_text, font=font_level, fill=tuple(level_color))
 
-            # Draw text
-            draw = ImageDraw.Draw(background)
+        # Draw ranking position (#1)
+        ranking_config = config.get("ranking_position", {})
+        if ranking_config:
+            ranking_text = "#1"
+            ranking_color = ranking_config.get("color", [255, 255, 255])
 
             try:
-                font_username = ImageFont.truetype("PlayPretend.otf", positions["fonts"]["username_size"])
-                font_level = ImageFont.truetype("PlayPretend.otf", config["level_position"]["font_size"])
+                font_ranking = load_font("PlayPretend.otf", ranking_config.get("font_size", 60))
             except IOError:
-                # Fallback vers les polices système si PlayPretend.otf n'est pas disponible
                 try:
-                    font_username = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", positions["fonts"]["username_size"])
-                    font_level = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", config["level_position"]["font_size"])
+                    font_ranking = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", ranking_config.get("font_size", 60))
                 except IOError:
-                    font_username = ImageFont.load_default()
-                    font_level = ImageFont.load_default()
+                    font_ranking = ImageFont.load_default()
 
-            # Draw username with configurable color and optional image overlay
-            username = user.name
-            username_color = config.get("username_color", [255, 255, 255]) # Default white
-            username_image_url = config.get("username_image")
+            draw.text((positions["ranking"]["x"], positions["ranking"]["y"]),
+                     ranking_text, font=font_ranking, fill=tuple(ranking_color))
 
-            if username_image_url and username_image_url != "None":
-                username_surface = await self.create_text_with_image_overlay(
-                    username, font_username, username_color, username_image_url
-                )
-                background.paste(username_surface, 
-                               (positions["username"]["x"] - 30, positions["username"]["y"] - 30), 
-                               username_surface)
-            else:
-                draw.text((positions["username"]["x"], positions["username"]["y"]),
-                         username, font=font_username, fill=tuple(username_color))
+        # Draw XP progress text (MAX for level 100)
+        xp_text = "MAX/MAX XP"
 
-            # Draw discriminator next to username
-            discriminator_config = config.get("discriminator_position", {})
-            if discriminator_config:
-                discriminator = f"#{user.discriminator}" if user.discriminator != "0" else f"#{user.id % 10000:04d}"
-                discriminator_color = discriminator_config.get("color", [200, 200, 200])
+        try:
+            font_xp = load_font("PlayPretend.otf", config["xp_text_position"]["font_size"])
+        except IOError:
+            try:
+                font_xp = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", config["xp_text_position"]["font_size"])
+            except IOError:
+                font_xp = ImageFont.load_default()
 
-                try:
-                    font_discriminator = ImageFont.truetype("PlayPretend.otf", discriminator_config.get("font_size", 50))
-                except IOError:
-                    try:
-                        font_discriminator = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", discriminator_config.get("font_size", 50))
-                    except IOError:
-                        font_discriminator = ImageFont.load_default()
+        draw.text((positions["xp_text"]["x"], positions["xp_text"]["y"]), xp_text, font=font_xp, fill=tuple(config.get("xp_text_color", [255, 255, 255])))
 
-                draw.text((positions["discriminator"]["x"], positions["discriminator"]["y"]),
-                         discriminator, font=font_discriminator, fill=tuple(discriminator_color))
+        return encode_card([background], kind='level_demo')
 
-            # Draw level with configurable color and optional image overlay
-            level_text = f"LEVEL {user_data['level']}"
-            level_color = config.get("level_color", [245, 55, 48]) # Default red
-            level_image_url = config.get("level_text_image")
+    except Exception as e:
+        print(f"Error creating demo level card: {e}")
+        return None
 
-            if level_image_url and level_image_url != "None":
-                level_surface = await self.create_text_with_image_overlay(
-                    level_text, font_level, level_color, level_image_url
-                )
-                background.paste(level_surface, 
-                               (positions["level"]["x"] - 30, positions["level"]["y"] - 30), 
-                               level_surface)
-            else:
-                draw.text((positions["level"]["x"], positions["level"]["y"]),
-                         level_text, font=font_level, fill=tuple(level_color))
+class LevelingSystem(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.user_cooldowns = {}
 
-            # Draw ranking position with optional image overlay
-            ranking_config = config.get("ranking_position", {})
-            if ranking_config:
-                ranking_text = f"#{user_ranking}"
-                ranking_color = ranking_config.get("color", [255, 255, 255])
-                ranking_image_url = ranking_config.get("background_image")
+    async def cog_unload(self):
+        # Les processus de rendu redémarrent au prochain rendu si le cog est rechargé
+        render_service.shutdown()
 
-                try:
-                    font_ranking = ImageFont.truetype("PlayPretend.otf", ranking_config.get("font_size", 60))
-                except IOError:
-                    try:
-                        font_ranking = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", ranking_config.get("font_size", 60))
-                    except IOError:
-                        font_ranking = ImageFont.load_default()
+    async def download_image(self, url):
+        """Download image from URL"""
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        return await response.read()
+            return None
+        except Exception as e:
+            print(f"Error downloading image {url}: {e}")
+            return None
 
-                if ranking_image_url and ranking_image_url != "None":
-                    ranking_surface = await self.create_text_with_image_overlay(
-                        ranking_text, font_ranking, ranking_color, ranking_image_url
-                    )
-                    background.paste(ranking_surface, 
-                                   (positions["ranking"]["x"] - 30, positions["ranking"]["y"] - 30), 
-                                   ranking_surface)
-                else:
-                    draw.text((positions["ranking"]["x"], positions["ranking"]["y"]),
-                             ranking_text, font=font_ranking, fill=tuple(ranking_color))
+    async def download_images(self, urls):
+        """Download several images at once: {url: bytes, or None when the download failed}"""
+        urls = list(dict.fromkeys(url for url in urls if url and url != "None"))
+        results = await asyncio.gather(*(self.download_image(url) for url in urls))
+        return dict(zip(urls, results))
 
-            # Draw XP progress text with optional image overlay
-            xp_needed, current_xp_in_level = get_xp_for_next_level(user_data["xp"])
-            xp_text = f"{current_xp_in_level}/{xp_needed} XP"
-            xp_info_image_url = config.get("xp_info_image")
+    def create_circle_mask(self, size):
+        """Create circular mask for profile picture"""
+        return create_circle_mask(size)
 
-            try:
-                font_xp = ImageFont.truetype("PlayPretend.otf", config["xp_text_position"]["font_size"])
-            except IOError:
-                # Fallback vers les polices système
-                try:
-                    font_xp = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", config["xp_text_position"]["font_size"])
-                except IOError:
-                    font_xp = ImageFont.load_default()
+    def resize_image_proportionally_centered(self, image, target_width, target_height):
+        """Resize image maintaining proportions and cropping from center - universal method"""
+        return resize_image_proportionally_centered(image, target_width, target_height)
 
-            if xp_info_image_url and xp_info_image_url != "None":
-                xp_surface = await self.create_text_with_image_overlay(
-                    xp_text, font_xp, config.get("xp_text_color", [255, 255, 255]), xp_info_image_url
-                )
-                background.paste(xp_surface, 
-                               (positions["xp_text"]["x"] - 30, positions["xp_text"]["y"] - 30), 
-                               xp_surface)
-            else:
-                draw.text((positions["xp_text"]["x"], positions["xp_text"]["y"]), 
-                         xp_text, font=font_xp, fill=tuple(config.get("xp_text_color", [255, 255, 255])))
+    def resize_xp_bar_image_proportionally(self, image, target_width, target_height):
+        """Resize XP bar image maintaining proportions and cropping from center"""
+        return self.resize_image_proportionally_centered(image, target_width, target_height)
 
+    async def apply_text_image_overlay(self, text_image_url, text_surface, text_bbox):
+        """Apply image overlay to text using mask technique"""
+        try:
+            if not text_image_url or text_image_url == "None":
+                return text_surface
 
-            # If it's an animated GIF, process all frames
-            if is_animated_gif:
-                final_frames = []
+            # Download overlay image
+            overlay_data = await self.download_image(text_image_url)
+            if not overlay_data:
+                return text_surface
 
-                for frame_idx, bg_frame in enumerate(frames):
-                    # Use bg_frame as background for this frame
-                    current_background = bg_frame.copy()
+            overlay_img = Image.open(io.BytesIO(overlay_data)).convert("RGBA")
 
-                    # Add level bar to this frame
-                    if levelbar_data:
-                        current_background.paste(levelbar, (levelbar_x, levelbar_y), levelbar)
+            # Resize overlay to match text bounding box
+            text_width = text_bbox[2] - text_bbox[0]
+            text_height = text_bbox[3] - text_bbox[1]
+            overlay_resized = overlay_img.resize((text_width, text_height), Image.Resampling.LANCZOS)
 
-                        # Add XP progress bar
-                        if progress > 0:
-                            xp_progress_bar_frame = Image.new("RGBA", (int(levelbar.width * progress), levelbar.height), xp_bar_color)
-                            current_background.paste(xp_progress_bar_frame, (levelbar_x, levelbar_y), xp_progress_bar_frame)
+            # Create mask from text surface alpha channel
+            text_mask = text_surface.split()[-1]  # Get alpha channel
 
-                    # Add avatar
-                    if avatar_data:
-                        current_background.paste(avatar, (config["profile_position"]["x"], config["profile_position"]["y"]), avatar)
+            # Apply mask to overlay image
+            overlay_resized.putalpha(text_mask)
 
-                    # Add text to this frame
-                    draw = ImageDraw.Draw(current_background)
+            # Create result image
+            result = Image.new('RGBA', text_surface.size, (0, 0, 0, 0))
+            result.paste(overlay_resized, (text_bbox[0], text_bbox[1]), overlay_resized)
 
-                    # Get adjusted font for username
-                    try:
-                        font_username_frame = ImageFont.truetype("PlayPretend.otf", positions["fonts"]["username_size"])
-                    except IOError:
-                        try:
-                            font_username_frame = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", positions["fonts"]["username_size"])
-                        except IOError:
-                            font_username_frame = ImageFont.load_default()
+            return result
 
-                    # Draw username
-                    draw.text((positions["username"]["x"], positions["username"]["y"]),
-                             username, font=font_username_frame, fill=tuple(username_color))
+        except Exception as e:
+            print(f"Error applying text image overlay: {e}")
+            return text_surface
 
-                    # Draw discriminator
-                    discriminator_config = config.get("discriminator_position", {})
-                    if discriminator_config:
-                        discriminator = f"#{user.discriminator}" if user.discriminator != "0" else f"#{user.id % 10000:04d}"
-                        discriminator_color = discriminator_config.get("color", [200, 200, 200])
+    async def create_text_with_image_overlay(self, text, font, color, image_url=None):
+        """Create text with optional image overlay"""
+        overlay_data = await self.download_image(image_url) if image_url and image_url != "None" else None
+        return text_with_image_overlay(text, font, color, overlay_data)
 
-                        try:
-                            font_discriminator = ImageFont.truetype("PlayPretend.otf", discriminator_config.get("font_size", 50))
-                        except IOError:
-                            try:
-                                font_discriminator = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", discriminator_config.get("font_size", 50))
-                            except IOError:
-                                font_discriminator = ImageFont.load_default()
+    def calculate_user_ranking(self, user_id):
+        """Calculate user's ranking position compared to all other users"""
+        data = load_leveling_data()
+        all_users = data["user_data"]
 
-                        draw.text((positions["discriminator"]["x"], positions["discriminator"]["y"]),
-                                 discriminator, font=font_discriminator, fill=tuple(discriminator_color))
+        # Create a list of (user_id, xp) tuples and sort by XP descending
+        user_xp_list = [(uid, udata["xp"]) for uid, udata in all_users.items()]
+        user_xp_list.sort(key=lambda x: x[1], reverse=True)
 
-                    # Draw level
-                    draw.text((positions["level"]["x"], positions["level"]["y"]),
-                             level_text, font=font_level, fill=tuple(level_color))
+        # Find the position of the current user
+        for position, (uid, xp) in enumerate(user_xp_list, 1):
+            if uid == str(user_id):
+                return position
 
-                    # Draw ranking position
-                    ranking_config = config.get("ranking_position", {})
-                    if ranking_config:
-                        ranking_text = f"#{user_ranking}"
-                        ranking_color = ranking_config.get("color", [255, 255, 255])
+        return len(user_xp_list) + 1  # If not found, place at the end
 
-                        try:
-                            font_ranking = ImageFont.truetype("PlayPretend.otf", ranking_config.get("font_size", 60))
-                        except IOError:
-                            try:
-                                font_ranking = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", ranking_config.get("font_size", 60))
-                            except IOError:
-                                font_ranking = ImageFont.load_default()
-
-                        draw.text((positions["ranking"]["x"], positions["ranking"]["y"]),
-                                 ranking_text, font=font_ranking, fill=tuple(ranking_color))
-
-                    # Draw XP progress text
-                    xp_needed, current_xp_in_level = get_xp_for_next_level(user_data["xp"])
-                    xp_text = f"{current_xp_in_level}/{xp_needed} XP"
-                    draw.text((positions["xp_text"]["x"], positions["xp_text"]["y"]), xp_text, font=font_xp, fill=tuple(config.get("xp_text_color", [255, 255, 255])))
-
-                    final_frames.append(current_background)
-
-                # Save the animated GIF
-                output = io.BytesIO()
-                final_frames[0].save(
-                    output,
-                    format='GIF',
-                    save_all=True,
-                    append_images=final_frames[1:],
-                    duration=durations,
-                    loop=0  # Infinite loop
-                )
-                output.seek(0)
-                return output
-            else:
-                # Static image - use the first frame if it was a static GIF
-                if frames:
-                    background = frames[0]
+    def calculate_dynamic_positions(self, user, user_data, user_ranking, config, bg_width, bg_height):
+        """Calculate dynamic positions for all text elements based on content length"""
+        return calculate_dynamic_positions(user, user_data, user_ranking, config, bg_width, bg_height)
 
-                # If background is still not defined, create a default image
-                if 'background' not in locals():
-                    # Use the specified background color in the config or default to red
-                    default_bg_color = config.get("background_color", [245, 55, 48])
-                    bg_color = tuple(default_bg_color) + (255,)
-                    background = Image.new("RGBA", (bg_width, bg_height), bg_color)
+    async def create_level_card(self, user):
+        """Create level card for user"""
+        try:
+            data = load_leveling_data()
+            user_data = data["user_data"].get(str(user.id), {"xp": 0, "level": 1})
+            config = load_user_level_card_config(user.id)
 
+            # Calculate user ranking
+            user_ranking = self.calculate_user_ranking(user.id)
 
-                output = io.BytesIO()
-                background.save(output, format='PNG')
-                output.seek(0)
-                return output
+            # Images downloaded here (all at once), the card is drawn by a render worker
+            avatar, assets = await asyncio.gather(
+                avatar_cache.get(user, config["profile_position"]["size"]),
+                self.download_images(level_card_image_urls(config))
+            )
+            return await render_service.run('level', render_level_card, card_user(user), avatar, user_data, user_ranking, config, assets)
 
         except Exception as e:
             print(f"Error creating level card: {e}")
@@ -1362,24 +1406,8 @@ class LevelingSystem(commands.Cog):
             # Apply the mask from the profile outline (use alpha channel as mask)
             alpha_mask = mask_image.split()[-1]  # Get alpha channel from outline
 
-            # Create final masked image with ONLY the overlapping parts visible
-            masked_image = Image.new("RGBA", custom_cropped.size, (0, 0, 0, 0))
-
-            # Use numpy for pixel-level masking to ensure only overlapping parts are visible
-            import numpy as np
-            custom_array = np.array(custom_cropped)
-            mask_array = np.array(alpha_mask)
-            result_array = np.zeros_like(custom_array)
-
-            # Only copy pixels where the mask is not transparent (>0)
-            mask_pixels = mask_array > 0
-            result_array[mask_pixels] = custom_array[mask_pixels]
-
-            # Set alpha channel to match the mask exactly
-            result_array[:, :, 3] = mask_array
-
-            # Convert back to PIL Image
-            masked_image = Image.fromarray(result_array, 'RGBA')
+            # ONLY the overlapping parts visible: alpha channel set to match the mask exactly
+            masked_image = apply_mask(custom_cropped, alpha_mask)
 
             # Save processed image
             os.makedirs('images', exist_ok=True)
@@ -1456,7 +1484,7 @@ class LevelingSystem(commands.Cog):
                             description=f"Congratulations {user.mention}! You've reached level {level}!",
                             color=0x00ff00
                         )
-                        file = discord.File(level_card, filename=f"level_{level}_notification.png")
+                        file = discord.File(level_card, filename=f"level_{level}_notification.{card_extension(level_card)}")
                         await dm_channel.send(embed=embed, file=file)
                     except:
                         # If DM fails, try to send in a channel (if in guild)
@@ -1469,196 +1497,13 @@ class LevelingSystem(commands.Cog):
     async def create_demo_level_card(self, bot_user):
         """Create demo level card for bot user showing level 100 and rank #1"""
         try:
-            data = load_leveling_data()
-            config = data["leveling_settings"]["level_card"]
-
-            # Create demo user data (level 100, rank #1)
-            demo_user_data = {"xp": 999999, "level": 100}
-
-            # Get background size from config
-            bg_width = config.get("background_size", {}).get("width", 2048)
-            bg_height = config.get("background_size", {}).get("height", 540)
-
-            # Create background based on configuration
-            if config.get("background_image") and config["background_image"] != "None":
-                bg_data = await self.download_image(config["background_image"])
-                if bg_data:
-                    original_bg = Image.open(io.BytesIO(bg_data))
-
-                    # Handle animated GIF or static image
-                    if hasattr(original_bg, 'is_animated') and original_bg.is_animated:
-                        original_bg.seek(0)
-                        frame = original_bg.copy().convert("RGBA")
-                    else:
-                        frame = original_bg.convert("RGBA")
-
-                    # Use centered proportional resizing for demo background
-                    background = self.resize_image_proportionally_centered(
-                        frame, bg_width, bg_height
-                    )
-                else:
-                    default_bg_color = config.get("background_color", [245, 55, 48])
-                    bg_color = tuple(default_bg_color) + (255,)
-                    background = Image.new("RGBA", (bg_width, bg_height), bg_color)
-            elif config.get("background_color") and config["background_color"] != "None":
-                if isinstance(config["background_color"], list) and len(config["background_color"]) == 3:
-                    bg_color = tuple(config["background_color"]) + (255,)
-                else:
-                    bg_color = (255, 255, 255, 255)
-                background = Image.new("RGBA", (bg_width, bg_height), bg_color)
-            else:
-                default_bg_color = config.get("background_color", [245, 55, 48])
-                bg_color = tuple(default_bg_color) + (255,)
-                background = Image.new("RGBA", (bg_width, bg_height), bg_color)
-
-            # Download and add level bar image
-            levelbar_data = await self.download_image(config.get("level_bar_image", "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/LevelBar.png"))
-            levelbar_x = 0
-            levelbar_y = 0
-
-            if levelbar_data:
-                levelbar = Image.open(io.BytesIO(levelbar_data)).convert("RGBA")
-                xp_bar_config = config.get("xp_bar_position", {})
-                if "x" in xp_bar_config and "y" in xp_bar_config:
-                    if "width" in xp_bar_config and "height" in xp_bar_config:
-                        levelbar = levelbar.resize((xp_bar_config["width"], xp_bar_config["height"]), Image.Resampling.LANCZOS)
-                    levelbar_x = xp_bar_config["x"]
-                    levelbar_y = xp_bar_config["y"]
-                else:
-                    levelbar_x = 30
-                    levelbar_y = bg_height - levelbar.height - 30
-
-                background.paste(levelbar, (levelbar_x, levelbar_y), levelbar)
-
-                # Create full XP progress bar (100% filled for demo)
-                xp_bar_color_rgb = config.get("xp_bar_color", [245, 55, 48])
-                xp_bar_color = tuple(xp_bar_color_rgb) + (255,)
-                progress_bar = Image.new("RGBA", (levelbar.width, levelbar.height), xp_bar_color)
-                background.paste(progress_bar, (levelbar_x, levelbar_y), levelbar)
-
-            # Download bot avatar
-            avatar_url = bot_user.display_avatar.url
-            avatar_data = await self.download_image(avatar_url)
-            if avatar_data:
-                avatar = Image.open(io.BytesIO(avatar_data)).convert("RGBA")
-                size = config["profile_position"]["size"]
-                avatar = avatar.resize((size, size), Image.Resampling.LANCZOS)
-
-                # Make avatar circular
-                mask = self.create_circle_mask((size, size))
-                avatar.putalpha(mask)
-
-                # Paste avatar
-                background.paste(avatar, (config["profile_position"]["x"], config["profile_position"]["y"]), avatar)
-
-                # Add profile outline (default enabled)
-                profile_outline_config = config.get("profile_outline", {"enabled": True, "url": "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/ProfileOutline.png"})
-                if profile_outline_config.get("enabled", True):
-                    outline_url = profile_outline_config.get("url", "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/ProfileOutline.png")
-                    outline_data = await self.download_image(outline_url)
-                    if outline_data:
-                        outline = Image.open(io.BytesIO(outline_data)).convert("RGBA")
-
-                        # Apply color override if specified
-                        if profile_outline_config.get("color_override"):
-                            color_override = profile_outline_config["color_override"]
-                            colored_outline = Image.new("RGBA", outline.size, tuple(color_override + [255]))
-                            colored_outline.putalpha(outline.split()[-1])
-                            outline = colored_outline
+            config = load_leveling_data()["leveling_settings"]["level_card"]
 
-                        # Get outline size from config (default to avatar size if not specified)
-                        outline_size = profile_outline_config.get("size", size)
-                        outline = outline.resize((outline_size, outline_size), Image.Resampling.LANCZOS)
-
-                        # Calculate centered position for outline
-                        avatar_center_x = config["profile_position"]["x"] + size // 2
-                        avatar_center_y = config["profile_position"]["y"] + size // 2
-                        outline_x = avatar_center_x - outline_size // 2
-                        outline_y = avatar_center_y - outline_size // 2
-
-                        # Paste outline centered over avatar
-                        background.paste(outline, (outline_x, outline_y), outline)
-
-            # Calculate dynamic positions for demo user
-            positions = self.calculate_dynamic_positions(bot_user, demo_user_data, 1, config, bg_width, bg_height)
-
-            # Draw text
-            draw = ImageDraw.Draw(background)
-
-            try:
-                font_username = ImageFont.truetype("PlayPretend.otf", positions["fonts"]["username_size"])
-                font_level = ImageFont.truetype("PlayPretend.otf", config["level_position"]["font_size"])
-            except IOError:
-                try:
-                    font_username = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", positions["fonts"]["username_size"])
-                    font_level = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", config["level_position"]["font_size"])
-                except IOError:
-                    font_username = ImageFont.load_default()
-                    font_level = ImageFont.load_default()
-
-            # Draw username with configurable color
-            username = bot_user.name
-            username_color = config.get("username_color", [255, 255, 255])
-            draw.text((positions["username"]["x"], positions["username"]["y"]),
-                     username, font=font_username, fill=tuple(username_color))
-
-            # Draw discriminator
-            discriminator_config = config.get("discriminator_position", {})
-            if discriminator_config:
-                discriminator = f"#{bot_user.discriminator}" if bot_user.discriminator != "0" else f"#{bot_user.id % 10000:04d}"
-                discriminator_color = discriminator_config.get("color", [200, 200, 200])
-
-                try:
-                    font_discriminator = ImageFont.truetype("PlayPretend.otf", discriminator_config.get("font_size", 50))
-                except IOError:
-                    try:
-                        font_discriminator = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", discriminator_config.get("font_size", 50))
-                    except IOError:
-                        font_discriminator = ImageFont.load_default()
-
-                draw.text((positions["discriminator"]["x"], positions["discriminator"]["y"]),
-                         discriminator, font=font_discriminator, fill=tuple(discriminator_color))
-
-            # Draw level with configurable color
-            level_text = "LEVEL 100"
-            level_color = config.get("level_color", [245, 55, 48])
-            draw.text((positions["level"]["x"], positions["level"]["y"]),
-                     level_text, font=font_level, fill=tuple(level_color))
-
-            # Draw ranking position (#1)
-            ranking_config = config.get("ranking_position", {})
-            if ranking_config:
-                ranking_text = "#1"
-                ranking_color = ranking_config.get("color", [255, 255, 255])
-
-                try:
-                    font_ranking = ImageFont.truetype("PlayPretend.otf", ranking_config.get("font_size", 60))
-                except IOError:
-                    try:
-                        font_ranking = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", ranking_config.get("font_size", 60))
-                    except IOError:
-                        font_ranking = ImageFont.load_default()
-
-                draw.text((positions["ranking"]["x"], positions["ranking"]["y"]),
-                         ranking_text, font=font_ranking, fill=tuple(ranking_color))
-
-            # Draw XP progress text (MAX for level 100)
-            xp_text = "MAX/MAX XP"
-
-            try:
-                font_xp = ImageFont.truetype("PlayPretend.otf", config["xp_text_position"]["font_size"])
-            except IOError:
-                try:
-                    font_xp = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", config["xp_text_position"]["font_size"])
-                except IOError:
-                    font_xp = ImageFont.load_default()
-
-            draw.text((positions["xp_text"]["x"], positions["xp_text"]["y"]), xp_text, font=font_xp, fill=tuple(config.get("xp_text_color", [255, 255, 255])))
-
-            output = io.BytesIO()
-            background.save(output, format='PNG')
-            output.seek(0)
-            return output
+            avatar, assets = await asyncio.gather(
+                avatar_cache.get(bot_user, config["profile_position"]["size"]),
+                self.download_images(demo_card_image_urls(config))
+            )
+            return await render_service.run('level_demo', render_demo_level_card, card_user(bot_user), avatar, config, assets)
 
         except Exception as e:
             print(f"Error creating demo level card: {e}")
@@ -1673,7 +1518,7 @@ class LevelingSystem(commands.Cog):
                 os.makedirs('images', exist_ok=True)
                 import time
                 timestamp = int(time.time())
-                filename = f"demo_level_card_{timestamp}.png"
+                filename = f"demo_level_card_{timestamp}.{card_extension(demo_card)}"
                 file_path = os.path.join('images', filename)
 
                 with open(file_path, 'wb') as f:
@@ -1730,14 +1575,7 @@ class LevelingSystem(commands.Cog):
 
         level_card = await self.create_level_card(interaction.user)
         if level_card:
-            # Determine file extension
-            level_card.seek(0)
-            file_header = level_card.read(6)
-            level_card.seek(0)
-
-            # Check if it's a GIF
-            is_gif = file_header.startswith(b'GIF87a') or file_header.startswith(b'GIF89a')
-            filename = "level_card.gif" if is_gif else "level_card.png"
+            filename = f"level_card.{card_extension(level_card)}"
 
             file = discord.File(level_card, filename=filename)
 
@@ -3094,15 +2932,8 @@ class LevelCardManagerView(discord.ui.View):
                 import time
                 timestamp = int(time.time())
 
-                # Determine extension based on content
-                preview_image.seek(0)
-                file_header = preview_image.read(10)
-                preview_image.seek(0)
-
-                if file_header.startswith(b'GIF'):
-                    filename = f"level_preview_{self.user_id}_{timestamp}.gif"
-                else:
-                    filename = f"level_preview_{self.user_id}_{timestamp}.png"
+                # Extension from the encoded content (GIF, WebP or PNG)
+                filename = f"level_preview_{self.user_id}_{timestamp}.{card_extension(preview_image)}"
 
                 file_path = os.path.join('images', filename)
 
@@ -4544,15 +4375,8 @@ class DMsLevelCardManagerView(discord.ui.View):
                 import time
                 timestamp = int(time.time())
 
-                # Determine extension based on content
-                preview_image.seek(0)
-                file_header = preview_image.read(10)
-                preview_image.seek(0)
-
-                if file_header.startswith(b'GIF'):
-                    filename = f"level_preview_{self.user_id}_{timestamp}.gif"
-                else:
-                    filename = f"level_preview_{self.user_id}_{timestamp}.png"
+                # Extension from the encoded content (GIF, WebP or PNG)
+                filename = f"level_preview_{self.user_id}_{timestamp}.{card_extension(preview_image)}"
 
                 file_path = os.path.join('images', filename)
 
@@ -1,3 +1,7 @@
+import time
+startup_started = time.perf_counter()
+
+import asyncio
 import discord
 import os
 import requests
@@ -6,6 +10,8 @@ import json
 from dotenv import load_dotenv
 from discord.ext import commands
 from github_sync import GitHubSync
+from startup_timing import StartupTimer
+from command_sync import sync_commands_if_changed
 # Removed incorrect imports - using cog loading instead
 
 # Charger les variables d'environnement du fichier .env
@@ -19,79 +25,67 @@ intents.members = True  # Nécessaire pour surveiller les membres du serveur
 # Créer le bot Discord avec support des commandes
 
 client = commands.Bot(command_prefix='!', intents=intents)
+startup_timer = StartupTimer(startup_started)
+startup_timer.checkpoint('imports')
+
+# Extensions indépendantes, chargées en parallèle une seule fois par processus
+EXTENSIONS = {
+    'embed_system': 'Embed system',
+    'pantheon_system': 'Pantheon system',
+    'notation_system': 'Notation system',
+    'autorank_system': 'AutoRank system',
+    'converters_system': 'Converters system',
+    'welcome_system': 'Welcome system',
+    'leveling_system': 'Leveling system',
+    'ticket_system': 'Ticket system',
+    'administrator_command': 'Administrator command',
+    'avatar_cache': 'Avatar cache'
+}
+
+async def load_extension_timed(name, label):
+    with startup_timer.phase(f'load {name}'):
+        try:
+            await client.load_extension(name)
+            print(f'{label} loaded!')
+        except Exception as e:
+            print(f'Failed to load {name}: {e}')
 
 @client.event
-async def on_ready():
-    print(f'Bot connected as {client.user.name}')
+async def setup_hook():
+    startup_timer.checkpoint('login')
 
     # Charger les extensions
-    try:
-        await client.load_extension('embed_system')
-        print('Embed system loaded!')
-    except Exception as e:
-        print(f'Failed to load embed_system: {e}')
+    with startup_timer.phase('extensions'):
+        await asyncio.gather(*(load_extension_timed(name, label) for name, label in EXTENSIONS.items()))
 
-    try:
-        await client.load_extension('pantheon_system')
-        print('Pantheon system loaded!')
-    except Exception as e:
-        print(f'Failed to load pantheon_system: {e}')
+    # Synchroniser les commandes slash (uniquement si l'arbre a changé)
+    with startup_timer.phase('command sync'):
+        try:
+            force = os.getenv('FORCE_COMMAND_SYNC', '').lower() in ('1', 'true', 'yes')
+            synced = await sync_commands_if_changed(client, force=force)
+            if synced is not None:
+                print(f'Synced {len(synced)} command(s)')
+        except Exception as e:
+            print(f'Failed to sync commands: {e}')
 
-    try:
-        await client.load_extension('notation_system')
-        print('Notation system loaded!')
-    except Exception as e:
-        print(f'Failed to load notation_system: {e}')
-
-    try:
-        await client.load_extension('autorank_system')
-        print('AutoRank system loaded!')
-        # Restore autorank buttons
-        from autorank_system import restore_autorank_buttons
-        await restore_autorank_buttons(client)
-    except Exception as e:
-        print(f'Failed to load autorank_system: {e}')
-
-    try:
-        await client.load_extension('converters_system')
-        print('Converters system loaded!')
-    except Exception as e:
-        print(f'Failed to load converters_system: {e}')
+    startup_timer.checkpoint('setup_hook')
 
-    try:
-        await client.load_extension('welcome_system')
-        print('Welcome system loaded!')
-    except Exception as e:
-        print(f'Failed to load welcome_system: {e}')
-
-    try:
-        await client.load_extension('leveling_system')
-        print('Leveling system loaded!')
-    except Exception as e:
-        print(f'Failed to load leveling_system: {e}')
-
-    # Setup du système de tickets
-    try:
-        from ticket_bot import setup_ticket_system, setup_persistent_views
-        setup_ticket_system(client)
-        setup_persistent_views(client)
-        print('Ticket system loaded!')
-    except Exception as e:
-        print(f'Failed to load ticket_system: {e}')
+@client.event
+async def on_ready():
+    print(f'Bot connected as {client.user.name}')
 
-    # Load AdministratorCommands cog
-    try:
-        await client.load_extension('administrator_command')
-        print('Administrator command loaded!')
-    except Exception as e:
-        print(f'Failed to load administrator_command: {e}')
+    # on_ready se répète à chaque reconnexion : le reste ne s'exécute qu'une fois
+    if startup_timer.reported:
+        return
+    startup_timer.checkpoint('gateway connect')
+    startup_timer.report()
 
-    # Synchroniser les commandes slash
+    # Restore autorank buttons (needs the guild cache)
     try:
-        synced = await client.tree.sync()
-        print(f'Synced {len(synced)} command(s)')
+        from autorank_system import restore_autorank_buttons
+        await restore_autorank_buttons(client)
     except Exception as e:
-        print(f'Failed to sync commands: {e}')
+        print(f'Failed to restore autorank buttons: {e}')
 
     # Synchroniser avec GitHub après les commandes
     github_sync = GitHubSync()
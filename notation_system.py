@@ -4,8 +4,13 @@ from discord.ext import commands
 from discord import app_commands
 import json
 import random
+import heapq
+import bisect
+import itertools
+import os
+import threading
 from datetime import datetime
-import math
+from json_store import json_document
 
 def get_bot_name(bot):
     return getattr(bot, 'user', {}).display_name or "Bot"
@@ -17,6 +22,7 @@ class NotationData:
         self.description = ""
         self.author_name = "Anonymous"
         self.image_url = ""
+        self.preview_url = ""
         self.location = ""
         self.votes = []  # List of {user_id: int, rating: int, timestamp: str}
         self.average_rating = 0.0
@@ -142,7 +148,7 @@ class VotingView(discord.ui.View):
 
                         # Add image if available
                         if self.artwork_data.image_url:
-                            updated_embed.set_image(url=self.artwork_data.image_url)
+                            updated_embed.set_image(url=self.artwork_data.preview_url or self.artwork_data.image_url)
                         else:
                             updated_embed.set_thumbnail(url=self.bot.user.display_avatar.url)
 
@@ -251,77 +257,549 @@ class RandomArtView(discord.ui.View):
         voting_view = VotingView(self.artwork_data, self.bot)
         await interaction.response.send_message(embed=embed, view=voting_view, ephemeral=True)
 
+class ArtworkRotation:
+    """In-memory scheduler for /random_art.
+
+    Keeps the Pantheon and notation data indexed by artwork ID, a pool of
+    never-shown artworks (random pick in O(1)) and a min-heap of shown artworks
+    keyed by last_shown (oldest in O(log n)). Heap entries are invalidated
+    lazily: stale entries are skipped when they reach the top.
+    """
+
+    def __init__(self, pantheon_file='pantheon_data.json', notation_file='notation_data.json'):
+        self.pantheon_store = json_document(pantheon_file)
+        self.notation_store = json_document(notation_file, indent=None)  # Machine-only: compact
+        self.pantheon_data = None
+        self.notation_data = None
+        self.pantheon_index = {}   # artwork ID -> Pantheon artwork
+        self.notation_index = {}   # artwork ID -> notation artwork
+        self.never_shown = []
+        self.never_shown_positions = {}
+        self.heap = []
+        self.counter = itertools.count()
+        self._pantheon_version = None
+        self._notation_version = None
+        self.notation_listeners = []  # Called with the data after notation_data.json is (re)loaded
+
+    # Loading
+    def refresh(self):
+        """Reload a data file only if it changed since it was last seen"""
+        pantheon_version = self.pantheon_store.version
+        notation_version = self.notation_store.version
+        reload_pantheon = self.pantheon_data is None or pantheon_version != self._pantheon_version
+        reload_notation = self.notation_data is None or notation_version != self._notation_version
+
+        if reload_pantheon:
+            # Read-only: the shared copy of the store is enough
+            self.pantheon_data = self.pantheon_store.read(default=lambda: {"artworks": []})
+            self._pantheon_version = pantheon_version
+        if reload_notation:
+            self.notation_data = self.notation_store.load(default=lambda: {"artworks": []})
+            self._notation_version = notation_version
+        if reload_pantheon or reload_notation:
+            self.rebuild()
+        if reload_notation:
+            self._notify_notation_loaded()
+
+    def _notify_notation_loaded(self):
+        for listener in self.notation_listeners:
+            listener(self.notation_data)
+
+    def rebuild(self):
+        self.pantheon_index = {artwork.get("id"): artwork for artwork in self.pantheon_data.get("artworks", [])}
+        self.notation_index = {artwork.get("artwork_id"): artwork for artwork in self.notation_data.setdefault("artworks", [])}
+        self.never_shown = []
+        self.never_shown_positions = {}
+        self.heap = []
+        for artwork_id in self.pantheon_index:
+            self._schedule(artwork_id)
+        heapq.heapify(self.heap)
+
+    def _schedule(self, artwork_id):
+        notation = self.notation_index.get(artwork_id)
+        if notation is None:
+            if artwork_id not in self.never_shown_positions:
+                self.never_shown_positions[artwork_id] = len(self.never_shown)
+                self.never_shown.append(artwork_id)
+        else:
+            self._discard_never_shown(artwork_id)
+            heapq.heappush(self.heap, (notation.get("last_shown") or "", next(self.counter), artwork_id))
+
+    def _discard_never_shown(self, artwork_id):
+        position = self.never_shown_positions.pop(artwork_id, None)
+        if position is None:
+            return
+        last = self.never_shown.pop()
+        if last != artwork_id:
+            self.never_shown[position] = last
+            self.never_shown_positions[last] = position
+
+    def _is_current(self, entry):
+        last_shown, _, artwork_id = entry
+        notation = self.notation_index.get(artwork_id)
+        return (artwork_id in self.pantheon_index and notation is not None
+                and (notation.get("last_shown") or "") == last_shown)
+
+    def _compact(self):
+        # Stale entries pile up as artworks are shown: rebuild once they dominate
+        if len(self.heap) > 2 * len(self.notation_index) + 64:
+            self.heap = [entry for entry in self.heap if self._is_current(entry)]
+            heapq.heapify(self.heap)
+
+    # Selection
+    def next_artwork(self):
+        """Return (pantheon_artwork, notation_artwork or None) to show next"""
+        self.refresh()
+
+        # Prioritize artworks that have never been shown
+        if self.never_shown:
+            artwork_id = random.choice(self.never_shown)
+            return self.pantheon_index[artwork_id], None
+
+        # If all have been shown, pick the one shown longest ago
+        while self.heap:
+            if self._is_current(self.heap[0]):
+                artwork_id = self.heap[0][2]
+                return self.pantheon_index[artwork_id], self.notation_index[artwork_id]
+            heapq.heappop(self.heap)
+
+        return None
+
+    # Notation updates
+    def get_notation_data(self):
+        self.refresh()
+        return self.notation_data
+
+    def get_notation(self, artwork_id):
+        self.refresh()
+        return self.notation_index.get(artwork_id)
+
+    def upsert_notation(self, artwork_dict):
+        """Insert or replace a notation artwork and reschedule it"""
+        self.refresh()
+        artwork_id = artwork_dict["artwork_id"]
+        existing = self.notation_index.get(artwork_id)
+        if existing is not None:
+            # Votes are owned by the vote ledger: keep the recorded ones
+            for key, value in artwork_dict.items():
+                if key not in VOTE_FIELDS:
+                    existing[key] = value
+        else:
+            self.notation_data["artworks"].append(artwork_dict)
+            self.notation_index[artwork_id] = artwork_dict
+        if artwork_id in self.pantheon_index:
+            self._schedule(artwork_id)
+            self._compact()
+
+    def notation_saved(self, data):
+        """Called after notation_data.json was written"""
+        self._notation_version = self.notation_store.version
+        if data is not self.notation_data:
+            self.notation_data = data
+            self.rebuild()
+            self._notify_notation_loaded()
+
+    # Pantheon updates
+    def sync_pantheon(self, pantheon_data):
+        """Apply Pantheon edits (create / edit / delete) after pantheon_data.json was written"""
+        if self.pantheon_data is None:
+            self.refresh()
+            return
+
+        artworks = {artwork.get("id"): dict(artwork) for artwork in pantheon_data.get("artworks", [])}
+        for artwork_id in list(self.pantheon_index):
+            if artwork_id not in artworks:
+                # Heap entries for removed artworks are skipped lazily
+                del self.pantheon_index[artwork_id]
+                self._discard_never_shown(artwork_id)
+        for artwork_id, artwork in artworks.items():
+            is_new = artwork_id not in self.pantheon_index
+            self.pantheon_index[artwork_id] = artwork
+            if is_new:
+                self._schedule(artwork_id)
+
+        self.pantheon_data = {"artworks": list(artworks.values())}
+        self._pantheon_version = self.pantheon_store.version
+
+artwork_rotation = ArtworkRotation()
+
+class ArtworkRanking:
+    """Bayesian-average ranking index over rated artworks.
+
+    score = (PRIOR_WEIGHT * prior_mean + vote_sum) / (PRIOR_WEIGHT + vote_count)
+    so a single 5-star vote doesn't outrank a well-established 4.8. Keys are
+    kept sorted (globally and per author) and moved on each vote; the prior is
+    only refreshed, with a full rebuild, once the global mean drifts.
+    """
+
+    PRIOR_WEIGHT = 5
+    DEFAULT_PRIOR = 3.0
+    PRIOR_DRIFT = 0.1
+
+    def __init__(self):
+        self.entries = []      # Sorted (-score, -vote_count, artwork_id)
+        self.by_author = {}    # Author name (lowercase) -> sorted keys
+        self.author_names = {} # Author name (lowercase) -> display name
+        self.keys = {}         # artwork ID -> (key, author)
+        self.total_sum = 0
+        self.total_count = 0
+        self.prior_mean = self.DEFAULT_PRIOR
+
+    def score(self, vote_sum, vote_count):
+        return (self.PRIOR_WEIGHT * self.prior_mean + vote_sum) / (self.PRIOR_WEIGHT + vote_count)
+
+    def rebuild(self, artworks):
+        self.total_sum = sum(artwork.get("vote_sum", 0) for artwork in artworks)
+        self.total_count = sum(artwork.get("vote_count", 0) for artwork in artworks)
+        self.prior_mean = self.total_sum / self.total_count if self.total_count else self.DEFAULT_PRIOR
+
+        self.entries = []
+        self.by_author = {}
+        self.author_names = {}
+        self.keys = {}
+        for artwork in artworks:
+            if artwork.get("vote_count"):
+                key, author = self._make_key(artwork)
+                self.keys[artwork["artwork_id"]] = (key, author)
+                self.entries.append(key)
+                self.by_author.setdefault(author, []).append(key)
+        self.entries.sort()
+        for keys in self.by_author.values():
+            keys.sort()
+
+    def _make_key(self, artwork):
+        author_name = artwork.get("author_name") or "Anonymous"
+        author = author_name.lower()
+        self.author_names.setdefault(author, author_name)
+        score = self.score(artwork["vote_sum"], artwork["vote_count"])
+        return (-score, -artwork["vote_count"], artwork["artwork_id"]), author
+
+    def record_vote(self, artwork, rating, artworks):
+        """Move an artwork after a vote (its stats must already include it)"""
+        self.total_sum += rating
+        self.total_count += 1
+        if abs(self.total_sum / self.total_count - self.prior_mean) > self.PRIOR_DRIFT:
+            self.rebuild(artworks)
+            return
+
+        artwork_id = artwork["artwork_id"]
+        previous = self.keys.pop(artwork_id, None)
+        if previous:
+            old_key, old_author = previous
+            self._remove(self.entries, old_key)
+            self._remove(self.by_author[old_author], old_key)
+
+        key, author = self._make_key(artwork)
+        self.keys[artwork_id] = (key, author)
+        bisect.insort(self.entries, key)
+        bisect.insort(self.by_author.setdefault(author, []), key)
+
+    @staticmethod
+    def _remove(keys, key):
+        index = bisect.bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            del keys[index]
+
+    def page(self, offset, limit, author=None, include=None):
+        """Return ([(rank, artwork_id, score)], has_more) for a leaderboard page.
+
+        include filters out artwork IDs (e.g. removed from the Pantheon)."""
+        keys = self.entries if author is None else self.by_author.get(author.lower(), [])
+        results = []
+        rank = 0
+        for key in keys:
+            artwork_id = key[2]
+            if include is not None and not include(artwork_id):
+                continue
+            rank += 1
+            if rank <= offset:
+                continue
+            if len(results) == limit:
+                return results, True
+            results.append((rank, artwork_id, -key[0]))
+        return results, False
+
+    def search_authors(self, query, limit=25):
+        query = query.lower()
+        return [name for author, name in self.author_names.items() if query in author and self.by_author.get(author)][:limit]
+
+artwork_ranking = ArtworkRanking()
+
+VOTE_FIELDS = ("votes", "average_rating", "vote_count", "vote_sum", "rating_histogram")
+
+class VoteLedger:
+    """Per-artwork voter sets and running rating statistics.
+
+    Each notation artwork stores vote_count, vote_sum and a 1-5 star
+    rating_histogram next to its votes, so a vote never rescans the list.
+    New votes, and /random_art shows (last_shown, times_shown), are appended
+    to a journal instead of rewriting notation_data.json; the journal is
+    folded into the data file on the next full save and replayed
+    (deduplicated) when the data file is loaded.
+    Entries are only dropped from the journal once the save that contains
+    them is on disk (the writer thread calls back), so a crash or a failed
+    write never loses a vote.
+    """
+
+    COMPACT_AFTER = 500  # Journal entries before notation_data.json is rewritten
+
+    def __init__(self, rotation, journal_file='notation_votes.jsonl'):
+        self.rotation = rotation
+        self.journal_file = journal_file
+        self.voters = {}  # artwork ID -> set of user IDs
+        self.journal_size = 0
+        self.unsaved = 0  # Journal entries no save has been queued for yet
+        self._dropped_bytes = 0  # Bytes already cut from the head of the journal
+        self._journal_lock = threading.Lock()  # The writer thread trims the journal
+        self._indexed_data = None
+        rotation.notation_listeners.append(self.reindex)
+
+    def ensure_index(self):
+        data = self.rotation.get_notation_data()
+        if data is not self._indexed_data:
+            self.reindex(data)
+
+    def reindex(self, data):
+        self._indexed_data = data
+        self.voters = {}
+        for artwork in data.get("artworks", []):
+            self.init_stats(artwork)
+            self.voters[artwork.get("artwork_id")] = {vote.get("user_id") for vote in artwork["votes"]}
+        self._replay_journal()
+        artwork_ranking.rebuild(data.get("artworks", []))
+
+    @staticmethod
+    def init_stats(artwork):
+        votes = artwork.setdefault("votes", [])
+        if artwork.get("vote_count") == len(votes) and "rating_histogram" in artwork:
+            return
+        histogram = {str(star): 0 for star in range(1, 6)}
+        for vote in votes:
+            histogram[str(vote["rating"])] = histogram.get(str(vote["rating"]), 0) + 1
+        artwork["vote_count"] = len(votes)
+        artwork["vote_sum"] = sum(vote["rating"] for vote in votes)
+        artwork["rating_histogram"] = histogram
+
+    def _replay_journal(self):
+        self.journal_size = 0
+        self.unsaved = 0
+        try:
+            with self._journal_lock, open(self.journal_file, 'r') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partially written line
+            self.journal_size += 1
+            self.unsaved += 1
+            if "shown" in entry:
+                self._apply_shown(entry)
+                continue
+            artwork = self.rotation.notation_index.get(entry.get("artwork_id"))
+            if artwork is not None:
+                self._apply(artwork, entry["vote"])
+
+    def _apply_shown(self, entry):
+        artwork = self.rotation.notation_index.get(entry["artwork_id"])
+        if artwork is None:
+            # First show: the entry carries the whole notation artwork
+            if "artwork" in entry:
+                self.rotation.upsert_notation(entry["artwork"])
+        elif (artwork.get("last_shown") or "") <= entry["shown"]["last_shown"]:
+            self.rotation.upsert_notation(dict(entry["shown"], artwork_id=entry["artwork_id"]))
+
+    def _apply(self, artwork, vote):
+        """Record a vote on an artwork; returns False if the user already voted"""
+        voters = self.voters.setdefault(artwork["artwork_id"], set())
+        if vote["user_id"] in voters:
+            return False
+        voters.add(vote["user_id"])
+
+        self.init_stats(artwork)
+        artwork["votes"].append(vote)
+        artwork["vote_count"] += 1
+        artwork["vote_sum"] += vote["rating"]
+        histogram = artwork["rating_histogram"]
+        histogram[str(vote["rating"])] = histogram.get(str(vote["rating"]), 0) + 1
+        artwork["average_rating"] = round(artwork["vote_sum"] / artwork["vote_count"], 3)
+        artwork_ranking.record_vote(artwork, vote["rating"], self.rotation.notation_data["artworks"])
+        return True
+
+    def has_voted(self, artwork_id, user_id):
+        self.ensure_index()
+        return user_id in self.voters.get(artwork_id, ())
+
+    def add_vote(self, artwork_id, vote):
+        """Record and persist a vote; returns False if it was rejected"""
+        self.ensure_index()
+        artwork = self.rotation.notation_index.get(artwork_id)
+        if artwork is None or not self._apply(artwork, vote):
+            return False
+
+        with self._journal_lock, open(self.journal_file, 'a') as f:
+            f.write(json.dumps({"artwork_id": artwork_id, "vote": vote}) + "\n")
+            self.journal_size += 1
+        self.unsaved += 1
+        return True
+
+    def record_shown(self, artwork_dict):
+        """Record a /random_art show (the artwork is created on its first show)"""
+        self.ensure_index()
+        artwork_id = artwork_dict["artwork_id"]
+        entry = {"artwork_id": artwork_id,
+                 "shown": {"last_shown": artwork_dict["last_shown"], "times_shown": artwork_dict["times_shown"]}}
+        if self.rotation.notation_index.get(artwork_id) is None:
+            entry["artwork"] = artwork_dict
+        self.rotation.upsert_notation(artwork_dict)
+
+        with self._journal_lock, open(self.journal_file, 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+            self.journal_size += 1
+        self.unsaved += 1
+
+    def needs_compaction(self):
+        return self.unsaved >= self.COMPACT_AFTER
+
+    def saving(self, data):
+        """notation_data.json is being saved with every journaled entry.
+
+        Returns the on_written callback that cuts those entries from the
+        journal once the file is on disk (None if there is nothing to cut);
+        entries journaled in the meantime are kept.
+        """
+        if data is not self._indexed_data:
+            return None
+        self.unsaved = 0
+        with self._journal_lock:
+            try:
+                saved_position = self._dropped_bytes + os.path.getsize(self.journal_file)
+            except OSError:
+                return None
+        return lambda: self._drop_saved(saved_position)
+
+    def _drop_saved(self, saved_position):
+        # Writer thread: the save containing the journal up to saved_position is on disk
+        with self._journal_lock:
+            cut = saved_position - self._dropped_bytes
+            if cut <= 0:
+                return
+            try:
+                with open(self.journal_file, 'rb') as f:
+                    f.seek(cut)
+                    rest = f.read()
+            except FileNotFoundError:
+                return
+            # Replaced atomically: a crash while trimming keeps the whole journal
+            temp_file = f"{self.journal_file}.tmp"
+            with open(temp_file, 'wb') as f:
+                f.write(rest)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.journal_file)
+            self._dropped_bytes += cut
+            self.journal_size = rest.count(b"\n")
+
+vote_ledger = VoteLedger(artwork_rotation)
+
+class LeaderboardView(discord.ui.View):
+    PAGE_SIZE = 10
+
+    def __init__(self, bot, author=None):
+        super().__init__(timeout=300)
+        self.bot = bot
+        self.author = author
+        self.page = 0
+        self.has_more = False
+
+    def get_embed(self):
+        notation_manager = NotationManager()
+        entries, self.has_more = notation_manager.get_leaderboard(self.page, self.PAGE_SIZE, self.author)
+
+        title = "<:WinnerLOGO:1409635881198948593> Pantheon Leaderboard"
+        if self.author:
+            title += f" - {self.author}"
+
+        embed = discord.Embed(title=title, color=discord.Color.gold(), timestamp=datetime.utcnow())
+
+        if entries:
+            lines = []
+            for rank, artwork, score in entries:
+                rating_display = notation_manager.get_rating_display(artwork.get("average_rating", 0.0))
+                line = f"**#{rank}** {artwork.get('title', 'Untitled')}"
+                if not self.author:
+                    line += f" by {artwork.get('author_name', 'Anonymous')}"
+                line += f"\n{rating_display} {artwork.get('average_rating', 0.0):.2f} ({artwork.get('vote_count', 0)} votes, score {score:.2f})"
+                lines.append(line)
+            embed.description = "\n\n".join(lines)
+        elif self.page == 0:
+            embed.description = "No rated artworks yet."
+        else:
+            embed.description = "No more artworks."
+
+        bot_name = get_bot_name(self.bot)
+        embed.set_thumbnail(url=self.bot.user.display_avatar.url)
+        embed.set_footer(text=f"{bot_name} | Page {self.page + 1}", icon_url=self.bot.user.display_avatar.url)
+
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = not self.has_more
+        return embed
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary, emoji="<:BackLOGO:1391511633431494666>")
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = max(0, self.page - 1)
+        await interaction.response.edit_message(embed=self.get_embed(), view=self)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary, emoji="<:SendLOGO:1407071529015181443>")
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        await interaction.response.edit_message(embed=self.get_embed(), view=self)
+
 class NotationManager:
     def __init__(self):
-        self.data_file = 'notation_data.json'
-        self.pantheon_file = 'pantheon_data.json'
+        self.notation_store = artwork_rotation.notation_store
+        self.pantheon_store = artwork_rotation.pantheon_store
 
     def load_notation_data(self):
-        try:
-            with open(self.data_file, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {"artworks": []}
+        return artwork_rotation.get_notation_data()
 
     def save_notation_data(self, data):
-        with open(self.data_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        # The rotation's copy is authoritative (votes go through the ledger): no merge.
+        # The vote journal is trimmed by the writer once the file is on disk
+        self.notation_store.save(data, merge=False, on_written=vote_ledger.saving(data))
+        artwork_rotation.notation_saved(data)
 
     def load_pantheon_data(self):
-        try:
-            with open(self.pantheon_file, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {"artworks": []}
+        return self.pantheon_store.load(default=lambda: {"artworks": []})
 
     def get_random_artwork(self):
-        pantheon_data = self.load_pantheon_data()
-        notation_data = self.load_notation_data()
-        
-        if not pantheon_data.get("artworks"):
+        selection = artwork_rotation.next_artwork()
+        if not selection:
             return None
 
-        # Create a mapping of notation data by artwork ID
-        notation_map = {artwork.get("artwork_id"): artwork for artwork in notation_data.get("artworks", [])}
-
-        # Prioritize artworks that have never been shown
-        never_shown = []
-        shown_artworks = []
-
-        for artwork in pantheon_data["artworks"]:
-            artwork_id = artwork.get("id")
-            if artwork_id not in notation_map:
-                never_shown.append(artwork)
-            else:
-                shown_artworks.append((artwork, notation_map[artwork_id]))
-
-        # If there are never shown artworks, pick one randomly
-        if never_shown:
-            selected = random.choice(never_shown)
-            return self.create_notation_data_from_pantheon(selected)
+        selected_pantheon, selected_notation = selection
+        if selected_notation is None:
+            return self.create_notation_data_from_pantheon(selected_pantheon)
 
-        # If all have been shown, pick the one shown longest ago
-        if shown_artworks:
-            # Sort by last_shown timestamp (oldest first)
-            shown_artworks.sort(key=lambda x: x[1].get("last_shown", ""))
-            selected_pantheon, selected_notation = shown_artworks[0]
-            
-            # Update the artwork data
-            notation_artwork = NotationData()
-            notation_artwork.artwork_id = selected_notation.get("artwork_id")
-            notation_artwork.title = selected_notation.get("title", "")
-            notation_artwork.description = selected_notation.get("description", "")
-            notation_artwork.author_name = selected_notation.get("author_name", "Anonymous")
-            notation_artwork.image_url = selected_notation.get("image_url", "")
-            notation_artwork.location = selected_notation.get("location", "")
-            notation_artwork.votes = selected_notation.get("votes", [])
-            notation_artwork.average_rating = selected_notation.get("average_rating", 0.0)
-            notation_artwork.last_shown = datetime.utcnow().isoformat()
-            notation_artwork.times_shown = selected_notation.get("times_shown", 0) + 1
-
-            return notation_artwork
+        # Update the artwork data
+        notation_artwork = NotationData()
+        notation_artwork.artwork_id = selected_notation.get("artwork_id")
+        notation_artwork.title = selected_notation.get("title", "")
+        notation_artwork.description = selected_notation.get("description", "")
+        notation_artwork.author_name = selected_notation.get("author_name", "Anonymous")
+        notation_artwork.image_url = selected_notation.get("image_url", "")
+        # The Pantheon has the preview of the current upload (the notation copy can be older)
+        notation_artwork.preview_url = selected_pantheon.get("preview_url") or selected_notation.get("preview_url", "")
+        notation_artwork.location = selected_notation.get("location", "")
+        notation_artwork.votes = selected_notation.get("votes", [])
+        notation_artwork.average_rating = selected_notation.get("average_rating", 0.0)
+        notation_artwork.last_shown = datetime.utcnow().isoformat()
+        notation_artwork.times_shown = selected_notation.get("times_shown", 0) + 1
 
-        return None
+        return notation_artwork
 
     def create_notation_data_from_pantheon(self, pantheon_artwork):
         notation_artwork = NotationData()
@@ -330,6 +808,7 @@ class NotationManager:
         notation_artwork.description = pantheon_artwork.get("description", "No description")
         notation_artwork.author_name = pantheon_artwork.get("author_name", "Anonymous")
         notation_artwork.image_url = pantheon_artwork.get("image_url", "")
+        notation_artwork.preview_url = pantheon_artwork.get("preview_url", "")
         notation_artwork.location = pantheon_artwork.get("location", "")
         notation_artwork.votes = []
         notation_artwork.average_rating = 0.0
@@ -339,21 +818,13 @@ class NotationManager:
         return notation_artwork
 
     def update_artwork_shown(self, artwork_data):
-        notation_data = self.load_notation_data()
-        
-        # Find existing artwork or create new entry
-        existing_artwork = None
-        for i, artwork in enumerate(notation_data.get("artworks", [])):
-            if artwork.get("artwork_id") == artwork_data.artwork_id:
-                existing_artwork = i
-                break
-
         artwork_dict = {
             "artwork_id": artwork_data.artwork_id,
             "title": artwork_data.title,
             "description": artwork_data.description,
             "author_name": artwork_data.author_name,
             "image_url": artwork_data.image_url,
+            "preview_url": artwork_data.preview_url,
             "location": artwork_data.location,
             "votes": artwork_data.votes,
             "average_rating": artwork_data.average_rating,
@@ -361,72 +832,61 @@ class NotationManager:
             "times_shown": artwork_data.times_shown
         }
 
-        if existing_artwork is not None:
-            notation_data["artworks"][existing_artwork] = artwork_dict
-        else:
-            if "artworks" not in notation_data:
-                notation_data["artworks"] = []
-            notation_data["artworks"].append(artwork_dict)
-
-        self.save_notation_data(notation_data)
+        # Journaled like votes: notation_data.json is only rewritten on compaction
+        vote_ledger.record_shown(artwork_dict)
+        if vote_ledger.needs_compaction():
+            self.save_notation_data(self.load_notation_data())
 
     def has_user_voted(self, artwork_id, user_id):
-        notation_data = self.load_notation_data()
-        
-        for artwork in notation_data.get("artworks", []):
-            if artwork.get("artwork_id") == artwork_id:
-                for vote in artwork.get("votes", []):
-                    if vote.get("user_id") == user_id:
-                        return True
-        return False
+        return vote_ledger.has_voted(artwork_id, user_id)
 
     def add_vote(self, artwork_id, user_id, rating):
-        if self.has_user_voted(artwork_id, user_id):
+        vote = {
+            "user_id": user_id,
+            "rating": rating,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        if not vote_ledger.add_vote(artwork_id, vote):
             return False
 
-        notation_data = self.load_notation_data()
-        
-        # Find artwork
-        for artwork in notation_data.get("artworks", []):
-            if artwork.get("artwork_id") == artwork_id:
-                # Add vote
-                vote = {
-                    "user_id": user_id,
-                    "rating": rating,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-                artwork["votes"].append(vote)
-                
-                # Calculate new average
-                total_rating = sum(vote["rating"] for vote in artwork["votes"])
-                artwork["average_rating"] = round(total_rating / len(artwork["votes"]), 3)
-                
-                self.save_notation_data(notation_data)
-                return True
-        
-        return False
+        if vote_ledger.needs_compaction():
+            self.save_notation_data(self.load_notation_data())
+        return True
 
     def get_artwork_by_id(self, artwork_id):
         """Get artwork data by ID"""
-        notation_data = self.load_notation_data()
-        
-        for artwork in notation_data.get("artworks", []):
-            if artwork.get("artwork_id") == artwork_id:
-                # Convert to NotationData object
-                notation_artwork = NotationData()
-                notation_artwork.artwork_id = artwork.get("artwork_id")
-                notation_artwork.title = artwork.get("title", "")
-                notation_artwork.description = artwork.get("description", "")
-                notation_artwork.author_name = artwork.get("author_name", "Anonymous")
-                notation_artwork.image_url = artwork.get("image_url", "")
-                notation_artwork.location = artwork.get("location", "")
-                notation_artwork.votes = artwork.get("votes", [])
-                notation_artwork.average_rating = artwork.get("average_rating", 0.0)
-                notation_artwork.last_shown = artwork.get("last_shown")
-                notation_artwork.times_shown = artwork.get("times_shown", 0)
-                return notation_artwork
-        
-        return None
+        artwork = artwork_rotation.get_notation(artwork_id)
+
+        if artwork is None:
+            return None
+
+        # Convert to NotationData object
+        notation_artwork = NotationData()
+        notation_artwork.artwork_id = artwork.get("artwork_id")
+        notation_artwork.title = artwork.get("title", "")
+        notation_artwork.description = artwork.get("description", "")
+        notation_artwork.author_name = artwork.get("author_name", "Anonymous")
+        notation_artwork.image_url = artwork.get("image_url", "")
+        notation_artwork.preview_url = artwork.get("preview_url", "")
+        notation_artwork.location = artwork.get("location", "")
+        notation_artwork.votes = artwork.get("votes", [])
+        notation_artwork.average_rating = artwork.get("average_rating", 0.0)
+        notation_artwork.last_shown = artwork.get("last_shown")
+        notation_artwork.times_shown = artwork.get("times_shown", 0)
+        return notation_artwork
+
+    def get_leaderboard(self, page, page_size, author=None):
+        """Return ([(rank, artwork, score)], has_more) from the ranking index"""
+        vote_ledger.ensure_index()
+        entries, has_more = artwork_ranking.page(
+            page * page_size, page_size, author,
+            include=lambda artwork_id: artwork_id in artwork_rotation.pantheon_index
+        )
+        return [(rank, artwork_rotation.notation_index[artwork_id], score) for rank, artwork_id, score in entries], has_more
+
+    def search_authors(self, query):
+        vote_ledger.ensure_index()
+        return artwork_ranking.search_authors(query)
 
     def get_rating_display(self, average_rating):
         if average_rating == 0:
@@ -479,7 +939,7 @@ class NotationSystem(commands.Cog):
 
         # Add image if available
         if artwork_data.image_url:
-            embed.set_image(url=artwork_data.image_url)
+            embed.set_image(url=artwork_data.preview_url or artwork_data.image_url)
         else:
             embed.set_thumbnail(url=self.bot.user.display_avatar.url)
 
@@ -506,5 +966,16 @@ class NotationSystem(commands.Cog):
         
         await interaction.response.send_message(embed=embed, view=view)
 
+    @app_commands.command(name="art_leaderboard", description="Display the top rated artworks of the Pantheon")
+    @app_commands.describe(author="Only show artworks from this author")
+    async def art_leaderboard(self, interaction: discord.Interaction, author: str = None):
+        view = LeaderboardView(self.bot, author)
+        await interaction.response.send_message(embed=view.get_embed(), view=view)
+
+    @art_leaderboard.autocomplete("author")
+    async def art_leaderboard_author_autocomplete(self, interaction: discord.Interaction, current: str):
+        notation_manager = NotationManager()
+        return [app_commands.Choice(name=name[:100], value=name[:100]) for name in notation_manager.search_authors(current)]
+
 async def setup(bot):
     await bot.add_cog(NotationSystem(bot))
@@ -0,0 +1,301 @@
+import atexit
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from color_metrics import get_color_metric
+from lazy_imports import LazyModule
+np = LazyModule('numpy')
+
+PALETTE_CACHE_DIR = 'palette_cache'
+MAX_CACHED_BYTES = int(os.getenv('PALETTE_CACHE_MAX_BYTES', 64 * 1024 * 1024))  # Tables kept in memory (LRU)
+SAVE_DELAY = 30.0  # Seconds refinements are batched before the table is written, from a timer thread
+EXACT_ENTRY_BYTES = 100  # Memory of one color of an exact table (dict entry, int key and value)
+
+BITS = 6  # Per channel: 64 x 64 x 64 coarse cells of 4 x 4 x 4 colors
+AMBIGUOUS = 255  # Coarse entry of a cell whose colors don't all map to one palette color
+CELL_SIDE = 256 >> BITS
+CHUNK_SIZE = 1 << 15  # Cells per vectorized build step
+REFINE_CHUNK_SIZE = 1 << 11
+
+class PaletteLUT:
+    """RGB -> palette index lookup table for one palette and distance metric.
+
+    Each coarse cell stores the palette index shared by all of its 64 colors.
+    Cells close to a boundary between two palette colors are marked
+    AMBIGUOUS and refined exactly (one index per color) the first time an
+    image hits them, so lookups always match a full distance search.
+
+    Metrics without a cell bound (CIEDE2000) map each color seen so far to
+    its index instead (a dict, only as large as the colors actually met).
+    New refinements are written to the disk cache SAVE_DELAY seconds later
+    by a timer thread, never on the conversion path.
+    """
+
+    def __init__(self, palette, metric='rgb', path=None):
+        self.palette = np.asarray(palette, dtype=np.float32).reshape(-1, 3)
+        self.metric = get_color_metric(metric) if isinstance(metric, str) else metric
+        self.palette_features = self.metric.prepare(self.palette)
+        self.path = path
+        self.coarse = None
+        self.fine_rows = None  # cell -> row of self.fine, -1 if not refined yet
+        self.fine = None       # refined cells: 64 palette indices per row
+        self.exact = None      # 24-bit color -> palette index, unbounded metrics only
+        self._coarse_bytes = b""
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._save_timer = None
+
+        if len(self.palette) >= AMBIGUOUS:
+            raise ValueError(f"Palettes are limited to {AMBIGUOUS - 1} colors")
+        if not (path and self._load()):
+            self._build()
+            self._schedule_save()
+
+    def _distances(self, rgb, candidates=None):
+        """Distances from (n, [m,] 3) RGB values to every palette color (or to candidates[n, k])"""
+        features = self.metric.prepare(rgb)
+        if candidates is None:
+            palette_features = self.palette_features
+        else:
+            palette_features = self.palette_features[candidates]
+            if features.ndim == 3:
+                palette_features = palette_features[:, np.newaxis, :, :]
+        return self.metric.distance(features[..., np.newaxis, :], palette_features)
+
+    def _cell_bounds(self, base):
+        """Center of the cells starting at base, and how far distances can move inside them"""
+        low = base.astype(np.float32)
+        high = low + (CELL_SIDE - 1)
+        return (low + high) / 2, self.metric.cell_radius(low, high)
+
+    def _build(self):
+        if self.metric.cell_radius(np.zeros(3), np.full(3, CELL_SIDE - 1)) is None:
+            self.exact = {}
+            return
+
+        levels = np.arange(1 << BITS) * CELL_SIDE
+        bases = np.stack(np.meshgrid(levels, levels, levels, indexing='ij'), axis=-1).reshape(-1, 3)
+
+        self.coarse = np.empty(len(bases), dtype=np.uint8)
+        for start in range(0, len(bases), CHUNK_SIZE):
+            centers, radius = self._cell_bounds(bases[start:start + CHUNK_SIZE])
+            distances = self._distances(centers)
+            nearest = np.argmin(distances, axis=1)
+            if len(self.palette) > 1:
+                # Unambiguous when the nearest color beats the second one by
+                # more than twice the radius: no color of the cell can cross
+                # over (the slack covers float32 rounding)
+                two_best = np.partition(distances, 1, axis=1)[:, :2]
+                slack = 1e-3 * (1 + two_best[:, 0])
+                nearest[two_best[:, 1] - two_best[:, 0] <= 2 * radius + slack] = AMBIGUOUS
+            self.coarse[start:start + CHUNK_SIZE] = nearest
+
+        self.fine_rows = np.full(len(bases), -1, dtype=np.int32)
+        self.fine = np.empty((0, CELL_SIDE ** 3), dtype=np.uint8)
+        self._coarse_bytes = self.coarse.tobytes()
+        self._dirty = True
+
+    def _refine_chunk(self, cells):
+        mask = (1 << BITS) - 1
+        base = np.stack([(cells >> (2 * BITS)) & mask, (cells >> BITS) & mask, cells & mask], axis=1) * CELL_SIDE
+        offsets = np.stack(np.meshgrid(*[np.arange(CELL_SIDE)] * 3, indexing='ij'), axis=-1).reshape(-1, 3)
+        points = (base[:, np.newaxis, :] + offsets[np.newaxis, :, :]).astype(np.float32)
+
+        # Only colors within twice the radius of the best one can win somewhere
+        # in the cell. Candidates keep palette order (argmin tie-breaking) and
+        # are padded with the first one, which can't change the result
+        centers, radius = self._cell_bounds(base)
+        distances = self._distances(centers)
+        best_distance = distances.min(axis=1, keepdims=True)
+        reach = distances <= best_distance + 2 * np.reshape(radius, (-1, 1)) + 1e-3 * (1 + best_distance)
+        order = np.argsort(~reach, axis=1, kind='stable')[:, :int(reach.sum(axis=1).max())]
+        candidates = np.where(np.take_along_axis(reach, order, axis=1), order, order[:, :1])
+
+        # Same arithmetic as a full search (ColorMetric.nearest)
+        best = np.argmin(self._distances(points, candidates), axis=2)
+        return np.take_along_axis(candidates, best, axis=1).astype(np.uint8)
+
+    def _refine(self, cells):
+        """Compute the exact index of every color of the given cells"""
+        with self._lock:
+            cells = cells[self.fine_rows[cells] < 0]
+            if len(cells) == 0:
+                return
+            rows = np.concatenate([self._refine_chunk(cells[start:start + REFINE_CHUNK_SIZE])
+                                   for start in range(0, len(cells), REFINE_CHUNK_SIZE)])
+            first_row = len(self.fine)
+            # Rows must exist before cells point at them (lookups don't take the lock)
+            self.fine = np.concatenate([self.fine, rows])
+            self.fine_rows[cells] = np.arange(first_row, first_row + len(cells), dtype=np.int32)
+            self._dirty = True
+        self._schedule_save()
+
+    # Lookups
+    def lookup(self, rgb):
+        """Palette indices (uint8) of an (..., 3) uint8 RGB array"""
+        rgb = np.asarray(rgb)
+        shape = rgb.shape[:-1]
+        flat = rgb.reshape(-1, 3).astype(np.int32)
+        if self.exact is not None:
+            return self._lookup_exact(flat).reshape(shape)
+
+        shift = 8 - BITS
+        cells = ((flat[:, 0] >> shift) << (2 * BITS)) | ((flat[:, 1] >> shift) << BITS) | (flat[:, 2] >> shift)
+        indices = self.coarse[cells]
+
+        ambiguous = indices == AMBIGUOUS
+        if ambiguous.any():
+            ambiguous_cells = cells[ambiguous]
+            self._refine(np.unique(ambiguous_cells))
+            sub = flat[ambiguous] % CELL_SIDE
+            sub_index = (sub[:, 0] * CELL_SIDE + sub[:, 1]) * CELL_SIDE + sub[:, 2]
+            indices[ambiguous] = self.fine[self.fine_rows[ambiguous_cells], sub_index]
+
+        return indices.reshape(shape)
+
+    def _lookup_exact(self, flat):
+        keys = (flat[:, 0] << 16) | (flat[:, 1] << 8) | flat[:, 2]
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        exact = self.exact
+        indices = np.fromiter((exact.get(key, AMBIGUOUS) for key in unique_keys.tolist()),
+                              dtype=np.uint8, count=len(unique_keys))
+        missing = indices == AMBIGUOUS
+        if missing.any():
+            new_keys = unique_keys[missing]
+            colors = np.stack([new_keys >> 16, (new_keys >> 8) & 255, new_keys & 255], axis=1)
+            nearest = np.asarray(self.metric.nearest(colors, self.palette_features), dtype=np.uint8)
+            with self._lock:
+                exact.update(zip(new_keys.tolist(), nearest.tolist()))
+                self._dirty = True
+            indices[missing] = nearest
+            self._schedule_save()
+        return indices[inverse.reshape(-1)]
+
+    def index_of(self, r, g, b):
+        """Palette index of a single color (values are rounded and clamped), for per-pixel loops"""
+        r = min(255, max(0, int(r + 0.5)))
+        g = min(255, max(0, int(g + 0.5)))
+        b = min(255, max(0, int(b + 0.5)))
+        if self.exact is not None:
+            index = self.exact.get((r << 16) | (g << 8) | b, AMBIGUOUS)
+        else:
+            shift = 8 - BITS
+            index = self._coarse_bytes[((r >> shift) << (2 * BITS)) | ((g >> shift) << BITS) | (b >> shift)]
+        if index != AMBIGUOUS:
+            return index
+        return int(self.lookup(np.array([r, g, b], dtype=np.uint8)))
+
+    def quantize(self, rgb):
+        """Nearest palette color (float32) of each pixel of an (..., 3) uint8 RGB array"""
+        return self.palette[self.lookup(rgb)]
+
+    # Disk cache
+    def _load(self):
+        try:
+            with np.load(self.path) as cached:
+                if not (np.array_equal(cached["palette"], self.palette) and cached["bits"] == BITS
+                        and str(cached["metric"]) == self.metric.name):
+                    return False
+                if "exact_keys" in cached.files:
+                    self.exact = dict(zip(cached["exact_keys"].tolist(), cached["exact_values"].tolist()))
+                    return True
+                if "exact" in cached.files:
+                    # Dense 2^24 table of older caches
+                    dense = cached["exact"]
+                    keys = np.flatnonzero(dense != AMBIGUOUS)
+                    self.exact = dict(zip(keys.tolist(), dense[keys].tolist()))
+                    return True
+                self.coarse = cached["coarse"]
+                self.fine_rows = cached["fine_rows"]
+                self.fine = cached["fine"]
+        except Exception as e:
+            if os.path.exists(self.path):
+                print(f"Ignoring palette cache {self.path}: {e}")
+            return False
+        self._coarse_bytes = self.coarse.tobytes()
+        return True
+
+    def nbytes(self):
+        """Approximate memory used by the table"""
+        if self.exact is not None:
+            return len(self.exact) * EXACT_ENTRY_BYTES
+        return self.coarse.nbytes + self.fine_rows.nbytes + self.fine.nbytes
+
+    def _schedule_save(self):
+        """Save SAVE_DELAY seconds from now (the refinements made until then are written together)"""
+        if not self.path:
+            return
+        with _pending_lock:
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(SAVE_DELAY, self.save)
+                self._save_timer.daemon = True
+                _pending_saves.add(self)
+                self._save_timer.start()
+
+    def save(self):
+        """Write the table (with its refined cells) to the disk cache now"""
+        with _pending_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            _pending_saves.discard(self)
+        if not self.path:
+            return
+
+        # Copied under the lock, compressed and written outside it (lookups keep refining)
+        with self._lock:
+            if not self._dirty:
+                return
+            if self.exact is not None:
+                tables = {"exact_keys": np.fromiter(self.exact.keys(), dtype=np.int32, count=len(self.exact)),
+                          "exact_values": np.fromiter(self.exact.values(), dtype=np.uint8, count=len(self.exact))}
+            else:
+                tables = {"coarse": self.coarse, "fine_rows": self.fine_rows.copy(), "fine": self.fine}
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                np.savez_compressed(f, palette=self.palette, bits=BITS, metric=self.metric.name, **tables)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Cannot save palette cache {self.path}: {e}")
+            with self._lock:
+                self._dirty = True
+
+_pending_saves = set()  # Tables with a save scheduled (evicted ones included)
+_pending_lock = threading.Lock()
+
+def save_pending():
+    """Write every table with unsaved refinements now (at exit)"""
+    with _pending_lock:
+        tables = list(_pending_saves)
+    for table in tables:
+        table.save()
+
+atexit.register(save_pending)
+
+_tables = OrderedDict()
+_tables_lock = threading.Lock()
+
+def palette_signature(palette, metric='rgb'):
+    """Stable key of a palette (colors in order) and color metric name"""
+    digest = hashlib.sha1(f"bits={BITS};metric={metric}".encode())
+    digest.update(np.asarray(palette, dtype=np.float32).tobytes())
+    return digest.hexdigest()[:20]
+
+def get_palette_lut(palette, metric='rgb'):
+    """Cached PaletteLUT for a palette and metric name: from memory, else from disk, else built"""
+    signature = palette_signature(palette, metric)
+    with _tables_lock:
+        table = _tables.get(signature)
+        if table is not None:
+            _tables.move_to_end(signature)
+        else:
+            table = _tables[signature] = PaletteLUT(palette, metric, os.path.join(PALETTE_CACHE_DIR, f"{signature}.npz"))
+        # Tables grow as they are refined: the budget is checked on each access
+        while len(_tables) > 1 and sum(cached.nbytes() for cached in _tables.values()) > MAX_CACHED_BYTES:
+            _tables.popitem(last=False)
+        return table
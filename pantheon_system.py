@@ -2,13 +2,17 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import json
 import os
-import aiohttp
 import uuid
 import base64
 import requests
 import time
+import asyncio
+from image_derivatives import FORMAT_EXTENSIONS, content_address, create_derivatives
+from image_ingest import ImageRejected, fetch_source_image
+from json_store import json_document
+
+pantheon_store = json_document('pantheon_data.json')
 
 def get_bot_name(bot):
     """Get the bot's display name"""
@@ -21,6 +25,8 @@ class PantheonArtwork:
         self.description = ""
         self.location = ""
         self.image_url = ""
+        self.preview_url = ""
+        self.thumbnail_url = ""
         self.author_enabled = False
         self.author_name = ""
         self.author_icon = ""
@@ -49,20 +55,20 @@ class PantheonManagerView(discord.ui.View):
         self.delete_select_mode = False
 
     def load_artworks(self):
-        try:
-            with open('pantheon_data.json', 'r') as f:
-                data = json.load(f)
-                # Add IDs to existing artworks that don't have them
-                for artwork in data.get("artworks", []):
-                    if "id" not in artwork:
-                        artwork["id"] = PantheonArtwork().generate_unique_id()
-                return data
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {"artworks": []}
+        data = pantheon_store.load(default=lambda: {"artworks": []})
+        # Add IDs to existing artworks that don't have them
+        for artwork in data.get("artworks", []):
+            if "id" not in artwork:
+                artwork["id"] = PantheonArtwork().generate_unique_id()
+        return data
 
     def save_artworks(self):
-        with open('pantheon_data.json', 'w') as f:
-            json.dump(self.artworks_data, f, indent=2)
+        # Merges with edits saved by other admins since this view loaded the artworks
+        pantheon_store.save(self.artworks_data)
+
+        # Keep the /random_art rotation in sync with Pantheon edits
+        from notation_system import artwork_rotation
+        artwork_rotation.sync_pantheon(self.artworks_data)
 
     def save_current_artwork(self):
         """Save the current artwork to the artworks list"""
@@ -76,6 +82,8 @@ class PantheonManagerView(discord.ui.View):
                 "description": self.current_artwork.description,
                 "location": self.current_artwork.location,
                 "image_url": self.current_artwork.image_url,
+                "preview_url": self.current_artwork.preview_url,
+                "thumbnail_url": self.current_artwork.thumbnail_url,
                 "author_enabled": self.current_artwork.author_enabled,
                 "author_name": self.current_artwork.author_name,
                 "author_icon": self.current_artwork.author_icon,
@@ -164,7 +172,8 @@ class PantheonManagerView(discord.ui.View):
             )
 
         bot_name = get_bot_name(self.bot)
-        embed.set_thumbnail(url=self.bot.user.display_avatar.url)
+        # Artwork thumbnail once an image is uploaded
+        embed.set_thumbnail(url=self.current_artwork.thumbnail_url or self.bot.user.display_avatar.url)
         embed.set_footer(text=f"{bot_name} | {action}", icon_url=self.bot.user.display_avatar.url)
 
         return embed
@@ -221,7 +230,7 @@ class PantheonManagerView(discord.ui.View):
         )
 
         bot_name = get_bot_name(self.bot)
-        embed.set_thumbnail(url=self.bot.user.display_avatar.url)
+        embed.set_thumbnail(url=self.current_artwork.thumbnail_url or self.bot.user.display_avatar.url)
         embed.set_footer(text=f"{bot_name} | Image Settings", icon_url=self.bot.user.display_avatar.url)
 
         return embed
@@ -297,6 +306,8 @@ class PantheonManagerView(discord.ui.View):
 
             async def clear_callback(interaction):
                 self.current_artwork.image_url = ""
+                self.current_artwork.preview_url = ""
+                self.current_artwork.thumbnail_url = ""
                 embed = self.get_image_settings_embed()
                 self.update_buttons()
                 await interaction.response.edit_message(embed=embed, view=self)
@@ -528,6 +539,9 @@ class PantheonImageURLModal(discord.ui.Modal):
     async def on_submit(self, interaction: discord.Interaction):
         image_url = self.url_input.value.strip()
         self.artwork_data.image_url = image_url
+        # External URLs have no generated derivatives
+        self.artwork_data.preview_url = ""
+        self.artwork_data.thumbnail_url = ""
         
         self.parent_view.image_mode = True
         embed = self.parent_view.get_image_settings_embed()
@@ -759,6 +773,8 @@ class ArtworkEditSelect(discord.ui.Select):
         parent_view.current_artwork.description = selected_artwork.get("description", "")
         parent_view.current_artwork.location = selected_artwork.get("location", "")
         parent_view.current_artwork.image_url = selected_artwork.get("image_url", "")
+        parent_view.current_artwork.preview_url = selected_artwork.get("preview_url", "")
+        parent_view.current_artwork.thumbnail_url = selected_artwork.get("thumbnail_url", "")
         parent_view.current_artwork.author_enabled = selected_artwork.get("author_enabled", False)
         parent_view.current_artwork.author_name = selected_artwork.get("author_name", "")
         parent_view.current_artwork.author_icon = selected_artwork.get("author_icon", "")
@@ -945,34 +961,54 @@ class PantheonCommand(commands.Cog):
         self.active_managers = {}
 
     async def download_image(self, image_url):
-        """Download image from URL, save locally, sync to GitHub, then delete locally"""
+        """Download an image and sync it to GitHub with its preview and thumbnail.
+
+        Files are named after their content hash; returns the URLs of the
+        original and its derivatives, or None if the original couldn't be stored.
+        """
         try:
+            # Same size and pixel limits as the converters
+            source = await fetch_source_image(image_url)
+            try:
+                source.buffer.seek(0)
+                data = source.buffer.read()
+            finally:
+                source.close()
+
+            stem = content_address(data)
+            derivatives = await asyncio.to_thread(create_derivatives, data)
+
+            files = {"image_url": (f"{stem}.{FORMAT_EXTENSIONS.get(source.format, 'png')}", data)}
+            if derivatives:
+                files["preview_url"] = (f"{stem}_preview.webp", derivatives["preview"])
+                files["thumbnail_url"] = (f"{stem}_thumb.png", derivatives["thumbnail"])
+
             os.makedirs('images', exist_ok=True)
-            filename = f"{uuid.uuid4()}.png"
-            file_path = os.path.join('images', filename)
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(image_url) as response:
-                    if response.status == 200:
-                        with open(file_path, 'wb') as f:
-                            async for chunk in response.content.iter_chunked(8192):
-                                f.write(chunk)
-
-                        from github_sync import GitHubSync
-                        github_sync = GitHubSync()
-                        sync_success = await github_sync.sync_image_to_pictures_repo(file_path)
-
-                        if sync_success:
-                            try:
-                                os.remove(file_path)
-                            except Exception as e:
-                                print(f"Error removing local file: {e}")
-
-                            filename = os.path.basename(file_path)
-                            github_url = f"https://raw.githubusercontent.com/TheBlueEL/pictures/main/{filename}"
-                            return github_url
-                        else:
-                            return None
+            from github_sync import GitHubSync
+            github_sync = GitHubSync()
+
+            async def upload(filename, content):
+                file_path = os.path.join('images', filename)
+                with open(file_path, 'wb') as f:
+                    f.write(content)
+
+                sync_success = await github_sync.sync_image_to_pictures_repo(file_path, content_addressed=True)
+                if sync_success:
+                    try:
+                        os.remove(file_path)
+                    except Exception as e:
+                        print(f"Error removing local file: {e}")
+                return sync_success
+
+            # Original, preview and thumbnail uploaded at the same time
+            results = await asyncio.gather(*(upload(filename, content) for filename, content in files.values()))
+            urls = {key: f"https://raw.githubusercontent.com/TheBlueEL/pictures/main/{filename}"
+                    for (key, (filename, _)), sync_success in zip(files.items(), results) if sync_success}
+            if "image_url" not in urls:
+                return None
+            return urls
+        except ImageRejected as e:
+            print(f"Image rejected: {e}")
             return None
         except Exception as e:
             print(f"Error downloading image: {e}")
@@ -988,17 +1024,19 @@ class PantheonCommand(commands.Cog):
             manager = self.active_managers[user_id]
             if manager.waiting_for_image and message.attachments:
                 attachment = message.attachments[0]
-                allowed_extensions = ['.png', '.jpg', '.jpeg', '.gif', '.webp', '.bmp', '.svg']
+                allowed_extensions = ['.png', '.jpg', '.jpeg', '.gif', '.webp', '.bmp']
                 if any(attachment.filename.lower().endswith(ext) for ext in allowed_extensions):
-                    local_file = await self.download_image(attachment.url)
+                    image_urls = await self.download_image(attachment.url)
 
-                    if local_file:
+                    if image_urls:
                         try:
                             await message.delete()
                         except:
                             pass
 
-                        manager.current_artwork.image_url = local_file
+                        manager.current_artwork.image_url = image_urls["image_url"]
+                        manager.current_artwork.preview_url = image_urls.get("preview_url", "")
+                        manager.current_artwork.thumbnail_url = image_urls.get("thumbnail_url", "")
                         manager.waiting_for_image = False
                         manager.save_current_artwork()
 
@@ -1015,7 +1053,7 @@ class PantheonCommand(commands.Cog):
                         )
 
                         bot_name = get_bot_name(self.bot)
-                        embed.set_thumbnail(url=self.bot.user.display_avatar.url)
+                        embed.set_thumbnail(url=manager.current_artwork.thumbnail_url or self.bot.user.display_avatar.url)
                         embed.set_footer(text=f"{bot_name} | Image Settings", icon_url=self.bot.user.display_avatar.url)
 
                         manager.update_buttons()
@@ -1037,7 +1075,7 @@ class PantheonCommand(commands.Cog):
 
                     error_embed = discord.Embed(
                         title="<:ErrorLOGO:1407071682031648850> Invalid File Type",
-                        description="Please upload only image files with these extensions:\n`.png`, `.jpg`, `.jpeg`, `.gif`, `.webp`, `.bmp`, `.svg`",
+                        description="Please upload only image files with these extensions:\n`.png`, `.jpg`, `.jpeg`, `.gif`, `.webp`, `.bmp`",
                         color=discord.Color.red()
                     )
 
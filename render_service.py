@@ -0,0 +1,179 @@
+import asyncio
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import card_encoder
+
+# Card rendering off the event loop: assets are downloaded by the cogs, then a
+# pure render function (module-level, picklable arguments) runs in a worker
+# process. 0 processes: threads only (asyncio.to_thread)
+RENDER_PROCESSES = int(os.getenv('CARD_RENDER_PROCESSES', min(2, os.cpu_count() or 1)))
+RENDER_TIMEOUT = float(os.getenv('CARD_RENDER_TIMEOUT', 60))  # Seconds before a render is given up
+RENDER_LIMITS = {  # Renders of one kind running at the same time
+    'level': 2,
+    'level_demo': 1,
+    'notification': 2,
+    'welcome': 2,
+    'welcome_template': 1,  # Background decode of a new welcome configuration
+}
+DEFAULT_RENDER_LIMIT = 2
+
+# What a render needs from a discord.User / Member (those can't be pickled);
+# the avatar comes from avatar_cache, already circular at the card's size
+CardUser = namedtuple('CardUser', ['id', 'name', 'discriminator', 'display_name'])
+
+def card_user(user):
+    return CardUser(user.id, user.name, user.discriminator, user.display_name)
+
+def _run_pickled(payload):
+    """Worker process side: run the render, return its result and the encoder stats it produced"""
+    function, args = pickle.loads(payload)
+    # A worker runs one task at a time: its stats are only this render's
+    card_encoder.encoder_stats.clear()
+    result = function(*args)
+    return result, dict(card_encoder.encoder_stats)
+
+class RenderService:
+    """Runs card renders in a process pool, with a thread fallback.
+
+    Each kind of card has its own concurrency limit (a raid of welcome cards
+    doesn't delay /level) and every render has a timeout. A worker can't be
+    interrupted, so a render that times out in a worker terminates the pool
+    (the renders it was also running fall back to threads) and the next
+    render starts a new one. Functions or arguments that can't be pickled,
+    and a broken pool, fall back to a thread.
+    """
+
+    def __init__(self, processes=RENDER_PROCESSES, timeout=RENDER_TIMEOUT, limits=None):
+        self.processes = processes
+        self.timeout = timeout
+        self.limits = dict(RENDER_LIMITS if limits is None else limits)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._semaphores = {}
+        self.stats = {}  # kind -> counters, see get_stats()
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None and self.processes > 0:
+                # spawn: workers don't inherit the bot's sockets and event loop
+                self._pool = ProcessPoolExecutor(max_workers=self.processes,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+            return self._pool
+
+    def _reset_pool(self, pool):
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _terminate_pool(self, pool):
+        """Kill the workers of a pool: a stuck render would hold its worker forever"""
+        with self._pool_lock:
+            if self._pool is not pool:
+                return False  # Already replaced (another render timed out in it)
+        processes = list((getattr(pool, '_processes', None) or {}).values())
+        self._reset_pool(pool)
+        for process in processes:
+            process.terminate()
+        return True
+
+    def _semaphore(self, kind):
+        # Créés au premier usage, dans la boucle du bot
+        semaphore = self._semaphores.get(kind)
+        if semaphore is None:
+            semaphore = self._semaphores[kind] = asyncio.Semaphore(self.limits.get(kind, DEFAULT_RENDER_LIMIT))
+        return semaphore
+
+    def _kind_stats(self, kind):
+        return self.stats.setdefault(kind, {
+            "renders": 0, "in_process": 0, "in_thread": 0, "fallbacks": 0,
+            "timeouts": 0, "errors": 0, "pool_restarts": 0, "running": 0, "waiting": 0,
+            "total_ms": 0.0, "last_ms": 0.0, "max_ms": 0.0
+        })
+
+    async def _run_in_process(self, pool, function, args, stats):
+        try:
+            payload = pickle.dumps((function, args), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            print(f"Render {getattr(function, '__qualname__', function)} can't run in a process: {e}")
+            return None, False
+
+        try:
+            future = pool.submit(_run_pickled, payload)
+            result, encoded = await asyncio.wrap_future(future)
+        except BrokenProcessPool as e:
+            print(f"Render process pool broken, restarting it: {e}")
+            self._reset_pool(pool)
+            return None, False
+        except asyncio.CancelledError:
+            # Timed out: a render already in a worker keeps running there
+            if future.running() and self._terminate_pool(pool):
+                print(f"Render {getattr(function, '__qualname__', function)} abandoned in a worker, pool restarted")
+                stats["pool_restarts"] += 1
+            raise
+        card_encoder.merge_encoder_stats(encoded)
+        return result, True
+
+    async def _render(self, kind, function, args, process):
+        stats = self._kind_stats(kind)
+        pool = self._get_pool() if process else None
+        if pool is not None:
+            result, done = await self._run_in_process(pool, function, args, stats)
+            if done:
+                stats["in_process"] += 1
+                return result
+            stats["fallbacks"] += 1
+        stats["in_thread"] += 1
+        return await asyncio.to_thread(function, *args)
+
+    async def run(self, kind, function, *args, process=True):
+        """Render in a worker (process=False: always a thread); returns function(*args).
+
+        Raises asyncio.TimeoutError after the timeout: the render is abandoned
+        (a worker already running it finishes it, but the result is dropped).
+        """
+        stats = self._kind_stats(kind)
+        stats["waiting"] += 1
+        async with self._semaphore(kind):
+            stats["waiting"] -= 1
+            stats["running"] += 1
+            started = time.perf_counter()
+            try:
+                return await asyncio.wait_for(self._render(kind, function, args, process), self.timeout)
+            except asyncio.TimeoutError:
+                stats["timeouts"] += 1
+                print(f"Render {kind} timed out after {self.timeout:g}s")
+                raise
+            except Exception:
+                stats["errors"] += 1
+                raise
+            finally:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                stats["running"] -= 1
+                stats["renders"] += 1
+                stats["total_ms"] += elapsed_ms
+                stats["last_ms"] = round(elapsed_ms, 1)
+                stats["max_ms"] = round(max(stats["max_ms"], elapsed_ms), 1)
+
+    def get_stats(self, kind):
+        """Counters for one kind of card, with the average render time"""
+        stats = dict(self._kind_stats(kind))
+        stats["avg_ms"] = round(stats["total_ms"] / max(1, stats["renders"]), 1)
+        stats["limit"] = self.limits.get(kind, DEFAULT_RENDER_LIMIT)
+        return stats
+
+    def shutdown(self):
+        """Stop the worker processes (a later render starts new ones)"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+render_service = RenderService()
@@ -0,0 +1,77 @@
+import json
+import time
+
+STARTUP_TIMINGS_FILE = 'startup_timings.json'
+MAX_HISTORY = 50
+
+class StartupTimer:
+    """Record startup phases and report cold-start-to-ready timings"""
+
+    def __init__(self, start=None):
+        self.start = start if start is not None else time.perf_counter()
+        self.phases = {}
+        self.reported = False
+        self._last_checkpoint = self.start
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def mark(self, phase, duration):
+        """Record the duration (seconds) of a phase"""
+        self.phases[phase] = round(duration * 1000, 1)
+
+    def checkpoint(self, phase):
+        """Record the time spent since the previous checkpoint"""
+        now = time.perf_counter()
+        self.mark(phase, now - self._last_checkpoint)
+        self._last_checkpoint = now
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def report(self):
+        """Print the startup report once and append it to the history file"""
+        if self.reported:
+            return
+        self.reported = True
+
+        ready_ms = round(self.elapsed() * 1000, 1)
+        history = load_startup_history()
+        previous = history[-1]["ready_ms"] if history else None
+
+        print("⏱️ Startup timings:")
+        for name, duration_ms in self.phases.items():
+            print(f"   {name:<28} {duration_ms:>9.1f} ms")
+        trend = f" (previous: {previous:.1f} ms)" if previous is not None else ""
+        print(f"   {'cold start to ready':<28} {ready_ms:>9.1f} ms{trend}")
+
+        history.append({
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+            "ready_ms": ready_ms,
+            "phases": self.phases
+        })
+        try:
+            with open(STARTUP_TIMINGS_FILE, 'w', encoding='utf-8') as f:
+                json.dump(history[-MAX_HISTORY:], f, indent=2)
+        except OSError as e:
+            print(f"Failed to save startup timings: {e}")
+
+class _Phase:
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.timer.mark(self.name, time.perf_counter() - self.started)
+        return False
+
+def load_startup_history():
+    try:
+        with open(STARTUP_TIMINGS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
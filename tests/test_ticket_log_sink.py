@@ -0,0 +1,78 @@
+import asyncio
+import os
+
+import discord
+
+from ticket_system.logs import TicketLogSink
+
+
+class FakeChannel:
+    def __init__(self, channel_id=1, error=None):
+        self.id = channel_id
+        self.error = error
+        self.sent = []
+
+    async def send(self, **kwargs):
+        if self.error is not None:
+            raise self.error
+        self.sent.append(kwargs)
+
+
+def write_transcript(tmp_path, name):
+    path = tmp_path / name
+    path.write_text("transcript")
+    return str(path)
+
+
+def test_dropped_event_removes_its_transcript(tmp_path):
+    async def scenario():
+        sink = TicketLogSink(max_queue_size=1, flush_delay=60)
+        channel = FakeChannel()
+        first = write_transcript(tmp_path, "first.html")
+        second = write_transcript(tmp_path, "second.html")
+
+        sink.enqueue(channel, discord.Embed(title="first"), first)
+        sink.enqueue(channel, discord.Embed(title="second"), second)
+        sink._worker.cancel()
+        return sink, first, second
+
+    sink, first, second = asyncio.run(scenario())
+
+    assert sink.metrics["dropped"] == 1
+    assert not os.path.exists(first)
+    assert os.path.exists(second)
+
+
+def test_failed_send_removes_its_transcript(tmp_path):
+    async def scenario():
+        sink = TicketLogSink(flush_delay=0, min_send_interval=0)
+        channel = FakeChannel(error=RuntimeError("channel gone"))
+        transcript = write_transcript(tmp_path, "failed.html")
+
+        sink.enqueue(channel, discord.Embed(title="closed"), transcript)
+        sink._worker.cancel()
+        await sink.flush()
+        return sink, transcript
+
+    sink, transcript = asyncio.run(scenario())
+
+    assert sink.metrics["send_errors"] == 1
+    assert not os.path.exists(transcript)
+
+
+def test_sent_transcript_is_removed(tmp_path):
+    async def scenario():
+        sink = TicketLogSink(flush_delay=0, min_send_interval=0)
+        channel = FakeChannel()
+        transcript = write_transcript(tmp_path, "sent.html")
+
+        sink.enqueue(channel, discord.Embed(title="saved"), transcript)
+        sink._worker.cancel()
+        await sink.flush()
+        return sink, channel, transcript
+
+    sink, channel, transcript = asyncio.run(scenario())
+
+    assert sink.metrics["messages_sent"] == 1
+    assert "file" in channel.sent[0]
+    assert not os.path.exists(transcript)
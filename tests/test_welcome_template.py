@@ -0,0 +1,80 @@
+import asyncio
+import io
+import time
+
+from PIL import Image
+
+from welcome_system import WelcomeSystem
+
+FONT = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+
+CONFIG = {
+    "background_image": "https://example.com/background.gif",
+    "default_profile": {"enabled": True, "url": "https://example.com/profile.png", "x": 40, "y": 40},
+    "profile_decoration": {"enabled": True, "url": "https://example.com/outline.png", "x": 30, "y": 30},
+    "avatar_position": {"x": 55, "y": 50, "diameter": 300},
+    "text_config": {
+        "welcome_text": {"x_offset": 20, "y_offset": 20, "font_size": 60, "font_path": FONT,
+                         "text": "WELCOME"},
+        "username_text": {"y_offset": 120, "font_size_max": 80, "font_size_min": 20,
+                          "font_path": FONT, "margin_right": 40}
+    }
+}
+
+
+def encode(image, image_format, **params):
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, **params)
+    return buffer.getvalue()
+
+
+def animated_background(count=8, size=(1600, 900)):
+    frames = [Image.effect_noise(size, 40 + index).convert("RGB") for index in range(count)]
+    return encode(frames[0], "GIF", save_all=True, append_images=frames[1:], duration=80, loop=0)
+
+
+def square(color):
+    return encode(Image.new("RGBA", (320, 320), color), "PNG")
+
+
+def test_event_loop_stays_responsive_while_template_builds():
+    downloads = {
+        CONFIG["background_image"]: animated_background(),
+        CONFIG["default_profile"]["url"]: square((255, 0, 0, 255)),
+        CONFIG["profile_decoration"]["url"]: square((0, 0, 255, 128)),
+    }
+    cog = WelcomeSystem.__new__(WelcomeSystem)
+
+    async def download_image(url):
+        return downloads[url]
+
+    cog.download_image = download_image
+
+    async def scenario():
+        gaps = []
+        building = True
+
+        async def ticker():
+            last = time.perf_counter()
+            while building:
+                await asyncio.sleep(0.005)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        ticks = asyncio.get_running_loop().create_task(ticker())
+        started = time.perf_counter()
+        template = await cog.build_welcome_template(CONFIG)
+        elapsed = time.perf_counter() - started
+        building = False
+        await ticks
+        return template, elapsed, gaps
+
+    template, elapsed, gaps = asyncio.run(scenario())
+
+    assert template is not None
+    assert template.is_animated and len(template.frames) == 8
+    assert template.frames[0].size == (2048, 1080)
+    # The build takes a while, but the loop kept running all along
+    assert elapsed > 0.3
+    assert max(gaps) < 0.2
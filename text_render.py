@@ -0,0 +1,157 @@
+import threading
+from collections import OrderedDict
+
+from lazy_imports import LazyModule
+Image = LazyModule('PIL.Image')
+ImageDraw = LazyModule('PIL.ImageDraw')
+ImageFont = LazyModule('PIL.ImageFont')
+
+TEXT_CACHE_SIZE = 256  # Rendered text surfaces / masks kept in memory
+FONT_CACHE_SIZE = 64   # Loaded (path, size) fonts
+WIDTH_CACHE_SIZE = 4096  # Measured (font, text) widths
+
+_rendered = OrderedDict()
+_rendered_lock = threading.Lock()
+
+def font_key(font):
+    """Hashable identity of a font file at a size, or None (not cached) for bitmap fonts"""
+    path = getattr(font, 'path', None)
+    if not isinstance(path, str):
+        return None
+    return (path, font.size, getattr(font, 'index', 0))
+
+def _cached(key, render):
+    if key is None:
+        return render()
+    with _rendered_lock:
+        value = _rendered.get(key)
+        if value is not None:
+            _rendered.move_to_end(key)
+            return value
+
+    value = render()
+    with _rendered_lock:
+        _rendered[key] = value
+        while len(_rendered) > TEXT_CACHE_SIZE:
+            _rendered.popitem(last=False)
+    return value
+
+_fonts = OrderedDict()
+_widths = OrderedDict()
+_measure_lock = threading.Lock()
+
+def _remember(cache, key, value, limit):
+    with _measure_lock:
+        cache[key] = value
+        while len(cache) > limit:
+            cache.popitem(last=False)
+    return value
+
+def load_font(path, size):
+    """Cached ImageFont.truetype(path, size); raises OSError like truetype when the file can't be loaded"""
+    key = (path, int(size))
+    with _measure_lock:
+        font = _fonts.get(key)
+        if font is not None:
+            _fonts.move_to_end(key)
+            return font
+    return _remember(_fonts, key, ImageFont.truetype(path, int(size)), FONT_CACHE_SIZE)
+
+def text_width(text, font):
+    """Width of the text's bounding box with this font, memoized per (font, size, text)"""
+    key = font_key(font)
+    if key is None:
+        left, _, right, _ = font.getbbox(text)
+        return right - left
+    key = (key, text)
+    with _measure_lock:
+        width = _widths.get(key)
+        if width is not None:
+            _widths.move_to_end(key)
+            return width
+    left, _, right, _ = font.getbbox(text)
+    return _remember(_widths, key, right - left, WIDTH_CACHE_SIZE)
+
+def fit_font(path, text, max_width, size_max, size_min, step=1):
+    """Largest font size from size_max down to size_min (by step) whose text fits in max_width.
+
+    Binary search on the sizes (text width grows with the size): a handful of
+    measurements instead of one font load per step. Returns (font, size,
+    width); when nothing fits, the size_min font. Raises OSError like load_font.
+    """
+    step = max(1, int(step))
+    # Candidate k is size_max - k * step, down to the last one not below size_min
+    count = max(0, (int(size_max) - int(size_min)) // step) + 1
+    def size_at(k):
+        return max(int(size_min), int(size_max) - k * step)
+
+    low, high = 0, count - 1
+    while low < high:
+        middle = (low + high) // 2
+        if text_width(text, load_font(path, size_at(middle))) <= max_width:
+            high = middle
+        else:
+            low = middle + 1
+
+    size = size_at(low)
+    font = load_font(path, size)
+    return font, size, text_width(text, font)
+
+def _text_bbox(text, font, stroke_width):
+    # ImageDraw.textbbox handles stroke_width for every font type
+    return ImageDraw.Draw(Image.new('L', (1, 1))).textbbox((0, 0), text, font=font, stroke_width=stroke_width)
+
+def text_mask(text, font, stroke_width=0):
+    """Cached L mask of the text (dilated by stroke_width) and its (left, top) offset from the text origin.
+
+    Shared: never modify the returned mask in place.
+    """
+    def render():
+        left, top, right, bottom = _text_bbox(text, font, stroke_width)
+        mask = Image.new('L', (max(1, right - left), max(1, bottom - top)), 0)
+        ImageDraw.Draw(mask).text((-left, -top), text, font=font, fill=255,
+                                  stroke_width=stroke_width, stroke_fill=255)
+        return mask, (left, top)
+
+    key = font_key(font)
+    return _cached(key and ('mask', key, text, stroke_width), render)
+
+def text_surface(text, font, fill, stroke_width=0, stroke_fill=None):
+    """Cached RGBA rendering of the text with a native outline (Pillow stroke) and its (left, top) offset.
+
+    Shared: never modify the returned surface in place.
+    """
+    fill = tuple(fill)
+    stroke_fill = tuple(stroke_fill) if stroke_width and stroke_fill is not None else None
+
+    def render():
+        left, top, right, bottom = _text_bbox(text, font, stroke_width)
+        surface = Image.new('RGBA', (max(1, right - left), max(1, bottom - top)), (0, 0, 0, 0))
+        ImageDraw.Draw(surface).text((-left, -top), text, font=font, fill=fill,
+                                     stroke_width=stroke_width, stroke_fill=stroke_fill)
+        return surface, (left, top)
+
+    key = font_key(font)
+    return _cached(key and ('surface', key, text, fill, stroke_width, stroke_fill), render)
+
+def paste_surface(image, surface, position):
+    """Composite an RGBA surface onto image at position (which may be partly outside)"""
+    x, y = position
+    if x >= image.width or y >= image.height or x + surface.width <= 0 or y + surface.height <= 0:
+        return
+    if x < 0 or y < 0:
+        surface = surface.crop((max(0, -x), max(0, -y), surface.width, surface.height))
+        x, y = max(0, x), max(0, y)
+    if image.mode == 'RGBA':
+        # Same result as drawing directly on the image
+        image.alpha_composite(surface, (x, y))
+    else:
+        image.paste(surface, (x, y), surface)
+
+def draw_text(image, position, text, font, fill, stroke_width=0, stroke_fill=None):
+    """Draw text like ImageDraw.text(..., stroke_width, stroke_fill), from a cached surface.
+
+    Drawing the same text on every frame of a GIF only renders it once.
+    """
+    surface, (left, top) = text_surface(text, font, fill, stroke_width, stroke_fill)
+    paste_surface(image, surface, (position[0] + left, position[1] + top))
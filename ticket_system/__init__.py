@@ -0,0 +1,17 @@
+# Ticket system extension
+# Submodules are only imported when the extension is loaded:
+#   models       - default data structures and bot name helpers
+#   storage      - ticket_bot.json / ticket_data.json persistence
+#   views        - modals, views and embed builders
+#   logs         - buffered ticket log sink
+#   transcripts  - ticket transcript serialization
+#   commands     - slash commands and persistent views setup
+
+async def setup(bot):
+    from .commands import setup_ticket_system, setup_persistent_views
+    setup_ticket_system(bot)
+    setup_persistent_views(bot)
+
+async def teardown(bot):
+    from .logs import ticket_log_sink
+    await ticket_log_sink.flush()
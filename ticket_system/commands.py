@@ -0,0 +1,525 @@
+import discord
+import asyncio
+from datetime import datetime
+
+from .models import set_bot_instance, empty_ticket_data
+from .storage import load_ticket_data, save_ticket_data, update_ticket_status, remove_ticket_status
+from .logs import log_ticket_action
+from .transcripts import serialize_message, store_transcript, write_transcript_file
+from .views import TicketPanelView, PublishedTicketView, TicketCloseView, TicketClosedActionsView, create_ticket_panel_embed
+
+async def handle_ai_message(message):
+    """Handle AI responses in ticket channels using existing AI system"""
+    if message.author.bot:
+        return False
+
+    # Check if this is a ticket channel with AI enabled
+    channel_name = message.channel.name
+    if not any(pattern in channel_name for pattern in ['-0', '-1', '-2', '-3', '-4', '-5', '-6', '-7', '-8', '-9']):
+        return False
+
+    # Extract ticket type from channel name
+    ticket_type = channel_name.split('-')[0]
+
+    # Check if AI is enabled for this ticket type
+    data = load_ticket_data()
+    ai_enabled = False
+
+    for panel_id, panel in data["tickets"].items():
+        # Handle both old and new data structures
+        if "sub_panels" in panel:
+            # New structure with sub_panels
+            for sub_panel_id, sub_panel in panel["sub_panels"].items():
+                if sub_panel["name"].lower() == ticket_type.lower() and sub_panel.get("ai_enabled", False):
+                    ai_enabled = True
+                    break
+        else:
+            # Old structure without sub_panels
+            if panel.get("name", "").lower() == ticket_type.lower() and panel.get("ai_enabled", False):
+                ai_enabled = True
+                break
+
+        if ai_enabled:
+            break
+
+    if not ai_enabled:
+        return False
+
+    # Generate AI response using the existing AI system
+    try:
+        from AI import generate_ai_response
+        ai_response = generate_ai_response(message.content, message.author.display_name)
+
+        if ai_response:
+            # Send AI response with a small delay to seem more natural
+            import asyncio
+            await asyncio.sleep(2)
+            await message.channel.send(f"<:BotLOGO:1407071803150569472> **Assistant AI:** {ai_response}")
+            return True
+    except Exception as e:
+        print(f"Error generating AI response in ticket channel: {e}")
+
+    return False
+
+# Persistent views setup function for main bot
+def setup_persistent_views(bot):
+    """Setup persistent views when bot starts"""
+    try:
+        # Add persistent views with custom_id
+        data = load_ticket_data()
+
+        # Ensure data structure is complete
+        if not isinstance(data, dict):
+            print("<:ErrorLOGO:1407071682031648850> Invalid ticket data structure")
+            return
+
+        # Add views for published panels
+        tickets = data.get("tickets", {})
+        if isinstance(tickets, dict):
+            for panel_id in tickets:
+                try:
+                    view = PublishedTicketView(panel_id)
+                    bot.add_view(view)
+                except Exception as e:
+                    print(f"Error adding view for panel {panel_id}: {e}")
+
+        # Add ticket close views
+        bot.add_view(TicketCloseView())
+        bot.add_view(TicketClosedActionsView())
+    except Exception as e:
+        print(f"Error setting up ticket persistent views: {e}")
+        # Initialize with empty data if there's an error
+        try:
+            empty_data = empty_ticket_data()
+            save_ticket_data(empty_data)
+            print("<:SucessLOGO:1407071637840592977> Initialized empty ticket data structure")
+        except Exception as init_error:
+            print(f"<:ErrorLOGO:1407071682031648850> Failed to initialize ticket data: {init_error}")
+
+# setup commands
+def setup_ticket_system(bot):
+    """Setup ticket system"""
+    # Définir l'instance globale du bot
+    set_bot_instance(bot)
+
+    @bot.tree.command(name="ticket_panel", description="Open the ticket management panel")
+    async def ticket_panel(interaction: discord.Interaction):
+        data = load_ticket_data()
+        view = TicketPanelView()
+        embed = create_ticket_panel_embed(data)
+
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=False)
+
+    @bot.tree.command(name="close", description="Ferme le ticket actuel")
+    async def close_command(interaction: discord.Interaction):
+        # Check if the command is used in a ticket channel
+        channel_name = interaction.channel.name
+        is_ticket = any(pattern in channel_name for pattern in ['-0', '-1', '-2', '-3', '-4', '-5', '-6', '-7', '-8', '-9'])
+
+        if not is_ticket:
+            await interaction.response.send_message("<:ErrorLOGO:1407071682031648850> Cette commande ne peut être utilisée que dans un channel de ticket.", ephemeral=True)
+            return
+
+        try:
+            # Save ticket data before closing
+            data = load_ticket_data()
+            if "closed_tickets" not in data:
+                data["closed_tickets"] = {}
+
+            ticket_name = interaction.channel.name
+            ticket_data = {
+                "original_name": ticket_name,
+                "channel_id": interaction.channel.id,
+                "closed_by": interaction.user.id,
+                "closed_at": datetime.now().isoformat(),
+                "permissions": {}
+            }
+
+            # Save current permissions
+            for member in interaction.channel.members:
+                if not member.bot:
+                    perms = interaction.channel.permissions_for(member)
+                    ticket_data["permissions"][str(member.id)] = {
+                        "view_channel": perms.view_channel,
+                        "send_messages": perms.send_messages,
+                        "read_message_history": perms.read_message_history
+                    }
+
+            data["closed_tickets"][str(interaction.channel.id)] = ticket_data
+            save_ticket_data(data)
+
+            # Send closing message
+            closing_embed = discord.Embed(
+                title="<a:LoadingLOGO:1407732919476424814> Closing Ticket...",
+                description="Closing the ticket in 3 seconds...",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=closing_embed, ephemeral=False)
+            await asyncio.sleep(3)
+
+            # Remove non-staff members
+            staff_roles = data.get("staff_roles", [])
+            staff_members = []
+            for role_id in staff_roles:
+                role = interaction.guild.get_role(role_id)
+                if role:
+                    for member in role.members:
+                        staff_members.append(member.id)
+
+            for member in interaction.channel.members:
+                if not member.bot and member.id not in staff_members and not member.guild_permissions.administrator:
+                    await interaction.channel.set_permissions(member, view_channel=False)
+
+            # Rename the ticket (with delay to avoid rate limiting)
+            ticket_type = ticket_name.split('-')[0]
+            new_channel_name = f"closed-{ticket_type}-{ticket_name.split('-')[1]}"
+
+            # Only rename if it's not already closed
+            if not interaction.channel.name.startswith("closed-"):
+                await asyncio.sleep(1)  # Small delay to prevent rate limiting
+                await interaction.channel.edit(name=new_channel_name)
+
+
+            # Log ticket closing
+            await log_ticket_action(interaction.guild, "ticket_closed", {
+                "channel": interaction.channel.mention,
+                "closed_by": interaction.user
+            })
+
+            # Send closed actions view
+            closed_embed = discord.Embed(
+                title="<:TicketLOGO:1407730639343714397> Ticket Closed",
+                description="This ticket has been closed. What would you like to do?",
+                color=0x57f287
+            )
+
+            closed_view = TicketClosedActionsView()
+            await interaction.channel.send(embed=closed_embed, view=closed_view)
+
+            # Update ticket status
+            update_ticket_status(interaction.channel.id, {"status": "closed"})
+
+        except Exception as e:
+            await interaction.followup.send(f"<:ErrorLOGO:1407071682031648850> Erreur lors de la fermeture du ticket: {str(e)}", ephemeral=True)
+
+    @bot.tree.command(name="delete", description="Supprime le ticket actuel")
+    async def delete_command(interaction: discord.Interaction):
+        # Check if the command is used in a ticket channel
+        channel_name = interaction.channel.name
+        is_ticket = any(pattern in channel_name for pattern in ['-0', '-1', '-2', '-3', '-4', '-5', '-6', '-7', '-8', '-9']) or channel_name.startswith("closed-")
+
+        if not is_ticket:
+            await interaction.response.send_message("<:ErrorLOGO:1407071682031648850> Cette commande ne peut être utilisée que dans un channel de ticket.", ephemeral=True)
+            return
+
+        try:
+            # Log deletion
+            await log_ticket_action(interaction.guild, "ticket_deleted", {
+                "channel": interaction.channel.mention,
+                "deleted_by": interaction.user
+            })
+
+            # Send deletion message
+            deletion_embed = discord.Embed(
+                title="<:DeleteLOGO:1407071421363916841> Deleting Ticket...",
+                description="Deleting the ticket in 3 seconds...",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=deletion_embed, ephemeral=False)
+            await asyncio.sleep(3)
+
+            # Delete the channel
+            await interaction.channel.delete(reason=f"Ticket supprimé par {interaction.user}")
+
+            # Remove ticket status
+            remove_ticket_status(interaction.channel.id)
+
+        except Exception as e:
+            await interaction.response.send_message(f"<:ErrorLOGO:1407071682031648850> Erreur lors de la suppression du ticket: {str(e)}", ephemeral=True)
+
+    @bot.tree.command(name="claim", description="Prend possession du ticket, supprime tous les autres staff")
+    async def claim_command(interaction: discord.Interaction):
+        # Check if the command is used in a ticket channel
+        channel_name = interaction.channel.name
+        is_ticket = any(pattern in channel_name for pattern in ['-0', '-1', '-2', '-3', '-4', '-5', '-6', '-7', '-8', '-9'])
+
+        if not is_ticket:
+            embed = discord.Embed(
+                title="<:ErrorLOGO:1407071682031648850> Erreur",
+                description="Cette commande ne peut être utilisée que dans un channel de ticket.",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        try:
+            # Get the staff roles from the ticket data
+            data = load_ticket_data()
+            staff_roles = data.get("staff_roles", [])
+
+            # Identify staff members to keep based on the command executor's roles
+            staff_to_keep = [interaction.user.id]
+            for role_id in staff_roles:
+                role = interaction.guild.get_role(role_id)
+                if role and interaction.user.top_role >= role:
+                    for member in role.members:
+                        if member.top_role <= interaction.user.top_role:
+                            staff_to_keep.append(member.id)
+
+            # Remove all other staff members from the ticket
+            for member in interaction.channel.members:
+                if not member.bot and member.id not in staff_to_keep and not member.guild_permissions.administrator:
+                    await interaction.channel.set_permissions(member, view_channel=False)
+
+            # Log ticket claiming
+            await log_ticket_action(interaction.guild, "ticket_claimed", {
+                "channel": interaction.channel.mention,
+                "claimed_by": interaction.user
+            })
+
+            embed = discord.Embed(
+                title="<:SucessLOGO:1407071637840592977> Ticket Claimed",
+                description="This ticket has been claimed.",
+                color=discord.Color.green()
+            )
+            await interaction.response.send_message(embed=embed)
+
+        except Exception as e:
+            await interaction.response.send_message(f"<:ErrorLOGO:1407071682031648850> Erreur lors de la prise en charge: {str(e)}", ephemeral=True)
+
+    @bot.tree.command(name="reopen", description="Rouvre un ticket fermé")
+    async def reopen_command(interaction: discord.Interaction):
+        # Check if the command is used in a ticket channel
+        channel_name = interaction.channel.name
+        is_closed_ticket = channel_name.startswith("closed-")
+
+        if not is_closed_ticket:
+            await interaction.response.send_message("<:ErrorLOGO:1407071682031648850> Cette commande ne peut être utilisée que dans un ticket fermé.", ephemeral=True)
+            return
+
+        try:
+            data = load_ticket_data()
+            channel_data = data.get("closed_tickets", {}).get(str(interaction.channel.id))
+
+            if not channel_data:
+                await interaction.response.send_message("<:ErrorLOGO:1407071682031648850> Ce ticket n'est pas dans l'état fermé ou les données sont introuvables.", ephemeral=True)
+                return
+
+            # Restore original name (with delay to avoid rate limiting)
+            original_name = channel_data["original_name"]
+
+            # Only rename if it's currently closed
+            if interaction.channel.name.startswith("closed-"):
+                await asyncio.sleep(2)  # Delay to prevent rate limiting
+                await interaction.channel.edit(name=original_name)
+
+
+            # Restore permissions
+            for member_id, perms in channel_data.get("permissions", {}).items():
+                member = interaction.guild.get_member(int(member_id))
+                if member:
+                    await interaction.channel.set_permissions(
+                        member,
+                        view_channel=perms["view_channel"],
+                        send_messages=perms["send_messages"],
+                        read_message_history=perms["read_message_history"]
+                    )
+
+            # Remove from closed tickets
+            if str(interaction.channel.id) in data["closed_tickets"]:
+                del data["closed_tickets"][str(interaction.channel.id)]
+                save_ticket_data(data)
+
+            # Log reopening
+            await log_ticket_action(interaction.guild, "ticket_reopened", {
+                "channel": interaction.channel.mention,
+                "reopened_by": interaction.user
+            })
+
+            # Send reopening message with new close button
+            reopen_embed = discord.Embed(
+                title="<:ViewLOGO:1407071916824461435> Ticket Reopened",
+                description="This ticket has been reopened successfully!",
+                color=0x57f287
+            )
+
+            # Create new close view
+            close_view = TicketCloseView()
+            await interaction.channel.send(embed=reopen_embed, view=close_view)
+
+            # Update ticket status
+            update_ticket_status(interaction.channel.id, {
+                "status": "open",
+                "original_name": original_name,
+                "reopened_by": interaction.user.id,
+                "reopened_at": datetime.now().isoformat()
+            })
+
+        except Exception as e:
+            await interaction.response.send_message(f"<:ErrorLOGO:1407071682031648850> Erreur lors de la réouverture du ticket: {str(e)}", ephemeral=True)
+
+    @bot.tree.command(name="transcript", description="Sauvegarde la transcription du ticket")
+    async def transcript_command(interaction: discord.Interaction):
+        # Check if the command is used in a ticket channel
+        channel_name = interaction.channel.name
+        is_ticket = any(pattern in channel_name for pattern in ['-0', '-1', '-2', '-3', '-4', '-5', '-6', '-7', '-8', '-9']) or channel_name.startswith("closed-")
+
+        if not is_ticket:
+            await interaction.response.send_message("<:ErrorLOGO:1407071682031648850> Cette commande ne peut être utilisée que dans un channel de ticket.", ephemeral=True)
+            return
+
+        try:
+            await interaction.response.defer(ephemeral=True)
+
+            # Get ticket data
+            data = load_ticket_data()
+
+            # Find ticket owner and panel info
+            ticket_owner = None
+            panel_name = "Unknown Panel"
+            panel_emoji = "<:TicketLOGO:1407730639343714397>"
+            ticket_type = "unknown"
+
+            # Extract ticket type from channel name
+            if channel_name.startswith("closed-"):
+                # For closed tickets: closed-support-0001 -> support
+                parts = channel_name.replace("closed-", "").split('-')
+                if len(parts) >= 1:
+                    ticket_type = parts[0]
+            else:
+                # For regular tickets: support-0001 -> support
+                parts = channel_name.split('-')
+                if len(parts) >= 1:
+                    ticket_type = parts[0]
+
+            # Find matching panel
+            for panel_id, panel in data.get("tickets", {}).items():
+                if "sub_panels" in panel:
+                    for sub_panel_id, sub_panel in panel["sub_panels"].items():
+                        sub_panel_name = sub_panel["name"].lower().strip()
+                        if sub_panel_name == ticket_type.lower().strip():
+                            panel_name = sub_panel.get("panel_title", sub_panel.get("ticket_title", sub_panel.get("title", "Panel par Défaut")))
+                            panel_emoji = sub_panel.get("panel_emoji", sub_panel.get("button_emoji", "<:TicketLOGO:1407730639343714397>"))
+                            break
+                    else:
+                        continue
+                    break
+
+            # Find ticket owner
+            for member in interaction.channel.members:
+                if not member.bot and member != interaction.guild.me:
+                    perms = interaction.channel.permissions_for(member)
+                    if perms.send_messages and not any(role.id in data.get("staff_roles", []) for role in member.roles):
+                        ticket_owner = member
+                        break
+
+            if not ticket_owner:
+                async for message in interaction.channel.history(limit=100, oldest_first=True):
+                    if not message.author.bot and message.author != interaction.guild.me:
+                        ticket_owner = message.author
+                        break
+
+            # Generate transcript
+            transcript_data = {
+                "server_info": {
+                    "server_name": interaction.guild.name,
+                    "server_id": interaction.guild.id,
+                    "channel_name": interaction.channel.name,
+                    "channel_id": interaction.channel.id
+                },
+                "ticket_info": {
+                    "ticket_owner": {
+                        "name": ticket_owner.display_name if ticket_owner else "Utilisateur Inconnu",
+                        "username": f"{ticket_owner.name}#{ticket_owner.discriminator}" if ticket_owner and ticket_owner.discriminator != "0" else ticket_owner.name if ticket_owner else "Inconnu",
+                        "id": ticket_owner.id if ticket_owner else None,
+                        "avatar_url": ticket_owner.display_avatar.url if ticket_owner else None
+                    },
+                    "ticket_name": interaction.channel.name,
+                    "panel_name": panel_name,
+                    "panel_emoji": panel_emoji,
+                    "created_at": datetime.now().isoformat(),
+                    "transcript_saved_by": {
+                        "name": interaction.user.display_name,
+                        "username": f"{interaction.user.name}#{interaction.user.discriminator}" if interaction.user.discriminator != "0" else interaction.user.name,
+                        "id": interaction.user.id,
+                        "avatar_url": interaction.user.display_avatar.url
+                    }
+                },
+                "messages": []
+            }
+
+            # Count messages
+            message_count = 0
+            async for message in interaction.channel.history(limit=None, oldest_first=True):
+                message_count += 1
+                transcript_data["messages"].append(serialize_message(message))
+
+            # Save to transcript file
+            store_transcript(interaction.channel.id, transcript_data)
+
+            # Create readable transcript file
+            transcript_filename = f"transcript_{interaction.channel.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+            transcript_content = []
+
+            transcript_content.append(f"=== TRANSCRIPTION TICKET ===")
+            transcript_content.append(f"Serveur: {interaction.guild.name}")
+            transcript_content.append(f"Canal: #{interaction.channel.name}")
+            transcript_content.append(f"Propriétaire: {ticket_owner.display_name if ticket_owner else 'Inconnu'}")
+            transcript_content.append(f"Type de Panel: {panel_name}")
+            transcript_content.append(f"Sauvegardé par: {interaction.user.display_name}")
+            transcript_content.append(f"Date: {datetime.now().strftime('%d/%m/%Y à %H:%M:%S')}")
+            transcript_content.append(f"Messages: {message_count}")
+            transcript_content.append("=" * 50)
+            transcript_content.append("")
+
+            # Add all messages
+            for msg_data in transcript_data["messages"]:
+                timestamp = datetime.fromisoformat(msg_data["timestamp"]).strftime('%d/%m/%Y %H:%M:%S')
+                author_name = msg_data["author"]["name"]
+                content = msg_data["content"] or "[No content message]"
+
+                transcript_content.append(f"[{timestamp}] {author_name}: {content}")
+
+                # Add embed details
+                if msg_data["embeds"]:
+                    for i, embed_data in enumerate(msg_data["embeds"], 1):
+                        transcript_content.append(f"   └── Embed {i}:")
+                        if embed_data.get("title"):
+                            transcript_content.append(f"       Title: {embed_data['title']}")
+                        if embed_data.get("description"):
+                            transcript_content.append(f"       Description: {embed_data['description'][:200]}{'...' if len(embed_data.get('description', '')) > 200 else ''}")
+                        if embed_data.get("fields"):
+                            transcript_content.append(f"       Fields: {len(embed_data['fields'])}")
+
+                if msg_data["attachments"]:
+                    for att in msg_data["attachments"]:
+                        transcript_content.append(f"   └── File: {att['filename']} ({att['size']} bytes)")
+
+                transcript_content.append("")
+
+            # Save transcript file
+            write_transcript_file(transcript_filename, transcript_content)
+
+            # Log transcript saving
+            await log_ticket_action(interaction.guild, "transcript_saved", {
+                "channel": interaction.channel.mention,
+                "saved_by": interaction.user,
+                "message_count": message_count,
+                "ticket_type": ticket_type,
+                "transcript_file": transcript_filename,
+                "ticket_owner": ticket_owner.mention if ticket_owner else "Inconnu",
+                "panel_name": panel_name
+            })
+
+            await interaction.followup.send("<:SucessLOGO:1407071637840592977> Transcript saved successfully and sent to logs!", ephemeral=True)
+
+            # Update ticket status
+            update_ticket_status(interaction.channel.id, {"transcript_saved": True})
+
+        except Exception as e:
+            await interaction.followup.send(f"<:ErrorLOGO:1407071682031648850> Erreur lors de la sauvegarde de la transcription: {str(e)}", ephemeral=True)
+
+    @bot.event
+    async def on_message(message):
+        """Handle AI responses in ticket channels"""
+        await handle_ai_message(message)
@@ -0,0 +1,354 @@
+import discord
+import asyncio
+import os
+import time
+from collections import deque
+
+from .storage import load_ticket_data
+
+# Logging system
+LOG_ACTION_COLORS = {
+    "ticket_opened": 0x57f287,  # Green
+    "ticket_claimed": 0xfee75c, # Yellow
+    "ticket_closed": 0xed4245,  # Red
+    "ticket_reopened": 0x57f287, # Green
+    "ticket_deleted": 0x99aab5,  # Gray
+    "transcript_saved": 0x5865f2  # Blurple
+}
+
+LOG_ACTION_LABELS = {
+    "ticket_opened": "Created",
+    "ticket_claimed": "Claimed",
+    "ticket_closed": "Closed",
+    "ticket_reopened": "Reopened",
+    "ticket_deleted": "Deleted",
+    "transcript_saved": "Transcript Saved"
+}
+
+class TicketLogSink:
+    """Asynchronous sink for ticket logs.
+
+    Events are queued and a background worker coalesces them into messages of
+    up to 10 embeds per log channel, spacing sends to stay under Discord's
+    per-channel rate limit. Log settings are cached in memory and refreshed by
+    save_ticket_data() instead of re-reading ticket_bot.json for every event.
+    """
+
+    MAX_EMBEDS_PER_MESSAGE = 10
+
+    def __init__(self, max_queue_size=500, flush_delay=1.0, min_send_interval=1.0):
+        self.max_queue_size = max_queue_size
+        self.flush_delay = flush_delay
+        self.min_send_interval = min_send_interval
+
+        self._queue = deque()
+        self._wakeup = None
+        self._worker = None
+        self._settings = None
+        self._last_send = {}
+        self.metrics = {
+            "enqueued": 0,
+            "dropped": 0,
+            "messages_sent": 0,
+            "embeds_sent": 0,
+            "send_errors": 0,
+            "rate_limited": 0,
+            "queue_depth": 0,
+            "max_queue_depth": 0,
+            "last_wait_ms": 0.0,
+            "max_wait_ms": 0.0
+        }
+
+    # Settings cache
+    def update_settings(self, data):
+        """Refresh the cached log settings from a ticket data snapshot"""
+        settings = data.get("settings", {})
+        panel_titles = {}
+        for panel in data.get("tickets", {}).values():
+            for sub_panel in panel.get("sub_panels", {}).values():
+                # Prioritize panel_title, then ticket_title, then title
+                panel_title = sub_panel.get("panel_title") or sub_panel.get("ticket_title") or sub_panel.get("title", "Default Panel")
+                panel_titles.setdefault(sub_panel["name"].lower().strip(), panel_title)
+
+        self._settings = {
+            "log_channel_id": settings.get("log_channel_id"),
+            "log_settings": dict(settings.get("log_settings", {})),
+            "panel_titles": panel_titles
+        }
+
+    def get_settings(self):
+        if self._settings is None:
+            self.update_settings(load_ticket_data())
+        return self._settings
+
+    # Queue
+    def enqueue(self, channel, embed, file_path=None):
+        """Queue an embed for a log channel without waiting for Discord"""
+        if len(self._queue) >= self.max_queue_size:
+            # Logs are best effort: drop the oldest event rather than block callers
+            dropped = self._queue.popleft()
+            self.metrics["dropped"] += 1
+            self._remove_file(dropped[2])
+
+        self._queue.append((channel, embed, file_path, time.monotonic()))
+        self.metrics["enqueued"] += 1
+        self._update_depth()
+        self._ensure_worker()
+        self._wakeup.set()
+
+    def _update_depth(self):
+        depth = len(self._queue)
+        self.metrics["queue_depth"] = depth
+        self.metrics["max_queue_depth"] = max(self.metrics["max_queue_depth"], depth)
+
+    def _ensure_worker(self):
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            # Let bursts (mass close / cleanup) accumulate before sending
+            await asyncio.sleep(self.flush_delay)
+            await self.flush()
+
+    def _next_batch(self):
+        """Pop the next batch: same channel, up to 10 embeds, at most one file"""
+        channel = self._queue[0][0]
+        batch = []
+        remaining = deque()
+        has_file = False
+        while self._queue:
+            item = self._queue.popleft()
+            full = len(batch) >= self.MAX_EMBEDS_PER_MESSAGE or (item[2] and has_file)
+            if full or item[0].id != channel.id:
+                remaining.append(item)
+                continue
+            batch.append(item)
+            has_file = has_file or bool(item[2])
+        self._queue = remaining
+        self._update_depth()
+        return channel, batch
+
+    async def flush(self):
+        """Send every queued event, coalesced per channel"""
+        while self._queue:
+            channel, batch = self._next_batch()
+            await self._send_batch(channel, batch)
+
+    async def _send_batch(self, channel, batch):
+        # Pace sends per channel to stay under the rate limit
+        elapsed = time.monotonic() - self._last_send.get(channel.id, 0)
+        if elapsed < self.min_send_interval:
+            await asyncio.sleep(self.min_send_interval - elapsed)
+
+        embeds = [item[1] for item in batch]
+        file_path = next((item[2] for item in batch if item[2]), None)
+
+        sent = False
+        try:
+            for attempt in range(2):
+                try:
+                    await self._send(channel, embeds, file_path)
+                    sent = True
+                    break
+                except discord.RateLimited as e:
+                    self.metrics["rate_limited"] += 1
+                    await asyncio.sleep(e.retry_after)
+                except discord.HTTPException as e:
+                    if e.status != 429:
+                        print(f"Error sending ticket logs: {e}")
+                        break
+                    self.metrics["rate_limited"] += 1
+                    retry_after = e.response.headers.get("Retry-After", 1) if e.response is not None else 1
+                    await asyncio.sleep(float(retry_after))
+                except Exception as e:
+                    print(f"Error sending ticket logs: {e}")
+                    break
+        finally:
+            # The transcript is only kept until its log is sent (or given up on)
+            self._remove_file(file_path)
+
+        if not sent:
+            self.metrics["send_errors"] += 1
+            return
+
+        now = time.monotonic()
+        self._last_send[channel.id] = now
+        wait_ms = (now - min(item[3] for item in batch)) * 1000
+        self.metrics["messages_sent"] += 1
+        self.metrics["embeds_sent"] += len(embeds)
+        self.metrics["last_wait_ms"] = round(wait_ms, 1)
+        self.metrics["max_wait_ms"] = round(max(self.metrics["max_wait_ms"], wait_ms), 1)
+
+    async def _send(self, channel, embeds, file_path):
+        if not file_path:
+            await channel.send(embeds=embeds)
+            return
+
+        # Send with transcript file attachment
+        try:
+            with open(file_path, 'rb') as f:
+                file = discord.File(f, filename=file_path)
+                await channel.send(embeds=embeds, file=file)
+        except (OSError, discord.HTTPException) as e:
+            if isinstance(e, discord.HTTPException) and e.status == 429:
+                raise
+            print(f"Error sending transcript file: {e}")
+            await channel.send(embeds=embeds)
+
+    @staticmethod
+    def _remove_file(file_path):
+        if not file_path or not os.path.exists(file_path):
+            return
+        try:
+            os.remove(file_path)
+        except OSError as e:
+            print(f"Error removing transcript file: {e}")
+
+    def get_metrics(self):
+        self._update_depth()
+        return dict(self.metrics)
+
+ticket_log_sink = TicketLogSink()
+
+def build_log_embed(guild, action_type, details, panel_titles):
+    """Build the embed for a ticket log entry with simplified styling like the example."""
+    # Get user object from details - extract ID from mention properly
+    user = None
+
+    # Extract user object from various possible keys in 'details'
+    user_keys_to_check = ["created_by", "claimed_by", "closed_by", "reopened_by", "deleted_by", "saved_by"]
+    found_user = None
+
+    for key in user_keys_to_check:
+        if key in details:
+            user_data = details[key]
+            if isinstance(user_data, discord.User):
+                found_user = user_data
+                break
+            elif isinstance(user_data, discord.Member):
+                found_user = user_data
+                break
+            elif isinstance(user_data, int):
+                # If it's an ID, try to get the member
+                found_user = guild.get_member(user_data)
+                if found_user:
+                    break
+            elif isinstance(user_data, str) and "<@" in user_data and ">" in user_data:
+                # If it's a mention, extract ID and get member
+                user_id_str = user_data.replace("<@", "").replace(">", "").replace("!", "")
+                try:
+                    user_id = int(user_id_str)
+                    found_user = guild.get_member(user_id)
+                    if found_user:
+                        break
+                except ValueError:
+                    pass # Ignore if ID is not valid
+
+    user = found_user # Assign the found user to the 'user' variable
+
+    # Extract ticket info from channel mention
+    channel_name = "Unknown"
+    ticket_name = "Unknown"
+    ticket_type = "unknown"
+
+    if "channel" in details:
+        channel_mention = details["channel"]
+        if isinstance(channel_mention, discord.TextChannel): # If it's already a channel object
+            channel_name = channel_mention.name
+        elif isinstance(channel_mention, str) and "<#" in channel_mention:
+            channel_id_str = channel_mention.replace("<#", "").replace(">", "")
+            try:
+                channel_id = int(channel_id_str)
+                channel_obj = guild.get_channel(channel_id)
+                if channel_obj:
+                    channel_name = channel_obj.name
+            except ValueError:
+                pass
+        else:
+            channel_name = channel_mention
+
+    # Extract ticket info from channel name
+    if "-" in channel_name:
+        if channel_name.startswith("closed-"):
+            # For closed tickets: closed-support-0048 -> support, Ticket-0048
+            parts = channel_name.replace("closed-", "").split('-')
+            if len(parts) >= 2: # Expecting at least type and number
+                ticket_type = parts[0]
+                ticket_name = f"Ticket-{parts[1]}"
+        else:
+            # For regular tickets: support-0048 -> support, Ticket-0048
+            parts = channel_name.split("-")
+            if len(parts) >= 2: # Expecting at least type and number
+                ticket_type = parts[0]
+                ticket_name = f"Ticket-{parts[1]}"
+
+    # Find panel info from the cached sub-panel titles
+    panel_name = "<:TicketLOGO:1407730639343714397> Default Panel"
+
+    # Check if panel_name is already provided in details
+    if "panel_name" in details and details["panel_name"]:
+        panel_name = f"<:TicketLOGO:1407730639343714397> {details['panel_name']}"
+    else:
+        if "ticket_type" in details:
+            ticket_type = details["ticket_type"]
+        panel_title = panel_titles.get(ticket_type.lower().strip())
+        if panel_title:
+            panel_name = f"<:TicketLOGO:1407730639343714397> {panel_title}"
+
+    # Create simplified embed like the example
+    embed = discord.Embed(
+        color=LOG_ACTION_COLORS.get(action_type, 0x7289da)
+    )
+
+    # Set user as author with avatar (top of embed) - this is crucial
+    if user:
+        embed.set_author(
+            name=user.display_name,
+            icon_url=user.display_avatar.url
+        )
+    else:
+        # Fallback if user not found
+        embed.set_author(
+            name="Unknown User",
+            icon_url="https://cdn.discordapp.com/embed/avatars/0.png"
+        )
+
+    # Create the main content fields exactly like the example
+    logged_info = f"**Logged Info**\nTicket: {ticket_name}\nAction: {LOG_ACTION_LABELS.get(action_type, 'Action')}"
+
+    panel_info = f"**Panel**\n{panel_name}"
+
+    embed.add_field(name="", value=logged_info, inline=True)
+    embed.add_field(name="", value=panel_info, inline=True)
+
+    # For transcript action, add simplified info
+    if action_type == "transcript_saved" and "message_count" in details:
+        embed.add_field(name="", value=f"**Messages:** {details['message_count']}", inline=False)
+
+    return embed
+
+async def log_ticket_action(guild, action_type, details):
+    """Queue a ticket action log for the configured log channel."""
+    settings = ticket_log_sink.get_settings()
+    log_channel_id = settings["log_channel_id"]
+
+    # Check if this log type is enabled
+    if not settings["log_settings"].get(action_type, True):
+        return
+
+    log_channel = guild.get_channel(log_channel_id) if log_channel_id else None
+
+    if not log_channel:
+        print("Log channel not configured or not found.")
+        return
+
+    embed = build_log_embed(guild, action_type, details, settings["panel_titles"])
+
+    # Transcript files are attached to the message but don't overload the embed
+    file_path = details.get("transcript_file") if action_type == "transcript_saved" else None
+    ticket_log_sink.enqueue(log_channel, embed, file_path)
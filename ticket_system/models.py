@@ -0,0 +1,112 @@
+import copy
+
+# Variable globale pour stocker l'instance du bot
+_bot_instance = None
+
+def set_bot_instance(bot):
+    """Définit l'instance globale du bot"""
+    global _bot_instance
+    _bot_instance = bot
+
+def get_bot_name(bot=None):
+    """Récupère le nom d'affichage du bot actuel"""
+    # Utilise le bot passé en paramètre, sinon l'instance globale
+    bot_to_use = bot or _bot_instance
+    if bot_to_use and bot_to_use.user:
+        return bot_to_use.user.display_name or bot_to_use.user.name
+    return "Ticket Bot"
+
+# Default permissions constants
+DEFAULT_PERMISSIONS = {
+    "owner": {
+        "view_channel": True,
+        "create_instant_invite": False,
+        "send_messages": True,
+        "send_messages_in_threads": True,
+        "embed_links": True,
+        "attach_files": True,
+        "add_reactions": True,
+        "use_external_emojis": True,
+        "use_external_stickers": True,
+        "read_message_history": True,
+        "manage_channels": False,
+        "manage_permissions": False,
+        "create_public_threads": False,
+        "create_private_threads": False,
+        "use_application_commands": False,
+        "manage_messages": False
+    },
+    "staff": {
+        "view_channel": True,
+        "create_instant_invite": True,
+        "send_messages": True,
+        "send_messages_in_threads": True,
+        "embed_links": True,
+        "attach_files": True,
+        "add_reactions": True,
+        "use_external_emojis": True,
+        "use_external_stickers": True,
+        "read_message_history": True,
+        "manage_channels": True,
+        "manage_permissions": True,
+        "create_public_threads": True,
+        "create_private_threads": True,
+        "use_application_commands": True,
+        "manage_messages": True
+    },
+    "authorized": {
+        "view_channel": True,
+        "create_instant_invite": False,
+        "send_messages": True,
+        "send_messages_in_threads": True,
+        "embed_links": True,
+        "attach_files": True,
+        "add_reactions": True,
+        "use_external_emojis": True,
+        "use_external_stickers": True,
+        "read_message_history": True,
+        "manage_channels": False,
+        "manage_permissions": False,
+        "create_public_threads": False,
+        "create_private_threads": False,
+        "use_application_commands": False,
+        "manage_messages": False
+    }
+}
+
+DEFAULT_LOG_SETTINGS = {
+    "ticket_opened": True,
+    "ticket_claimed": True,
+    "ticket_closed": True,
+    "ticket_deleted": True,
+    "ticket_reopened": True,
+    "transcript_saved": True
+}
+
+def default_settings():
+    """Default ticket settings (built on each call for the current bot name)"""
+    return {
+        "default_embed": {
+            "title": "",
+            "outside_description": "",
+            "description": "Support will be with you shortly. To close this ticket.",
+            "thumbnail": "",
+            "image": "",
+            "footer": f"{get_bot_name()} - Ticket Bot"
+        },
+        "button_enabled": True,
+        "button_emoji": "<:CloseLOGO:1407072519420248256>",
+        "button_label": "Close Ticket",
+        "ai_enabled": False,
+        "log_settings": copy.deepcopy(DEFAULT_LOG_SETTINGS)
+    }
+
+def empty_ticket_data():
+    """Empty ticket data structure"""
+    return {
+        "tickets": {},
+        "staff_roles": [],
+        "settings": default_settings(),
+        "ticket_counters": {},
+        "closed_tickets": {}
+    }
@@ -0,0 +1,106 @@
+import copy
+
+from json_store import json_document
+
+from .models import DEFAULT_PERMISSIONS, DEFAULT_LOG_SETTINGS, get_bot_name, default_settings, empty_ticket_data
+
+ticket_store = json_document('ticket_bot.json', indent=4, ensure_ascii=False)
+ticket_status_store = json_document('ticket_data.json', indent=None, ensure_ascii=False)  # Machine-only: compact
+
+def load_ticket_data():
+    """Load ticket data from JSON file"""
+    data = ticket_store.load(default=empty_ticket_data)
+
+    # Ensure all required top-level keys exist
+    if "staff_roles" not in data:
+        data["staff_roles"] = []
+
+    if "settings" not in data:
+        data["settings"] = default_settings()
+
+    # Ensure log_settings exist in settings
+    if "log_settings" not in data["settings"]:
+        data["settings"]["log_settings"] = copy.deepcopy(DEFAULT_LOG_SETTINGS)
+
+    if "ticket_counters" not in data:
+        data["ticket_counters"] = {}
+
+    if "closed_tickets" not in data:
+        data["closed_tickets"] = {}
+
+    # Migrate old data structure to new sub_panels structure
+    migrated = False
+    if "tickets" in data:
+        for panel_id, panel in data["tickets"].items():
+            if "sub_panels" not in panel and "name" in panel:
+                # Convert old structure to new structure
+                panel["sub_panels"] = {
+                    "1": {
+                        "id": "1",
+                        "name": panel["name"],
+                        "title": panel.get("title", "Default"),
+                        "description": panel.get("description", "Default ticket"),
+                        "permissions": panel.get("permissions", copy.deepcopy(DEFAULT_PERMISSIONS)),
+                        "ai_enabled": panel.get("ai_enabled", False),
+                        "button_visible": True,
+                        "button_emoji": "<:TicketLOGO:1407730639343714397>",
+                        "button_text": "",
+                        "ticket_description": "Support will be with you shortly. To close this ticket.",
+                        "ticket_footer": f"{get_bot_name()} - Ticket Bot"
+                    }
+                }
+                panel["display_type"] = "buttons"
+                migrated = True
+                # Remove old fields that are now in sub_panels
+                if "permissions" in panel:
+                    del panel["permissions"]
+                if "ai_enabled" in panel:
+                    del panel["ai_enabled"]
+
+    # Save migrated data
+    if migrated:
+        save_ticket_data(data)
+
+    return data
+
+def save_ticket_data(data):
+    """Save ticket data to JSON file"""
+    ticket_store.save(data)
+
+    # Keep the log sink's cached settings in sync
+    from .logs import ticket_log_sink
+    ticket_log_sink.update_settings(data)
+
+def get_next_ticket_number(data, ticket_name):
+    """Get next ticket number for a given ticket name"""
+    if "ticket_counters" not in data:
+        data["ticket_counters"] = {}
+
+    if ticket_name not in data["ticket_counters"]:
+        data["ticket_counters"][ticket_name] = 0
+
+    data["ticket_counters"][ticket_name] += 1
+    return data["ticket_counters"][ticket_name]
+
+# Helper function to check if a channel is a ticket channel
+def is_ticket_channel(channel_name):
+    """Check if a channel name matches the ticket channel pattern."""
+    # Check if channel name contains ticket patterns
+    return any(pattern in channel_name for pattern in ['-0', '-1', '-2', '-3', '-4', '-5', '-6', '-7', '-8', '-9']) or channel_name.startswith("closed-")
+
+# Helper function to update ticket status in @ticket_data.json
+def update_ticket_status(channel_id, new_data):
+    """Update ticket status in @ticket_data.json."""
+    ticket_data = ticket_status_store.load()
+    ticket_data[str(channel_id)] = new_data
+    ticket_status_store.save(ticket_data)
+
+# Helper function to remove ticket status from @ticket_data.json
+def remove_ticket_status(channel_id):
+    """Remove ticket status from @ticket_data.json when the ticket is deleted."""
+    ticket_data = ticket_status_store.load()  # Empty if the file doesn't exist or is corrupted
+
+    channel_id_str = str(channel_id)
+    if channel_id_str in ticket_data:
+        del ticket_data[channel_id_str]
+        ticket_status_store.save(ticket_data)
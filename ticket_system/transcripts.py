@@ -0,0 +1,36 @@
+import json
+
+def serialize_message(message):
+    """Serialize a ticket message for ticket_transcript.json"""
+    return {
+        "id": message.id,
+        "author": {
+            "name": message.author.display_name,
+            "username": f"{message.author.name}#{message.author.discriminator}" if message.author.discriminator != "0" else message.author.name,
+            "id": message.author.id,
+            "bot": message.author.bot,
+            "avatar_url": message.author.display_avatar.url
+        },
+        "content": message.content,
+        "timestamp": message.created_at.isoformat(),
+        "embeds": [embed.to_dict() for embed in message.embeds],
+        "attachments": [{"filename": att.filename, "url": att.url, "size": att.size} for att in message.attachments]
+    }
+
+def store_transcript(channel_id, transcript_data):
+    """Save a ticket transcript in ticket_transcript.json"""
+    try:
+        with open('ticket_transcript.json', 'r', encoding='utf-8') as f:
+            transcripts = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        transcripts = {}
+
+    transcripts[str(channel_id)] = transcript_data
+
+    with open('ticket_transcript.json', 'w', encoding='utf-8') as f:
+        json.dump(transcripts, f, indent=4, ensure_ascii=False)
+
+def write_transcript_file(transcript_filename, transcript_content):
+    """Write the readable transcript file sent to the logs"""
+    with open(transcript_filename, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(transcript_content))
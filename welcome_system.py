@@ -3,74 +3,399 @@ from discord.ext import commands
 from discord import app_commands
 import aiohttp
 import io
-from PIL import Image, ImageDraw, ImageFont
+from lazy_imports import LazyModule
+# PIL is only imported when the first image is processed
+Image = LazyModule('PIL.Image')
+ImageDraw = LazyModule('PIL.ImageDraw')
+ImageFont = LazyModule('PIL.ImageFont')
 import requests
 import os
 import json
 import time
 import uuid
+import asyncio
+from collections import OrderedDict, deque
+from animated_media import AnimatedMedia
+from avatar_cache import avatar_cache
+from card_encoder import card_extension, encode_card, get_encoder_stats
+from image_masks import apply_mask
+from json_store import json_document
+from render_service import render_service
+from text_render import draw_text, fit_font, load_font, text_mask
+
+welcome_store = json_document('welcome_data.json', ensure_ascii=False)
 
 def get_bot_name(bot):
     """Récupère le nom d'affichage du bot"""
     return bot.user.display_name if bot.user else "Bot"
 
-def load_welcome_data():
-    """Load welcome data from JSON file"""
-    try:
-        with open('welcome_data.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        # Return default configuration if file doesn't exist
-        return {
-            "welcome_settings": {
-                "enabled": False,
-                "channel_id": None,
-                "welcome_message": "Welcome {user}!"
+def default_welcome_data():
+    """Default configuration, used while welcome_data.json doesn't exist"""
+    return {
+        "welcome_settings": {
+            "enabled": False,
+            "channel_id": None,
+            "welcome_message": "Welcome {user}!"
+        },
+        "template_config": {
+            "template_url": "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/WelcomeCard.png",
+            "avatar_position": {
+                "x": 55,
+                "y": 50,
+                "diameter": 120
             },
-            "template_config": {
-                "template_url": "https://raw.githubusercontent.com/TheBlueEL/pictures/refs/heads/main/WelcomeCard.png",
-                "avatar_position": {
-                    "x": 55,
-                    "y": 50,
-                    "diameter": 120
+            "text_config": {
+                "welcome_text": {
+                    "x_offset": 20,
+                    "y_offset": 20,
+                    "font_size": 28,
+                    "font_path": "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
                 },
-                "text_config": {
-                    "welcome_text": {
-                        "x_offset": 20,
-                        "y_offset": 20,
-                        "font_size": 28,
-                        "font_path": "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
-                    },
-                    "server_text": {
-                        "x_offset": 20,
-                        "y_offset": 40,
-                        "font_size": 24,
-                        "font_path": "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-                        "text": "To the Server!"
-                    },
-                    "text_color": [255, 255, 255, 255],
-                    "shadow_color": [0, 0, 0, 128],
-                    "shadow_offset": 2
-                }
+                "server_text": {
+                    "x_offset": 20,
+                    "y_offset": 40,
+                    "font_size": 24,
+                    "font_path": "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+                    "text": "To the Server!"
+                },
+                "text_color": [255, 255, 255, 255],
+                "shadow_color": [0, 0, 0, 128],
+                "shadow_offset": 2
             }
         }
+    }
+
+def load_welcome_data():
+    """Load welcome data from JSON file"""
+    return welcome_store.load(default=default_welcome_data)
+
+WELCOME_TEMPLATE_CACHE_SIZE = 2  # Templates gardés en mémoire (configuration actuelle + aperçu)
+
+_templates = OrderedDict()  # config_signature -> WelcomeTemplate
+_template_lock = None
+
+def config_signature(config):
+    """Clé stable d'une configuration de carte"""
+    return json.dumps(config, sort_keys=True)
+
+def template_build_lock():
+    # Créé au premier usage, dans la boucle du bot
+    global _template_lock
+    if _template_lock is None:
+        _template_lock = asyncio.Lock()
+    return _template_lock
+
+def invalidate_welcome_templates():
+    """Oublie les templates en cache (les images peuvent changer sans que les URLs changent)"""
+    _templates.clear()
+
+class WelcomeTemplate:
+    """Partie d'une carte de bienvenue commune à tous les membres.
+
+    Frames du fond (DefaultProfile déjà collé), décoration prête à coller,
+    masque de l'avatar et calque du texte de bienvenue; seuls l'avatar et le
+    nom du membre sont ajoutés pour chaque carte.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.frames = []
+        self.durations = []
+        self.is_animated = False
+        self.decoration = None
+        self.decoration_position = None
+        self.avatar_position = None
+        self.avatar_diameter = None
+        self.avatar_mask = None
+        self.username_config = None
+        self.text_x = 0
+        self.text_y_username = 0
+        self.text_color = None
+        self.shadow_color = None
+        self.shadow_offset = 0
+        self.text_layer = None
+        self.texture = None       # Texture du texte redimensionnée, None: texte avec ombre
+        self.texture_mask = None  # Texte recevant la texture
+
+    def draw_text_line(self, layer, texture_mask, text, font, y):
+        if self.texture is not None:
+            # Fine bordure noire (contour natif) autour du texte pour la lisibilité
+            border_thickness = 3
+            draw_text(layer, (self.text_x, y), text, font, (0, 0, 0, 255),
+                      stroke_width=border_thickness, stroke_fill=(0, 0, 0, 255))
+
+            # Masque du texte (sans bordure) pour la texture
+            line_mask, (left, top) = text_mask(text, font)
+            box = (self.text_x + left, y + top, self.text_x + left + line_mask.width, y + top + line_mask.height)
+            texture_mask.paste(255, box, line_mask)
+        else:
+            # Texte avec ombre, couleurs depuis la configuration
+            draw_text(layer, (self.text_x + self.shadow_offset, y + self.shadow_offset), text, font, self.shadow_color)
+            draw_text(layer, (self.text_x, y), text, font, self.text_color)
+
+    def text_layer_with(self, username_text, font):
+        """Calque de texte complet: texte de bienvenue en cache plus le nom du membre"""
+        layer = self.text_layer.copy()
+        if self.texture is None:
+            self.draw_text_line(layer, None, username_text, font, self.text_y_username)
+            return layer
+
+        texture_mask = self.texture_mask.copy()
+        self.draw_text_line(layer, texture_mask, username_text, font, self.text_y_username)
+        # Texture appliquée uniquement sur le texte, par-dessus toutes les bordures noires
+        texture = self.texture.copy()
+        texture.putalpha(texture_mask)
+        return Image.alpha_composite(layer, texture)
+
+    def circle_avatar(self, avatar, diameter):
+        """Avatar redimensionné et découpé en cercle (déjà fait par avatar_cache s'il a ce diamètre)"""
+        if avatar.size == (diameter, diameter):
+            return avatar
+        mask = self.avatar_mask
+        if diameter != self.avatar_diameter:
+            mask = Image.new('L', (diameter, diameter), 0)
+            ImageDraw.Draw(mask).ellipse((0, 0, diameter, diameter), fill=255)
+        avatar = avatar.resize((diameter, diameter), Image.Resampling.LANCZOS)
+        avatar_circle = Image.new("RGBA", (diameter, diameter), (0, 0, 0, 0))
+        avatar_circle.paste(avatar, (0, 0))
+        avatar_circle.putalpha(mask)
+        return avatar_circle
+
+    def avatar_layout(self, count):
+        """(x, y, diamètre) de chaque avatar: un seul avatar occupe tout le cercle, plusieurs se partagent une grille"""
+        x, y = self.avatar_position
+        if count <= 1:
+            return [(x, y, self.avatar_diameter)]
+        columns = 2
+        rows = (count + columns - 1) // columns
+        diameter = self.avatar_diameter // columns
+        top = y + (self.avatar_diameter - rows * diameter) // 2
+        return [(x + (index % columns) * diameter, top + (index // columns) * diameter, diameter)
+                for index in range(count)]
+
+    def render_card(self, avatars, username_text, static=False):
+        """Compose la carte (PNG, ou GIF si le fond est animé et static est False).
+
+        Travail PIL uniquement (appelé dans un thread): avatars est la liste
+        des avatars circulaires d'avatar_cache, plusieurs pour une carte groupée.
+        """
+        # Deuxième zone: "[USERNAME]" avec taille adaptative
+        username_config = self.username_config
+        available_width = self.width - self.text_x - username_config["margin_right"]
+
+        # Trouver la taille de police optimale (recherche dichotomique, polices et mesures en cache)
+        try:
+            font_username, _, _ = fit_font(username_config["font_path"], username_text, available_width,
+                                           username_config["font_size_max"], username_config["font_size_min"], step=5)
+        except Exception:
+            font_username = ImageFont.load_default()
+
+        text_layer = self.text_layer_with(username_text, font_username)
+        avatar_circles = [(self.circle_avatar(avatar, diameter), (x, y))
+                          for avatar, (x, y, diameter) in zip(avatars, self.avatar_layout(len(avatars)))]
+
+        # Composer chaque frame (une seule pour une image statique)
+        animated = self.is_animated and not static
+        final_frames = []
+        for bg_frame in (self.frames if animated else self.frames[:1]):
+            current_template = bg_frame.copy()
+            for avatar_circle, position in avatar_circles:
+                current_template.paste(avatar_circle, position, avatar_circle)
+            if self.decoration and len(avatar_circles) == 1:
+                current_template.paste(self.decoration, self.decoration_position, self.decoration)
+            final_frames.append(Image.alpha_composite(current_template, text_layer))
+
+        # GIF à palette partagée si animé, sinon WebP sans perte ou PNG à palette
+        return encode_card(final_frames, self.durations if animated else None, kind='welcome')
+
+# File de rendu des cartes de bienvenue
+WELCOME_QUEUE_SIZE = 200        # Arrivées en attente au maximum (les plus anciennes sont abandonnées)
+WELCOME_RENDER_WORKERS = 2      # Cartes rendues en même temps (PIL dans des threads)
+WELCOME_BURST_JOINS = 5         # Arrivées dans un salon pendant WELCOME_BURST_WINDOW secondes
+WELCOME_BURST_WINDOW = 10.0     # au-delà desquelles on passe en mode rafale
+WELCOME_BURST_BATCH_SIZE = 10   # Membres au maximum sur une carte groupée
+WELCOME_GROUP_NAMES = 4         # Noms (et avatars) affichés sur une carte groupée, les autres comptés en "+N"
+
+_http_session = None
+
+def welcome_http_session():
+    """Session HTTP partagée par tous les téléchargements du système de bienvenue"""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+    return _http_session
+
+class WelcomeRenderQueue:
+    """Bounded queue of welcome cards to render and send.
+
+    Joins are queued instead of rendered inline; a few workers render them
+    (PIL work in threads, off the event loop) and send them. When a channel
+    receives more than burst_joins joins in burst_window seconds (welcome
+    settings, raids and invite waves), the queued joins of that channel are
+    merged into one static "welcome A, B, C" card, and single joins get a
+    static card instead of an animated one.
+    """
+
+    def __init__(self, cog, max_queue_size=WELCOME_QUEUE_SIZE, workers=WELCOME_RENDER_WORKERS):
+        self.cog = cog
+        self.max_queue_size = max_queue_size
+        self.worker_count = workers
+
+        self._queue = deque()
+        self._wakeup = None
+        self._workers = []
+        self._recent_joins = {}  # channel id -> join times within the burst window
+        self.metrics = {
+            "enqueued": 0,
+            "dropped": 0,
+            "cards_sent": 0,
+            "burst_cards": 0,
+            "members_welcomed": 0,
+            "errors": 0,
+            "queue_depth": 0,
+            "max_queue_depth": 0,
+            "last_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+            "last_render_ms": 0.0
+        }
+        self._total_wait_ms = 0.0
+        self._waits = 0
+
+    def enqueue(self, member, channel, welcome_settings):
+        """Queue a welcome card for a member without rendering it"""
+        now = time.monotonic()
+        burst_window = welcome_settings.get("burst_window", WELCOME_BURST_WINDOW)
+        joins = self._recent_joins.setdefault(channel.id, deque())
+        joins.append(now)
+        while joins and joins[0] < now - burst_window:
+            joins.popleft()
+        burst = len(joins) > welcome_settings.get("burst_joins", WELCOME_BURST_JOINS)
+
+        if len(self._queue) >= self.max_queue_size:
+            # Best effort during raids: drop the oldest join rather than grow without limit
+            self._queue.popleft()
+            self.metrics["dropped"] += 1
+
+        welcome_message = welcome_settings.get("welcome_message", "Welcome {user}!")
+        self._queue.append((member, channel, welcome_message, burst, now))
+        self.metrics["enqueued"] += 1
+        self._update_depth()
+        self._ensure_workers()
+        self._wakeup.set()
+
+    def _update_depth(self):
+        depth = len(self._queue)
+        self.metrics["queue_depth"] = depth
+        self.metrics["max_queue_depth"] = max(self.metrics["max_queue_depth"], depth)
+
+    def _ensure_workers(self):
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        loop = asyncio.get_running_loop()
+        while len(self._workers) < self.worker_count:
+            self._workers.append(loop.create_task(self._run()))
+
+    def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+
+    async def _run(self):
+        while True:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            batch = self._next_batch()
+            try:
+                await self._welcome(batch)
+            except Exception as e:
+                self.metrics["errors"] += 1
+                print(f"Error sending welcome card: {e}")
+
+    def _next_batch(self):
+        """Next join, with the other queued joins of its channel when it is in burst mode"""
+        first = self._queue.popleft()
+        batch = [first]
+        if first[3]:
+            remaining = deque()
+            while self._queue:
+                item = self._queue.popleft()
+                if item[1].id == first[1].id and len(batch) < WELCOME_BURST_BATCH_SIZE:
+                    batch.append(item)
+                else:
+                    remaining.append(item)
+            self._queue = remaining
+        self._update_depth()
+        return batch
+
+    async def _welcome(self, batch):
+        now = time.monotonic()
+        wait_ms = (now - min(item[4] for item in batch)) * 1000
+        self.metrics["last_wait_ms"] = round(wait_ms, 1)
+        self.metrics["max_wait_ms"] = round(max(self.metrics["max_wait_ms"], wait_ms), 1)
+        self._total_wait_ms += sum((now - item[4]) * 1000 for item in batch)
+        self._waits += len(batch)
+
+        members = [item[0] for item in batch]
+        channel, welcome_message, burst = batch[0][1], batch[0][2], batch[0][3]
+
+        started = time.perf_counter()
+        if len(members) > 1:
+            welcome_card = await self.cog.create_group_welcome_card(members)
+        else:
+            welcome_card = await self.cog.create_welcome_card(members[0], static=burst)
+        self.metrics["last_render_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        if not welcome_card:
+            self.metrics["errors"] += 1
+            print(f"Failed to create welcome card for {', '.join(member.display_name for member in members)}")
+            return
+
+        # Get welcome message and replace {user} placeholder
+        welcome_message = welcome_message.replace("{user}", ", ".join(member.mention for member in members))
+
+        filename = f"welcome.{card_extension(welcome_card)}"
+
+        # Send welcome message with image ONLY if card was created successfully
+        file = discord.File(welcome_card, filename=filename)
+        await channel.send(content=welcome_message, file=file)
+
+        self.metrics["cards_sent"] += 1
+        self.metrics["members_welcomed"] += len(members)
+        if burst:
+            self.metrics["burst_cards"] += 1
+        print(f"Welcome message sent for {', '.join(member.display_name for member in members)}")
+
+    def get_metrics(self):
+        self._update_depth()
+        metrics = dict(self.metrics)
+        metrics["avg_wait_ms"] = round(self._total_wait_ms / max(1, self._waits), 1)
+        return metrics
 
 class WelcomeSystem(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.config = load_welcome_data()["template_config"]
         self.active_managers = {}  # Track welcome system managers
+        self.render_queue = WelcomeRenderQueue(self)
+
+    async def cog_unload(self):
+        self.render_queue.stop()
+        if _http_session is not None:
+            await _http_session.close()
 
     async def download_image(self, url):
         """Télécharge une image depuis une URL"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.read()
-                        return data
-                    else:
-                        print(f"Échec du téléchargement: HTTP {response.status}")
+            async with welcome_http_session().get(url) as response:
+                if response.status == 200:
+                    data = await response.read()
+                    return data
+                else:
+                    print(f"Échec du téléchargement: HTTP {response.status}")
             return None
         except Exception as e:
             print(f"Erreur lors du téléchargement de l'image {url}: {e}")
@@ -83,436 +408,258 @@ class WelcomeSystem(commands.Cog):
         draw.ellipse((0, 0, size[0], size[1]), fill=255)
         return mask
 
-    async def create_welcome_card(self, user):
-        """Crée la carte de bienvenue personnalisée"""
-        try:
-            # Recharger la configuration pour les modifications en temps réel
-            self.config = load_welcome_data()["template_config"]
-
-            # Taille cible pour le template
-            target_width, target_height = 2048, 1080
-            target_ratio = target_width / target_height
-
-            # Variables pour gérer les GIFs animés
-            is_animated_gif = False
-            frames = []
-            durations = []
-
-            # Créer un template avec couleur de fond ou image personnalisée
-            if self.config.get("background_image"):
-                template_data = await self.download_image(self.config["background_image"])
-                if not template_data:
+    def crop_to_card(self, image, target_width, target_height):
+        """Rogne l'image au ratio de la carte (depuis le centre) puis la redimensionne"""
+        target_ratio = target_width / target_height
+        orig_width, orig_height = image.size
+        orig_ratio = orig_width / orig_height
+
+        if orig_ratio > target_ratio:
+            # Image trop large, rogner sur les côtés
+            new_width = int(orig_height * target_ratio)
+            left = (orig_width - new_width) // 2
+            image = image.crop((left, 0, left + new_width, orig_height))
+        elif orig_ratio < target_ratio:
+            # Image trop haute, rogner en haut et en bas
+            new_height = int(orig_width / target_ratio)
+            top = (orig_height - new_height) // 2
+            image = image.crop((0, top, orig_width, top + new_height))
+
+        # Redimensionner à la taille exacte
+        return image.resize((target_width, target_height), Image.Resampling.LANCZOS)
+
+    def crop_to_square(self, image):
+        """Rogne l'image en carré depuis le centre"""
+        width, height = image.size
+        if width == height:
+            return image
+        min_dimension = min(width, height)
+        left = (width - min_dimension) // 2
+        top = (height - min_dimension) // 2
+        return image.crop((left, top, left + min_dimension, top + min_dimension))
+
+    async def get_welcome_template(self):
+        """Template de la configuration actuelle, depuis le cache ou construit"""
+        key = config_signature(self.config)
+        template = _templates.get(key)
+        if template is not None:
+            _templates.move_to_end(key)
+            return template
+
+        async with template_build_lock():
+            # Un autre membre a pu construire le même template pendant l'attente
+            template = _templates.get(key)
+            if template is None:
+                template = await self.build_welcome_template(self.config)
+                if template is None:
                     return None
+                _templates[key] = template
+                while len(_templates) > WELCOME_TEMPLATE_CACHE_SIZE:
+                    _templates.popitem(last=False)
+            return template
+
+    async def build_welcome_template(self, config):
+        """Télécharge tout ce qui ne dépend pas du membre, puis prépare le template hors de la boucle"""
+        default_profile_config = config.get("default_profile", {})
+        decoration_config = config.get("profile_decoration", {})
+        decoration_enabled = decoration_config.get("enabled", True)
+
+        # Téléchargements en parallèle, dans la boucle (None: échec)
+        urls = {
+            "background": config.get("background_image"),
+            "default_profile": default_profile_config.get("url") if default_profile_config.get("enabled", True) else None,
+            "custom_content": default_profile_config.get("custom_image_url"),
+            "decoration": decoration_config.get("url") if decoration_enabled else None,
+            "custom_decoration": (decoration_config.get("custom_image")
+                                  if decoration_enabled and not decoration_config.get("color_override") else None)
+        }
+        names = [name for name, url in urls.items() if url]
+        downloads = dict(zip(names, await asyncio.gather(*(self.download_image(urls[name]) for name in names))))
+        if urls["background"] and not downloads["background"]:
+            return None
 
-                # Ouvrir l'image de fond
-                bg_image = Image.open(io.BytesIO(template_data))
-                
-                # Vérifier si c'est un GIF animé
-                if hasattr(bg_image, 'is_animated') and bg_image.is_animated:
-                    is_animated_gif = True
-                    # Traiter chaque frame du GIF
-                    for frame_idx in range(bg_image.n_frames):
-                        bg_image.seek(frame_idx)
-                        frame = bg_image.copy().convert("RGBA")
-                        
-                        # Appliquer les mêmes transformations à chaque frame
-                        orig_width, orig_height = frame.size
-                        orig_ratio = orig_width / orig_height
-
-                        # Rogner l'image pour maintenir les bonnes proportions
-                        if orig_ratio > target_ratio:
-                            # Image trop large, rogner sur les côtés
-                            new_width = int(orig_height * target_ratio)
-                            left = (orig_width - new_width) // 2
-                            frame = frame.crop((left, 0, left + new_width, orig_height))
-                        elif orig_ratio < target_ratio:
-                            # Image trop haute, rogner en haut et en bas
-                            new_height = int(orig_width / target_ratio)
-                            top = (orig_height - new_height) // 2
-                            frame = frame.crop((0, top, orig_width, top + new_height))
-
-                        # Redimensionner à la taille exacte
-                        frame = frame.resize((target_width, target_height), Image.Resampling.LANCZOS)
-                        frames.append(frame)
-                        
-                        # Récupérer la durée de la frame
-                        try:
-                            duration = bg_image.info.get('duration', 100)
-                            durations.append(duration)
-                        except:
-                            durations.append(100)  # 100ms par défaut
-                else:
-                    # Image statique
-                    bg_image = bg_image.convert("RGBA")
-                    orig_width, orig_height = bg_image.size
-                    orig_ratio = orig_width / orig_height
-
-                    # Rogner l'image pour maintenir les bonnes proportions
-                    if orig_ratio > target_ratio:
-                        # Image trop large, rogner sur les côtés
-                        new_width = int(orig_height * target_ratio)
-                        left = (orig_width - new_width) // 2
-                        bg_image = bg_image.crop((left, 0, left + new_width, orig_height))
-                    elif orig_ratio < target_ratio:
-                        # Image trop haute, rogner en haut et en bas
-                        new_height = int(orig_width / target_ratio)
-                        top = (orig_height - new_height) // 2
-                        bg_image = bg_image.crop((0, top, orig_width, top + new_height))
-
-                    # Redimensionner à la taille exacte
-                    template = bg_image.resize((target_width, target_height), Image.Resampling.LANCZOS)
+        # Décodage des frames du fond, redimensionnements et compositions: dans un thread,
+        # un GIF de fond peut occuper la boucle plusieurs secondes
+        return await render_service.run('welcome_template', self.compose_welcome_template, config, downloads,
+                                        process=False)
+
+    def compose_welcome_template(self, config, downloads):
+        """Prépare le template depuis les images téléchargées (travail PIL uniquement)"""
+        # Taille cible pour le template
+        target_width, target_height = 2048, 1080
+        template = WelcomeTemplate(target_width, target_height)
+
+        # Créer un template avec couleur de fond ou image personnalisée
+        if config.get("background_image"):
+            template_data = downloads["background"]
+
+            # Frames du fond (GIF, WebP ou APNG animés), décodées une à une et limitées
+            background = AnimatedMedia(template_data)
+            for frame, duration in background.frames((target_width, target_height),
+                                                     lambda frame: self.crop_to_card(frame, target_width, target_height)):
+                template.frames.append(frame)
+                template.durations.append(duration)
+            background.close()
+            # Une seule frame restante (image statique ou frames identiques fusionnées): carte PNG
+            template.is_animated = len(template.frames) > 1
+        else:
+            # Créer une image avec couleur de fond
+            bg_color = config.get("background_color", [255, 255, 255])
+            template.frames.append(Image.new("RGBA", (target_width, target_height), tuple(bg_color + [255])))
+
+        # DefaultProfile (ou l'image de contenu personnalisée), derrière l'avatar
+        default_profile = None
+        default_profile_config = config.get("default_profile", {})
+        if default_profile_config.get("enabled", True) and "url" in default_profile_config:
+            default_profile_data = downloads.get("default_profile")
+            if not default_profile_data:
+                print("⚠️ Échec du chargement de DefaultProfile")
             else:
-                # Créer une image avec couleur de fond
-                bg_color = self.config.get("background_color", [255, 255, 255])
-                template = Image.new("RGBA", (target_width, target_height), tuple(bg_color + [255]))
-
-            # Télécharger l'avatar de l'utilisateur
-            avatar_url = user.display_avatar.url
-            avatar_data = await self.download_image(avatar_url)
-            if not avatar_data:
-                return None
-
-            # Télécharger DefaultProfile si activée
-            default_profile_data = None
-            default_profile_config = self.config.get("default_profile", {})
-            if default_profile_config.get("enabled", True) and "url" in default_profile_config:
-                default_profile_url = default_profile_config["url"]
-                default_profile_data = await self.download_image(default_profile_url)
-                if not default_profile_data:
-                    print("⚠️ Échec du chargement de DefaultProfile")
-
-            # Télécharger la décoration de profil si activée
-            decoration_data = None
-            decoration_config = self.config.get("profile_decoration", {})
-            if decoration_config.get("enabled", True) and "url" in decoration_config:
-                decoration_url = decoration_config["url"]
-                decoration_data = await self.download_image(decoration_url)
-                if not decoration_data:
-                    print("⚠️ Échec du chargement de ProfileOutline")
-
-            # Ouvrir l'avatar
-            avatar = Image.open(io.BytesIO(avatar_data)).convert("RGBA")
-
-            # Ouvrir DefaultProfile si disponible
-            default_profile = None
-            if default_profile_data:
                 try:
                     default_profile = Image.open(io.BytesIO(default_profile_data)).convert("RGBA")
                 except Exception as e:
                     print(f"❌ Erreur lors du traitement de DefaultProfile: {e}")
 
-            # Vérifier si une image personnalisée de contenu est définie
-            default_profile_config = self.config.get("default_profile", {})
-            if default_profile_config.get("custom_image_url"):
-                try:
-                    custom_content_data = await self.download_image(default_profile_config["custom_image_url"])
-                    if custom_content_data:
-                        custom_default_profile = Image.open(io.BytesIO(custom_content_data)).convert("RGBA")
-                        # Utiliser l'image personnalisée au lieu de la default
-                        default_profile = custom_default_profile
-                except Exception as e:
-                    print(f"❌ Erreur lors du chargement de l'image de contenu personnalisée: {e}")
-
-            # Ouvrir la décoration si disponible
+        # L'image de contenu personnalisée sert aussi de texture pour le texte
+        custom_content = None
+        if default_profile_config.get("custom_image_url"):
+            try:
+                custom_content_data = downloads.get("custom_content")
+                if custom_content_data:
+                    custom_content = Image.open(io.BytesIO(custom_content_data)).convert("RGBA")
+                    # Utiliser l'image personnalisée au lieu de la default
+                    default_profile = custom_content
+            except Exception as e:
+                print(f"❌ Erreur lors du chargement de l'image de contenu personnalisée: {e}")
+
+        # DefaultProfile fait partie du fond: collé une fois sur chaque frame
+        if default_profile and default_profile_config.get("enabled", True):
+            position = (default_profile_config["x"], default_profile_config["y"])
+            for frame in template.frames:
+                frame.paste(default_profile, position, default_profile)
+
+        # Décoration de profil (couleur ou image personnalisée déjà appliquée), par-dessus l'avatar
+        decoration_config = config.get("profile_decoration", {})
+        if decoration_config.get("enabled", True) and "url" in decoration_config:
+            decoration_data = downloads.get("decoration")
             decoration = None
-            if decoration_data:
+            if not decoration_data:
+                print("⚠️ Échec du chargement de ProfileOutline")
+            else:
                 try:
-                    decoration = Image.open(io.BytesIO(decoration_data)).convert("RGBA")
-
-                    # Traitement de l'image de décoration pour la rendre carrée si nécessaire
-                    dec_width, dec_height = decoration.size
-                    if dec_width != dec_height:
-                        # Rogner pour faire un carré depuis le centre
-                        min_dimension = min(dec_width, dec_height)
-                        left = (dec_width - min_dimension) // 2
-                        top = (dec_height - min_dimension) // 2
-                        decoration = decoration.crop((left, top, left + min_dimension, top + min_dimension))
-
+                    decoration = self.crop_to_square(Image.open(io.BytesIO(decoration_data)).convert("RGBA"))
                 except Exception as e:
                     print(f"❌ Erreur lors du traitement de ProfileOutline: {e}")
 
-            # Configuration de l'avatar depuis JSON
-            avatar_config = self.config["avatar_position"]
-            circle_x = avatar_config["x"]
-            circle_y = avatar_config["y"]
-            circle_diameter = avatar_config["diameter"]
-
-            # Redimensionner l'avatar pour qu'il rentre dans le cercle
-            avatar = avatar.resize((circle_diameter, circle_diameter), Image.Resampling.LANCZOS)
-
-            # Créer un masque circulaire pour l'avatar
-            mask = self.create_circle_mask((circle_diameter, circle_diameter))
-
-            # Appliquer le masque circulaire à l'avatar
-            avatar_circle = Image.new("RGBA", (circle_diameter, circle_diameter), (0, 0, 0, 0))
-            avatar_circle.paste(avatar, (0, 0))
-            avatar_circle.putalpha(mask)
-
-            # Ajouter DefaultProfile derrière l'avatar si disponible
-            if default_profile and self.config.get("default_profile", {}).get("enabled", True):
-                default_profile_config = self.config["default_profile"]
-                default_profile_x = default_profile_config["x"]
-                default_profile_y = default_profile_config["y"]
-
-                # Coller DefaultProfile à sa taille d'origine (derrière l'avatar)
-                template.paste(default_profile, (default_profile_x, default_profile_y), default_profile)
-
-            # Coller l'avatar circulaire sur le template (par-dessus DefaultProfile)
-            template.paste(avatar_circle, (circle_x, circle_y), avatar_circle)
-
-            # Ajouter la décoration de profil par-dessus l'avatar si disponible
-            if decoration and self.config.get("profile_decoration", {}).get("enabled", True):
-                decoration_config = self.config["profile_decoration"]
-                decoration_x = decoration_config["x"]
-                decoration_y = decoration_config["y"]
-
+            if decoration:
                 # Appliquer le changement de couleur si défini
                 if decoration_config.get("color_override"):
-                    color_override = decoration_config["color_override"]
-                    # Créer une nouvelle image avec la couleur de remplacement
-                    colored_decoration = Image.new("RGBA", decoration.size, tuple(color_override + [255]))
-                    # Utiliser le canal alpha de l'image originale
+                    # Nouvelle image de la couleur de remplacement, avec le canal alpha de l'originale
+                    colored_decoration = Image.new("RGBA", decoration.size, tuple(decoration_config["color_override"] + [255]))
                     colored_decoration.putalpha(decoration.split()[-1])
                     decoration = colored_decoration
                 elif decoration_config.get("custom_image"):
-                    # Si une image personnalisée est définie, la télécharger
-                    custom_decoration_data = await self.download_image(decoration_config["custom_image"])
+                    custom_decoration_data = downloads.get("custom_decoration")
                     if custom_decoration_data:
-                        custom_decoration = Image.open(io.BytesIO(custom_decoration_data)).convert("RGBA")
-
-                        # Traitement de l'image personnalisée pour la rendre carrée si nécessaire
-                        dec_width, dec_height = custom_decoration.size
-                        if dec_width != dec_height:
-                            # Rogner pour faire un carré depuis le centre
-                            min_dimension = min(dec_width, dec_height)
-                            left = (dec_width - min_dimension) // 2
-                            top = (dec_height - min_dimension) // 2
-                            custom_decoration = custom_decoration.crop((left, top, left + min_dimension, top + min_dimension))
-
+                        custom_decoration = self.crop_to_square(Image.open(io.BytesIO(custom_decoration_data)).convert("RGBA"))
                         # Redimensionner l'image personnalisée à la taille de ProfileOutline
-                        if decoration:
-                            custom_decoration = custom_decoration.resize(decoration.size, Image.Resampling.LANCZOS)
-
-                            # Appliquer le masque alpha de ProfileOutline sur l'image personnalisée
-                            # Utiliser le canal alpha de ProfileOutline comme masque
-                            alpha_mask = decoration.split()[-1]  # Canal alpha de ProfileOutline
-
-                            # Créer une nouvelle image avec l'image personnalisée mais utilisant le masque de ProfileOutline
-                            masked_decoration = Image.new("RGBA", custom_decoration.size, (0, 0, 0, 0))
-                            masked_decoration.paste(custom_decoration, (0, 0))
-                            masked_decoration.putalpha(alpha_mask)
-
-                            decoration = masked_decoration
-
-                # Coller la décoration à sa taille d'origine (par-dessus l'avatar)
-                template.paste(decoration, (decoration_x, decoration_y), decoration)
-
-            # Ajouter le texte
-            draw = ImageDraw.Draw(template)
-
-            # Configuration du texte depuis JSON
-            text_config = self.config["text_config"]
-            welcome_config = text_config["welcome_text"]
-            username_config = text_config["username_text"]
-
-            # Position du texte (à droite de l'avatar)
-            text_x = circle_x + circle_diameter + welcome_config["x_offset"]
-            text_y_welcome = circle_y + welcome_config["y_offset"]
-            text_y_username = circle_y + username_config["y_offset"]
-
-            # Couleurs depuis la configuration avec valeurs par défaut
-            text_color = tuple(text_config.get("text_color", [255, 255, 255, 255]))
-            shadow_color = tuple(text_config.get("shadow_color", [0, 0, 0, 128]))
-            shadow_offset = text_config.get("shadow_offset", 2)
+                        custom_decoration = custom_decoration.resize(decoration.size, Image.Resampling.LANCZOS)
+
+                        # Image personnalisée avec le masque alpha de ProfileOutline
+                        masked_decoration = Image.new("RGBA", custom_decoration.size, (0, 0, 0, 0))
+                        masked_decoration.paste(custom_decoration, (0, 0))
+                        masked_decoration.putalpha(decoration.split()[-1])
+                        decoration = masked_decoration
+
+                template.decoration = decoration
+                template.decoration_position = (decoration_config["x"], decoration_config["y"])
+
+        # Configuration de l'avatar depuis JSON
+        avatar_config = config["avatar_position"]
+        template.avatar_position = (avatar_config["x"], avatar_config["y"])
+        template.avatar_diameter = avatar_config["diameter"]
+        template.avatar_mask = self.create_circle_mask((template.avatar_diameter, template.avatar_diameter))
+
+        # Configuration du texte depuis JSON
+        text_config = config["text_config"]
+        welcome_config = text_config["welcome_text"]
+        template.username_config = username_config = text_config["username_text"]
+
+        # Position du texte (à droite de l'avatar)
+        template.text_x = avatar_config["x"] + avatar_config["diameter"] + welcome_config["x_offset"]
+        text_y_welcome = avatar_config["y"] + welcome_config["y_offset"]
+        template.text_y_username = avatar_config["y"] + username_config["y_offset"]
+
+        # Couleurs depuis la configuration avec valeurs par défaut
+        template.text_color = tuple(text_config.get("text_color", [255, 255, 255, 255]))
+        template.shadow_color = tuple(text_config.get("shadow_color", [0, 0, 0, 128]))
+        template.shadow_offset = text_config.get("shadow_offset", 2)
+
+        # Première zone: Message de bienvenue fixe, rendu une fois dans le calque de texte
+        welcome_text = welcome_config.get("text", "WELCOME TO THE SERVER")
+        try:
+            font_welcome = load_font(welcome_config["font_path"], welcome_config["font_size"])
+        except:
+            font_welcome = ImageFont.load_default()
+
+        template.text_layer = Image.new("RGBA", (target_width, target_height), (0, 0, 0, 0))
+        if custom_content:
+            # Texture redimensionnée pour couvrir toute la zone de texte
+            template.texture = custom_content.resize((target_width, target_height), Image.Resampling.LANCZOS)
+            template.texture_mask = Image.new('L', (target_width, target_height), 0)
+        template.draw_text_line(template.text_layer, template.texture_mask, welcome_text, font_welcome, text_y_welcome)
+        return template
+
+    async def create_welcome_card(self, user, static=False):
+        """Crée la carte de bienvenue personnalisée (static: PNG même si le fond est animé)"""
+        try:
+            # Configuration actuelle (copie partagée en lecture seule, revalidée sur le fichier)
+            self.config = welcome_store.read(default=default_welcome_data)["template_config"]
 
-            # Récupérer le message de bienvenue personnalisé depuis welcome_config
-            welcome_text = welcome_config.get("text", "WELCOME TO THE SERVER")
-            
-            # Première zone: Message de bienvenue fixe
-            try:
-                font_welcome = ImageFont.truetype(welcome_config["font_path"], welcome_config["font_size"])
-            except:
-                font_welcome = ImageFont.load_default()
+            # Fond, DefaultProfile, décoration et texte de bienvenue: communs à tous les membres
+            template = await self.get_welcome_template()
+            if template is None:
+                return None
 
-            # Deuxième zone: "[USERNAME]" avec taille adaptative
-            username_text = user.display_name.upper()
+            # Avatar de l'utilisateur, déjà circulaire au diamètre de la carte
+            avatar = await avatar_cache.get(user, template.avatar_diameter)
+            if avatar is None:
+                return None
 
-            # Calculer l'espace disponible pour le nom d'utilisateur
-            image_width = template.width
-            available_width = image_width - text_x - username_config["margin_right"]
+            # Composition et encodage hors de la boucle d'événements. Dans un thread: les
+            # frames du template sont en mémoire dans ce processus, les envoyer à un
+            # processus coûterait plus cher que la composition
+            return await render_service.run('welcome', template.render_card, [avatar],
+                                            user.display_name.upper(), static, process=False)
 
-            # Trouver la taille de police optimale
-            font_size = username_config["font_size_max"]
-            font_username = None
+        except Exception as e:
+            print(f"Erreur lors de la création de la carte de bienvenue: {e}")
+            return None
 
-            while font_size >= username_config["font_size_min"]:
-                try:
-                    font_username = ImageFont.truetype(username_config["font_path"], font_size)
-                except:
-                    font_username = ImageFont.load_default()
+    async def create_group_welcome_card(self, members):
+        """Carte statique unique pour plusieurs arrivées (mode rafale): "A, B, C +N" """
+        try:
+            self.config = welcome_store.read(default=default_welcome_data)["template_config"]
+            template = await self.get_welcome_template()
+            if template is None:
+                return None
 
-                # Calculer la largeur du texte avec cette police
-                bbox = draw.textbbox((0, 0), username_text, font=font_username)
-                text_width = bbox[2] - bbox[0]
+            shown = members[:WELCOME_GROUP_NAMES]
+            # Au diamètre de la grille; si certains manquent, render_card redimensionne les autres
+            diameter = template.avatar_layout(len(shown))[0][2]
+            avatars = await asyncio.gather(*(avatar_cache.get(member, diameter) for member in shown))
+            avatars = [avatar for avatar in avatars if avatar is not None]
+            if not avatars:
+                return None
 
-                # Si le texte rentre dans l'espace disponible, on garde cette taille
-                if text_width <= available_width:
-                    break
+            names = ", ".join(member.display_name.upper() for member in shown)
+            if len(members) > len(shown):
+                names += f" +{len(members) - len(shown)}"
 
-                # Sinon, réduire la taille de police
-                font_size -= 5
-
-            # S'assurer qu'on a une police valide
-            if font_username is None:
-                try:
-                    font_username = ImageFont.truetype(username_config["font_path"], username_config["font_size_min"])
-                except:
-                    font_username = ImageFont.load_default()
-
-            # Vérifier si une image de texture de texte est définie
-            text_texture_image = None
-            default_profile_config = self.config.get("default_profile", {})
-            if default_profile_config.get("custom_image_url"):
-                try:
-                    texture_data = await self.download_image(default_profile_config["custom_image_url"])
-                    if texture_data:
-                        text_texture_image = Image.open(io.BytesIO(texture_data)).convert("RGBA")
-                except Exception as e:
-                    print(f"❌ Erreur lors du chargement de la texture de texte: {e}")
-
-            if text_texture_image:
-                # Créer une fine bordure noire autour du texte pour la lisibilité
-                border_thickness = 3
-                draw = ImageDraw.Draw(template)
-
-                # Dessiner la bordure noire (plusieurs passes pour épaissir)
-                for adj in range(-border_thickness, border_thickness + 1):
-                    for adj_y in range(-border_thickness, border_thickness + 1):
-                        if adj != 0 or adj_y != 0:
-                            draw.text((text_x + adj, text_y_welcome + adj_y),
-                                     welcome_text, font=font_welcome, fill=(0, 0, 0, 255))
-                            draw.text((text_x + adj, text_y_username + adj_y),
-                                     username_text, font=font_username, fill=(0, 0, 0, 255))
-
-                # Créer un masque pour le texte (sans bordure)
-                text_mask = Image.new('L', template.size, 0)
-                mask_draw = ImageDraw.Draw(text_mask)
-
-                # Dessiner le texte sur le masque en blanc (visible) - seulement le texte principal, pas la bordure
-                mask_draw.text((text_x, text_y_welcome),
-                             welcome_text, font=font_welcome, fill=255)
-                mask_draw.text((text_x, text_y_username),
-                             username_text, font=font_username, fill=255)
-
-                # Redimensionner l'image de texture pour couvrir toute la zone de texte
-                texture_resized = text_texture_image.resize(template.size, Image.Resampling.LANCZOS)
-
-                # Créer une image avec la texture appliquée uniquement sur le texte
-                textured_text = Image.new("RGBA", template.size, (0, 0, 0, 0))
-                textured_text.paste(texture_resized, (0, 0))
-                textured_text.putalpha(text_mask)
-
-                # Coller l'image texturée sur le template (par-dessus la bordure noire)
-                template = Image.alpha_composite(template, textured_text)
-            else:
-                # Dessiner le texte normalement avec les couleurs
-                draw.text((text_x + shadow_offset, text_y_welcome + shadow_offset),
-                         welcome_text, font=font_welcome, fill=shadow_color)
-                draw.text((text_x, text_y_welcome),
-                         welcome_text, font=font_welcome, fill=text_color)
-
-                # Dessiner le nom d'utilisateur avec l'ombre
-                draw.text((text_x + shadow_offset, text_y_username + shadow_offset),
-                         username_text, font=font_username, fill=shadow_color)
-                draw.text((text_x, text_y_username),
-                         username_text, font=font_username, fill=text_color)
-
-            # Si c'est un GIF animé, traiter toutes les frames
-            if is_animated_gif:
-                final_frames = []
-                
-                for frame_idx, bg_frame in enumerate(frames):
-                    # Utiliser bg_frame comme template pour cette frame
-                    current_template = bg_frame.copy()
-                    
-                    # Ajouter tous les éléments overlay sur cette frame
-                    # Ajouter DefaultProfile derrière l'avatar si disponible
-                    if default_profile and self.config.get("default_profile", {}).get("enabled", True):
-                        default_profile_config = self.config["default_profile"]
-                        default_profile_x = default_profile_config["x"]
-                        default_profile_y = default_profile_config["y"]
-                        current_template.paste(default_profile, (default_profile_x, default_profile_y), default_profile)
-
-                    # Coller l'avatar circulaire sur le template
-                    current_template.paste(avatar_circle, (circle_x, circle_y), avatar_circle)
-
-                    # Ajouter la décoration de profil si disponible
-                    if decoration and self.config.get("profile_decoration", {}).get("enabled", True):
-                        decoration_config = self.config["profile_decoration"]
-                        decoration_x = decoration_config["x"]
-                        decoration_y = decoration_config["y"]
-                        current_template.paste(decoration, (decoration_x, decoration_y), decoration)
-
-                    # Ajouter le texte sur cette frame
-                    draw = ImageDraw.Draw(current_template)
-                    
-                    if text_texture_image:
-                        # Appliquer la texture de texte
-                        border_thickness = 3
-                        for adj in range(-border_thickness, border_thickness + 1):
-                            for adj_y in range(-border_thickness, border_thickness + 1):
-                                if adj != 0 or adj_y != 0:
-                                    draw.text((text_x + adj, text_y_welcome + adj_y),
-                                             welcome_text, font=font_welcome, fill=(0, 0, 0, 255))
-                                    draw.text((text_x + adj, text_y_username + adj_y),
-                                             username_text, font=font_username, fill=(0, 0, 0, 255))
-
-                        text_mask = Image.new('L', current_template.size, 0)
-                        mask_draw = ImageDraw.Draw(text_mask)
-                        mask_draw.text((text_x, text_y_welcome),
-                                     welcome_text, font=font_welcome, fill=255)
-                        mask_draw.text((text_x, text_y_username),
-                                     username_text, font=font_username, fill=255)
-
-                        texture_resized = text_texture_image.resize(current_template.size, Image.Resampling.LANCZOS)
-                        textured_text = Image.new("RGBA", current_template.size, (0, 0, 0, 0))
-                        textured_text.paste(texture_resized, (0, 0))
-                        textured_text.putalpha(text_mask)
-                        current_template = Image.alpha_composite(current_template, textured_text)
-                    else:
-                        # Texte normal
-                        draw.text((text_x + shadow_offset, text_y_welcome + shadow_offset),
-                                 welcome_text, font=font_welcome, fill=shadow_color)
-                        draw.text((text_x, text_y_welcome),
-                                 welcome_text, font=font_welcome, fill=text_color)
-                        draw.text((text_x + shadow_offset, text_y_username + shadow_offset),
-                                 username_text, font=font_username, fill=shadow_color)
-                        draw.text((text_x, text_y_username),
-                                 username_text, font=font_username, fill=text_color)
-                    
-                    final_frames.append(current_template)
-                
-                # Sauvegarder le GIF animé
-                output = io.BytesIO()
-                final_frames[0].save(
-                    output,
-                    format='GIF',
-                    save_all=True,
-                    append_images=final_frames[1:],
-                    duration=durations,
-                    loop=0  # Boucle infinie
-                )
-                output.seek(0)
-                return output
-            else:
-                # Image statique
-                output = io.BytesIO()
-                template.save(output, format='PNG')
-                output.seek(0)
-                return output
+            return await render_service.run('welcome', template.render_card, avatars, names, True, process=False)
 
         except Exception as e:
-            print(f"Erreur lors de la création de la carte de bienvenue: {e}")
+            print(f"Erreur lors de la création de la carte de bienvenue groupée: {e}")
             return None
 
     @app_commands.command(name="welcome_system", description="Manage welcome card settings and design")
@@ -566,7 +713,7 @@ class WelcomeSystem(commands.Cog):
     async def on_member_join(self, member):
         """Handle new member joining"""
         try:
-            welcome_data = load_welcome_data()
+            welcome_data = welcome_store.read(default=default_welcome_data)
             welcome_settings = welcome_data.get("welcome_settings", {})
 
             # Check if welcome system is enabled
@@ -582,29 +729,8 @@ class WelcomeSystem(commands.Cog):
             if not channel:
                 return
 
-            # Create welcome card
-            welcome_card = await self.create_welcome_card(member)
-            if not welcome_card:
-                print(f"Failed to create welcome card for {member.display_name}")
-                return
-
-            # Get welcome message and replace {user} placeholder
-            welcome_message = welcome_settings.get("welcome_message", "Welcome {user}!")
-            welcome_message = welcome_message.replace("{user}", member.mention)
-
-            # Determine file extension for the welcome card
-            welcome_card.seek(0)
-            file_header = welcome_card.read(6)  # GIF header is 6 bytes: "GIF87a" or "GIF89a"
-            welcome_card.seek(0)
-
-            # Check for proper GIF signature
-            is_gif = file_header.startswith(b'GIF87a') or file_header.startswith(b'GIF89a')
-            filename = "welcome.gif" if is_gif else "welcome.png"
-
-            # Send welcome message with image ONLY if card was created successfully
-            file = discord.File(welcome_card, filename=filename)
-            await channel.send(content=welcome_message, file=file)
-            print(f"Welcome message sent for {member.display_name}")
+            # Rendered and sent by the render queue (merged into group cards during raids)
+            self.render_queue.enqueue(member, channel, welcome_settings)
 
         except Exception as e:
             print(f"Error in on_member_join: {e}")
@@ -804,10 +930,8 @@ class WelcomeSystem(commands.Cog):
             draw = ImageDraw.Draw(mask)
             draw.ellipse((0, 0, custom_image.size[0], custom_image.size[1]), fill=255)
 
-            # Create final masked image
-            masked_image = Image.new("RGBA", custom_image.size, (0, 0, 0, 0))
-            masked_image.paste(custom_image, (0, 0))
-            masked_image.putalpha(mask)
+            # Create final masked image (the resized image is masked in place)
+            masked_image = apply_mask(custom_image, mask)
 
             # Save processed image
             os.makedirs('images', exist_ok=True)
@@ -1269,6 +1393,20 @@ class WelcomeSystemManagerView(discord.ui.View):
             inline=False
         )
 
+        welcome_system = self.bot.get_cog("WelcomeSystem")
+        if welcome_system:
+            metrics = welcome_system.render_queue.get_metrics()
+            encoding = get_encoder_stats('welcome')
+            embed.add_field(
+                name="Render Queue",
+                value=f"Pending: {metrics['queue_depth']} (max {metrics['max_queue_depth']})\n"
+                      f"Sent: {metrics['members_welcomed']} member(s) in {metrics['cards_sent']} card(s), {metrics['burst_cards']} in burst mode\n"
+                      f"Dropped: {metrics['dropped']} | Errors: {metrics['errors']}\n"
+                      f"Wait: {metrics['avg_wait_ms']:.0f} ms avg, {metrics['max_wait_ms']:.0f} ms max | Last render: {metrics['last_render_ms']:.0f} ms\n"
+                      f"Encoded: {encoding['avg_bytes'] // 1024} KB avg in {encoding['avg_encode_ms']:.0f} ms ({encoding['cards']} card(s))",
+                inline=False
+            )
+
         # Add preview image if available
         if hasattr(self, 'preview_image_url') and self.preview_image_url:
             embed.set_image(url=self.preview_image_url)
@@ -1323,8 +1461,8 @@ class WelcomeSystemManagerView(discord.ui.View):
         """Save the current configuration to JSON file"""
         data = load_welcome_data()
         data["template_config"] = self.config
-        with open('welcome_data.json', 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        welcome_store.save(data)
+        invalidate_welcome_templates()
         
         # Sauvegarder aussi dans embed_command.json pour compatibilité
         try:
@@ -1363,8 +1501,8 @@ class WelcomeSystemManagerView(discord.ui.View):
             # Recharger la configuration pour avoir les dernières modifications
             self.config = load_welcome_data()["template_config"]
 
-            welcome_system = WelcomeSystem(self.bot)
-            welcome_system.config = self.config  # S'assurer que le welcome_system utilise la config mise à jour
+            # Le cog chargé partage le cache de templates et la session HTTP
+            welcome_system = self.bot.get_cog("WelcomeSystem") or WelcomeSystem(self.bot)
 
             preview_image = await welcome_system.create_welcome_card(interaction_user)
 
@@ -1374,15 +1512,8 @@ class WelcomeSystemManagerView(discord.ui.View):
                 import time
                 timestamp = int(time.time())
 
-                # Déterminer l'extension basée sur le contenu
-                preview_image.seek(0)
-                file_header = preview_image.read(10)
-                preview_image.seek(0)
-
-                if file_header.startswith(b'GIF'):
-                    filename = f"welcome_preview_{self.user_id}_{timestamp}.gif"
-                else:
-                    filename = f"welcome_preview_{self.user_id}_{timestamp}.png"
+                # Extension d'après le contenu encodé (GIF, WebP ou PNG)
+                filename = f"welcome_preview_{self.user_id}_{timestamp}.{card_extension(preview_image)}"
 
                 file_path = os.path.join('images', filename)
 
@@ -2184,16 +2315,12 @@ class WelcomeSystemManagerView(discord.ui.View):
         await interaction.response.edit_message(embed=embed, view=self)
 
     async def toggle_welcome_system(self, interaction: discord.Interaction):
-        welcome_data = load_welcome_data()
-        if "welcome_settings" not in welcome_data:
-            welcome_data["welcome_settings"] = {}
-
-        current_state = welcome_data["welcome_settings"].get("enabled", False)
-        welcome_data["welcome_settings"]["enabled"] = not current_state
+        async with welcome_store.edit(default=default_welcome_data) as welcome_data:
+            if "welcome_settings" not in welcome_data:
+                welcome_data["welcome_settings"] = {}
 
-        # Save to file
-        with open('welcome_data.json', 'w', encoding='utf-8') as f:
-            json.dump(welcome_data, f, indent=2, ensure_ascii=False)
+            current_state = welcome_data["welcome_settings"].get("enabled", False)
+            welcome_data["welcome_settings"]["enabled"] = not current_state
 
         embed = self.get_settings_embed()
         self.update_buttons()
@@ -2742,14 +2869,11 @@ class WelcomeChannelSelect(discord.ui.Select):
         channel_id = int(self.values[0])
 
         # Save the selected channel
-        welcome_data = load_welcome_data()
-        if "welcome_settings" not in welcome_data:
-            welcome_data["welcome_settings"] = {}
+        async with welcome_store.edit(default=default_welcome_data) as welcome_data:
+            if "welcome_settings" not in welcome_data:
+                welcome_data["welcome_settings"] = {}
 
-        welcome_data["welcome_settings"]["channel_id"] = channel_id
-
-        with open('welcome_data.json', 'w', encoding='utf-8') as f:
-            json.dump(welcome_data, f, indent=2, ensure_ascii=False)
+            welcome_data["welcome_settings"]["channel_id"] = channel_id
 
         # Go back to settings
         parent_view = self.view
@@ -2777,14 +2901,11 @@ class WelcomeMessageModal(discord.ui.Modal):
         self.add_item(self.message_input)
 
     async def on_submit(self, interaction: discord.Interaction):
-        welcome_data = load_welcome_data()
-        if "welcome_settings" not in welcome_data:
-            welcome_data["welcome_settings"] = {}
-
-        welcome_data["welcome_settings"]["welcome_message"] = self.message_input.value
+        async with welcome_store.edit(default=default_welcome_data) as welcome_data:
+            if "welcome_settings" not in welcome_data:
+                welcome_data["welcome_settings"] = {}
 
-        with open('welcome_data.json', 'w', encoding='utf-8') as f:
-            json.dump(welcome_data, f, indent=2, ensure_ascii=False)
+            welcome_data["welcome_settings"]["welcome_message"] = self.message_input.value
 
         # Go back to settings
         self.view.mode = "settings"